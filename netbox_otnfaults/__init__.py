@@ -20,6 +20,10 @@ class OtnFaultsConfig(PluginConfig):
         'map_default_zoom': 4.2,
         # 热力图数据缓存时间（秒）
         'heatmap_cache_timeout': 300,
+        # 统计载荷缓存：已结束周期保留时间、未结束周期新鲜期及过期后可返回旧数据的保留时间（秒）
+        'statistics_cache_ended_timeout': 12 * 3600,
+        'statistics_cache_fresh_timeout': 60,
+        'statistics_cache_stale_timeout': 15 * 60,
         # 是否使用本地底图（默认 False 使用网络底图）
         'use_local_basemap': False,
         # 本地瓦片服务地址（仅 use_local_basemap=True 时生效）
@@ -27,6 +31,14 @@ class OtnFaultsConfig(PluginConfig):
         # 本地字体服务地址（仅 use_local_basemap=True 时生效）
         'local_glyphs_url': '/maps/fonts/{fontstack}/{range}.pbf',
         'otn_paths_pmtiles_url': '/maps/otn_paths.pmtiles', # OTN路径PMTiles服务URL
+        # OTN路径PMTiles归档在服务器上的文件路径（build_otn_paths_pmtiles 输出位置，应与上方 URL 指向同一文件）
+        'otn_paths_pmtiles_file': '/opt/maps/data/otn_paths.pmtiles',
+        # 路由计算用路径图快照文件（rebuild_otn_path_graph_snapshot 输出位置，留空时使用 MEDIA_ROOT/netbox_otnfaults/otn_path_graph.snapshot），同一主机的 worker 共用
+        'otn_path_graph_snapshot_file': '',
+        # 路径图与高速公路图的路由引擎：'networkx'（默认，支持路径增量更新）或 'csr'（需安装 SciPy，稀疏矩阵存储，内存更小）
+        'graph_engine': 'networkx',
+        # 大屏变更事件流（SSE）：异步视图逐条推送，仅在 ASGI 部署下开启（WSGI 无法实时推送）；关闭时大屏按定时轮询刷新
+        'dashboard_event_stream': False,
     }
     
     # Netbox 4.x compatibility
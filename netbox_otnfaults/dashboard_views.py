@@ -3,11 +3,13 @@ OTN 全国网络故障自动化大屏 - 后端视图
 
 提供大屏页面渲染和聚合数据 API。
 """
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from django.templatetags.static import static
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.conf import settings
+from django.core.exceptions import PermissionDenied
 from django.db.models import Count
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.views import View
@@ -21,7 +23,11 @@ from .models import (
     CutoverStatusChoices, FaultCategoryChoices, FaultStatusChoices, UrgencyChoices,
 )
 from .dashboard_topology import build_fault_path_overlays
-from .services.fault_coordinates import resolve_fault_coordinates, resolve_cutover_coordinates
+from .services.fault_coordinates import resolve_many
+from .services.fault_map_data import get_cached_sites_data
+from .services.dashboard_delta import DASHBOARD_CUTOVER_WINDOW_DAYS, build_dashboard_response, dashboard_data_version
+from .services.event_stream import stream_events
+from .services.time_buckets import count_by_interval
 
 
 def get_plugin_settings() -> dict:
@@ -117,6 +123,7 @@ class DashboardPageView(PermissionRequiredMixin, View):
             'local_tiles_url': plugin_settings.get('local_tiles_url', ''),
             'local_glyphs_url': plugin_settings.get('local_glyphs_url', ''),
             'otn_paths_pmtiles_url': plugin_settings.get('otn_paths_pmtiles_url', ''),
+            'dashboard_event_stream': plugin_settings.get('dashboard_event_stream', False),
             'colors_config': json.dumps({
                 'category_colors': CATEGORY_COLORS,
                 'category_names': CATEGORY_NAMES,
@@ -128,14 +135,54 @@ class DashboardPageView(PermissionRequiredMixin, View):
         })
 
 
+class DashboardEventStreamView(View):
+    """
+    大屏变更事件流（Server-Sent Events）- 故障、业务影响与割接变更时通知客户端刷新。
+    异步视图返回异步事件流，ASGI 下逐条推送且等待期间不占用工作线程；WSGI 无法逐条推送，
+    需配置 dashboard_event_stream 开启（仅限 ASGI 部署）。
+    PermissionRequiredMixin 的 dispatch 为同步实现，此处在线程中自行校验权限。
+    """
+    permission_required = 'netbox_otnfaults.view_otnfault'
+
+    def _has_permission(self, request) -> bool:
+        return request.user.has_perm(self.permission_required)
+
+    async def get(self, request):
+        if not get_plugin_settings().get('dashboard_event_stream', False):
+            raise Http404('大屏事件流未开启')
+        if not await sync_to_async(self._has_permission)(request):
+            raise PermissionDenied
+
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+
+        response = StreamingHttpResponse(stream_events(last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # 禁止 Nginx 缓冲事件流
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 class DashboardDataAPI(PermissionRequiredMixin, View):
     """大屏聚合数据 API - 一次返回所有大屏所需数据"""
     permission_required = 'netbox_otnfaults.view_otnfault'
 
     def get(self, request) -> JsonResponse:
         now = timezone.localtime()
-        twenty_four_hours_ago = now - timedelta(hours=24)
-        cutover_window_end = now + timedelta(days=7)
+        since = request.GET.get('since') or None
+        version = dashboard_data_version(now)
+        if since == version:
+            return JsonResponse({'version': version, 'unchanged': True})
+
+        payload = self.build_payload(now)
+        return JsonResponse(
+            build_dashboard_response(payload, version, since),
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+    def build_payload(self, now) -> dict:
+        """构建大屏全量数据载荷。"""
+        cutover_window_end = now + timedelta(days=DASHBOARD_CUTOVER_WINDOW_DAYS)
         year_start = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
 
         # ── 1. 活跃故障（处理中）──
@@ -149,9 +196,11 @@ class DashboardDataAPI(PermissionRequiredMixin, View):
             'interruption_location', 'impacts', 'impacts__bare_fiber_service', 'impacts__circuit_service'
         )
 
+        fault_coordinates = resolve_many(active_faults_qs)
+
         active_faults = []
         for fault in active_faults_qs:
-            resolved = resolve_fault_coordinates(fault)
+            resolved = fault_coordinates[fault.pk]
             if resolved is None:
                 continue
             lat, lng = resolved.lat, resolved.lng
@@ -235,29 +284,34 @@ class DashboardDataAPI(PermissionRequiredMixin, View):
         suspended_count = all_faults.filter(fault_status='suspended').count()
 
         # ── 3. 24H 趋势 ──
-        trend_data = []
-        for i in range(24):
-            hour_start = twenty_four_hours_ago + timedelta(hours=i)
-            hour_end = hour_start + timedelta(hours=1)
-            count = OtnFault.objects.filter(
-                fault_occurrence_time__gte=hour_start,
-                fault_occurrence_time__lt=hour_end
-            ).count()
-            trend_data.append({
-                'hour': hour_start.strftime('%H:%M'),
+        # 按整点分桶（末桶为当前小时），同一小时内标签与分桶不变，与数据版本号中的整点一致
+        trend_start = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=23)
+        hourly_counts = count_by_interval(
+            OtnFault.objects.all(),
+            'fault_occurrence_time',
+            trend_start,
+            timedelta(hours=1),
+            24,
+        )
+        trend_data = [
+            {
+                'hour': (trend_start + timedelta(hours=i)).strftime('%H:%M'),
                 'count': count,
-            })
+            }
+            for i, count in enumerate(hourly_counts)
+        ]
 
         # ── 4. 站点坐标 ──
-        from dcim.models import Site
-        sites = []
-        for site in Site.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True):
-            sites.append({
-                'id': site.pk,
-                'name': site.name,
-                'lat': float(site.latitude),
-                'lng': float(site.longitude),
-            })
+        # 复用地图共享的站点数据集缓存
+        sites = [
+            {
+                'id': site['id'],
+                'name': site['name'],
+                'lat': site['latitude'],
+                'lng': site['longitude'],
+            }
+            for site in get_cached_sites_data()
+        ]
 
         # ── 5. 故障关联路径覆盖层数据 ──
         # 仅按故障 A/Z 站点对定位关联路径，避免单端命中带来相邻路径误判
@@ -312,10 +366,12 @@ class DashboardDataAPI(PermissionRequiredMixin, View):
             impact_count=Count('impacts', distinct=True)
         ).order_by('planned_cutover_time', 'pk')[:20]
 
+        cutover_coordinates = resolve_many(upcoming_cutovers_qs)
+
         cutovers_data = []
         for cutover in upcoming_cutovers_qs:
             z_site_objects = list(cutover.interruption_location.all())
-            resolved = resolve_cutover_coordinates(cutover)
+            resolved = cutover_coordinates[cutover.pk]
             z_sites = [site.name for site in z_site_objects]
             minutes_until = int((cutover.planned_cutover_time - now).total_seconds() // 60)
             cutovers_data.append({
@@ -358,7 +414,7 @@ class DashboardDataAPI(PermissionRequiredMixin, View):
                 'url': hd.get_absolute_url(),
             })
 
-        return JsonResponse({
+        return {
             'timestamp': now.isoformat(),
             'summary': {
                 'total_faults': total_count,
@@ -376,5 +432,5 @@ class DashboardDataAPI(PermissionRequiredMixin, View):
             'ticker_events': ticker_events,
             'cutovers': cutovers_data,
             'heavy_duties': heavy_duties_data,
-        }, json_dumps_params={'ensure_ascii': False})
+        }
 
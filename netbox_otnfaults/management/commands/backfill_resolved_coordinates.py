@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import CutoverTask, OtnFault
+from ...services.fault_coordinates import backfill_resolved_coordinates
+
+
+MODELS = {
+    "faults": ("故障", OtnFault),
+    "cutovers": ("割接", CutoverTask),
+}
+
+
+class Command(BaseCommand):
+    help = "批量解析并写入故障与割接的地图定位坐标"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--model", choices=[*MODELS, "all"], default="all", help="回填对象，默认全部")
+        parser.add_argument("--only-missing", action="store_true", help="仅回填尚未解析的记录")
+        parser.add_argument("--batch-size", type=int, default=500, help="批量读写条数，默认 500")
+
+    def handle(self, *args, **options) -> None:
+        names = list(MODELS) if options["model"] == "all" else [options["model"]]
+        for name in names:
+            label, model = MODELS[name]
+            started = time.monotonic()
+            row_count = backfill_resolved_coordinates(
+                model,
+                only_missing=options["only_missing"],
+                batch_size=options["batch_size"],
+            )
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(f"{label}定位坐标回填完成: {row_count} 条，耗时 {elapsed:.2f} 秒"))
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import highway_graph, otn_path_graph
+from ...services.csr_graph import HAS_SCIPY, NETWORKX_ENGINE, CsrRouteGraph
+from ...services.spatial_index import graph_spatial_index
+
+
+class Command(BaseCommand):
+    help = "对比 NetworkX 与 CSR 路由引擎（含空间索引）的内存占用与最短路径查询耗时"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--graph", choices=("otn", "highway"), default="otn", help="测试的图：OTN 路径图或高速公路图")
+        parser.add_argument("--pairs", type=int, default=200, help="随机抽取的起终点对数")
+        parser.add_argument("--seed", type=int, default=0, help="随机种子，便于多次运行对比")
+
+    def handle(self, *args, **options) -> None:
+        if not otn_path_graph.HAS_NETWORKX:
+            raise CommandError("NetworkX 未安装，无法构建路径图")
+        if not HAS_SCIPY:
+            raise CommandError("SciPy 未安装，无法构建 CSR 图")
+
+        tracemalloc.start()
+        try:
+            started = time.monotonic()
+            before = tracemalloc.get_traced_memory()[0]
+            service = self._build_networkx(options["graph"])
+            networkx_bytes = tracemalloc.get_traced_memory()[0] - before
+            networkx_build = time.monotonic() - started
+
+            graph = service._graph
+            if graph is None or graph.number_of_nodes() == 0:
+                raise CommandError("图为空，无法测试")
+
+            started = time.monotonic()
+            before = tracemalloc.get_traced_memory()[0]
+            csr_graph = CsrRouteGraph.from_edges(list(graph.nodes()), graph.edges(data=True))
+            csr_index = csr_graph.spatial_index()
+            csr_bytes = tracemalloc.get_traced_memory()[0] - before
+            csr_build = time.monotonic() - started
+        finally:
+            tracemalloc.stop()
+        # cKDTree 的树节点不经 tracemalloc 统计，按索引自身的字节数补计
+        csr_bytes += csr_index.tree_bytes
+
+        # 在最大连通分量内抽样，避免不可达的起终点对拉低耗时统计
+        component = sorted(max(otn_path_graph.nx.connected_components(graph), key=len))
+        rng = random.Random(options["seed"])
+        pairs = [tuple(rng.sample(component, 2)) for _ in range(options["pairs"])] if len(component) > 1 else []
+        if not pairs:
+            raise CommandError("最大连通分量不足两个节点，无法测试")
+
+        networkx_times, networkx_lengths = self._time_routes(service._shortest_path, pairs)
+        csr_times, csr_lengths = self._time_routes(csr_graph.shortest_path, pairs)
+        max_difference = max(abs(a - b) for a, b in zip(networkx_lengths, csr_lengths))
+
+        self.stdout.write(
+            f"{options['graph']} 图: {graph.number_of_nodes()} 节点, {graph.number_of_edges()} 边, "
+            f"{len(pairs)} 对起终点（最大连通分量 {len(component)} 节点）"
+        )
+        self.stdout.write(f"{'引擎':<10}{'内存 MB':>10}{'构建 s':>10}{'平均 ms':>10}{'P50 ms':>10}{'P95 ms':>10}")
+        for name, size, build, times in (
+            ("networkx", networkx_bytes, networkx_build, networkx_times),
+            ("csr", csr_bytes, csr_build, csr_times),
+        ):
+            ordered = sorted(times)
+            self.stdout.write(
+                f"{name:<10}{size / 1024 / 1024:>10.2f}{build:>10.2f}{statistics.mean(times):>10.2f}"
+                f"{ordered[len(ordered) // 2]:>10.2f}{ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]:>10.2f}"
+            )
+        self.stdout.write(
+            f"CSR 明细: 图 {csr_graph.nbytes / 1024 / 1024:.2f} MB, 空间索引 {csr_index.nbytes / 1024 / 1024:.2f} MB"
+        )
+        self.stdout.write(self.style.SUCCESS(f"对比完成，两种引擎路径长度最大差异 {max_difference:.3f} 米"))
+
+    def _build_networkx(self, graph_name: str):
+        """构建独立的 NetworkX 图实例及其空间索引，不影响本进程单例，也不读写快照"""
+        if graph_name == "highway":
+            service = object.__new__(highway_graph.HighwayGraphService)
+            service._load_graph(engine=NETWORKX_ENGINE)
+        else:
+            service = object.__new__(otn_path_graph.OtnPathGraphService)
+            service._build_graph()
+            service._spatial_index = graph_spatial_index(service._graph)
+        return service
+
+    def _time_routes(self, shortest_path, pairs) -> tuple[list[float], list[float]]:
+        times, lengths = [], []
+        for source, target in pairs:
+            started = time.perf_counter()
+            result = shortest_path(source, target)
+            times.append((time.perf_counter() - started) * 1000)
+            lengths.append(result[1] if result else float("inf"))
+        return times, lengths
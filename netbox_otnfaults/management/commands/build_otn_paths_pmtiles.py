@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from ...services.path_pmtiles import DEFAULT_MAX_ZOOM, DEFAULT_MIN_ZOOM, build_otn_paths_pmtiles
+
+
+class Command(BaseCommand):
+    help = "由 OtnPath 几何直接生成地图路径图层的 PMTiles 归档"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--output", default=None, help="归档输出路径，默认取插件配置 otn_paths_pmtiles_file")
+        parser.add_argument("--min-zoom", type=int, default=DEFAULT_MIN_ZOOM)
+        parser.add_argument("--max-zoom", type=int, default=DEFAULT_MAX_ZOOM)
+
+    def handle(self, *args, **options) -> None:
+        result = build_otn_paths_pmtiles(
+            options["output"],
+            min_zoom=options["min_zoom"],
+            max_zoom=options["max_zoom"],
+            on_zoom=lambda z, tiles, elapsed: self.stdout.write(f"z{z:<3} {tiles:>8} 张瓦片  {elapsed:8.2f}s"),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"PMTiles 生成完成: {result.output_path}，路径 {result.path_count} 条（跳过 {result.skipped_count} 条），"
+            f"瓦片 {result.tile_count} 张，归档 {result.size_bytes / 1024 / 1024:.2f} MB，耗时 {result.elapsed:.2f} 秒"
+        ))
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import gzip
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services.province_boundaries import BOUNDARY_LEVELS, get_province_boundaries
+
+
+class Command(BaseCommand):
+    help = "生成各缩放分档的简化省界并写入缓存，可同时输出 gzip 文件供静态服务器直接下发"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help="额外写出 province_boundaries_<分档>.geojson.gz 的目录，默认仅写入缓存",
+        )
+
+    def handle(self, *args, **options) -> None:
+        started = time.monotonic()
+        output_dir = options["output_dir"]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        for level in BOUNDARY_LEVELS:
+            _version, data = get_province_boundaries(level, force_refresh=True)
+            if output_dir:
+                with open(os.path.join(output_dir, f"province_boundaries_{level.name}.geojson.gz"), "wb") as output:
+                    output.write(data)
+            self.stdout.write(
+                f"{level.name:<8} z{level.min_zoom}-{level.max_zoom:<3} "
+                f"{len(gzip.decompress(data)) / 1024:9.1f} KB  gzip {len(data) / 1024:8.1f} KB"
+            )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"省界简化完成: {len(BOUNDARY_LEVELS)} 档，耗时 {elapsed:.2f} 秒"))
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services.repeat_links import rebuild_repeat_links
+
+
+class Command(BaseCommand):
+    help = "全量重建重复故障关联表"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="批量写入条数，默认 1000")
+
+    def handle(self, *args, **options) -> None:
+        started = time.monotonic()
+        link_count = rebuild_repeat_links(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"重复故障关联重建完成: {link_count} 条，耗时 {elapsed:.2f} 秒"))
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services.stats_warmup import WarmupResult, warm_statistics_cache
+
+
+class Command(BaseCommand):
+    help = "预热统计看板与故障地图缓存（本年、本月、本周及上一周期）"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--provinces",
+            action="append",
+            default=[],
+            help="额外预热的省份组合，逗号分隔，可重复指定；默认仅预热不筛选省份的数据",
+        )
+
+    def handle(self, *args, **options) -> None:
+        province_sets = [[]] + [
+            [province.strip() for province in value.split(",") if province.strip()]
+            for value in options["provinces"]
+        ]
+        started = time.monotonic()
+        results = warm_statistics_cache(province_sets, on_result=self._write_result)
+        elapsed = time.monotonic() - started
+        failed = sum(1 for result in results if result.error)
+        summary = f"统计缓存预热完成: {len(results)} 项，失败 {failed} 项，耗时 {elapsed:.2f} 秒"
+        self.stdout.write(self.style.WARNING(summary) if failed else self.style.SUCCESS(summary))
+
+    def _write_result(self, result: WarmupResult) -> None:
+        line = f"{result.payload:<20} {result.elapsed:8.2f}s  {result.params}"
+        if result.error:
+            self.stderr.write(f"{line}  失败: {result.error}")
+        else:
+            self.stdout.write(line)
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+FIBER_FAULT_CATEGORIES = ('fiber_break', 'fiber_degradation', 'fiber_jitter')
+REPEAT_FAULT_WINDOW = timedelta(days=60)
+
+
+def populate_repeat_links(apps, schema_editor):
+    OtnFault = apps.get_model('netbox_otnfaults', 'OtnFault')
+    OtnFaultRepeatLink = apps.get_model('netbox_otnfaults', 'OtnFaultRepeatLink')
+
+    buckets = defaultdict(list)
+    faults = (
+        OtnFault.objects.filter(fault_category__in=FIBER_FAULT_CATEGORIES)
+        .order_by('fault_occurrence_time')
+        .prefetch_related('interruption_location')
+    )
+    for fault in faults:
+        # 与 RepeatFaultIndex 一致：无 A 端站点或无发生时间的故障不参与重复判定
+        if not fault.interruption_location_a_id or not fault.fault_occurrence_time:
+            continue
+        for site in fault.interruption_location.all():
+            buckets[(fault.interruption_location_a_id, site.id)].append(fault)
+
+    links = {}
+    for bucket in buckets.values():
+        for position, fault in enumerate(bucket):
+            for previous_fault in reversed(bucket[:position]):
+                gap = fault.fault_occurrence_time - previous_fault.fault_occurrence_time
+                if gap > REPEAT_FAULT_WINDOW:
+                    break
+                if gap > timedelta(0):
+                    links[(fault.id, previous_fault.id)] = gap
+
+    OtnFaultRepeatLink.objects.bulk_create(
+        [
+            OtnFaultRepeatLink(fault_id=fault_id, previous_fault_id=previous_fault_id, gap=gap)
+            for (fault_id, previous_fault_id), gap in links.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_otnfaults', '0090_alter_cutoverimpact_business_impact'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OtnFaultRepeatLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gap', models.DurationField(verbose_name='间隔')),
+                (
+                    'fault',
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name='repeat_links',
+                        to='netbox_otnfaults.otnfault',
+                        verbose_name='故障',
+                    ),
+                ),
+                (
+                    'previous_fault',
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name='repeat_followup_links',
+                        to='netbox_otnfaults.otnfault',
+                        verbose_name='前序故障',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': '重复故障关联',
+                'verbose_name_plural': '重复故障关联',
+                'ordering': ('fault', 'previous_fault'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='otnfaultrepeatlink',
+            constraint=models.UniqueConstraint(
+                fields=('fault', 'previous_fault'),
+                name='unique_otn_fault_repeat_link',
+            ),
+        ),
+        migrations.RunPython(populate_repeat_links, migrations.RunPython.noop),
+    ]
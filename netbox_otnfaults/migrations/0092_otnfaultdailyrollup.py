@@ -0,0 +1,161 @@
+import math
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+
+HISTOGRAM_SIZE = 25
+CLASS_I_CATEGORIES_BY_FLAG = {
+    'ac_fault': 'ac_fault_is_class_i',
+    'device_fault': 'device_fault_is_class_i',
+}
+
+
+def _impact_level(fault):
+    if fault.source_cutover_task_id is not None:
+        return 'cutover'
+    if fault.fault_status == 'suspended' or fault.is_suspended:
+        return 'class_v'
+    category = fault.fault_category
+    if (
+        (category == 'fiber_break' and fault.has_class_i_business_impact)
+        or (category == 'power_fault' and fault.power_fault_impact == 'hosted')
+        or (category in CLASS_I_CATEGORIES_BY_FLAG and getattr(fault, CLASS_I_CATEGORIES_BY_FLAG[category]))
+    ):
+        return 'class_i'
+    if category == 'fiber_break':
+        return 'class_ii'
+    if category in ('power_fault', 'ac_fault', 'device_fault'):
+        return 'class_iii'
+    if category in ('fiber_degradation', 'fiber_jitter'):
+        return 'class_iv'
+    return 'unknown'
+
+
+def _source_group(resource_type):
+    if resource_type in ('self_built', 'coordinated'):
+        return '自控'
+    if resource_type == 'leased':
+        return '第三方'
+    return '其他/未填'
+
+
+def populate_fault_rollups(apps, schema_editor):
+    OtnFault = apps.get_model('netbox_otnfaults', 'OtnFault')
+    OtnFaultImpact = apps.get_model('netbox_otnfaults', 'OtnFaultImpact')
+    OtnFaultDailyRollup = apps.get_model('netbox_otnfaults', 'OtnFaultDailyRollup')
+
+    class_i_impacts = OtnFaultImpact.objects.filter(
+        otn_fault_id=OuterRef('pk'),
+        business_impact='interrupted',
+    ).filter(
+        Q(service_type='bare_fiber')
+        | Q(service_type='circuit', circuit_service__is_important=True)
+    )
+    faults = OtnFault.objects.filter(
+        fault_occurrence_time__isnull=False,
+        fault_recovery_time__isnull=False,
+    ).annotate(has_class_i_business_impact=Exists(class_i_impacts))
+
+    rollups = {}
+    for fault in faults.iterator(chunk_size=1000):
+        dimensions = {
+            'day': timezone.localdate(fault.fault_occurrence_time),
+            'province_id': fault.province_id,
+            'fault_category': fault.fault_category or '',
+            'resource_type': fault.resource_type or '',
+            'interruption_reason': fault.interruption_reason or '',
+            'source_group': _source_group(fault.resource_type),
+            'is_suspended': fault.fault_status == 'suspended' or fault.is_suspended,
+            'is_planned_rectification': (
+                fault.interruption_reason == 'cable_rectification'
+                and fault.interruption_reason_detail == 'planned_reporting'
+            ),
+            'impact_level': _impact_level(fault),
+        }
+        key = tuple(dimensions.values())
+        if key not in rollups:
+            rollups[key] = OtnFaultDailyRollup(
+                **dimensions,
+                fault_count=0,
+                duration_hours=0.0,
+                long_count=0,
+                duration_histogram=[0] * HISTOGRAM_SIZE,
+            )
+        rollup = rollups[key]
+        duration_hours = (fault.fault_recovery_time - fault.fault_occurrence_time).total_seconds() / 3600.0
+        rollup.fault_count += 1
+        rollup.duration_hours += duration_hours
+        if duration_hours >= 6.0:
+            rollup.long_count += 1
+        rollup.duration_histogram[min(HISTOGRAM_SIZE, max(1, math.ceil(duration_hours))) - 1] += 1
+
+    OtnFaultDailyRollup.objects.bulk_create(list(rollups.values()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0215_rackreservation_status'),
+        ('netbox_otnfaults', '0091_otnfaultrepeatlink'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OtnFaultDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='日期')),
+                ('fault_category', models.CharField(blank=True, max_length=20, verbose_name='故障分类')),
+                ('resource_type', models.CharField(blank=True, max_length=20, verbose_name='资源类型')),
+                ('interruption_reason', models.CharField(blank=True, max_length=50, verbose_name='故障原因')),
+                ('source_group', models.CharField(max_length=20, verbose_name='资源归属')),
+                ('is_suspended', models.BooleanField(verbose_name='是否挂起')),
+                ('is_planned_rectification', models.BooleanField(verbose_name='是否计划报备整改')),
+                ('impact_level', models.CharField(max_length=20, verbose_name='影响等级')),
+                ('fault_count', models.PositiveIntegerField(default=0, verbose_name='故障条数')),
+                ('duration_hours', models.FloatField(default=0.0, verbose_name='历时合计（小时）')),
+                ('long_count', models.PositiveIntegerField(default=0, verbose_name='长历时条数')),
+                (
+                    'duration_histogram',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                        verbose_name='历时分布',
+                    ),
+                ),
+                (
+                    'province',
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name='+',
+                        to='dcim.region',
+                        verbose_name='省份',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': '故障日汇总',
+                'verbose_name_plural': '故障日汇总',
+                'ordering': ('day', 'province'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='otnfaultdailyrollup',
+            index=models.Index(fields=['day', 'province'], name='otnfault_rollup_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='otnfaultdailyrollup',
+            constraint=models.UniqueConstraint(
+                fields=(
+                    'day', 'province', 'fault_category', 'resource_type', 'interruption_reason',
+                    'source_group', 'is_suspended', 'is_planned_rectification', 'impact_level',
+                ),
+                name='unique_otn_fault_daily_rollup',
+            ),
+        ),
+        migrations.RunPython(populate_fault_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,113 @@
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def _site_coordinate(site):
+    if site is None or site.latitude is None or site.longitude is None:
+        return None
+    return float(site.latitude), float(site.longitude)
+
+
+def _sites_center(sites):
+    coords = [coord for coord in (_site_coordinate(site) for site in sites) if coord is not None]
+    if not coords:
+        return None
+    return sum(lat for lat, _lng in coords) / len(coords), sum(lng for _lat, lng in coords) / len(coords)
+
+
+def _path_midpoint(OtnPath, a_site, z_site):
+    path = (
+        OtnPath.objects.filter(Q(site_a=a_site, site_z=z_site) | Q(site_a=z_site, site_z=a_site))
+        .exclude(geometry__isnull=True)
+        .exclude(geometry=[])
+        .first()
+    )
+    if path is None:
+        return None
+    geometry = path.geometry
+    coords = geometry.get('coordinates') if isinstance(geometry, dict) else geometry
+    if not isinstance(coords, list) or not coords:
+        return None
+    midpoint = coords[len(coords) // 2]
+    if not isinstance(midpoint, (list, tuple)) or len(midpoint) < 2 or midpoint[0] is None or midpoint[1] is None:
+        return None
+    return float(midpoint[1]), float(midpoint[0])
+
+
+def _resolve(OtnPath, fault):
+    """与 services.fault_coordinates.resolve_location_coordinates 的回退顺序一致。"""
+    if fault.interruption_latitude is not None and fault.interruption_longitude is not None:
+        return float(fault.interruption_latitude), float(fault.interruption_longitude), 'fault'
+
+    a_site = fault.interruption_location_a
+    z_sites = list(fault.interruption_location.all())
+    if a_site is None:
+        center = _sites_center(z_sites)
+        return (*center, 'sites_center') if center else None
+
+    if len(z_sites) == 1:
+        midpoint = _path_midpoint(OtnPath, a_site, z_sites[0])
+        if midpoint is not None:
+            return (*midpoint, 'path_midpoint')
+
+    a_site_coordinate = _site_coordinate(a_site)
+    if a_site_coordinate is not None:
+        return (*a_site_coordinate, 'a_site')
+
+    center = _sites_center([a_site] + z_sites)
+    return (*center, 'sites_center') if center else None
+
+
+def populate_resolved_coordinates(apps, schema_editor):
+    OtnFault = apps.get_model('netbox_otnfaults', 'OtnFault')
+    OtnPath = apps.get_model('netbox_otnfaults', 'OtnPath')
+
+    faults = (
+        OtnFault.objects.select_related('interruption_location_a')
+        .prefetch_related('interruption_location')
+        .only('pk', 'interruption_latitude', 'interruption_longitude', 'interruption_location_a')
+    )
+    for fault in faults.iterator(chunk_size=500):
+        resolved = _resolve(OtnPath, fault)
+        if resolved is None:
+            continue
+        lat, lng, source = resolved
+        OtnFault.objects.filter(pk=fault.pk).update(
+            resolved_latitude=round(lat, 6),
+            resolved_longitude=round(lng, 6),
+            resolved_coords_source=source,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_otnfaults', '0092_otnfaultdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otnfault',
+            name='resolved_longitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=9, null=True, verbose_name='地图定位经度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnfault',
+            name='resolved_latitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=8, null=True, verbose_name='地图定位纬度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnfault',
+            name='resolved_coords_source',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='地图定位来源'),
+        ),
+        migrations.AddIndex(
+            model_name='otnfault',
+            index=models.Index(fields=['resolved_longitude', 'resolved_latitude'], name='otnfault_resolved_coord_idx'),
+        ),
+        migrations.RunPython(populate_resolved_coordinates, migrations.RunPython.noop),
+    ]
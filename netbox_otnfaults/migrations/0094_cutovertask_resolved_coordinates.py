@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_otnfaults', '0093_otnfault_resolved_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cutovertask',
+            name='resolved_longitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=9, null=True, verbose_name='地图定位经度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='cutovertask',
+            name='resolved_latitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=8, null=True, verbose_name='地图定位纬度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='cutovertask',
+            name='resolved_coords_source',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='地图定位来源'),
+        ),
+    ]
@@ -0,0 +1,187 @@
+import math
+
+from django.db import migrations, models
+
+
+EARTH_RADIUS_M = 6371000
+
+PATH_METRIC_FIELDS = (
+    'midpoint_latitude',
+    'midpoint_longitude',
+    'bbox_west',
+    'bbox_south',
+    'bbox_east',
+    'bbox_north',
+    'vertex_count',
+)
+
+
+def _line_coordinates(geometry):
+    coords = geometry.get('coordinates') if isinstance(geometry, dict) else geometry
+    if not isinstance(coords, list):
+        return []
+    points = []
+    for point in coords:
+        if not isinstance(point, (list, tuple)) or len(point) < 2 or point[0] is None or point[1] is None:
+            continue
+        try:
+            points.append((float(point[0]), float(point[1])))
+        except (TypeError, ValueError):
+            continue
+    return points
+
+
+def _segment_lengths(points):
+    lengths = []
+    for (lng_a, lat_a), (lng_b, lat_b) in zip(points, points[1:]):
+        lat_a, lat_b = math.radians(lat_a), math.radians(lat_b)
+        a = (
+            math.sin((lat_b - lat_a) / 2) ** 2
+            + math.cos(lat_a) * math.cos(lat_b) * math.sin(math.radians(lng_b - lng_a) / 2) ** 2
+        )
+        lengths.append(2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a))))
+    return lengths
+
+
+def _arc_length_midpoint(points):
+    lengths = _segment_lengths(points)
+    half = sum(lengths) / 2
+    if half <= 0:
+        return points[0][1], points[0][0]
+    travelled = 0.0
+    for index, length in enumerate(lengths):
+        if travelled + length >= half:
+            ratio = (half - travelled) / length
+            (lng_a, lat_a), (lng_b, lat_b) = points[index], points[index + 1]
+            return lat_a + (lat_b - lat_a) * ratio, lng_a + (lng_b - lng_a) * ratio
+        travelled += length
+    return points[-1][1], points[-1][0]
+
+
+def _path_metric_fields(geometry):
+    """与迁移时 services.path_geometry.path_metric_fields 的口径一致。"""
+    points = _line_coordinates(geometry)
+    if not points:
+        return {**{name: None for name in PATH_METRIC_FIELDS}, 'vertex_count': 0}
+    midpoint_lat, midpoint_lng = _arc_length_midpoint(points)
+    lngs = [lng for lng, _lat in points]
+    lats = [lat for _lng, lat in points]
+    return {
+        'midpoint_latitude': round(midpoint_lat, 6),
+        'midpoint_longitude': round(midpoint_lng, 6),
+        'bbox_west': round(min(lngs), 6),
+        'bbox_south': round(min(lats), 6),
+        'bbox_east': round(max(lngs), 6),
+        'bbox_north': round(max(lats), 6),
+        'vertex_count': len(points),
+    }
+
+
+def populate_path_metrics(apps, schema_editor):
+    OtnPath = apps.get_model('netbox_otnfaults', 'OtnPath')
+
+    batch = []
+    for path in OtnPath.objects.only('pk', 'geometry').iterator(chunk_size=500):
+        for field_name, value in _path_metric_fields(path.geometry).items():
+            setattr(path, field_name, value)
+        batch.append(path)
+        if len(batch) >= 500:
+            OtnPath.objects.bulk_update(batch, PATH_METRIC_FIELDS)
+            batch = []
+    if batch:
+        OtnPath.objects.bulk_update(batch, PATH_METRIC_FIELDS)
+
+
+def refresh_path_midpoint_coordinates(apps, schema_editor):
+    """
+    0093 按中间顶点回填的 path_midpoint 定位改为路径弧长中点。
+    两端站点间已无带中点的路径时清空定位来源，读取时按当前回退顺序重新解析。
+    """
+    OtnPath = apps.get_model('netbox_otnfaults', 'OtnPath')
+
+    for model_name in ('OtnFault', 'CutoverTask'):
+        model = apps.get_model('netbox_otnfaults', model_name)
+        rows = (
+            model.objects.filter(resolved_coords_source='path_midpoint')
+            .select_related('interruption_location_a')
+            .prefetch_related('interruption_location')
+        )
+        for row in rows.iterator(chunk_size=500):
+            a_site = row.interruption_location_a
+            z_sites = list(row.interruption_location.all())
+            path = None
+            if a_site is not None and len(z_sites) == 1:
+                path = (
+                    OtnPath.objects.filter(
+                        models.Q(site_a=a_site, site_z=z_sites[0]) | models.Q(site_a=z_sites[0], site_z=a_site)
+                    )
+                    .filter(midpoint_latitude__isnull=False, midpoint_longitude__isnull=False)
+                    .first()
+                )
+            if path is None:
+                model.objects.filter(pk=row.pk).update(
+                    resolved_latitude=None, resolved_longitude=None, resolved_coords_source='',
+                )
+            else:
+                model.objects.filter(pk=row.pk).update(
+                    resolved_latitude=path.midpoint_latitude, resolved_longitude=path.midpoint_longitude,
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_otnfaults', '0094_cutovertask_resolved_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otnpath',
+            name='midpoint_longitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=9, null=True, verbose_name='路径中点经度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='midpoint_latitude',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=8, null=True, verbose_name='路径中点纬度',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='bbox_west',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=9, null=True, verbose_name='范围西界',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='bbox_south',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=8, null=True, verbose_name='范围南界',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='bbox_east',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=9, null=True, verbose_name='范围东界',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='bbox_north',
+            field=models.DecimalField(
+                blank=True, decimal_places=6, editable=False, max_digits=8, null=True, verbose_name='范围北界',
+            ),
+        ),
+        migrations.AddField(
+            model_name='otnpath',
+            name='vertex_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='顶点数'),
+        ),
+        migrations.RunPython(populate_path_metrics, migrations.RunPython.noop),
+        migrations.RunPython(refresh_path_midpoint_coordinates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+import sys
+from array import array
+
+from django.db import migrations, models
+
+
+# 微度（1e-6 度）存储为小端 int32 的 (lng, lat) 序列
+COORDINATE_SCALE = 1_000_000
+
+
+def _encoded_geometry(geometry):
+    """与迁移时 services.path_geometry.encoded_geometry 的编码一致；无有效顶点时为 None。"""
+    coords = geometry.get('coordinates') if isinstance(geometry, dict) else geometry
+    if not isinstance(coords, list):
+        return None
+    values = array('i')
+    for point in coords:
+        if not isinstance(point, (list, tuple)) or len(point) < 2 or point[0] is None or point[1] is None:
+            continue
+        try:
+            lng, lat = float(point[0]), float(point[1])
+        except (TypeError, ValueError):
+            continue
+        values.append(round(lng * COORDINATE_SCALE))
+        values.append(round(lat * COORDINATE_SCALE))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes() or None
+
+
+def populate_encoded_geometry(apps, schema_editor):
+    OtnPath = apps.get_model('netbox_otnfaults', 'OtnPath')
+
+    batch = []
+    for path in OtnPath.objects.only('pk', 'geometry').iterator(chunk_size=500):
+        path.geometry_encoded = _encoded_geometry(path.geometry)
+        batch.append(path)
+        if len(batch) >= 500:
+            OtnPath.objects.bulk_update(batch, ['geometry_encoded'])
+            batch = []
+    if batch:
+        OtnPath.objects.bulk_update(batch, ['geometry_encoded'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_otnfaults', '0095_otnpath_geometry_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otnpath',
+            name='geometry_encoded',
+            field=models.BinaryField(blank=True, editable=False, null=True, verbose_name='紧凑坐标'),
+        ),
+        migrations.RunPython(populate_encoded_geometry, migrations.RunPython.noop),
+    ]
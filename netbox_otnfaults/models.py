@@ -16,6 +16,15 @@ from utilities.choices import ChoiceSet
 import taggit.managers
 from django.core.exceptions import ValidationError
 
+from .services.path_geometry import (
+    PATH_METRIC_FIELDS,
+    coordinate_array,
+    decode_coordinates,
+    encoded_geometry,
+    line_coordinates,
+    path_metric_fields,
+)
+
 
 def _format_duration_units(days: int, hours: int, minutes: int, seconds: int) -> str:
     units: list[tuple[int, str]] = [
@@ -530,6 +539,29 @@ class CutoverTask(OtnBaseModel, ImageAttachmentsMixin):
         null=True,
         verbose_name='割接位置纬度'
     )
+    # 按地图定位回退策略预先解析的坐标，由保存信号维护
+    resolved_longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='地图定位经度'
+    )
+    resolved_latitude = models.DecimalField(
+        max_digits=8,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='地图定位纬度'
+    )
+    resolved_coords_source = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+        verbose_name='地图定位来源'
+    )
     interruption_location_a = models.ForeignKey(
         to=Site,
         on_delete=models.PROTECT,
@@ -1093,6 +1125,29 @@ class OtnFault(OtnBaseModel, ImageAttachmentsMixin):
         verbose_name='故障位置纬度',
         help_text='GPS坐标（十进制格式, xx.yyyyyy）'
     )
+    # 按地图定位回退策略预先解析的坐标，由保存信号维护，供地图按视野范围过滤
+    resolved_longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='地图定位经度'
+    )
+    resolved_latitude = models.DecimalField(
+        max_digits=8,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='地图定位纬度'
+    )
+    resolved_coords_source = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+        verbose_name='地图定位来源'
+    )
     
     # 新增字段
     # 1) 省份，引用netbox组织机构中的地区
@@ -1434,6 +1489,7 @@ class OtnFault(OtnBaseModel, ImageAttachmentsMixin):
             GinIndex(fields=['rectification_measures']),
             models.Index(fields=["fault_category", "fault_occurrence_time"], name="otnfault_cat_occ_idx"),
             models.Index(fields=["is_suspended", "fault_status", "fault_occurrence_time"], name="otnfault_susp_stat_occ_idx"),
+            models.Index(fields=["resolved_longitude", "resolved_latitude"], name="otnfault_resolved_coord_idx"),
         ]
         verbose_name = '故障'
         verbose_name_plural = '故障'
@@ -1875,6 +1931,125 @@ class OtnFault(OtnBaseModel, ImageAttachmentsMixin):
                 if attempt == max_attempts - 1:
                     raise
 
+
+class OtnFaultRepeatLink(models.Model):
+    """
+    重复故障关联物化表：记录光缆故障与其 60 天内同路由（A端站点相同且Z端站点有交集）的前序故障。
+    由故障保存及Z端站点变更信号增量维护，可通过 rebuild_repeat_links 命令全量重建。
+    """
+    fault = models.ForeignKey(
+        to='netbox_otnfaults.OtnFault',
+        on_delete=models.CASCADE,
+        related_name='repeat_links',
+        verbose_name='故障'
+    )
+    previous_fault = models.ForeignKey(
+        to='netbox_otnfaults.OtnFault',
+        on_delete=models.CASCADE,
+        related_name='repeat_followup_links',
+        verbose_name='前序故障'
+    )
+    gap = models.DurationField(
+        verbose_name='间隔'
+    )
+
+    class Meta:
+        ordering = ('fault', 'previous_fault')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('fault', 'previous_fault'),
+                name='unique_otn_fault_repeat_link',
+            )
+        ]
+        verbose_name = '重复故障关联'
+        verbose_name_plural = '重复故障关联'
+
+    def __str__(self) -> str:
+        return f"{self.fault_id} <- {self.previous_fault_id}"
+
+
+class OtnFaultDailyRollup(models.Model):
+    """
+    故障日汇总物化表：按本地自然日及统计维度汇总已恢复故障的条数、历时与历时分布。
+    由故障及业务影响保存信号按天增量刷新，可通过 rebuild_fault_rollups 命令全量重建。
+    """
+    day = models.DateField(
+        verbose_name='日期'
+    )
+    province = models.ForeignKey(
+        to='dcim.Region',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='省份'
+    )
+    fault_category = models.CharField(
+        max_length=20,
+        blank=True,
+        verbose_name='故障分类'
+    )
+    resource_type = models.CharField(
+        max_length=20,
+        blank=True,
+        verbose_name='资源类型'
+    )
+    interruption_reason = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name='故障原因'
+    )
+    source_group = models.CharField(
+        max_length=20,
+        verbose_name='资源归属'
+    )
+    is_suspended = models.BooleanField(
+        verbose_name='是否挂起'
+    )
+    is_planned_rectification = models.BooleanField(
+        verbose_name='是否计划报备整改'
+    )
+    impact_level = models.CharField(
+        max_length=20,
+        verbose_name='影响等级'
+    )
+    fault_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='故障条数'
+    )
+    duration_hours = models.FloatField(
+        default=0.0,
+        verbose_name='历时合计（小时）'
+    )
+    long_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='长历时条数'
+    )
+    duration_histogram = ArrayField(
+        base_field=models.PositiveIntegerField(),
+        default=list,
+        verbose_name='历时分布'
+    )
+
+    class Meta:
+        ordering = ('day', 'province')
+        constraints = [
+            models.UniqueConstraint(
+                fields=(
+                    'day', 'province', 'fault_category', 'resource_type', 'interruption_reason',
+                    'source_group', 'is_suspended', 'is_planned_rectification', 'impact_level',
+                ),
+                name='unique_otn_fault_daily_rollup',
+            )
+        ]
+        indexes = [
+            models.Index(fields=('day', 'province'), name='otnfault_rollup_day_idx'),
+        ]
+        verbose_name = '故障日汇总'
+        verbose_name_plural = '故障日汇总'
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.fault_category} {self.impact_level}"
+
+
 class ServiceTypeChoices(ChoiceSet):
     key = 'OtnFaultImpact.service_type'
 
@@ -2311,6 +2486,46 @@ class OtnPath(OtnBaseModel):
         verbose_name='长度',
         help_text='单位: 公里 (km)'
     )
+    # 由 geometry 预计算的冗余列，保存时同步刷新，坐标解析与地图定位无需读取完整几何
+    midpoint_longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='路径中点经度'
+    )
+    midpoint_latitude = models.DecimalField(
+        max_digits=8,
+        decimal_places=6,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='路径中点纬度'
+    )
+    bbox_west = models.DecimalField(
+        max_digits=9, decimal_places=6, blank=True, null=True, editable=False, verbose_name='范围西界'
+    )
+    bbox_south = models.DecimalField(
+        max_digits=8, decimal_places=6, blank=True, null=True, editable=False, verbose_name='范围南界'
+    )
+    bbox_east = models.DecimalField(
+        max_digits=9, decimal_places=6, blank=True, null=True, editable=False, verbose_name='范围东界'
+    )
+    bbox_north = models.DecimalField(
+        max_digits=8, decimal_places=6, blank=True, null=True, editable=False, verbose_name='范围北界'
+    )
+    vertex_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='顶点数'
+    )
+    geometry_encoded = models.BinaryField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='紧凑坐标'
+    )
     description = models.TextField(
         blank=True,
         verbose_name='描述'
@@ -2325,6 +2540,26 @@ class OtnPath(OtnBaseModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        for field_name, value in path_metric_fields(self.geometry).items():
+            setattr(self, field_name, value)
+        self.geometry_encoded = encoded_geometry(self.geometry)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'geometry' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *PATH_METRIC_FIELDS, 'geometry_encoded'}
+        super().save(*args, **kwargs)
+
+    @property
+    def coordinates(self) -> list[tuple[float, float]]:
+        """(lng, lat) 坐标列表：优先解码紧凑坐标，尚未生成时回退解析 geometry。"""
+        if self.geometry_encoded:
+            return decode_coordinates(self.geometry_encoded)
+        return line_coordinates(self.geometry)
+
+    def coordinate_array(self) -> Any:
+        """紧凑坐标的零拷贝 (N, 2) int32 视图，单位微度。"""
+        return coordinate_array(self.geometry_encoded)
+
     def get_absolute_url(self):
         return reverse('plugins:netbox_otnfaults:otnpath', args=[self.pk])
 
@@ -20,6 +20,8 @@ from django.db import transaction
 from django.utils import timezone
 from extras.scripts import Script, BooleanVar
 from netbox_otnfaults.models import OtnFault, FaultStatusChoices, FaultCategoryChoices
+from netbox_otnfaults.services.fault_rollup import rebuild_fault_rollups
+from netbox_otnfaults.services.repeat_links import rebuild_repeat_links
 
 
 class AdjustFaultTimes(Script):
@@ -149,7 +151,11 @@ class AdjustFaultTimes(Script):
                             'cable_route',
                         ]
                         OtnFault.objects.bulk_update(update_list, update_fields)
+                        # bulk_update 不触发 post_save，重复故障关联需整体重建
+                        link_count = rebuild_repeat_links()
+                        rollup_count = rebuild_fault_rollups()
                     self.log_success(f"成功更新 {len(update_list)} 条记录！")
+                    self.log_info(f"已重建重复故障关联 {link_count} 条、故障日汇总 {rollup_count} 行")
                 except Exception as e:
                     self.log_failure(f"更新失败: {str(e)}")
                     raise
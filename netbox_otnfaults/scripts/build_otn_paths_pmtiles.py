@@ -0,0 +1,63 @@
+"""
+NetBox自定义脚本：由 OtnPath 生成路径图层 PMTiles
+
+功能：
+1. 逐块读取 OtnPath 几何，按缩放级别简化并切分为矢量瓦片
+2. 直接写出 PMTiles v3 归档并替换地图使用的文件（无需导出 GeoJSON 与 tippecanoe）
+3. 输出各缩放级别瓦片数、归档大小与耗时
+
+使用方式：
+在 NetBox 的"自定义脚本"界面中：
+1. 选择脚本模块：netbox_otnfaults.scripts.build_otn_paths_pmtiles
+2. 选择脚本类：BuildOtnPathsPmtiles
+3. 运行脚本；导入路径后也可在导入脚本中勾选自动重建
+"""
+
+from extras.scripts import IntegerVar, Script, StringVar
+from netbox_otnfaults.services.path_pmtiles import (
+    DEFAULT_MAX_ZOOM,
+    DEFAULT_MIN_ZOOM,
+    build_otn_paths_pmtiles,
+    default_output_path,
+)
+
+
+class BuildOtnPathsPmtiles(Script):
+    """
+    生成 OtnPath PMTiles 归档的自定义脚本
+    """
+
+    class Meta:
+        name = "生成路径 PMTiles"
+        description = "由 OtnPath 几何直接生成地图路径图层的 PMTiles 归档，输出耗时与归档大小"
+        commit_default = True
+
+    output_path = StringVar(
+        label="输出路径",
+        description="PMTiles 归档输出路径，留空取插件配置 otn_paths_pmtiles_file",
+        required=False,
+    )
+    max_zoom = IntegerVar(
+        label="最大缩放级别",
+        default=DEFAULT_MAX_ZOOM,
+        min_value=DEFAULT_MIN_ZOOM,
+        max_value=16,
+    )
+
+    def run(self, data, commit):
+        """脚本主入口"""
+        output_path = data.get('output_path') or default_output_path()
+        self.log_info(f"开始生成 PMTiles: {output_path}")
+        result = build_otn_paths_pmtiles(
+            output_path,
+            max_zoom=data.get('max_zoom') or DEFAULT_MAX_ZOOM,
+            on_zoom=lambda z, tiles, elapsed: self.log_info(f"缩放级别 {z}: {tiles} 张瓦片，累计 {elapsed:.2f} 秒"),
+        )
+        if result.skipped_count:
+            self.log_warning(f"跳过 {result.skipped_count} 条无有效几何数据的路径")
+        message = (
+            f"已生成 {result.output_path}：路径 {result.path_count} 条，瓦片 {result.tile_count} 张，"
+            f"归档 {result.size_bytes / 1024 / 1024:.2f} MB，耗时 {result.elapsed:.2f} 秒"
+        )
+        self.log_success(message)
+        return message
@@ -37,9 +37,11 @@ class ExportPathsGeoJSON(Script):
         features = []
         skipped = 0
         
-        for path in OtnPath.objects.all():
+        # 紧凑坐标统一了纯坐标数组与 GeoJSON 两种存储格式，且无需加载 JSON 几何
+        for path in OtnPath.objects.select_related('site_a', 'site_z').defer('geometry'):
+            coordinates = path.coordinates
             # 跳过没有几何数据的路径
-            if not path.geometry:
+            if not coordinates:
                 skipped += 1
                 continue
 
@@ -47,7 +49,7 @@ class ExportPathsGeoJSON(Script):
                 "type": "Feature",
                 "geometry": {
                     "type": "LineString",
-                    "coordinates": path.geometry
+                    "coordinates": [list(point) for point in coordinates]
                 },
                 "properties": {
                     "id": path.pk,
@@ -214,13 +214,13 @@ class FixFaultSitesByPath(Script):
         """
         matching_paths = []
         
-        # 获取所有有几何数据的路径
-        paths = OtnPath.objects.exclude(geometry__isnull=True)
+        # 获取所有有几何数据的路径，读取紧凑坐标而不加载 JSON 几何
+        paths = OtnPath.objects.filter(vertex_count__gte=2).defer('geometry')
         
         for path in paths:
             try:
                 distance = self.point_to_line_distance(
-                    fault_lat, fault_lon, path.geometry
+                    fault_lat, fault_lon, path.coordinates
                 )
                 
                 if distance <= distance_threshold:
@@ -27,6 +27,7 @@ from tenancy.models import Tenant
 from netbox_contract.models import ServiceProvider
 from extras.scripts import Script, ChoiceVar, IntegerVar, BooleanVar
 from netbox_otnfaults.models import OtnFault, OtnFaultImpact
+from netbox_otnfaults.services.fault_rollup import rebuild_fault_rollups
 
 
 class GenerateFaultData(Script):
@@ -544,6 +545,10 @@ class GenerateFaultData(Script):
         if commit:
             OtnFaultImpact.objects.bulk_create(impacts)
             self.log_success(f"成功创建 {len(impacts)} 条业务影响记录")
+            
+            # bulk_create 不触发 post_save，且日汇总依赖业务影响，全部写入后整体重建
+            rollup_count = rebuild_fault_rollups()
+            self.log_success(f"已重建故障日汇总 {rollup_count} 行")
         else:
             self.log_info(f"模拟模式：将创建 {len(impacts)} 条业务影响记录")
         
@@ -35,6 +35,11 @@ class ImportOtnPaths(Script):
         description="模拟模式：仅预览导入结果，不写入数据库。"
     )
 
+    rebuild_pmtiles = BooleanVar(
+        default=False,
+        description="导入写入数据库后重建路径图层 PMTiles 归档，使地图拓扑与导入结果保持一致。"
+    )
+
     def get_arcgis_session(self) -> requests.Session:
         session = requests.Session()
         session.trust_env = False
@@ -781,5 +786,14 @@ class ImportOtnPaths(Script):
             dry_run_msg = "当前为模拟模式，本次运行未写入数据库。"
             self.log_warning(dry_run_msg)
             report_msg += f"\n{dry_run_msg}"
+        elif should_save and data.get('rebuild_pmtiles'):
+            from netbox_otnfaults.services.path_pmtiles import build_otn_paths_pmtiles
+            result = build_otn_paths_pmtiles()
+            pmtiles_msg = (
+                f"已重建路径 PMTiles：{result.output_path}，瓦片 {result.tile_count} 张，"
+                f"归档 {result.size_bytes / 1024 / 1024:.2f} MB，耗时 {result.elapsed:.2f} 秒"
+            )
+            self.log_success(pmtiles_msg)
+            report_msg += f"\n{pmtiles_msg}"
 
         return report_msg
@@ -1,33 +1,20 @@
 #!/bin/bash
 # =============================================================================
 # 一键刷新 PMTiles
-# 整合 GeoJSON 导出和 PMTiles 生成流程
+# 调用插件管理命令由 OtnPath 直接生成 PMTiles 归档（无需 GeoJSON 导出与 tippecanoe）
+# 如需沿用 tippecanoe 流程，可先运行 export_paths_geojson 脚本，再执行 generate_pmtiles.sh
 # =============================================================================
 
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 NETBOX_DIR="/opt/netbox"
 
 echo "=========================================="
 echo " OtnPath PMTiles 刷新脚本"
 echo "=========================================="
 
-# 步骤 1: 导出 GeoJSON
-echo ""
-echo "[步骤 1/2] 调用 NetBox 脚本导出 GeoJSON..."
 cd "$NETBOX_DIR"
 source "$NETBOX_DIR/venv/bin/activate"
 
-python manage.py runscript netbox_otnfaults.scripts.export_paths_geojson --commit
-
-if [ $? -ne 0 ]; then
-    echo "GeoJSON 导出失败!"
-    exit 1
-fi
-
-# 步骤 2: 生成 PMTiles
-echo ""
-echo "[步骤 2/2] 生成 PMTiles..."
-"$SCRIPT_DIR/generate_pmtiles.sh"
+python manage.py build_otn_paths_pmtiles "$@"
 
 if [ $? -eq 0 ]; then
     echo ""
@@ -0,0 +1,57 @@
+"""
+NetBox自定义脚本：预热统计看板与故障地图缓存
+
+功能：
+1. 计算故障分布地图载荷
+2. 计算本年、本月、本周及各自上一周期的故障统计、业务统计与光缆中断地图载荷
+3. 以与接口相同的缓存键写入缓存，并输出每项载荷的耗时
+
+使用方式：
+在 NetBox 的"自定义脚本"界面中：
+1. 选择脚本模块：netbox_otnfaults.scripts.warm_statistics_cache
+2. 选择脚本类：WarmStatisticsCache
+3. 运行脚本，可设置定时间隔周期执行
+"""
+
+from extras.scripts import Script, TextVar
+from netbox_otnfaults.services.stats_warmup import warm_statistics_cache
+
+
+class WarmStatisticsCache(Script):
+    """
+    预热统计看板与故障地图缓存的自定义脚本
+    """
+
+    class Meta:
+        name = "预热统计缓存"
+        description = "预计算标准统计周期的统计看板与故障地图数据并写入缓存，输出各载荷耗时"
+        commit_default = True
+
+    provinces = TextVar(
+        label="省份组合",
+        description="额外预热的省份组合，每行一组，组内以逗号分隔；留空仅预热不筛选省份的数据",
+        required=False,
+    )
+
+    def run(self, data, commit):
+        """脚本主入口"""
+        province_sets = [[]]
+        for line in (data.get('provinces') or '').splitlines():
+            provinces = [province.strip() for province in line.split(',') if province.strip()]
+            if provinces:
+                province_sets.append(provinces)
+
+        self.log_info(f"开始预热统计缓存，省份组合 {len(province_sets)} 组")
+        results = warm_statistics_cache(province_sets)
+
+        total_elapsed = 0.0
+        for result in results:
+            total_elapsed += result.elapsed
+            message = f"{result.payload} {result.params or '-'}: {result.elapsed:.2f} 秒"
+            if result.error:
+                self.log_failure(f"{message}，失败: {result.error}")
+            else:
+                self.log_success(message)
+
+        failed = sum(1 for result in results if result.error)
+        return f"预热 {len(results)} 项，失败 {failed} 项，累计耗时 {total_elapsed:.2f} 秒"
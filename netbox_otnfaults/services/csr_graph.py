@@ -0,0 +1,265 @@
+"""
+基于 SciPy 稀疏矩阵的路径图引擎。
+
+节点坐标存为 NumPy 数组并按 (lng, lat) 排序下标二分查找，邻接关系存为 CSR 稀疏矩阵，边属性（路径名称、光缆类型）去重后以整数编码数组保存，
+每条边仅占若干字节；最短路径由 scipy.sparse.csgraph.dijkstra 在 C 层计算，最近节点查询由坐标数组上的 cKDTree 完成。
+与 NetworkX 图相比内存小一个数量级，但不支持按路径增量更新，路径变更后整体重新加载。
+通过插件配置 graph_engine = 'csr' 启用，未安装 SciPy 时回退到 NetworkX。
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import sys
+from collections.abc import Iterable
+from typing import Any
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+    np = None
+
+
+NETWORKX_ENGINE = 'networkx'
+CSR_ENGINE = 'csr'
+
+EARTH_RADIUS_M = 6371000
+
+# Dijkstra 先将搜索范围限制为直线距离的倍数加固定余量，找不到时再不限范围重算
+SEARCH_LIMIT_FACTOR = 3.0
+SEARCH_LIMIT_MARGIN = 100000
+
+# CSR 中数值为 0 的元素不视为边，零长度边以极小正值保存
+_MIN_WEIGHT = 1e-9
+
+Coordinate = tuple[float, float]
+
+
+def graph_engine() -> str:
+    """插件配置选择的路径图引擎；配置为 csr 但未安装 SciPy 时回退到 NetworkX。"""
+    from django.conf import settings
+
+    engine = settings.PLUGINS_CONFIG.get('netbox_otnfaults', {}).get('graph_engine', NETWORKX_ENGINE)
+    if engine == CSR_ENGINE and not HAS_SCIPY:
+        print('[graph_engine] 已配置 csr 引擎但未安装 SciPy，回退到 NetworkX')
+        return NETWORKX_ENGINE
+    return engine if engine in (NETWORKX_ENGINE, CSR_ENGINE) else NETWORKX_ENGINE
+
+
+def _haversine(coord1: Coordinate, coord2: Coordinate) -> float:
+    lat1, lat2 = math.radians(coord1[1]), math.radians(coord2[1])
+    dlat = lat2 - lat1
+    dlng = math.radians(coord2[0] - coord1[0])
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class CsrRouteGraph:
+    """
+    只读的 CSR 路径图，节点仍以 (lng, lat) 元组对外暴露，
+    可直接替换 NetworkX 图供空间索引与 calculate_route 使用。
+    坐标到节点下标的映射不保留元组列表与字典，只在坐标数组的字典序下标上二分查找。
+    """
+
+    def __init__(self, lngs, lats, indptr, indices, weights, edge_attrs, attr_table: list[dict[str, Any]]):
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.edge_attrs = np.asarray(edge_attrs, dtype=np.int32)
+        self.attr_table = attr_table
+        node_count = len(self.lngs)
+        self.matrix = csr_matrix(
+            (np.maximum(np.asarray(weights, dtype=np.float64), _MIN_WEIGHT),
+             np.asarray(indices, dtype=np.int32),
+             np.asarray(indptr, dtype=np.int32)),
+            shape=(node_count, node_count),
+        )
+        # 按经度、纬度字典序排列的节点下标
+        self._order = np.lexsort((self.lats, self.lngs)).astype(np.int32)
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> CsrRouteGraph:
+        """由路径图快照构建；快照本身即为 CSR 布局，数组复制出 mmap 后快照即可关闭。"""
+        return cls(
+            *(np.array(view) for view in (
+                snapshot.lngs, snapshot.lats, snapshot.indptr, snapshot.indices, snapshot.weights, snapshot.edge_paths,
+            )),
+            [_route_attrs(attrs) for attrs in snapshot.path_attrs],
+        )
+
+    @classmethod
+    def from_edges(cls, nodes: list[Coordinate], edges: Iterable[tuple[Coordinate, Coordinate, dict[str, Any]]]) -> CsrRouteGraph:
+        """由节点列表与 (节点, 节点, 属性) 边序列构建，属性去重编码；自环不参与路由，直接丢弃。"""
+        node_ids = {node: index for index, node in enumerate(nodes)}
+        attr_codes: dict[tuple, int] = {}
+        attr_table: list[dict[str, Any]] = []
+        adjacency: list[list[tuple[int, float, int]]] = [[] for _ in nodes]
+        for node_a, node_b, attrs in edges:
+            source, target = node_ids[node_a], node_ids[node_b]
+            if source == target:
+                continue
+            route_attrs = _route_attrs(attrs)
+            key = tuple(sorted(route_attrs.items()))
+            if key not in attr_codes:
+                attr_codes[key] = len(attr_table)
+                attr_table.append(route_attrs)
+            weight = float(attrs.get('weight', 0.0))
+            adjacency[source].append((target, weight, attr_codes[key]))
+            adjacency[target].append((source, weight, attr_codes[key]))
+
+        indptr, indices, weights, edge_attrs = [0], [], [], []
+        for neighbours in adjacency:
+            for target, weight, code in sorted(neighbours):
+                indices.append(target)
+                weights.append(weight)
+                edge_attrs.append(code)
+            indptr.append(len(indices))
+        return cls(
+            [node[0] for node in nodes], [node[1] for node in nodes],
+            indptr, indices, weights, edge_attrs, attr_table,
+        )
+
+    def _node_id(self, node: Coordinate) -> int | None:
+        lngs, lats, order = self.lngs, self.lats, self._order
+        key = (node[0], node[1])
+        position = bisect.bisect_left(order, key, key=lambda index: (lngs[index], lats[index]))
+        if position < len(order) and (lngs[order[position]], lats[order[position]]) == key:
+            return int(order[position])
+        return None
+
+    def _node(self, index: int) -> Coordinate:
+        return float(self.lngs[index]), float(self.lats[index])
+
+    def __contains__(self, node) -> bool:
+        return self._node_id(node) is not None
+
+    def nodes(self) -> list[Coordinate]:
+        """按需生成的节点坐标列表，图本身不持有。"""
+        return list(zip(self.lngs.tolist(), self.lats.tolist()))
+
+    def number_of_nodes(self) -> int:
+        return len(self.lngs)
+
+    def number_of_edges(self) -> int:
+        return self.matrix.nnz // 2
+
+    @property
+    def nbytes(self) -> int:
+        """图占用的字节数：坐标、排序下标、CSR 与边属性编码数组，加上去重后的属性表。"""
+        matrix = self.matrix
+        attr_bytes = sys.getsizeof(self.attr_table) + sum(
+            sys.getsizeof(attrs) + sum(sys.getsizeof(value) for value in attrs.values()) for attrs in self.attr_table
+        )
+        return (
+            self.lngs.nbytes + self.lats.nbytes + self._order.nbytes + self.edge_attrs.nbytes
+            + matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes + attr_bytes
+        )
+
+    def spatial_index(self) -> CsrSpatialIndex:
+        """基于坐标数组的最近节点索引，供 graph_spatial_index 代替逐节点构建的 NodeSpatialIndex。"""
+        return CsrSpatialIndex(self)
+
+    def edge_data(self, node_a: Coordinate, node_b: Coordinate) -> dict[str, Any] | None:
+        source, target = self._node_id(node_a), self._node_id(node_b)
+        if source is None or target is None:
+            return None
+        start, end = self.matrix.indptr[source], self.matrix.indptr[source + 1]
+        for entry in range(start, end):
+            if self.matrix.indices[entry] == target:
+                return {'weight': float(self.matrix.data[entry]), **self.attr_table[self.edge_attrs[entry]]}
+        return None
+
+    def shortest_path(self, source: Coordinate, target: Coordinate) -> tuple[tuple[Coordinate, ...], float] | None:
+        """两节点间的最短路径 (节点序列, 长度米)，不可达时返回 None。"""
+        source_id, target_id = self._node_id(source), self._node_id(target)
+        if source_id is None or target_id is None:
+            return None
+        if source_id == target_id:
+            return (source,), 0.0
+
+        limit = _haversine(source, target) * SEARCH_LIMIT_FACTOR + SEARCH_LIMIT_MARGIN
+        distances, predecessors = dijkstra(
+            self.matrix, directed=True, indices=source_id, return_predecessors=True, limit=limit,
+        )
+        if not math.isfinite(distances[target_id]):
+            distances, predecessors = dijkstra(self.matrix, directed=True, indices=source_id, return_predecessors=True)
+            if not math.isfinite(distances[target_id]):
+                return None
+
+        path = [target_id]
+        while path[-1] != source_id:
+            path.append(int(predecessors[path[-1]]))
+        return tuple(self._node(index) for index in reversed(path)), float(distances[target_id])
+
+
+class CsrSpatialIndex:
+    """
+    CSR 图节点的空间索引：由坐标数组换算单位球面三维坐标并构建 cKDTree，查询结果的下标经图的坐标数组还原为节点，
+    不为每个节点保留 Python 对象。距离与 NodeSpatialIndex 一致按弦长换算为大圆距离（米），接口亦相同。
+    """
+
+    # cKDTree 每个树节点的 C 结构体大小（切分维度与切分值、点下标区间、左右子树），由 C++ 分配，不在 NumPy 数组中
+    TREE_NODE_BYTES = 72
+
+    def __init__(self, graph: CsrRouteGraph):
+        self._graph = graph
+        lng_rad, lat_rad = np.radians(graph.lngs), np.radians(graph.lats)
+        cos_lat = np.cos(lat_rad)
+        points = np.column_stack((cos_lat * np.cos(lng_rad), cos_lat * np.sin(lng_rad), np.sin(lat_rad)))
+        self._tree = cKDTree(points, copy_data=False)
+
+    def __len__(self) -> int:
+        return self._tree.n
+
+    @property
+    def tree_bytes(self) -> int:
+        """树节点占用的字节数；树节点由 C++ 分配，tracemalloc 统计不到。"""
+        return self._tree.size * self.TREE_NODE_BYTES
+
+    @property
+    def nbytes(self) -> int:
+        """索引占用的字节数：三维坐标与点下标数组，加上树节点。"""
+        return self._tree.data.nbytes + self._tree.indices.nbytes + self.tree_bytes
+
+    def _results(self, chords, indices) -> list[tuple[float, Coordinate]]:
+        meters = 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(1.0, chords / 2))
+        return [(float(distance), self._graph._node(index)) for distance, index in zip(meters.tolist(), indices.tolist())]
+
+    def nearest(self, lng: float, lat: float, k: int = 1, max_distance: float | None = None) -> list[tuple[float, Coordinate]]:
+        """返回距离最近的至多 k 个节点，按距离升序排列为 [(距离米, 节点), ...]。"""
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        # cKDTree 只返回严格小于上界的点，上界取弦长的下一个浮点数以包含恰好位于 max_distance 处的节点
+        bound = np.inf if max_distance is None else np.nextafter(_meters_to_chord(max_distance), np.inf)
+        chords, indices = self._tree.query(_unit_vector(lng, lat), k=k, distance_upper_bound=bound)
+        chords, indices = np.atleast_1d(chords), np.atleast_1d(indices)
+        found = np.isfinite(chords)
+        return self._results(chords[found], indices[found])
+
+    def within(self, lng: float, lat: float, radius: float) -> list[tuple[float, Coordinate]]:
+        """返回 radius 米内的全部节点，按距离升序排列为 [(距离米, 节点), ...]。"""
+        target = _unit_vector(lng, lat)
+        indices = np.asarray(self._tree.query_ball_point(target, _meters_to_chord(radius)), dtype=np.intp)
+        chords = np.linalg.norm(self._tree.data[indices] - target, axis=1)
+        order = np.argsort(chords, kind='stable')
+        return self._results(chords[order], indices[order])
+
+
+def _unit_vector(lng: float, lat: float):
+    lng_rad, lat_rad = math.radians(lng), math.radians(lat)
+    cos_lat = math.cos(lat_rad)
+    return np.array((cos_lat * math.cos(lng_rad), cos_lat * math.sin(lng_rad), math.sin(lat_rad)))
+
+
+def _meters_to_chord(distance: float) -> float:
+    return 2 * math.sin(min(distance / (2 * EARTH_RADIUS_M), math.pi / 2))
+
+
+def _route_attrs(attrs: dict[str, Any]) -> dict[str, Any]:
+    """只保留展示用的边属性；权重另存，所属路径仅供 NetworkX 引擎增量更新使用。"""
+    return {key: value for key, value in attrs.items() if key not in ('weight', 'path_ids')}
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from dcim.models import Site
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+
+from ..models import CutoverImpact, CutoverTask, HeavyDuty, OtnFault, OtnFaultImpact, OtnPath
+
+
+# 按 ID 增量下发的大屏数据集合，其余字段（汇总、趋势、事件流等）体积小，每次随响应全量下发
+DASHBOARD_DELTA_COLLECTIONS: tuple[str, ...] = (
+    'active_faults',
+    'cutovers',
+    'fault_paths',
+    'sites',
+    'heavy_duties',
+)
+
+# 随时间推移而非数据变更变化的条目字段：不计入条目摘要与版本号，由客户端按时间戳推算，增量响应中每次随附当前值
+DASHBOARD_VOLATILE_FIELDS: dict[str, tuple[str, ...]] = {
+    'active_faults': ('duration', 'priority_score'),
+    'cutovers': ('minutes_until',),
+}
+
+# 大屏割接展示窗口（天），与 DashboardDataAPI.build_payload 一致
+DASHBOARD_CUTOVER_WINDOW_DAYS = 7
+
+# 各版本集合摘要的保留时长（秒），超时后客户端将收到全量数据
+DASHBOARD_SNAPSHOT_TIMEOUT = 15 * 60
+
+DASHBOARD_SOURCE_MODELS = (OtnFault, OtnFaultImpact, CutoverTask, CutoverImpact, HeavyDuty, OtnPath, Site)
+
+
+def _snapshot_key(version: str) -> str:
+    return f"otnfaults:dashboard:snapshot:{version}"
+
+
+def dashboard_data_version(now: datetime) -> str:
+    """
+    返回大屏数据版本号。
+    由各数据源的记录数与最近更新时间、落入 24 小时趋势、割接与重保展示窗口的记录数，
+    以及当前整点折算，仅在大屏展示的数据变化或 24H 趋势跨过整点时变化，无需构建完整载荷即可判断。
+    """
+    fingerprint: list[Any] = [now.strftime('%Y-%m-%dT%H')]
+    fingerprint += [
+        model.objects.aggregate(count=Count('pk'), updated=Max('last_updated'))
+        for model in DASHBOARD_SOURCE_MODELS
+    ]
+    fingerprint.append({
+        'recent_faults': OtnFault.objects.filter(fault_occurrence_time__gte=now - timedelta(hours=24)).count(),
+        'upcoming_cutovers': CutoverTask.objects.filter(
+            planned_cutover_time__gte=now,
+            planned_cutover_time__lte=now + timedelta(days=DASHBOARD_CUTOVER_WINDOW_DAYS),
+        ).count(),
+        'active_heavy_duties': HeavyDuty.objects.filter(start_time__lte=now, end_time__gte=now).count(),
+    })
+    encoded = json.dumps(fingerprint, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.md5(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def _item_digest(item: dict[str, Any], volatile_fields: tuple[str, ...] = ()) -> str:
+    stable = {key: value for key, value in item.items() if key not in volatile_fields}
+    encoded = json.dumps(stable, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.md5(encoded.encode('utf-8')).hexdigest()
+
+
+def build_dashboard_response(payload: dict[str, Any], version: str, since: str | None) -> dict[str, Any]:
+    """
+    根据客户端上次版本构建响应。
+    上次版本的集合摘要仍在缓存中时仅下发新增、变更与移除的条目及当前顺序，否则下发全量载荷。
+    摘要不含随时间变化的字段，同一版本只写入一次，避免覆盖其他客户端据以计算增量的摘要。
+    """
+    digests = {
+        name: {
+            item['id']: _item_digest(item, DASHBOARD_VOLATILE_FIELDS.get(name, ()))
+            for item in payload.get(name, [])
+        }
+        for name in DASHBOARD_DELTA_COLLECTIONS
+    }
+    cache.add(_snapshot_key(version), digests, timeout=DASHBOARD_SNAPSHOT_TIMEOUT)
+
+    previous = cache.get(_snapshot_key(since)) if since else None
+    if previous is None:
+        return {**payload, 'version': version, 'delta': False}
+
+    response = {
+        key: value
+        for key, value in payload.items()
+        if key not in DASHBOARD_DELTA_COLLECTIONS
+    }
+    changes: dict[str, dict[str, list]] = {}
+    for name in DASHBOARD_DELTA_COLLECTIONS:
+        old_digests = previous.get(name, {})
+        new_digests = digests[name]
+        added: list[dict[str, Any]] = []
+        changed: list[dict[str, Any]] = []
+        for item in payload.get(name, []):
+            old_digest = old_digests.get(item['id'])
+            if old_digest is None:
+                added.append(item)
+            elif old_digest != new_digests[item['id']]:
+                changed.append(item)
+        changes[name] = {
+            'added': added,
+            'changed': changed,
+            'removed': [item_id for item_id in old_digests if item_id not in new_digests],
+            'order': list(new_digests),
+        }
+    # 未变更条目不再下发，其随时间变化的字段按 ID 每次随附
+    volatile = {
+        name: {item['id']: {field: item.get(field) for field in fields} for item in payload.get(name, [])}
+        for name, fields in DASHBOARD_VOLATILE_FIELDS.items()
+    }
+    response.update({'version': version, 'delta': True, 'changes': changes, 'volatile': volatile})
+    return response
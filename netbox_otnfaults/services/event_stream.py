@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+
+EVENT_STREAM_PREFIX = "otnfaults:events"
+EVENT_SEQUENCE_KEY = f"{EVENT_STREAM_PREFIX}:seq"
+
+# 单条事件在缓存中的保留时长（秒），超出后断线重连的客户端需全量刷新
+EVENT_RETENTION = 10 * 60
+
+# 事件流读取轮询间隔、心跳间隔与单次连接时长（秒）；连接到期后由浏览器按 retry 自动重连
+EVENT_POLL_INTERVAL = 1.0
+EVENT_HEARTBEAT_INTERVAL = 15.0
+EVENT_STREAM_LIFETIME = 5 * 60
+EVENT_RETRY_MILLISECONDS = 3000
+
+# 序号已分配而事件持续缺失的轮询次数上限，超出视为事件丢失
+EVENT_MISSING_POLL_LIMIT = 3
+
+
+def _event_key(sequence: int) -> str:
+    return f"{EVENT_STREAM_PREFIX}:{sequence}"
+
+
+def current_event_sequence() -> int:
+    return cache.get(EVENT_SEQUENCE_KEY) or 0
+
+
+async def acurrent_event_sequence() -> int:
+    return await cache.aget(EVENT_SEQUENCE_KEY) or 0
+
+
+def _next_event_sequence() -> int:
+    try:
+        return cache.incr(EVENT_SEQUENCE_KEY)
+    except ValueError:
+        cache.add(EVENT_SEQUENCE_KEY, 0, timeout=None)
+        return cache.incr(EVENT_SEQUENCE_KEY)
+
+
+def publish_event(kind: str, action: str, object_id: int | None, **data: Any) -> None:
+    """事务提交后将变更事件写入共享缓存，供各进程的事件流连接读取；缓存后端异常不影响数据保存。"""
+    def publish() -> None:
+        try:
+            sequence = _next_event_sequence()
+            cache.set(
+                _event_key(sequence),
+                {'kind': kind, 'action': action, 'id': object_id, **data},
+                timeout=EVENT_RETENTION,
+            )
+        except Exception:
+            pass
+
+    transaction.on_commit(publish)
+
+
+def _collect_events(sequences: range, found: dict[str, Any]) -> tuple[list[tuple[int, dict[str, Any]]], bool]:
+    events = [
+        (sequence, found[_event_key(sequence)])
+        for sequence in sequences
+        if _event_key(sequence) in found
+    ]
+    return events, len(events) == len(sequences)
+
+
+def read_events(after: int, until: int) -> tuple[list[tuple[int, dict[str, Any]]], bool]:
+    """
+    读取序号 (after, until] 内的事件，返回 (事件列表, 是否完整)。
+    任一事件已过期或尚未写入时视为不完整，由调用方通知客户端全量刷新。
+    """
+    if until <= after:
+        return [], True
+    sequences = range(after + 1, until + 1)
+    return _collect_events(sequences, cache.get_many([_event_key(sequence) for sequence in sequences]))
+
+
+async def aread_events(after: int, until: int) -> tuple[list[tuple[int, dict[str, Any]]], bool]:
+    """read_events 的异步版本，供事件流在事件循环内读取缓存。"""
+    if until <= after:
+        return [], True
+    sequences = range(after + 1, until + 1)
+    return _collect_events(sequences, await cache.aget_many([_event_key(sequence) for sequence in sequences]))
+
+
+def _format_event(event: str, data: Any, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_events(last_event_id: int | None) -> AsyncIterator[str]:
+    """
+    生成 SSE 事件流。
+    客户端携带 Last-Event-ID 重连时补发期间事件，无法补全时发送 resync 事件要求全量刷新。
+    异步生成器在 ASGI 下逐条下发，轮询等待期间不占用工作线程；同步迭代器会被 StreamingHttpResponse 整体读完后才发送。
+    """
+    cursor = await acurrent_event_sequence()
+    yield f"retry: {EVENT_RETRY_MILLISECONDS}\n\n"
+    if last_event_id is not None and last_event_id != cursor:
+        events, complete = await aread_events(last_event_id, cursor) if last_event_id < cursor else ([], False)
+        if complete:
+            for sequence, payload in events:
+                yield _format_event(payload['kind'], payload, sequence)
+        else:
+            yield _format_event('resync', {'reason': 'events expired'}, cursor)
+    yield _format_event('ready', {'sequence': cursor}, cursor)
+
+    started = time.monotonic()
+    last_sent = started
+    missing_polls = 0
+    while time.monotonic() - started < EVENT_STREAM_LIFETIME:
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+        latest = await acurrent_event_sequence()
+        if latest > cursor:
+            events, _complete = await aread_events(cursor, latest)
+            for sequence, payload in events:
+                # 仅按序号连续下发；序号已分配但事件尚未写入时留待下一轮
+                if sequence != cursor + 1:
+                    break
+                yield _format_event(payload['kind'], payload, sequence)
+                cursor = sequence
+                last_sent = time.monotonic()
+            missing_polls = missing_polls + 1 if cursor < latest else 0
+            if missing_polls > EVENT_MISSING_POLL_LIMIT:
+                yield _format_event('resync', {'reason': 'events expired'}, latest)
+                cursor = latest
+                missing_polls = 0
+                last_sent = time.monotonic()
+        if time.monotonic() - last_sent >= EVENT_HEARTBEAT_INTERVAL:
+            yield ": heartbeat\n\n"
+            last_sent = time.monotonic()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from django.core.cache import cache
+
+from .fault_map_data import bbox_contains, fault_map_data_version, get_cached_fault_map_payload
+from .mvt import lnglat_to_world, world_to_lnglat
+
+
+# 不高于该缩放级别时返回聚合结果，更高级别返回单个故障标记
+CLUSTER_MAX_ZOOM = 14
+
+# 聚合半径（按 256 像素瓦片计的屏幕像素）
+CLUSTER_RADIUS = 60
+
+CLUSTER_INDEX_TIMEOUT = 24 * 60 * 60
+
+
+def _merge_level(clusters: list[dict[str, Any]], z: int) -> list[dict[str, Any]]:
+    """将下一级的聚合按当前级别的网格合并，质心按成员数加权。"""
+    cell = CLUSTER_RADIUS / (256 * (1 << z))
+    cells: dict[tuple[int, int], dict[str, Any]] = {}
+    for cluster in clusters:
+        key = (int(cluster['x'] // cell), int(cluster['y'] // cell))
+        merged = cells.get(key)
+        if merged is None:
+            cells[key] = {**cluster, 'categories': Counter(cluster['categories'])}
+            continue
+        total = merged['count'] + cluster['count']
+        merged['x'] = (merged['x'] * merged['count'] + cluster['x'] * cluster['count']) / total
+        merged['y'] = (merged['y'] * merged['count'] + cluster['y'] * cluster['count']) / total
+        merged['count'] = total
+        merged['categories'].update(cluster['categories'])
+        merged['fault_id'] = None
+    return list(cells.values())
+
+
+def build_cluster_index(markers: list[dict[str, Any]]) -> dict[int, list[dict[str, Any]]]:
+    """
+    自最大聚合级别向下逐级合并，构建各缩放级别的聚合结果。
+    每级仅合并上一级的聚合而非原始标记，整体耗时与级数、标记数成线性关系。
+    """
+    current = []
+    for marker in markers:
+        x, y = lnglat_to_world(marker['lng'], marker['lat'])
+        current.append({
+            'x': x,
+            'y': y,
+            'count': 1,
+            'categories': {marker.get('category', 'other'): 1},
+            'fault_id': marker.get('id'),
+        })
+
+    index: dict[int, list[dict[str, Any]]] = {}
+    for z in range(CLUSTER_MAX_ZOOM, -1, -1):
+        current = _merge_level(current, z)
+        index[z] = []
+        for cluster in current:
+            lng, lat = world_to_lnglat(cluster['x'], cluster['y'])
+            item = {
+                'lng': round(lng, 6),
+                'lat': round(lat, 6),
+                'count': cluster['count'],
+                'categories': dict(cluster['categories']),
+            }
+            if cluster['count'] == 1:
+                item['fault_id'] = cluster['fault_id']
+            index[z].append(item)
+    return index
+
+
+def _index_key(version: str) -> str:
+    return f"otnfaults:map:fault-clusters:v1:{version}"
+
+
+def get_fault_clusters(
+    zoom: int,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> dict[str, Any]:
+    """
+    返回视野内的故障聚合：低缩放级别为带类别分布的聚合点，高于 CLUSTER_MAX_ZOOM 时为单个故障标记。
+    聚合索引按故障地图数据版本构建一次并缓存，命中索引时不读取故障地图载荷。
+    载荷在后台刷新期间返回的是旧版本数据，索引与响应中的版本号均以载荷自带的版本为准，
+    避免旧数据以新版本号缓存。
+    """
+    version = fault_map_data_version()
+
+    def visible(item: dict[str, Any]) -> bool:
+        return bbox is None or bbox_contains(bbox, item['lng'], item['lat'])
+
+    if zoom > CLUSTER_MAX_ZOOM:
+        payload = get_cached_fault_map_payload()
+        return {
+            'version': payload.get('version', version),
+            'zoom': zoom,
+            'clusters': [],
+            'markers': [marker for marker in payload['marker_data'] if visible(marker)],
+        }
+
+    index = cache.get(_index_key(version))
+    if index is None:
+        payload = get_cached_fault_map_payload()
+        version = payload.get('version', version)
+        index = cache.get(_index_key(version))
+        if index is None:
+            index = build_cluster_index(payload['marker_data'])
+            cache.set(_index_key(version), index, timeout=CLUSTER_INDEX_TIMEOUT)
+    return {
+        'version': version,
+        'zoom': zoom,
+        'clusters': [cluster for cluster in index[max(zoom, 0)] if visible(cluster)],
+        'markers': [],
+    }
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
 from django.db.models import Q
 
-from ..models import OtnFault, CutoverTask
+from ..models import OtnFault, OtnPath, CutoverTask
 
 
 @dataclass(frozen=True)
@@ -23,8 +24,13 @@ def resolve_location_coordinates(
     obj: Any = None,
     a_site: Any = None,
     z_sites: list[Any] | None = None,
+    path_finder: Callable[[Any, Any], Any] | None = None,
 ) -> FaultCoordinate | None:
-    """Resolve coordinates using shared map fallback policy for OtnFault, CutoverTask or Site pairs."""
+    """
+    Resolve coordinates using shared map fallback policy for OtnFault, CutoverTask or Site pairs.
+
+    path_finder replaces the per-call OtnPath query; resolve_many passes a lookup into prefetched paths.
+    """
     # 1. 如果传入了模型实例，先判断显式自带的经纬度
     if obj is not None:
         model_name = getattr(getattr(obj, '_meta', None), 'model_name', '')
@@ -70,9 +76,9 @@ def resolve_location_coordinates(
 
     # 3. 若只配置了 1 个 Z 端站点，优先检索两站点之间的光缆路径中点
     if len(z_sites) == 1 and z_sites[0] is not None:
-        path = _find_path_between_sites(a_site, z_sites[0])
+        path = (path_finder or _find_path_between_sites)(a_site, z_sites[0])
         if path:
-            midpoint = _geometry_midpoint(path.geometry)
+            midpoint = _path_midpoint(path)
             if midpoint is not None:
                 lat, lng = midpoint
                 return FaultCoordinate(lat=lat, lng=lng, source='path_midpoint')
@@ -88,14 +94,172 @@ def resolve_location_coordinates(
 
 def resolve_fault_coordinates(fault: OtnFault) -> FaultCoordinate | None:
     """Resolve fault coordinates using shared map fallback policy."""
+    stored = _stored_coordinate(fault)
+    if stored is not _NOT_STORED:
+        return stored
     return resolve_location_coordinates(obj=fault)
 
 
 def resolve_cutover_coordinates(cutover: CutoverTask) -> FaultCoordinate | None:
     """Resolve cutover coordinates using shared map fallback policy."""
+    stored = _stored_coordinate(cutover)
+    if stored is not _NOT_STORED:
+        return stored
     return resolve_location_coordinates(obj=cutover)
 
 
+def resolve_many(objs: Iterable[Any], refresh: bool = False) -> dict[int, FaultCoordinate | None]:
+    """
+    Resolve many faults or cutover tasks at once, keyed by pk.
+
+    Stored coordinates are used as-is unless refresh is set. The remaining objects share a single
+    OtnPath query for all their (A, Z) site pairs and are then resolved in memory.
+    """
+    results: dict[int, FaultCoordinate | None] = {}
+    pending: list[tuple[Any, list[Any]]] = []
+    pairs: set[tuple[int, int]] = set()
+    for obj in objs:
+        stored = _NOT_STORED if refresh else _stored_coordinate(obj)
+        if stored is not _NOT_STORED:
+            results[obj.pk] = stored
+            continue
+        z_sites = list(obj.interruption_location.all())
+        a_site = obj.interruption_location_a
+        if a_site is not None and len(z_sites) == 1 and z_sites[0] is not None:
+            pairs.add((a_site.pk, z_sites[0].pk))
+        pending.append((obj, z_sites))
+
+    paths = _paths_by_site_pair(pairs)
+    for obj, z_sites in pending:
+        results[obj.pk] = resolve_location_coordinates(
+            obj=obj,
+            z_sites=z_sites,
+            path_finder=lambda a_site, z_site: paths.get((a_site.pk, z_site.pk)),
+        )
+    return results
+
+
+# 已解析但无法定位的对象记录该来源，与尚未解析（空来源）区分
+UNRESOLVED_SOURCE = 'unresolved'
+
+_NOT_STORED = object()
+
+
+def _stored_coordinate(obj: Any) -> Any:
+    """Return the persisted resolution of obj, or _NOT_STORED when it has not been resolved yet."""
+    source = getattr(obj, 'resolved_coords_source', '')
+    if not source:
+        return _NOT_STORED
+    if source == UNRESOLVED_SOURCE or obj.resolved_latitude is None or obj.resolved_longitude is None:
+        return None
+    return FaultCoordinate(lat=float(obj.resolved_latitude), lng=float(obj.resolved_longitude), source=source)
+
+
+def resolved_coordinate_fields(resolved: FaultCoordinate | None) -> dict[str, Any]:
+    """Return the persisted resolved-coordinate column values for a resolution result."""
+    if resolved is None:
+        return {'resolved_latitude': None, 'resolved_longitude': None, 'resolved_coords_source': UNRESOLVED_SOURCE}
+    return {
+        'resolved_latitude': round(resolved.lat, 6),
+        'resolved_longitude': round(resolved.lng, 6),
+        'resolved_coords_source': resolved.source,
+    }
+
+
+def _locatable_queryset(model: Any) -> Any:
+    return model.objects.select_related('interruption_location_a').prefetch_related('interruption_location')
+
+
+def _refresh_resolved_coordinates(model: Any, pk: int) -> FaultCoordinate | None:
+    obj = _locatable_queryset(model).filter(pk=pk).first()
+    if obj is None:
+        return None
+    resolved = resolve_location_coordinates(obj=obj)
+    model.objects.filter(pk=pk).update(**resolved_coordinate_fields(resolved))
+    return resolved
+
+
+def refresh_fault_resolved_coordinates(fault_id: int) -> FaultCoordinate | None:
+    """Re-resolve one fault and store the result; update() avoids re-triggering save signals."""
+    return _refresh_resolved_coordinates(OtnFault, fault_id)
+
+
+def refresh_cutover_resolved_coordinates(cutover_id: int) -> FaultCoordinate | None:
+    """Re-resolve one cutover task and store the result."""
+    return _refresh_resolved_coordinates(CutoverTask, cutover_id)
+
+
+def _site_derived(model: Any) -> Any:
+    """Objects whose resolution depends on site coordinates, i.e. without explicit coordinates of their own."""
+    if model is OtnFault:
+        return model.objects.filter(Q(interruption_latitude__isnull=True) | Q(interruption_longitude__isnull=True))
+    return model.objects.filter(Q(cutover_latitude__isnull=True) | Q(cutover_longitude__isnull=True))
+
+
+def refresh_resolved_coordinates_for_site(site_id: int) -> int:
+    """Re-resolve faults and cutovers located through the given site; return the refreshed row count."""
+    refreshed = 0
+    for model in (OtnFault, CutoverTask):
+        ids = (
+            _site_derived(model)
+            .filter(Q(interruption_location_a_id=site_id) | Q(interruption_location__id=site_id))
+            .values_list('pk', flat=True)
+            .distinct()
+        )
+        for pk in list(ids):
+            _refresh_resolved_coordinates(model, pk)
+            refreshed += 1
+    return refreshed
+
+
+def refresh_resolved_coordinates_for_path(site_a_id: int | None, site_z_id: int | None) -> int:
+    """Re-resolve faults and cutovers whose A/Z site pair matches a changed OtnPath, in either direction."""
+    if site_a_id is None or site_z_id is None:
+        return 0
+    refreshed = 0
+    for model in (OtnFault, CutoverTask):
+        ids = (
+            _site_derived(model)
+            .filter(
+                Q(interruption_location_a_id=site_a_id, interruption_location__id=site_z_id)
+                | Q(interruption_location_a_id=site_z_id, interruption_location__id=site_a_id)
+            )
+            .values_list('pk', flat=True)
+            .distinct()
+        )
+        for pk in list(ids):
+            _refresh_resolved_coordinates(model, pk)
+            refreshed += 1
+    return refreshed
+
+
+def backfill_resolved_coordinates(model: Any, only_missing: bool = False, batch_size: int = 500) -> int:
+    """Resolve and store coordinates for every row of model (OtnFault or CutoverTask) in batches."""
+    queryset = _locatable_queryset(model).order_by('pk')
+    if only_missing:
+        queryset = queryset.filter(resolved_coords_source='')
+
+    fields = list(resolved_coordinate_fields(None))
+    batch: list[Any] = []
+    updated = 0
+    for obj in queryset.iterator(chunk_size=batch_size):
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            updated += _store_resolved_batch(model, batch, fields)
+            batch = []
+    if batch:
+        updated += _store_resolved_batch(model, batch, fields)
+    return updated
+
+
+def _store_resolved_batch(model: Any, batch: list[Any], fields: list[str]) -> int:
+    resolved = resolve_many(batch, refresh=True)
+    for obj in batch:
+        for field_name, value in resolved_coordinate_fields(resolved[obj.pk]).items():
+            setattr(obj, field_name, value)
+    return model.objects.bulk_update(batch, fields)
+
+
 def _site_coordinate(site: Any, source: str) -> FaultCoordinate | None:
     if site is None or getattr(site, 'latitude', None) is None or getattr(site, 'longitude', None) is None:
         return None
@@ -122,29 +286,40 @@ def _find_path_between_sites(a_site: Any, z_site: Any) -> Any:
             OtnPath.objects.filter(
                 Q(site_a=a_site, site_z=z_site) | Q(site_a=z_site, site_z=a_site)
             )
-            .exclude(geometry__isnull=True)
-            .exclude(geometry=[])
+            .filter(midpoint_latitude__isnull=False, midpoint_longitude__isnull=False)
+            .only(*_PATH_MIDPOINT_FIELDS)
             .first()
         )
     except Exception:
         return None
 
 
-def _geometry_midpoint(geometry: Any) -> tuple[float, float] | None:
-    if isinstance(geometry, dict):
-        coords = geometry.get('coordinates')
-    else:
-        coords = geometry
+# 路径中点取自 OtnPath 的预计算列，查询时不加载完整几何
+_PATH_MIDPOINT_FIELDS = ('pk', 'site_a_id', 'site_z_id', 'midpoint_latitude', 'midpoint_longitude')
 
-    if not isinstance(coords, list) or not coords:
-        return None
 
-    midpoint = coords[len(coords) // 2]
-    if not isinstance(midpoint, (list, tuple)) or len(midpoint) < 2:
-        return None
+def _paths_by_site_pair(pairs: set[tuple[int, int]]) -> dict[tuple[int, int], Any]:
+    """Fetch paths for all (A, Z) pairs in one query; like _find_path_between_sites, either direction matches."""
+    if not pairs:
+        return {}
 
-    lng, lat = midpoint[0], midpoint[1]
-    if lat is None or lng is None:
-        return None
-    return float(lat), float(lng)
+    site_ids = {site_id for pair in pairs for site_id in pair}
+    paths: dict[tuple[int, int], Any] = {}
+    queryset = (
+        OtnPath.objects.filter(site_a_id__in=site_ids, site_z_id__in=site_ids)
+        .filter(midpoint_latitude__isnull=False, midpoint_longitude__isnull=False)
+        .only(*_PATH_MIDPOINT_FIELDS)
+    )
+    for path in queryset:
+        for pair in ((path.site_a_id, path.site_z_id), (path.site_z_id, path.site_a_id)):
+            if pair in pairs:
+                # 与 .first() 一致，按默认排序保留每个站点对的第一条路径
+                paths.setdefault(pair, path)
+    return paths
 
+
+def _path_midpoint(path: Any) -> tuple[float, float] | None:
+    """Return the stored arc-length midpoint (lat, lng) of a path."""
+    if path.midpoint_latitude is None or path.midpoint_longitude is None:
+        return None
+    return float(path.midpoint_latitude), float(path.midpoint_longitude)
@@ -1,12 +1,17 @@
+import hashlib
 from datetime import timedelta
 from typing import Any
 
 from dcim.models import Site
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 
-from ..models import FaultCategoryChoices, FaultStatusChoices, OtnFault, CutoverTask, CutoverStatusChoices
+from ..models import FaultStatusChoices, OtnFault, CutoverTask, CutoverStatusChoices
 from ..statistics_views import _source_group_for_fault
-from .fault_coordinates import resolve_fault_coordinates
+from .fault_coordinates import resolve_fault_coordinates, resolve_many, FaultCoordinate
+from .repeat_links import get_repeat_fault_ids
+from .stats_cache import SITES_TAG, get_or_compute, period_cache_tags, statistics_cache_timeouts, tagged_cache_key
 
 
 VALID_FAULT_CATEGORIES: set[str] = {
@@ -38,6 +43,11 @@ def _reason_display(fault: OtnFault, empty_label: str) -> str:
         return empty_label
     return reason_display
 
+SITES_DATA_CACHE_KEY = "otnfaults:map:sites:v1"
+
+# Site dataset cache lifetime (seconds); Site saves invalidate it through SITES_TAG well before expiry.
+SITES_DATA_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 def get_sites_data() -> list[dict]:
     """Return shared site marker data for all unified map modes."""
@@ -63,15 +73,40 @@ def get_sites_data() -> list[dict]:
     ]
 
 
+def sites_data_version() -> str:
+    """Return the site dataset version; it changes whenever SITES_TAG is invalidated."""
+    return tagged_cache_key(SITES_DATA_CACHE_KEY, [SITES_TAG]).removeprefix(f"{SITES_DATA_CACHE_KEY}:t")
+
+
+def get_cached_sites_data(version: str | None = None) -> list[dict]:
+    """Read the shared site marker dataset of the given (default: current) version through the cache."""
+    version = version or sites_data_version()
+    return get_or_compute(
+        f"{SITES_DATA_CACHE_KEY}:t{version}",
+        get_sites_data,
+        SITES_DATA_CACHE_TIMEOUT,
+        SITES_DATA_CACHE_TIMEOUT,
+    )
+
+
+def sites_data_url() -> str:
+    """Return the versioned site dataset URL, so browsers may cache each version indefinitely."""
+    return f"{reverse('plugins:netbox_otnfaults:map_sites_data')}?v={sites_data_version()}"
+
+
 class FaultMapMarkerSerializer:
     """Serialize a fault into the legacy fault-map marker payload."""
 
-    def __init__(self, fault: OtnFault) -> None:
+    def __init__(self, fault: OtnFault, coordinates: dict[int, FaultCoordinate | None] | None = None) -> None:
         self.fault = fault
+        self.coordinates = coordinates
 
     def data(self) -> dict | None:
         fault = self.fault
-        resolved = resolve_fault_coordinates(fault)
+        if self.coordinates is not None and fault.pk in self.coordinates:
+            resolved = self.coordinates[fault.pk]
+        else:
+            resolved = resolve_fault_coordinates(fault)
         if resolved is None:
             return None
 
@@ -96,6 +131,7 @@ class FaultMapMarkerSerializer:
                 })
 
         return {
+            'id': fault.pk,
             'lat': resolved.lat,
             'lng': resolved.lng,
             'coords_from_site': resolved.coords_from_site,
@@ -143,17 +179,20 @@ class StatisticsCableBreakMapMarkerSerializer:
         self,
         fault: OtnFault,
         now: Any,
-        past_faults_list: list[OtnFault],
-        fault_z_sites_cache: dict[int, set[int]],
+        repeat_fault_ids: set[int],
+        coordinates: dict[int, FaultCoordinate | None] | None = None,
     ) -> None:
         self.fault = fault
         self.now = now
-        self.past_faults_list = past_faults_list
-        self.fault_z_sites_cache = fault_z_sites_cache
+        self.repeat_fault_ids = repeat_fault_ids
+        self.coordinates = coordinates
 
     def data(self) -> dict | None:
         fault = self.fault
-        resolved = resolve_fault_coordinates(fault)
+        if self.coordinates is not None and fault.pk in self.coordinates:
+            resolved = self.coordinates[fault.pk]
+        else:
+            resolved = resolve_fault_coordinates(fault)
         if resolved is None:
             return None
 
@@ -208,24 +247,7 @@ class StatisticsCableBreakMapMarkerSerializer:
         if not fault.is_fiber_fault:
             return False
 
-        fault_z_site_ids = self.fault_z_sites_cache.get(
-            fault.id,
-            set(site.id for site in fault.interruption_location.all()),
-        )
-
-        for past_fault in self.past_faults_list:
-            if past_fault.id == fault.id:
-                continue
-            if past_fault.fault_occurrence_time >= fault.fault_occurrence_time:
-                continue
-            if (fault.fault_occurrence_time - past_fault.fault_occurrence_time) > timedelta(days=60):
-                continue
-            if past_fault.interruption_location_a_id != fault.interruption_location_a_id:
-                continue
-            if self.fault_z_sites_cache.get(past_fault.id, set()).intersection(fault_z_site_ids):
-                return True
-
-        return False
+        return fault.id in self.repeat_fault_ids
 
 
 def build_fault_map_payload() -> dict[str, list[dict]]:
@@ -233,7 +255,30 @@ def build_fault_map_payload() -> dict[str, list[dict]]:
     now = timezone.localtime()
     twelve_months_ago = now - timedelta(days=365)
     all_faults = OtnFault.objects.filter(fault_occurrence_time__gte=twelve_months_ago)
-
+    return _build_fault_map_payload(all_faults)
+
+
+def build_fault_map_window_payload(
+    since: Any = None,
+    until: Any = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Build the fault map payload for a time window and viewport.
+
+    The bbox is matched against the persisted resolved-coordinate columns, so the
+    filter runs as an indexed query; ``since`` defaults to the last 365 days.
+    """
+    since = since or timezone.localtime() - timedelta(days=365)
+    faults = OtnFault.objects.filter(fault_occurrence_time__gte=since)
+    if until is not None:
+        faults = faults.filter(fault_occurrence_time__lt=until)
+    if bbox is not None:
+        faults = faults.filter(bbox_filter(bbox, 'resolved_latitude', 'resolved_longitude'))
+    return _build_fault_map_payload(faults)
+
+
+def _build_fault_map_payload(all_faults: Any) -> dict[str, list[dict]]:
     marker_faults = all_faults.select_related(
         'province',
         'interruption_location_a',
@@ -249,9 +294,11 @@ def build_fault_map_payload() -> dict[str, list[dict]]:
         'secondary_impacts__circuit_service',
     )
 
+    marker_faults = list(marker_faults)
+    coordinates = resolve_many(marker_faults)
     marker_data = [
         marker
-        for marker in (FaultMapMarkerSerializer(fault).data() for fault in marker_faults)
+        for marker in (FaultMapMarkerSerializer(fault, coordinates).data() for fault in marker_faults)
         if marker is not None
     ]
     heatmap_data = [
@@ -271,35 +318,87 @@ def build_fault_map_payload() -> dict[str, list[dict]]:
     }
 
 
+def fault_map_cache_keys() -> tuple[str, str]:
+    """Return (cache key, stale key) for the fault distribution map payload of the current day."""
+    today = timezone.localdate()
+    now = timezone.localtime()
+    base_cache_key = f"otnfaults:stats:fault-map:v1:{today.strftime('%Y%m%d')}"
+    cache_key = tagged_cache_key(
+        base_cache_key,
+        period_cache_tags([(now - timedelta(days=365), now + timedelta(days=1))], []),
+    )
+    return cache_key, base_cache_key
+
+
+def _fault_map_version(cache_key: str) -> str:
+    return hashlib.md5(cache_key.encode('utf-8')).hexdigest()[:16]
+
+
+def fault_map_data_version() -> str:
+    """Return a short version of the fault map payload, shared by tiles and clusters as cache key and ETag."""
+    cache_key, _base_cache_key = fault_map_cache_keys()
+    return _fault_map_version(cache_key)
+
+
+def parse_bbox(value: str | None) -> tuple[float, float, float, float] | None:
+    """Parse a ``west,south,east,north`` bbox parameter; return None when missing or malformed."""
+    try:
+        west, south, east, north = (float(part) for part in (value or '').split(','))
+    except ValueError:
+        return None
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        return None
+    return west, south, east, north
+
+
+def bbox_contains(bbox: tuple[float, float, float, float], lng: float, lat: float) -> bool:
+    """Whether a point lies in the bbox; a bbox with west > east crosses the antimeridian."""
+    west, south, east, north = bbox
+    if not south <= lat <= north:
+        return False
+    return west <= lng <= east if west <= east else (lng >= west or lng <= east)
+
+
+def bbox_filter(bbox: tuple[float, float, float, float], lat_field: str, lng_field: str) -> Q:
+    """Return the queryset filter equivalent of bbox_contains for the given coordinate columns."""
+    west, south, east, north = bbox
+    lat_q = Q(**{f'{lat_field}__gte': south, f'{lat_field}__lte': north})
+    if west <= east:
+        return lat_q & Q(**{f'{lng_field}__gte': west, f'{lng_field}__lte': east})
+    return lat_q & (Q(**{f'{lng_field}__gte': west}) | Q(**{f'{lng_field}__lte': east}))
+
+
+def get_cached_fault_map_payload(force_refresh: bool = False) -> dict[str, Any]:
+    """
+    Read the fault distribution map payload through the statistics cache.
+
+    The payload carries the data version it was built for under ``version``; while a
+    newer version is refreshed in the background the previous payload is returned.
+    """
+    cache_key, base_cache_key = fault_map_cache_keys()
+    fresh_timeout, stale_timeout = statistics_cache_timeouts(False)
+    version = _fault_map_version(cache_key)
+    return get_or_compute(
+        cache_key,
+        lambda: {**build_fault_map_payload(), 'version': version},
+        fresh_timeout,
+        stale_timeout,
+        stale_key=base_cache_key,
+        force_refresh=force_refresh,
+    )
+
+
 def build_statistics_cable_break_map_payload(
     faults: list[OtnFault],
     end_date: Any,
     now: Any,
 ) -> dict[str, Any]:
     """Build map data for the statistics cable-break map."""
-    if faults:
-        min_occurrence = min(fault.fault_occurrence_time for fault in faults)
-        check_start = min_occurrence - timedelta(days=60)
-        past_faults_list = list(
-            OtnFault.objects.filter(
-                fault_occurrence_time__gte=check_start,
-                fault_occurrence_time__lt=end_date,
-                fault_category__in=[
-                    FaultCategoryChoices.FIBER_BREAK,
-                    FaultCategoryChoices.FIBER_DEGRADATION,
-                    FaultCategoryChoices.FIBER_JITTER,
-                ],
-            )
-            .select_related('interruption_location_a')
-            .prefetch_related('interruption_location')
-        )
-    else:
-        past_faults_list = []
-
-    fault_z_sites_cache = {
-        past_fault.id: set(site.id for site in past_fault.interruption_location.all())
-        for past_fault in past_faults_list
-    }
+    repeat_fault_ids = get_repeat_fault_ids(
+        fault.id for fault in faults if fault.is_fiber_fault
+    )
+
+    coordinates = resolve_many(faults)
 
     marker_data: list[dict] = []
     skipped_count = 0
@@ -308,8 +407,8 @@ def build_statistics_cable_break_map_payload(
         marker = StatisticsCableBreakMapMarkerSerializer(
             fault,
             now,
-            past_faults_list,
-            fault_z_sites_cache,
+            repeat_fault_ids,
+            coordinates,
         ).data()
         if marker is None:
             skipped_count += 1
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from netbox_otnfaults.models import OtnFault, OtnFaultDailyRollup
+from netbox_otnfaults.statistics_views import (
+    FAULT_ROLLUP_HISTOGRAM_SIZE,
+    _annotate_class_i_business_impact,
+    _duration_histogram_bucket_index,
+    _duration_hours_for_fault,
+    _fault_rollup_dimensions,
+)
+
+
+def _recovered_fault_queryset():
+    return _annotate_class_i_business_impact(
+        OtnFault.objects.filter(
+            fault_occurrence_time__isnull=False,
+            fault_recovery_time__isnull=False,
+        )
+    )
+
+
+def _local_day_bounds(day: date) -> tuple[datetime, datetime]:
+    tz = timezone.get_current_timezone()
+    day_start = datetime.combine(day, time.min, tzinfo=tz)
+    return day_start, day_start + timedelta(days=1)
+
+
+def _build_rollups(faults: Iterable[OtnFault]) -> list[OtnFaultDailyRollup]:
+    rollups: dict[tuple, OtnFaultDailyRollup] = {}
+    for fault in faults:
+        dimensions = _fault_rollup_dimensions(fault)
+        key = tuple(dimensions.values())
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = OtnFaultDailyRollup(
+                **dimensions,
+                duration_histogram=[0] * FAULT_ROLLUP_HISTOGRAM_SIZE,
+            )
+            rollups[key] = rollup
+
+        # 已恢复故障的历时与当前时间无关
+        duration_hours = _duration_hours_for_fault(fault, None)
+        rollup.fault_count += 1
+        rollup.duration_hours += duration_hours
+        if duration_hours >= 6.0:
+            rollup.long_count += 1
+        rollup.duration_histogram[_duration_histogram_bucket_index(duration_hours) - 1] += 1
+    return list(rollups.values())
+
+
+def refresh_fault_rollup_days(days: Iterable[date | None]) -> int:
+    """按本地自然日整体重算故障日汇总，返回写入行数。"""
+    written = 0
+    for day in sorted({day for day in days if day is not None}):
+        day_start, day_end = _local_day_bounds(day)
+        faults = _recovered_fault_queryset().filter(
+            fault_occurrence_time__gte=day_start,
+            fault_occurrence_time__lt=day_end,
+        )
+        rollups = _build_rollups(faults)
+        with transaction.atomic():
+            OtnFaultDailyRollup.objects.filter(day=day).delete()
+            OtnFaultDailyRollup.objects.bulk_create(rollups)
+        written += len(rollups)
+    return written
+
+
+def rebuild_fault_rollups(batch_size: int = 1000) -> int:
+    """清空并全量重建故障日汇总表，返回写入行数。"""
+    rollups = _build_rollups(_recovered_fault_queryset().iterator(chunk_size=batch_size))
+    with transaction.atomic():
+        OtnFaultDailyRollup.objects.all().delete()
+        OtnFaultDailyRollup.objects.bulk_create(rollups, batch_size=batch_size)
+    return len(rollups)
+
+
+def fault_rollup_day(occurrence_time: datetime | None) -> date | None:
+    """返回故障发生时间所属的日汇总日期，无发生时间时返回 None。"""
+    if not occurrence_time:
+        return None
+    return timezone.localdate(occurrence_time)
@@ -1,6 +1,6 @@
 """
 高速公路图服务
-加载 highways.geojson，构建 NetworkX 图用于路径计算
+加载 highways.geojson，构建 NetworkX 图用于路径计算；插件配置 graph_engine = 'csr' 时转为 CSR 稀疏矩阵图
 """
 import json
 import os
@@ -15,13 +15,18 @@ except ImportError:
     HAS_NETWORKX = False
     nx = None
 
+from .csr_graph import CSR_ENGINE, NETWORKX_ENGINE, CsrRouteGraph, graph_engine
+from .spatial_index import graph_spatial_index
+
 
 class HighwayGraphService:
     """高速公路图服务 - 单例模式"""
     
     _instance = None
     _graph = None
-    _node_index = None  # 空间索引：用于快速查找最近节点
+    _node_index = None  # 坐标去重索引：截断后的坐标 -> 节点
+    _spatial_index = None  # 空间索引：用于快速查找最近节点
+    _engine = NETWORKX_ENGINE
     
     def __new__(cls):
         if cls._instance is None:
@@ -32,8 +37,8 @@ class HighwayGraphService:
         if self._graph is None:
             self._load_graph()
     
-    def _load_graph(self):
-        """加载高速公路数据并构建图"""
+    def _load_graph(self, engine=None):
+        """加载高速公路数据并构建图，engine 未指定时按插件配置选择路由引擎"""
         if not HAS_NETWORKX:
             print('[HighwayGraphService] NetworkX 未安装，路径计算不可用')
             return
@@ -53,6 +58,7 @@ class HighwayGraphService:
             return
         
         print(f'[HighwayGraphService] 正在加载 {geojson_path}...')
+        self._engine = engine or graph_engine()
         
         # 构建图
         self._graph = nx.Graph()
@@ -92,6 +98,11 @@ class HighwayGraphService:
                 self._graph.add_edge(node1, node2, weight=length, highway=highway_type)
                 edge_count += 1
         
+        if self._engine == CSR_ENGINE:
+            self._graph = CsrRouteGraph.from_edges(list(self._graph.nodes()), self._graph.edges(data=True))
+            self._node_index = None
+        
+        self._spatial_index = graph_spatial_index(self._graph)
         node_count = self._graph.number_of_nodes()
         print(f'[HighwayGraphService] 图构建完成: {node_count} 节点, {edge_count} 边')
     
@@ -118,22 +129,33 @@ class HighwayGraphService:
         
         return R * c
     
-    def find_nearest_node(self, lng, lat, max_distance=50000):
-        """查找最近的图节点（暴力搜索，后续可优化为 R-tree）"""
-        if not self._graph:
+    def _shortest_path(self, source, target):
+        """两节点间的最短路径 (节点序列, 长度米)，不可达时返回 None"""
+        if self._engine == CSR_ENGINE:
+            return self._graph.shortest_path(source, target)
+        try:
+            path = nx.shortest_path(self._graph, source, target, weight='weight')
+        except nx.NetworkXNoPath:
             return None
-        
-        target = (lng, lat)
-        min_dist = float('inf')
-        nearest = None
-        
-        for node in self._graph.nodes():
-            dist = self._haversine(target, node)
-            if dist < min_dist and dist <= max_distance:
-                min_dist = dist
-                nearest = node
-        
-        return nearest
+        length = sum(self._graph.get_edge_data(path[j], path[j + 1]).get('weight', 0) for j in range(len(path) - 1))
+        return path, length
+    
+    def find_nearest_node(self, lng, lat, max_distance=50000):
+        """查找 max_distance 米内最近的图节点"""
+        nearest = self.find_nearest_nodes(lng, lat, k=1, max_distance=max_distance)
+        return nearest[0][1] if nearest else None
+    
+    def find_nearest_nodes(self, lng, lat, k=1, max_distance=None):
+        """查找最近的 k 个图节点，返回按距离升序的 [(距离米, 节点), ...]"""
+        if not self._spatial_index:
+            return []
+        return self._spatial_index.nearest(lng, lat, k=k, max_distance=max_distance)
+    
+    def find_nodes_within(self, lng, lat, radius):
+        """查找 radius 米内的全部图节点，返回按距离升序的 [(距离米, 节点), ...]"""
+        if not self._spatial_index:
+            return []
+        return self._spatial_index.within(lng, lat, radius)
     
     def calculate_route(self, waypoints):
         """
@@ -176,20 +198,16 @@ class HighwayGraphService:
         total_length = 0
         
         for i in range(len(route_nodes) - 1):
-            try:
-                path = nx.shortest_path(self._graph, route_nodes[i], route_nodes[i+1], weight='weight')
-                # 跳过第一个节点（已在上一段末尾）
-                full_path.extend(path[1:])
-                
-                # 累加长度
-                for j in range(len(path) - 1):
-                    edge_data = self._graph.get_edge_data(path[j], path[j+1])
-                    total_length += edge_data.get('weight', 0)
-                    
-            except nx.NetworkXNoPath:
+            segment = self._shortest_path(route_nodes[i], route_nodes[i+1])
+            if segment is None:
                 # 无可达路径，返回直线
                 print(f'[HighwayGraphService] 节点 {i} 到 {i+1} 之间无可达路径，使用直线')
                 return self._fallback_straight_line(waypoints)
+            
+            path, length = segment
+            # 跳过第一个节点（已在上一段末尾）
+            full_path.extend(path[1:])
+            total_length += length
         
         # 构建 GeoJSON 几何
         coordinates = [[node[0], node[1]] for node in full_path]
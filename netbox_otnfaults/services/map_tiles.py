@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+
+from .fault_map_data import (
+    build_cutover_map_payload,
+    fault_map_data_version,
+    get_cached_fault_map_payload,
+    get_cached_sites_data,
+    sites_data_version,
+)
+from .mvt import GEOM_POINT, MVT_EXTENT, encode_tile, lnglat_to_world, world_to_tile_pixel
+from .stats_cache import CUTOVERS_TAG, get_or_compute, tagged_cache_key
+
+
+MAP_TILE_MAX_ZOOM = 18
+
+# 瓦片四周的缓冲像素，避免图标在瓦片边缘被截断
+MAP_TILE_BUFFER = 64
+
+# 瓦片缓存按数据集版本区分，数据变更后旧瓦片自然不再命中
+MAP_TILE_CACHE_TIMEOUT = 24 * 60 * 60
+
+# 瓦片索引的分桶缩放级别：要素按该级别的瓦片分桶缓存，生成瓦片时只读取与其重叠的桶
+MAP_TILE_INDEX_ZOOM = 8
+
+CUTOVER_DATA_CACHE_KEY = "otnfaults:map:cutovers:v1"
+CUTOVER_DATA_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class MapTileLayer:
+    """
+    矢量瓦片图层：数据集读取方式、坐标字段与随瓦片下发的样式属性。
+    records 按版本读取数据集，返回 (数据实际所属版本, 记录列表)；数据集刷新期间实际版本可能仍为上一版本。
+    """
+    version: Callable[[], str]
+    records: Callable[[str], tuple[str, list[dict]]]
+    lng_field: str
+    lat_field: str
+    properties: tuple[str, ...]
+
+
+def _fault_records(version: str) -> tuple[str, list[dict]]:
+    payload = get_cached_fault_map_payload()
+    return payload.get('version', version), payload['marker_data']
+
+
+def _site_records(version: str) -> tuple[str, list[dict]]:
+    return version, get_cached_sites_data(version)
+
+
+def _cutover_data_version() -> str:
+    return tagged_cache_key(CUTOVER_DATA_CACHE_KEY, [CUTOVERS_TAG]).removeprefix(f"{CUTOVER_DATA_CACHE_KEY}:t")
+
+
+def _cutover_records(version: str) -> tuple[str, list[dict]]:
+    return version, get_or_compute(
+        f"{CUTOVER_DATA_CACHE_KEY}:t{version}",
+        build_cutover_map_payload,
+        CUTOVER_DATA_CACHE_TIMEOUT,
+        CUTOVER_DATA_CACHE_TIMEOUT,
+    )
+
+
+MAP_TILE_LAYERS: dict[str, MapTileLayer] = {
+    'faults': MapTileLayer(
+        version=fault_map_data_version,
+        records=_fault_records,
+        lng_field='lng',
+        lat_field='lat',
+        properties=('number', 'category', 'status_key', 'province'),
+    ),
+    'sites': MapTileLayer(
+        version=sites_data_version,
+        records=_site_records,
+        lng_field='longitude',
+        lat_field='latitude',
+        properties=('name', 'status'),
+    ),
+    'cutovers': MapTileLayer(
+        version=_cutover_data_version,
+        records=_cutover_records,
+        lng_field='lng',
+        lat_field='lat',
+        properties=('number', 'status_key', 'status_color'),
+    ),
+}
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAP_TILE_MAX_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+def _index_key(name: str, version: str, suffix: str) -> str:
+    return f"otnfaults:map:tiles:index:{name}:{version}:{suffix}"
+
+
+def _bucket_suffix(bucket: tuple[int, int]) -> str:
+    return f"bucket:{bucket[0]}:{bucket[1]}"
+
+
+def _build_index(
+    name: str, layer: MapTileLayer, version: str,
+) -> tuple[str, dict[tuple[int, int], list[tuple]], dict[int, dict]]:
+    """
+    构建并缓存数据集的瓦片索引，返回 (数据实际所属版本, 分桶, ID 到记录的映射)。
+    分桶按 MAP_TILE_INDEX_ZOOM 级瓦片存放要素的世界坐标与瓦片属性，每条记录另按 ID 单独缓存供弹窗读取，
+    桶清单最后写入，读到清单即可认为桶与记录均已就绪。
+    """
+    data_version, records = layer.records(version)
+    scale = 1 << MAP_TILE_INDEX_ZOOM
+    buckets: dict[tuple[int, int], list[tuple]] = {}
+    features: dict[int, dict] = {}
+    for record in records:
+        features[record['id']] = record
+        lng, lat = record.get(layer.lng_field), record.get(layer.lat_field)
+        if lng is None or lat is None:
+            continue
+        world_x, world_y = lnglat_to_world(lng, lat)
+        bucket = (min(int(world_x * scale), scale - 1), min(int(world_y * scale), scale - 1))
+        buckets.setdefault(bucket, []).append(
+            (world_x, world_y, record['id'], {key: record.get(key) for key in layer.properties})
+        )
+    entries: dict[str, Any] = {
+        _index_key(name, data_version, _bucket_suffix(bucket)): items
+        for bucket, items in buckets.items()
+    }
+    entries.update({
+        _index_key(name, data_version, f"feature:{feature_id}"): record
+        for feature_id, record in features.items()
+    })
+    cache.set_many(entries, timeout=MAP_TILE_CACHE_TIMEOUT)
+    cache.set(_index_key(name, data_version, 'manifest'), list(buckets), timeout=MAP_TILE_CACHE_TIMEOUT)
+    return data_version, buckets, features
+
+
+def _overlapping_buckets(z: int, x: int, y: int, manifest: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """返回清单中与瓦片（含缓冲区）重叠的桶。"""
+    buffer = MAP_TILE_BUFFER / MVT_EXTENT
+    scale = (1 << MAP_TILE_INDEX_ZOOM) / (1 << z)
+    last = (1 << MAP_TILE_INDEX_ZOOM) - 1
+    min_x, max_x = max(0, int((x - buffer) * scale)), min(last, int((x + 1 + buffer) * scale))
+    min_y, max_y = max(0, int((y - buffer) * scale)), min(last, int((y + 1 + buffer) * scale))
+    if (max_x - min_x + 1) * (max_y - min_y + 1) > len(manifest):
+        return [bucket for bucket in manifest if min_x <= bucket[0] <= max_x and min_y <= bucket[1] <= max_y]
+    present = set(manifest)
+    return [
+        (bucket_x, bucket_y)
+        for bucket_x in range(min_x, max_x + 1)
+        for bucket_y in range(min_y, max_y + 1)
+        if (bucket_x, bucket_y) in present
+    ]
+
+
+def _read_buckets(name: str, layer: MapTileLayer, version: str, z: int, x: int, y: int) -> tuple[str, list[list[tuple]]]:
+    """读取与瓦片重叠的桶，返回 (数据实际所属版本, 桶列表)；索引缺失或有桶被淘汰时重建索引。"""
+    manifest = cache.get(_index_key(name, version, 'manifest'))
+    if manifest is not None:
+        keys = [_index_key(name, version, _bucket_suffix(bucket)) for bucket in _overlapping_buckets(z, x, y, manifest)]
+        found = cache.get_many(keys)
+        if len(found) == len(keys):
+            return version, list(found.values())
+    data_version, buckets, _features = _build_index(name, layer, version)
+    return data_version, [buckets[bucket] for bucket in _overlapping_buckets(z, x, y, list(buckets))]
+
+
+def _build_tile(name: str, buckets: list[list[tuple]], z: int, x: int, y: int) -> bytes:
+    features: list[dict[str, Any]] = []
+    low, high = -MAP_TILE_BUFFER, MVT_EXTENT + MAP_TILE_BUFFER
+    for items in buckets:
+        for world_x, world_y, feature_id, properties in items:
+            px, py = world_to_tile_pixel(world_x, world_y, z, x, y)
+            if not (low <= px <= high and low <= py <= high):
+                continue
+            features.append({
+                'id': feature_id,
+                'type': GEOM_POINT,
+                'geometry': [(px, py)],
+                'properties': {'id': feature_id, **properties},
+            })
+    return encode_tile({name: features})
+
+
+def get_map_tile(name: str, z: int, x: int, y: int) -> tuple[str, bytes]:
+    """返回 (数据集版本, MVT 瓦片字节)，瓦片按图层、版本与坐标缓存，未命中时只读取重叠的索引桶。"""
+    layer = MAP_TILE_LAYERS[name]
+    version = layer.version()
+    tile = cache.get(f"otnfaults:map:tiles:{name}:{version}:{z}:{x}:{y}")
+    if tile is None:
+        # 数据集仍在刷新时按实际所属的上一版本生成与缓存，避免旧数据写入新版本的瓦片缓存
+        version, buckets = _read_buckets(name, layer, version, z, x, y)
+        tile = _build_tile(name, buckets, z, x, y)
+        cache.set(f"otnfaults:map:tiles:{name}:{version}:{z}:{x}:{y}", tile, timeout=MAP_TILE_CACHE_TIMEOUT)
+    return version, tile
+
+
+def get_map_feature(name: str, feature_id: int) -> dict | None:
+    """按 ID 返回瓦片要素的完整数据，供弹窗按需加载详情。"""
+    layer = MAP_TILE_LAYERS[name]
+    version = layer.version()
+    record = cache.get(_index_key(name, version, f"feature:{feature_id}"))
+    if record is not None or cache.get(_index_key(name, version, 'manifest')) is not None:
+        return record
+    _data_version, _buckets, features = _build_index(name, layer, version)
+    return features.get(feature_id)
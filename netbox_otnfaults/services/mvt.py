@@ -0,0 +1,201 @@
+"""
+Mapbox Vector Tile（MVT 2.1）纯 Python 编码。
+
+仅覆盖本插件需要的点与线几何，坐标均为瓦片内整数像素坐标（默认 4096 范围）。
+"""
+from __future__ import annotations
+
+import json
+import math
+import struct
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+MVT_EXTENT = 4096
+MVT_VERSION = 2
+
+GEOM_POINT = 1
+GEOM_LINESTRING = 2
+
+_CMD_MOVE_TO = 1
+_CMD_LINE_TO = 2
+
+# Web Mercator 可表示的最大纬度
+MAX_LATITUDE = 85.0511287798066
+
+
+# ── 瓦片坐标换算 ──
+
+def lnglat_to_world(lng: float, lat: float) -> tuple[float, float]:
+    """经纬度换算为 [0, 1) 的 Web Mercator 世界坐标。"""
+    lat = max(min(lat, MAX_LATITUDE), -MAX_LATITUDE)
+    sin_lat = math.sin(math.radians(lat))
+    return (lng + 180.0) / 360.0, 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+
+
+def world_to_lnglat(world_x: float, world_y: float) -> tuple[float, float]:
+    """Web Mercator 世界坐标换算回经纬度。"""
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * world_y))))
+    return world_x * 360.0 - 180.0, lat
+
+
+def world_to_tile_pixel(
+    world_x: float, world_y: float, z: int, x: int, y: int, extent: int = MVT_EXTENT,
+) -> tuple[int, int]:
+    """世界坐标换算为瓦片 (z, x, y) 内的整数像素坐标，瓦片外的点坐标可为负或超出 extent。"""
+    scale = (1 << z) * extent
+    return round(world_x * scale - x * extent), round(world_y * scale - y * extent)
+
+
+def lnglat_to_tile_pixel(
+    lng: float, lat: float, z: int, x: int, y: int, extent: int = MVT_EXTENT,
+) -> tuple[int, int]:
+    return world_to_tile_pixel(*lnglat_to_world(lng, lat), z, x, y, extent)
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """返回瓦片的经纬度范围 (west, south, east, north)。"""
+    n = 1 << z
+
+    def lat_at(tile_y: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return x / n * 360.0 - 180.0, lat_at(y + 1), (x + 1) / n * 360.0 - 180.0, lat_at(y)
+
+
+# ── Protobuf 基础编码 ──
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _varint_field(field: int, value: int) -> bytes:
+    return _key(field, 0) + _varint(value)
+
+
+def _bytes_field(field: int, value: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(value)) + value
+
+
+def _packed_field(field: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(value) for value in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        if value < 0:
+            return _varint_field(6, _zigzag(value))
+        return _varint_field(5, value)
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False)
+    return _bytes_field(1, value.encode("utf-8"))
+
+
+# ── 几何编码 ──
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def _encode_points(points: Sequence[tuple[int, int]]) -> list[int]:
+    geometry = [_command(_CMD_MOVE_TO, len(points))]
+    cursor_x = cursor_y = 0
+    for px, py in points:
+        geometry += [_zigzag(px - cursor_x), _zigzag(py - cursor_y)]
+        cursor_x, cursor_y = px, py
+    return geometry
+
+
+def _encode_lines(lines: Sequence[Sequence[tuple[int, int]]]) -> list[int]:
+    geometry: list[int] = []
+    cursor_x = cursor_y = 0
+    for line in lines:
+        # 量化后相邻重复的顶点不参与编码，退化为单点的线段整体丢弃
+        vertices = [point for index, point in enumerate(line) if index == 0 or point != line[index - 1]]
+        if len(vertices) < 2:
+            continue
+        (start_x, start_y), rest = vertices[0], vertices[1:]
+        geometry += [_command(_CMD_MOVE_TO, 1), _zigzag(start_x - cursor_x), _zigzag(start_y - cursor_y)]
+        cursor_x, cursor_y = start_x, start_y
+        geometry.append(_command(_CMD_LINE_TO, len(rest)))
+        for px, py in rest:
+            geometry += [_zigzag(px - cursor_x), _zigzag(py - cursor_y)]
+            cursor_x, cursor_y = px, py
+    return geometry
+
+
+def _encode_layer(name: str, features: Iterable[dict[str, Any]], extent: int) -> bytes:
+    keys: dict[str, int] = {}
+    values: dict[bytes, int] = {}
+    encoded_features: list[bytes] = []
+
+    for feature in features:
+        if feature['type'] == GEOM_POINT:
+            geometry = _encode_points(feature['geometry'])
+        else:
+            geometry = _encode_lines(feature['geometry'])
+        if len(geometry) <= 1:
+            continue
+
+        tags: list[int] = []
+        for prop_key, prop_value in feature.get('properties', {}).items():
+            if prop_value is None:
+                continue
+            encoded_value = _encode_value(prop_value)
+            tags.append(keys.setdefault(prop_key, len(keys)))
+            tags.append(values.setdefault(encoded_value, len(values)))
+
+        body = b""
+        if feature.get('id') is not None:
+            body += _varint_field(1, feature['id'])
+        if tags:
+            body += _packed_field(2, tags)
+        body += _varint_field(3, feature['type'])
+        body += _packed_field(4, geometry)
+        encoded_features.append(body)
+
+    if not encoded_features:
+        return b""
+
+    layer = _bytes_field(1, name.encode("utf-8"))
+    layer += b"".join(_bytes_field(2, feature) for feature in encoded_features)
+    layer += b"".join(_bytes_field(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(_bytes_field(4, value) for value in values)
+    layer += _varint_field(5, extent)
+    layer += _varint_field(15, MVT_VERSION)
+    return layer
+
+
+def encode_tile(layers: dict[str, Iterable[dict[str, Any]]], extent: int = MVT_EXTENT) -> bytes:
+    """
+    编码一张矢量瓦片。
+    layers 为 {图层名: 要素列表}，要素为 {'id', 'type', 'geometry', 'properties'}：
+    点要素 geometry 为像素坐标列表，线要素为若干条像素坐标序列；无要素的图层不写入。
+    """
+    tile = b""
+    for name, features in layers.items():
+        layer = _encode_layer(name, features, extent)
+        if layer:
+            tile += _bytes_field(3, layer)
+    return tile
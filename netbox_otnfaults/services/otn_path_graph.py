@@ -1,11 +1,26 @@
 """
 OTN 路径图服务
 从 OtnPath 模型加载光缆路径数据，构建 NetworkX 图用于路径计算
+
+路径保存或删除时递增共享缓存中的图版本号并记录变更的路径，
+各进程在下次使用路径图时按版本号补齐期间的变更，仅对变更路径做边级增删
+
+变更在图的副本上应用，完成后整体替换引用；已发布的图不再修改，
+其他线程正在进行的路由查询继续使用旧图，无需加锁
+
+插件配置 graph_engine = 'csr' 时图加载后转为只读的 CSR 稀疏矩阵（见 csr_graph），
+内存占用更小，路径变更后整体重新加载而非增量更新
 """
+import heapq
+import itertools
 import json
 import math
+import threading
 from functools import lru_cache
 
+from django.core.cache import cache
+from django.db import transaction
+
 try:
     import networkx as nx
     HAS_NETWORKX = True
@@ -13,13 +28,87 @@ except ImportError:
     HAS_NETWORKX = False
     nx = None
 
+from .csr_graph import CSR_ENGINE, NETWORKX_ENGINE, CsrRouteGraph, graph_engine
+from .otn_path_graph_snapshot import default_snapshot_path, open_snapshot, otn_path_graph_version, write_snapshot
+from .spatial_index import graph_spatial_index
+
+
+GRAPH_CHANGE_PREFIX = 'otnfaults:otn-path-graph:changes'
+GRAPH_VERSION_KEY = f'{GRAPH_CHANGE_PREFIX}:seq'
+
+# 单条变更在缓存中的保留时长（秒），进程落后超出保留范围时整体重新加载
+GRAPH_CHANGE_RETENTION = 24 * 60 * 60
+
+# 单次补齐的变更条数上限，超出时整体重新加载更快
+GRAPH_CHANGE_REPLAY_LIMIT = 500
+
+# 版本号已分配而变更记录持续缺失的同步次数上限，超出视为记录丢失
+GRAPH_MISSING_SYNC_LIMIT = 3
+
+# 分段路由结果的 LRU 缓存容量，路由编辑器反复吸附同一段时直接命中
+ROUTE_CACHE_SIZE = 1024
+
+
+def _graph_change_key(version):
+    return f'{GRAPH_CHANGE_PREFIX}:{version}'
+
+
+def current_graph_version():
+    return cache.get(GRAPH_VERSION_KEY) or 0
+
+
+def _next_graph_version():
+    try:
+        return cache.incr(GRAPH_VERSION_KEY)
+    except ValueError:
+        cache.add(GRAPH_VERSION_KEY, 0, timeout=None)
+        return cache.incr(GRAPH_VERSION_KEY)
+
+
+def record_otn_path_change(path_id):
+    """事务提交后记录路径变更并递增图版本号；缓存后端异常不影响数据保存"""
+    def record():
+        try:
+            cache.set(_graph_change_key(_next_graph_version()), path_id, timeout=GRAPH_CHANGE_RETENTION)
+        except Exception:
+            pass
+    
+    transaction.on_commit(record)
+
+
+def read_graph_changes(after, until):
+    """
+    读取版本 (after, until] 内连续记录的变更路径 ID，返回 (路径 ID 列表, 已读取到的版本号)。
+    遇到缺失的记录即停止，由调用方决定等待或整体重新加载。
+    """
+    versions = range(after + 1, until + 1)
+    found = cache.get_many([_graph_change_key(version) for version in versions])
+    path_ids = []
+    reached = after
+    for version in versions:
+        key = _graph_change_key(version)
+        if key not in found:
+            break
+        path_ids.append(found[key])
+        reached = version
+    return path_ids, reached
+
 
 class OtnPathGraphService:
     """OTN 路径图服务 - 单例模式"""
     
     _instance = None
     _graph = None
-    _node_index = None  # 空间索引：用于快速查找最近节点
+    _node_index = None  # 坐标去重索引：截断后的坐标 -> 节点
+    _spatial_index = None  # 空间索引：用于快速查找最近节点，图变更后置空并在下次查询时重建
+    _path_edges = None  # 路径 ID -> 该路径贡献的边，用于增量删除
+    _version = 0  # 已应用到本进程图上的图版本号
+    _missing_syncs = 0
+    _cached_route = None  # (起点节点, 终点节点) -> (节点序列, 长度米) 的 LRU 缓存，图变更时清空
+    _engine = NETWORKX_ENGINE
+    _update_lock = threading.Lock()  # 串行化 sync / update_path，同一时刻只有一个线程构建替换用的图
+    
+    PATH_FIELDS = ('pk', 'name', 'cable_type', 'geometry_encoded')
     
     def __new__(cls):
         if cls._instance is None:
@@ -31,23 +120,85 @@ class OtnPathGraphService:
             self._load_graph()
     
     def _load_graph(self):
-        """加载 OTN 路径数据并构建图"""
+        """加载 OTN 路径图：快照版本与当前路径数据一致时直接读取快照，否则从数据库重建并写回快照"""
         if not HAS_NETWORKX:
             print('[OtnPathGraphService] NetworkX 未安装，路径计算不可用')
             return
         
+        self._engine = graph_engine()
+        self._reset_route_cache()
+        try:
+            # 先读取版本号再加载数据，加载期间发生的变更会在下次同步时重新应用
+            self._version = current_graph_version()
+            self._missing_syncs = 0
+            version = otn_path_graph_version()
+            snapshot_path = default_snapshot_path()
+        except Exception as e:
+            print(f'[OtnPathGraphService] 读取路径版本时出错: {e}')
+            version = snapshot_path = None
+        
+        if not (version and self._load_snapshot(snapshot_path, version)):
+            self._build_graph()
+            if version and self._graph is not None and self._graph.number_of_nodes() > 0:
+                self._write_snapshot(snapshot_path, version)
+            if self._engine == CSR_ENGINE and self._graph is not None:
+                self._compact_graph()
+        
+        if self._graph is not None:
+            self._spatial_index = graph_spatial_index(self._graph)
+    
+    def _load_snapshot(self, snapshot_path, version):
+        """从 mmap 快照重建图，快照缺失、格式不兼容或版本过期时返回 False"""
+        with open_snapshot(snapshot_path) as snapshot:
+            if snapshot is None or snapshot.version != version:
+                return False
+            if self._engine == CSR_ENGINE:
+                self._graph = CsrRouteGraph.from_snapshot(snapshot)
+                self._node_index = self._path_edges = None
+                print(f'[OtnPathGraphService] 已从快照加载 CSR 图: {self._graph.number_of_nodes()} 节点, {self._graph.number_of_edges()} 边')
+                return True
+            nodes = snapshot.nodes()
+            self._graph = nx.Graph()
+            self._graph.add_nodes_from((node, {'lng': node[0], 'lat': node[1]}) for node in nodes)
+            self._graph.add_edges_from(snapshot.edges(nodes))
+        self._node_index = {node: node for node in nodes}
+        self._path_edges = {}
+        for node1, node2, path_ids in self._graph.edges(data='path_ids', default=()):
+            for path_id in path_ids:
+                self._path_edges.setdefault(path_id, set()).add((node1, node2))
+        print(f'[OtnPathGraphService] 已从快照加载: {len(nodes)} 节点, {self._graph.number_of_edges()} 边')
+        return True
+    
+    def _write_snapshot(self, snapshot_path, version):
+        """写入图快照，失败时仅记录日志，不影响本进程使用已构建的图"""
+        try:
+            size = write_snapshot(snapshot_path, version, list(self._graph.nodes()), self._graph.edges(data=True))
+            print(f'[OtnPathGraphService] 图快照已写入 {snapshot_path} ({size / 1024 / 1024:.2f} MB)')
+        except OSError as e:
+            print(f'[OtnPathGraphService] 写入图快照失败: {e}')
+    
+    def _compact_graph(self):
+        """将构建完成的 NetworkX 图转为 CSR 图，释放节点字典与逐边属性"""
+        graph = self._graph
+        self._graph = CsrRouteGraph.from_edges(list(graph.nodes()), graph.edges(data=True))
+        self._node_index = self._path_edges = None
+        print(f'[OtnPathGraphService] 已转为 CSR 图，占用 {self._graph.nbytes / 1024 / 1024:.2f} MB')
+    
+    def _build_graph(self):
+        """从 OtnPath 数据构建图"""
         print('[OtnPathGraphService] 正在从数据库加载 OtnPath 数据...')
         
         # 构建图
         self._graph = nx.Graph()
         self._node_index = {}
+        self._path_edges = {}
         
         # 从数据库加载路径数据
         try:
             from netbox_otnfaults.models import OtnPath
             
-            # 查询所有有效路径（geometry 不为空）
-            paths = OtnPath.objects.exclude(geometry__isnull=True).exclude(geometry={})
+            # 查询所有有效路径，只读取紧凑坐标而不加载 JSON 几何
+            paths = OtnPath.objects.filter(vertex_count__gte=2).only(*self.PATH_FIELDS)
             path_count = paths.count()
             
             print(f'[OtnPathGraphService] 找到 {path_count} 条有效路径')
@@ -60,67 +211,19 @@ class OtnPathGraphService:
             skip_count = 0
             skip_reasons = {}
             
-            for path in paths:
-                geometry = path.geometry
-                
-                # 🔧 兼容两种格式：
-                # 1. 标准 GeoJSON: {"type": "LineString", "coordinates": [...]}
-                # 2. 简化格式: [[lng, lat], ...](直接是坐标数组)
-                coords = None
-                
-                if isinstance(geometry, dict):
-                    # 标准 GeoJSON 格式
-                    geom_type = geometry.get('type')
-                    if geom_type != 'LineString':
-                        skip_count += 1
-                        reason = f'type不是LineString(type={geom_type})'
-                        skip_reasons[reason] = skip_reasons.get(reason, 0) + 1
-                        if skip_count <= 3:
-                            print(f'[OtnPathGraphService] 跳过 {path.name}: {reason}')
-                        continue
-                    coords = geometry.get('coordinates', [])
-                    
-                elif isinstance(geometry, list):
-                    # 简化格式：直接是坐标数组
-                    coords = geometry
-                    
-                else:
-                    skip_count += 1
-                    reason = f'geometry格式错误(类型:{type(geometry).__name__})'
-                    skip_reasons[reason] = skip_reasons.get(reason, 0) + 1
-                    if skip_count <= 3:
-                        print(f'[OtnPathGraphService] 跳过 {path.name}: {reason}')
-                    continue
+            for path in paths.iterator(chunk_size=500):
+                coords = path.coordinates
                 
                 # 验证坐标数据
-                if not coords or len(coords) < 2:
+                if len(coords) < 2:
                     skip_count += 1
-                    reason = f'坐标点数不足(len={len(coords) if coords else 0})'
+                    reason = f'坐标点数不足(len={len(coords)})'
                     skip_reasons[reason] = skip_reasons.get(reason, 0) + 1
                     if skip_count <= 3:
                         print(f'[OtnPathGraphService] 跳过 {path.name}: {reason}')
                     continue
                 
-                # 将线段拆分为边
-                for i in range(len(coords) - 1):
-                    coord1 = tuple(coords[i][:2])  # [lng, lat]
-                    coord2 = tuple(coords[i + 1][:2])
-                    
-                    # 添加节点
-                    node1 = self._get_or_create_node(coord1)
-                    node2 = self._get_or_create_node(coord2)
-                    
-                    # 计算边长度
-                    length = self._haversine(coord1, coord2)
-                    
-                    # 添加边（使用路径名称和光缆类型作为额外属性）
-                    self._graph.add_edge(
-                        node1, node2,
-                        weight=length,
-                        path_name=path.name,
-                        cable_type=path.cable_type
-                    )
-                    edge_count += 1
+                edge_count += self._add_path_edges(path, coords)
             
             node_count = self._graph.number_of_nodes()
             print(f'[OtnPathGraphService] 图构建完成: {node_count} 节点, {edge_count} 边')
@@ -136,6 +239,194 @@ class OtnPathGraphService:
             import traceback
             traceback.print_exc()
     
+    def _add_path_edges(self, path, coords):
+        """将路径的线段拆分为边加入图，返回边数；多条路径共用的边记录全部所属路径"""
+        edges = self._path_edges.setdefault(path.pk, set())
+        for i in range(len(coords) - 1):
+            coord1 = tuple(coords[i][:2])  # [lng, lat]
+            coord2 = tuple(coords[i + 1][:2])
+            
+            # 添加节点
+            node1 = self._get_or_create_node(coord1)
+            node2 = self._get_or_create_node(coord2)
+            
+            # 计算边长度
+            length = self._haversine(coord1, coord2)
+            
+            # 添加边（使用路径名称和光缆类型作为额外属性）
+            data = self._graph.get_edge_data(node1, node2)
+            path_ids = data['path_ids'] if data and 'path_ids' in data else []
+            if path.pk not in path_ids:
+                path_ids = [*path_ids, path.pk]
+            self._graph.add_edge(
+                node1, node2,
+                weight=length,
+                path_name=path.name,
+                cable_type=path.cable_type,
+                path_ids=path_ids
+            )
+            edges.add((node1, node2))
+        return len(coords) - 1
+    
+    def _remove_path_edges(self, path_id):
+        """移除路径贡献的边；仍被其他路径使用的边保留，移除后不再连接任何边的节点一并回收"""
+        for node1, node2 in self._path_edges.pop(path_id, ()):
+            data = self._graph.get_edge_data(node1, node2)
+            if data is None:
+                continue
+            owners = [owner for owner in data.get('path_ids', ()) if owner != path_id]
+            if owners:
+                data['path_ids'] = owners
+                continue
+            self._graph.remove_edge(node1, node2)
+            for node in (node1, node2):
+                if node in self._graph and self._graph.degree(node) == 0:
+                    self._graph.remove_node(node)
+                    self._node_index.pop(node, None)
+    
+    def update_path(self, path_id):
+        """按数据库中的当前状态重建单条路径的边：已删除或几何无效的路径仅移除"""
+        with self._update_lock:
+            self._apply_path_changes([path_id])
+    
+    def _apply_path_changes(self, path_ids):
+        """在图的副本上逐条重建变更路径，完成后整体替换"""
+        working = object.__new__(type(self))
+        working._engine = self._engine
+        working._graph = self._graph.copy()
+        working._node_index = dict(self._node_index)
+        working._path_edges = {path_id: set(edges) for path_id, edges in self._path_edges.items()}
+        for path_id in path_ids:
+            working._rebuild_path(path_id)
+        self._publish(working)
+    
+    def _rebuild_path(self, path_id):
+        from netbox_otnfaults.models import OtnPath
+        
+        self._remove_path_edges(path_id)
+        path = OtnPath.objects.filter(pk=path_id, vertex_count__gte=2).only(*self.PATH_FIELDS).first()
+        if path is not None:
+            coords = path.coordinates
+            if len(coords) >= 2:
+                self._add_path_edges(path, coords)
+    
+    def _publish(self, built):
+        """换上已构建完成的图及其索引；空间索引在替换前建好，避免查询线程按旧图重建"""
+        if built._spatial_index is None and built._graph is not None and built._graph.number_of_nodes() > 0:
+            built._spatial_index = graph_spatial_index(built._graph)
+        self._graph = built._graph
+        self._node_index = built._node_index
+        self._path_edges = built._path_edges
+        self._spatial_index = built._spatial_index
+        self._reset_route_cache()
+    
+    def sync(self):
+        """按共享图版本号补齐其他进程记录的路径变更，变更记录缺失或落后过多时整体重新加载"""
+        if self._graph is None:
+            return
+        # 其他线程正在更新时沿用当前图，不让请求排队等待
+        if not self._update_lock.acquire(blocking=False):
+            return
+        try:
+            self._sync_changes()
+        finally:
+            self._update_lock.release()
+    
+    def _sync_changes(self):
+        try:
+            latest = current_graph_version()
+        except Exception:
+            return
+        if latest == self._version:
+            return
+        if latest < self._version or latest - self._version > GRAPH_CHANGE_REPLAY_LIMIT:
+            print('[OtnPathGraphService] 图版本号已重置或落后过多，重新加载')
+            self._reload()
+            return
+        if self._engine == CSR_ENGINE:
+            # CSR 图为只读数组，无法按路径增删边
+            print('[OtnPathGraphService] 路径已变更，重新加载 CSR 图')
+            self._reload()
+            return
+        
+        path_ids, reached = read_graph_changes(self._version, latest)
+        if path_ids:
+            self._apply_path_changes(list(dict.fromkeys(path_ids)))
+        self._version = reached
+        
+        if reached < latest:
+            self._missing_syncs += 1
+            if self._missing_syncs > GRAPH_MISSING_SYNC_LIMIT:
+                print('[OtnPathGraphService] 路径变更记录缺失，重新加载')
+                self._reload()
+        else:
+            self._missing_syncs = 0
+        if path_ids:
+            print(f'[OtnPathGraphService] 已增量应用 {len(path_ids)} 条路径变更，图版本 {self._version}')
+    
+    def _reload(self):
+        """在独立实例上重新加载，加载期间查询仍使用当前图"""
+        fresh = object.__new__(type(self))
+        fresh._load_graph()
+        self._engine = fresh._engine
+        self._version = fresh._version
+        self._missing_syncs = fresh._missing_syncs
+        self._publish(fresh)
+    
+    def _reset_route_cache(self):
+        self._cached_route = lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._shortest_path)
+    
+    def _route_between(self, source, target):
+        """两节点间的最短路径 (节点序列, 长度米)，不可达时返回 None；无向图按节点排序共用一条缓存"""
+        if self._cached_route is None:
+            self._reset_route_cache()
+        if target < source:
+            result = self._cached_route(target, source)
+            return (result[0][::-1], result[1]) if result else None
+        return self._cached_route(source, target)
+    
+    def _shortest_path(self, source, target):
+        if self._engine == CSR_ENGINE:
+            return self._graph.shortest_path(source, target)
+        return self._astar(source, target)
+    
+    def _astar(self, source, target):
+        """
+        A* 最短路径，启发函数为到终点的 haversine 距离（不超过任何路径的实际长度）。
+        搜索时同步累计长度，一次返回 (节点序列, 长度米)；不可达时返回 None。
+        """
+        graph = self._graph
+        if source not in graph or target not in graph:
+            return None
+        
+        tie_breaker = itertools.count()
+        best = {source: 0.0}
+        parents = {source: None}
+        frontier = [(self._haversine(source, target), 0.0, next(tie_breaker), source)]
+        while frontier:
+            _estimate, cost, _order, node = heapq.heappop(frontier)
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return tuple(reversed(path)), cost
+            if cost > best[node]:
+                continue
+            for neighbour, data in graph.adj[node].items():
+                neighbour_cost = cost + data.get('weight', 0)
+                if neighbour_cost < best.get(neighbour, math.inf):
+                    best[neighbour] = neighbour_cost
+                    parents[neighbour] = node
+                    estimate = neighbour_cost + self._haversine(neighbour, target)
+                    heapq.heappush(frontier, (estimate, neighbour_cost, next(tie_breaker), neighbour))
+        return None
+    
+    def _get_spatial_index(self):
+        if self._spatial_index is None and self._graph is not None and self._graph.number_of_nodes() > 0:
+            self._spatial_index = graph_spatial_index(self._graph)
+        return self._spatial_index
+    
     def _get_or_create_node(self, coord):
         """获取或创建节点，使用坐标精度截断避免重复"""
         # 将坐标截断到 5 位小数（约 1 米精度）
@@ -160,21 +451,23 @@ class OtnPathGraphService:
         return R * c
     
     def find_nearest_node(self, lng, lat, max_distance=50000):
-        """查找最近的图节点（暴力搜索，后续可优化为 R-tree）"""
-        if not self._graph:
-            return None
-        
-        target = (lng, lat)
-        min_dist = float('inf')
-        nearest = None
-        
-        for node in self._graph.nodes():
-            dist = self._haversine(target, node)
-            if dist < min_dist and dist <= max_distance:
-                min_dist = dist
-                nearest = node
-        
-        return nearest
+        """查找 max_distance 米内最近的图节点"""
+        nearest = self.find_nearest_nodes(lng, lat, k=1, max_distance=max_distance)
+        return nearest[0][1] if nearest else None
+    
+    def find_nearest_nodes(self, lng, lat, k=1, max_distance=None):
+        """查找最近的 k 个图节点，返回按距离升序的 [(距离米, 节点), ...]"""
+        spatial_index = self._get_spatial_index()
+        if not spatial_index:
+            return []
+        return spatial_index.nearest(lng, lat, k=k, max_distance=max_distance)
+    
+    def find_nodes_within(self, lng, lat, radius):
+        """查找 radius 米内的全部图节点，返回按距离升序的 [(距离米, 节点), ...]"""
+        spatial_index = self._get_spatial_index()
+        if not spatial_index:
+            return []
+        return spatial_index.within(lng, lat, radius)
     
     def calculate_route(self, waypoints):
         """
@@ -217,20 +510,16 @@ class OtnPathGraphService:
         total_length = 0
         
         for i in range(len(route_nodes) - 1):
-            try:
-                path = nx.shortest_path(self._graph, route_nodes[i], route_nodes[i+1], weight='weight')
-                # 跳过第一个节点（已在上一段末尾）
-                full_path.extend(path[1:])
-                
-                # 累加长度
-                for j in range(len(path) - 1):
-                    edge_data = self._graph.get_edge_data(path[j], path[j+1])
-                    total_length += edge_data.get('weight', 0)
-                    
-            except nx.NetworkXNoPath:
+            segment = self._route_between(route_nodes[i], route_nodes[i+1])
+            if segment is None:
                 # 无可达路径，返回直线
                 print(f'[OtnPathGraphService] 节点 {i} 到 {i+1} 之间无可达路径，使用直线')
                 return self._fallback_straight_line(waypoints)
+            
+            path, length = segment
+            # 跳过第一个节点（已在上一段末尾）
+            full_path.extend(path[1:])
+            total_length += length
         
         # 构建 GeoJSON 几何
         coordinates = [[node[0], node[1]] for node in full_path]
@@ -283,4 +572,21 @@ def get_otn_path_graph_service():
     global _otn_path_graph_service
     if _otn_path_graph_service is None:
         _otn_path_graph_service = OtnPathGraphService()
+    else:
+        _otn_path_graph_service.sync()
     return _otn_path_graph_service
+
+
+def rebuild_otn_path_graph_snapshot(snapshot_path=None):
+    """忽略现有快照，从数据库重建路径图并覆盖快照，返回 (节点数, 边数, 快照字节数, 快照路径)"""
+    if not HAS_NETWORKX:
+        raise RuntimeError('NetworkX 未安装，无法构建路径图')
+    
+    version = otn_path_graph_version()
+    snapshot_path = snapshot_path or default_snapshot_path()
+    # 独立实例，不影响本进程已加载的单例
+    service = object.__new__(OtnPathGraphService)
+    service._build_graph()
+    graph = service._graph
+    size = write_snapshot(snapshot_path, version, list(graph.nodes()), graph.edges(data=True))
+    return graph.number_of_nodes(), graph.number_of_edges(), size, snapshot_path
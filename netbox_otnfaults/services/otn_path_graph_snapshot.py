@@ -0,0 +1,195 @@
+"""
+OTN 路径图的磁盘快照。
+
+路径图以 CSR 邻接数组加节点坐标的紧凑二进制格式保存，文件头记录由 OtnPath 变更时间计算的版本号。
+各 worker 通过 mmap 读取快照重建图，无需再逐条读取路径并计算线段长度；版本不一致时由加载方重新构建并覆盖快照。
+
+文件布局（本机字节序，各数组按 8 字节对齐）：
+    文件头 | 经度 float64[N] | 纬度 float64[N] | 边长 float64[M] | indptr int32[N+1] | indices int32[M] | 路径序号 int32[M] | 路径属性 JSON
+其中 M 为双向邻接条目数（每条无向边记两次，自环记一次）。
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+
+SNAPSHOT_MAGIC = b'OTNG'
+# 2：边属性增加所属路径 path_ids，供增量更新按路径删除边
+SNAPSHOT_FORMAT_VERSION = 2
+
+# magic, 格式版本, 是否小端, 节点数, 邻接条目数, 路径属性数, 路径属性 JSON 长度, 数据版本号
+_HEADER = struct.Struct('<4sHBxIIII40s')
+_HEADER_SIZE = _HEADER.size  # 64 字节，其后的 float64 数组自然对齐
+
+Coordinate = tuple[float, float]
+
+
+@dataclass
+class GraphSnapshot:
+    """mmap 上的零拷贝数组视图，仅在 open_snapshot 的 with 块内有效。"""
+    version: str
+    lngs: memoryview
+    lats: memoryview
+    weights: memoryview
+    indptr: memoryview
+    indices: memoryview
+    edge_paths: memoryview
+    path_attrs: list[dict[str, Any]]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.lngs)
+
+    def nodes(self) -> list[Coordinate]:
+        return list(zip(self.lngs, self.lats))
+
+    def edges(self, nodes: list[Coordinate] | None = None) -> Iterator[tuple[Coordinate, Coordinate, dict[str, Any]]]:
+        """按无向边逐条返回 (节点, 节点, 属性)，每条边仅返回一次。"""
+        nodes = nodes if nodes is not None else self.nodes()
+        indptr, indices, weights, edge_paths = self.indptr, self.indices, self.weights, self.edge_paths
+        for source in range(len(nodes)):
+            for entry in range(indptr[source], indptr[source + 1]):
+                target = indices[entry]
+                if target >= source:
+                    yield nodes[source], nodes[target], {'weight': weights[entry], **self.path_attrs[edge_paths[entry]]}
+
+
+def default_snapshot_path() -> str:
+    """未配置时放在 NetBox 的 MEDIA_ROOT 下；不使用公共可写的系统临时目录，避免快照被其他用户预置或冲突。"""
+    from django.conf import settings
+
+    configured = settings.PLUGINS_CONFIG.get('netbox_otnfaults', {}).get('otn_path_graph_snapshot_file')
+    return configured or os.path.join(settings.MEDIA_ROOT, 'netbox_otnfaults', 'otn_path_graph.snapshot')
+
+
+def otn_path_graph_version() -> str:
+    """由参与建图的 OtnPath 主键与最后修改时间计算的版本号，路径增删改后随之变化。"""
+    from netbox_otnfaults.models import OtnPath
+
+    digest = hashlib.sha1()
+    rows = OtnPath.objects.filter(vertex_count__gte=2).order_by('pk').values_list('pk', 'last_updated')
+    for pk, last_updated in rows.iterator(chunk_size=2000):
+        digest.update(f'{pk}:{last_updated.isoformat() if last_updated else ""};'.encode())
+    return digest.hexdigest()
+
+
+def _padding(length: int) -> bytes:
+    return b'\0' * (-length % 8)
+
+
+def write_snapshot(
+    path: str,
+    version: str,
+    nodes: list[Coordinate],
+    edges: Iterable[tuple[Coordinate, Coordinate, dict[str, Any]]],
+) -> int:
+    """将图写为快照并原子替换目标文件，返回文件字节数。edges 中的属性除 weight 外整体作为路径属性去重保存。"""
+    node_ids = {node: index for index, node in enumerate(nodes)}
+    adjacency: list[list[tuple[int, float, int]]] = [[] for _ in nodes]
+    path_ids: dict[str, int] = {}
+    path_attrs: list[dict[str, Any]] = []
+    for node_a, node_b, attrs in edges:
+        attrs = dict(attrs)
+        weight = float(attrs.pop('weight', 0.0))
+        key = json.dumps(attrs, ensure_ascii=False, sort_keys=True)
+        if key not in path_ids:
+            path_ids[key] = len(path_attrs)
+            path_attrs.append(attrs)
+        source, target = node_ids[node_a], node_ids[node_b]
+        adjacency[source].append((target, weight, path_ids[key]))
+        if target != source:
+            adjacency[target].append((source, weight, path_ids[key]))
+
+    lngs, lats = array('d', (node[0] for node in nodes)), array('d', (node[1] for node in nodes))
+    weights, indptr, indices, edge_paths = array('d'), array('i', [0]), array('i'), array('i')
+    for neighbours in adjacency:
+        for target, weight, path_id in neighbours:
+            indices.append(target)
+            weights.append(weight)
+            edge_paths.append(path_id)
+        indptr.append(len(indices))
+    meta = json.dumps(path_attrs, ensure_ascii=False).encode('utf-8')
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, sys.byteorder == 'little',
+        len(nodes), len(indices), len(path_attrs), len(meta), version.encode('ascii'),
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.partial', delete=False) as output:
+        try:
+            output.write(header)
+            for values in (lngs, lats, weights, indptr, indices, edge_paths):
+                data = values.tobytes()
+                output.write(data + _padding(len(data)))
+            output.write(meta)
+        except BaseException:
+            output.close()
+            os.unlink(output.name)
+            raise
+    os.replace(output.name, path)
+    return os.path.getsize(path)
+
+
+def _read_header(buffer: mmap.mmap) -> tuple | None:
+    if len(buffer) < _HEADER_SIZE:
+        return None
+    header = _HEADER.unpack_from(buffer, 0)
+    magic, format_version, little_endian = header[:3]
+    if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION or little_endian != (sys.byteorder == 'little'):
+        return None
+    return header
+
+
+def _map_arrays(buffer: mmap.mmap, views: list[memoryview]) -> GraphSnapshot | None:
+    header = _read_header(buffer)
+    if header is None:
+        return None
+    _magic, _format, _little, node_count, entry_count, _path_count, meta_length, version = header
+    whole = memoryview(buffer)
+    views.append(whole)
+    offset = _HEADER_SIZE
+    arrays = []
+    for fmt, count in (('d', node_count), ('d', node_count), ('d', entry_count),
+                       ('i', node_count + 1), ('i', entry_count), ('i', entry_count)):
+        length = count * struct.calcsize(fmt)
+        if offset + length > len(buffer):
+            return None
+        view = whole[offset:offset + length].cast(fmt)
+        views.append(view)
+        arrays.append(view)
+        offset += length + len(_padding(length))
+    try:
+        path_attrs = json.loads(bytes(whole[offset:offset + meta_length]).decode('utf-8'))
+    except ValueError:
+        return None
+    return GraphSnapshot(version.decode('ascii').rstrip('\0'), *arrays, path_attrs=path_attrs)
+
+
+@contextlib.contextmanager
+def open_snapshot(path: str) -> Iterator[GraphSnapshot | None]:
+    """以 mmap 打开快照并返回数组视图；文件不存在、格式不兼容或被截断时返回 None。"""
+    try:
+        with open(path, 'rb') as source:
+            buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        yield None
+        return
+    views: list[memoryview] = []
+    try:
+        yield _map_arrays(buffer, views)
+    finally:
+        for view in reversed(views):
+            view.release()
+        buffer.close()
@@ -0,0 +1,205 @@
+"""
+OtnPath 几何的派生数据：按弧长计算的真实中点、经纬度范围、顶点数与紧凑二进制坐标，以及通用的折线简化。
+
+仅依赖标准库（NumPy 可选，仅用于零拷贝数组视图），供模型保存时写入冗余列，坐标解析、地图定位与路径图加载据此无需再解析完整 JSON 几何。
+"""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None
+
+
+EARTH_RADIUS_M = 6371000
+
+# 压缩坐标以微度（1e-6 度，约 0.1 米）存储为小端 int32 的 (lng, lat) 序列
+COORDINATE_SCALE = 1_000_000
+
+PATH_METRIC_FIELDS: tuple[str, ...] = (
+    'midpoint_latitude',
+    'midpoint_longitude',
+    'bbox_west',
+    'bbox_south',
+    'bbox_east',
+    'bbox_north',
+    'vertex_count',
+)
+
+
+@dataclass(frozen=True)
+class PathGeometryMetrics:
+    midpoint_lat: float
+    midpoint_lng: float
+    west: float
+    south: float
+    east: float
+    north: float
+    vertex_count: int
+
+
+def line_coordinates(geometry: Any) -> list[tuple[float, float]]:
+    """兼容 GeoJSON LineString 与直接存储的坐标数组，返回有效的 (lng, lat) 列表。"""
+    coords = geometry.get('coordinates') if isinstance(geometry, dict) else geometry
+    if not isinstance(coords, list):
+        return []
+    points: list[tuple[float, float]] = []
+    for point in coords:
+        if not isinstance(point, (list, tuple)) or len(point) < 2 or point[0] is None or point[1] is None:
+            continue
+        try:
+            points.append((float(point[0]), float(point[1])))
+        except (TypeError, ValueError):
+            continue
+    return points
+
+
+def segment_lengths(points: list[tuple[float, float]]) -> list[float]:
+    """相邻顶点间的 haversine 距离（米），整列一次换算弧度后逐段计算。"""
+    lngs = [math.radians(lng) for lng, _lat in points]
+    lats = [math.radians(lat) for _lng, lat in points]
+    cos_lats = [math.cos(lat) for lat in lats]
+    lengths: list[float] = []
+    for i in range(len(points) - 1):
+        a = (
+            math.sin((lats[i + 1] - lats[i]) / 2) ** 2
+            + cos_lats[i] * cos_lats[i + 1] * math.sin((lngs[i + 1] - lngs[i]) / 2) ** 2
+        )
+        lengths.append(2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a))))
+    return lengths
+
+
+def arc_length_midpoint(points: list[tuple[float, float]]) -> tuple[float, float] | None:
+    """返回沿线长度一半处的 (lat, lng)，在所在线段内按长度比例线性插值。"""
+    if not points:
+        return None
+    lengths = segment_lengths(points)
+    half = sum(lengths) / 2
+    if half <= 0:
+        return points[0][1], points[0][0]
+
+    travelled = 0.0
+    for index, length in enumerate(lengths):
+        if travelled + length >= half:
+            ratio = (half - travelled) / length
+            (lng_a, lat_a), (lng_b, lat_b) = points[index], points[index + 1]
+            return lat_a + (lat_b - lat_a) * ratio, lng_a + (lng_b - lng_a) * ratio
+        travelled += length
+    return points[-1][1], points[-1][0]
+
+
+def compute_path_metrics(geometry: Any) -> PathGeometryMetrics | None:
+    points = line_coordinates(geometry)
+    midpoint = arc_length_midpoint(points)
+    if midpoint is None:
+        return None
+    lngs = [lng for lng, _lat in points]
+    lats = [lat for _lng, lat in points]
+    return PathGeometryMetrics(
+        midpoint_lat=midpoint[0],
+        midpoint_lng=midpoint[1],
+        west=min(lngs),
+        south=min(lats),
+        east=max(lngs),
+        north=max(lats),
+        vertex_count=len(points),
+    )
+
+
+def path_metric_fields(geometry: Any) -> dict[str, Any]:
+    """返回写入 OtnPath 冗余列的字段值；无有效几何时中点与范围为空、顶点数为 0。"""
+    metrics = compute_path_metrics(geometry)
+    if metrics is None:
+        return {**{name: None for name in PATH_METRIC_FIELDS}, 'vertex_count': 0}
+    return {
+        'midpoint_latitude': round(metrics.midpoint_lat, 6),
+        'midpoint_longitude': round(metrics.midpoint_lng, 6),
+        'bbox_west': round(metrics.west, 6),
+        'bbox_south': round(metrics.south, 6),
+        'bbox_east': round(metrics.east, 6),
+        'bbox_north': round(metrics.north, 6),
+        'vertex_count': metrics.vertex_count,
+    }
+
+
+def simplify_line(points: list[tuple[float, float]], tolerance: float) -> list[tuple[float, float]]:
+    """Douglas-Peucker 简化，保留首尾点。"""
+    if len(points) <= 2:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    tolerance_sq = tolerance * tolerance
+    while stack:
+        start, end = stack.pop()
+        (ax, ay), (bx, by) = points[start], points[end]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        max_distance_sq, max_index = -1.0, start
+        for index in range(start + 1, end):
+            px, py = points[index]
+            if length_sq == 0:
+                distance_sq = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+                distance_sq = (px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2
+            if distance_sq > max_distance_sq:
+                max_distance_sq, max_index = distance_sq, index
+        if max_distance_sq > tolerance_sq:
+            keep[max_index] = True
+            stack.append((start, max_index))
+            stack.append((max_index, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def encode_coordinates(points: list[tuple[float, float]]) -> bytes:
+    """将 (lng, lat) 列表编码为紧凑二进制坐标，每个顶点 8 字节。"""
+    values = array('i')
+    for lng, lat in points:
+        values.append(round(lng * COORDINATE_SCALE))
+        values.append(round(lat * COORDINATE_SCALE))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def decode_coordinates(data: bytes | memoryview | None) -> list[tuple[float, float]]:
+    """将紧凑二进制坐标解码为 (lng, lat) 列表。"""
+    if not data:
+        return []
+    values = array('i')
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return [(values[i] / COORDINATE_SCALE, values[i + 1] / COORDINATE_SCALE) for i in range(0, len(values) - 1, 2)]
+
+
+def coordinate_array(data: bytes | memoryview | None) -> Any:
+    """
+    以零拷贝方式返回紧凑坐标的 (N, 2) int32 视图（单位微度，除以 COORDINATE_SCALE 得经纬度）。
+    未安装 NumPy 时返回 array('i') 扁平序列。
+    """
+    if HAS_NUMPY:
+        if not data:
+            return np.empty((0, 2), dtype='<i4')
+        return np.frombuffer(data, dtype='<i4').reshape(-1, 2)
+    values = array('i')
+    if data:
+        values.frombytes(bytes(data))
+        if sys.byteorder == 'big':
+            values.byteswap()
+    return values
+
+
+def encoded_geometry(geometry: Any) -> bytes | None:
+    """返回 OtnPath.geometry 对应的紧凑坐标；无有效顶点时为 None。"""
+    return encode_coordinates(line_coordinates(geometry)) or None
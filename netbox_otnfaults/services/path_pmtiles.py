@@ -0,0 +1,212 @@
+"""
+OtnPath 几何生成 PMTiles 归档（替代导出 GeoJSON 后由 tippecanoe 生成的离线流程）。
+
+逐块读取路径几何并换算为 Web Mercator 世界坐标，逐级缩放按容差简化、
+按线段切分到所覆盖的瓦片，编码为 MVT 后顺序写入 PMTiles v3 归档。
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+from ..models import OtnPath
+from .mvt import GEOM_LINESTRING, MVT_EXTENT, encode_tile, lnglat_to_world, world_to_tile_pixel
+from .path_geometry import simplify_line
+from .pmtiles import PmtilesWriter, zxy_to_tile_id
+
+
+# 图层名需与地图前端 otn-paths 图层的 source-layer 一致
+OTN_PATHS_LAYER = 'otn_paths'
+
+DEFAULT_MIN_ZOOM = 0
+DEFAULT_MAX_ZOOM = 12
+
+# 各级缩放的简化容差与瓦片缓冲（瓦片像素，extent 4096 下 16 像素约合屏幕 1 像素）
+SIMPLIFY_TOLERANCE = 8
+TILE_BUFFER = 64
+
+PATH_CHUNK_SIZE = 500
+
+WORLD_BOUNDS = (-180.0, -85.0511, 180.0, 85.0511)
+
+
+@dataclass
+class PathPmtilesResult:
+    output_path: str
+    path_count: int
+    skipped_count: int
+    tile_count: int
+    size_bytes: int
+    elapsed: float
+    tiles_per_zoom: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class _PathGeometry:
+    world_points: list[tuple[float, float]]
+    properties: dict[str, Any]
+
+
+def default_output_path() -> str:
+    return settings.PLUGINS_CONFIG.get('netbox_otnfaults', {}).get(
+        'otn_paths_pmtiles_file', '/opt/maps/data/otn_paths.pmtiles'
+    )
+
+
+def _path_properties(path: OtnPath) -> dict[str, Any]:
+    return {
+        'id': path.pk,
+        'name': path.name,
+        'site_a': path.site_a.name if path.site_a else None,
+        'site_z': path.site_z.name if path.site_z else None,
+        'site_a_id': path.site_a.pk if path.site_a else None,
+        'site_z_id': path.site_z.pk if path.site_z else None,
+        'cable_type': path.cable_type,
+        'length_m': float(path.calculated_length) if path.calculated_length else None,
+        'description': path.description or '',
+    }
+
+
+def _load_paths() -> tuple[list[_PathGeometry], int, tuple[float, float, float, float]]:
+    """逐块读取路径，返回 (路径几何, 跳过数, 经纬度范围)。"""
+    paths: list[_PathGeometry] = []
+    skipped = 0
+    west, south, east, north = math.inf, math.inf, -math.inf, -math.inf
+
+    # 读取紧凑坐标，避免逐条加载并解析 JSON 几何
+    queryset = OtnPath.objects.defer('geometry').select_related('site_a', 'site_z').order_by('pk')
+    for path in queryset.iterator(chunk_size=PATH_CHUNK_SIZE):
+        lnglats = path.coordinates
+        if len(lnglats) < 2:
+            skipped += 1
+            continue
+
+        for lng, lat in lnglats:
+            west, east = min(west, lng), max(east, lng)
+            south, north = min(south, lat), max(north, lat)
+        paths.append(_PathGeometry(
+            world_points=[lnglat_to_world(lng, lat) for lng, lat in lnglats],
+            properties=_path_properties(path),
+        ))
+
+    bounds = (west, south, east, north) if paths else WORLD_BOUNDS
+    return paths, skipped, bounds
+
+
+def _tile_range(low: float, high: float, scale: int, buffer: float) -> range:
+    first = max(int(math.floor(low * scale - buffer)), 0)
+    last = min(int(math.floor(high * scale + buffer)), scale - 1)
+    return range(first, last + 1)
+
+
+def build_zoom_tiles(paths: list[_PathGeometry], z: int) -> dict[tuple[int, int], list[dict[str, Any]]]:
+    """
+    构建单级缩放的瓦片要素。
+    路径按线段归入其外包框（含缓冲）覆盖的瓦片，同一瓦片内连续的线段合并为一段折线，
+    瓦片只包含经过自身的部分而非整条路径。
+    """
+    scale = 1 << z
+    tolerance = SIMPLIFY_TOLERANCE / (scale * MVT_EXTENT)
+    buffer = TILE_BUFFER / MVT_EXTENT
+    tiles: dict[tuple[int, int], list[dict[str, Any]]] = defaultdict(list)
+
+    for path in paths:
+        points = simplify_line(path.world_points, tolerance)
+        segments_by_tile: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for index in range(len(points) - 1):
+            (ax, ay), (bx, by) = points[index], points[index + 1]
+            for tile_x in _tile_range(min(ax, bx), max(ax, bx), scale, buffer):
+                for tile_y in _tile_range(min(ay, by), max(ay, by), scale, buffer):
+                    segments_by_tile[(tile_x, tile_y)].append(index)
+
+        for (tile_x, tile_y), indices in segments_by_tile.items():
+            parts: list[list[tuple[int, int]]] = []
+            run_start = previous = indices[0]
+            for index in indices[1:] + [None]:
+                if index is not None and index == previous + 1:
+                    previous = index
+                    continue
+                parts.append([
+                    world_to_tile_pixel(wx, wy, z, tile_x, tile_y)
+                    for wx, wy in points[run_start:previous + 2]
+                ])
+                if index is not None:
+                    run_start = previous = index
+            tiles[(tile_x, tile_y)].append({
+                'id': path.properties['id'],
+                'type': GEOM_LINESTRING,
+                'geometry': parts,
+                'properties': path.properties,
+            })
+    return tiles
+
+
+def _metadata(min_zoom: int, max_zoom: int) -> dict[str, Any]:
+    return {
+        'name': 'OTN 光缆路径',
+        'description': 'NetBox OtnPath 数据',
+        'format': 'pbf',
+        'generator': 'netbox_otnfaults',
+        'vector_layers': [{
+            'id': OTN_PATHS_LAYER,
+            'minzoom': min_zoom,
+            'maxzoom': max_zoom,
+            'fields': {
+                'id': 'Number',
+                'name': 'String',
+                'site_a': 'String',
+                'site_z': 'String',
+                'site_a_id': 'Number',
+                'site_z_id': 'Number',
+                'cable_type': 'String',
+                'length_m': 'Number',
+                'description': 'String',
+            },
+        }],
+    }
+
+
+def build_otn_paths_pmtiles(
+    output_path: str | None = None,
+    min_zoom: int = DEFAULT_MIN_ZOOM,
+    max_zoom: int = DEFAULT_MAX_ZOOM,
+    on_zoom: Callable[[int, int, float], None] | None = None,
+) -> PathPmtilesResult:
+    """
+    生成 OtnPath 的 PMTiles 归档并原子替换目标文件。
+    on_zoom 在每级缩放完成后以 (缩放级别, 瓦片数, 累计耗时) 回调，用于输出进度。
+    """
+    output_path = output_path or default_output_path()
+    started = time.monotonic()
+    paths, skipped, bounds = _load_paths()
+
+    writer = PmtilesWriter(output_path)
+    tiles_per_zoom: dict[int, int] = {}
+    try:
+        for z in range(min_zoom, max_zoom + 1):
+            tiles = build_zoom_tiles(paths, z)
+            for tile_x, tile_y in sorted(tiles, key=lambda key: zxy_to_tile_id(z, *key)):
+                writer.write_tile(z, tile_x, tile_y, encode_tile({OTN_PATHS_LAYER: tiles[(tile_x, tile_y)]}))
+            tiles_per_zoom[z] = len(tiles)
+            if on_zoom:
+                on_zoom(z, len(tiles), time.monotonic() - started)
+        size_bytes = writer.finalize(min_zoom, max_zoom, bounds, _metadata(min_zoom, max_zoom))
+    except BaseException:
+        writer.discard()
+        raise
+
+    return PathPmtilesResult(
+        output_path=output_path,
+        path_count=len(paths),
+        skipped_count=skipped,
+        tile_count=sum(tiles_per_zoom.values()),
+        size_bytes=size_bytes,
+        elapsed=time.monotonic() - started,
+        tiles_per_zoom=tiles_per_zoom,
+    )
@@ -0,0 +1,212 @@
+"""
+PMTiles v3 归档写入。
+
+瓦片按 Hilbert 曲线顺序编号写入，相同内容的瓦片只存一份；
+根目录放不下时拆分为叶目录，保证头部与根目录位于文件前 16 KB 内。
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Any
+
+
+PMTILES_HEADER_SIZE = 127
+PMTILES_ROOT_MAX_SIZE = 16384 - PMTILES_HEADER_SIZE
+
+COMPRESSION_GZIP = 2
+TILE_TYPE_MVT = 1
+
+
+def zxy_to_tile_id(z: int, x: int, y: int) -> int:
+    """按 PMTiles 规范将瓦片坐标换算为 Hilbert 曲线序号。"""
+    tile_id = ((1 << (z * 2)) - 1) // 3
+    for level in range(z - 1, -1, -1):
+        size = 1 << level
+        rx = size & x
+        ry = size & y
+        tile_id += ((3 * rx) ^ ry) << level
+        if ry == 0:
+            if rx != 0:
+                x = size - 1 - x
+                y = size - 1 - y
+            x, y = y, x
+    return tile_id
+
+
+@dataclass
+class _Entry:
+    tile_id: int
+    offset: int
+    length: int
+    run_length: int
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _serialize_directory(entries: list[_Entry]) -> bytes:
+    data = bytearray(_varint(len(entries)))
+    last_id = 0
+    for entry in entries:
+        data += _varint(entry.tile_id - last_id)
+        last_id = entry.tile_id
+    for entry in entries:
+        data += _varint(entry.run_length)
+    for entry in entries:
+        data += _varint(entry.length)
+    for index, entry in enumerate(entries):
+        previous = entries[index - 1] if index else None
+        if previous is not None and entry.offset == previous.offset + previous.length:
+            data += _varint(0)
+        else:
+            data += _varint(entry.offset + 1)
+    return gzip.compress(bytes(data), mtime=0)
+
+
+def _build_directories(entries: list[_Entry]) -> tuple[bytes, bytes]:
+    """返回 (根目录, 叶目录) 字节；条目过多时按块拆分叶目录，直至根目录满足大小上限。"""
+    root = _serialize_directory(entries)
+    if len(root) <= PMTILES_ROOT_MAX_SIZE:
+        return root, b""
+
+    leaf_size = 4096
+    while True:
+        root_entries: list[_Entry] = []
+        leaves = bytearray()
+        for start in range(0, len(entries), leaf_size):
+            chunk = entries[start:start + leaf_size]
+            leaf = _serialize_directory(chunk)
+            root_entries.append(_Entry(chunk[0].tile_id, len(leaves), len(leaf), 0))
+            leaves += leaf
+        root = _serialize_directory(root_entries)
+        if len(root) <= PMTILES_ROOT_MAX_SIZE:
+            return root, bytes(leaves)
+        leaf_size *= 2
+
+
+def _header(
+    root_length: int,
+    metadata_length: int,
+    leaves_length: int,
+    data_length: int,
+    addressed_tiles: int,
+    tile_entries: int,
+    tile_contents: int,
+    min_zoom: int,
+    max_zoom: int,
+    bounds: tuple[float, float, float, float],
+) -> bytes:
+    root_offset = PMTILES_HEADER_SIZE
+    metadata_offset = root_offset + root_length
+    leaves_offset = metadata_offset + metadata_length
+    data_offset = leaves_offset + leaves_length
+    west, south, east, north = bounds
+    center_zoom = (min_zoom + max_zoom) // 2
+    return b"PMTiles" + struct.pack(
+        "<BQQQQQQQQQQQBBBBBBiiiiBii",
+        3,
+        root_offset, root_length,
+        metadata_offset, metadata_length,
+        leaves_offset, leaves_length,
+        data_offset, data_length,
+        addressed_tiles, tile_entries, tile_contents,
+        1, COMPRESSION_GZIP, COMPRESSION_GZIP, TILE_TYPE_MVT,
+        min_zoom, max_zoom,
+        round(west * 1e7), round(south * 1e7), round(east * 1e7), round(north * 1e7),
+        center_zoom, round((west + east) / 2 * 1e7), round((south + north) / 2 * 1e7),
+    )
+
+
+class PmtilesWriter:
+    """
+    顺序写入 PMTiles 归档：瓦片须按瓦片序号递增写入（逐级缩放、级内按 Hilbert 序号排序）。
+    瓦片数据先写入临时文件，finalize 时拼接头部与目录后原子替换目标文件。
+    """
+
+    def __init__(self, output_path: str) -> None:
+        self.output_path = output_path
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        self._data = tempfile.NamedTemporaryFile(dir=directory, suffix=".tiles", delete=False)
+        self._entries: list[_Entry] = []
+        self._offsets_by_digest: dict[bytes, tuple[int, int]] = {}
+        self._data_length = 0
+        self._addressed_tiles = 0
+        self._last_tile_id = -1
+
+    def write_tile(self, z: int, x: int, y: int, tile: bytes) -> None:
+        """写入一张未压缩的 MVT 瓦片，空瓦片不写入。"""
+        if not tile:
+            return
+        tile_id = zxy_to_tile_id(z, x, y)
+        if tile_id <= self._last_tile_id:
+            raise ValueError(f"瓦片须按序号递增写入: {z}/{x}/{y}")
+        self._last_tile_id = tile_id
+
+        data = gzip.compress(tile, mtime=0)
+        digest = hashlib.md5(data).digest()
+        if digest in self._offsets_by_digest:
+            offset, length = self._offsets_by_digest[digest]
+        else:
+            offset, length = self._data_length, len(data)
+            self._data.write(data)
+            self._data_length += length
+            self._offsets_by_digest[digest] = (offset, length)
+
+        self._addressed_tiles += 1
+        last = self._entries[-1] if self._entries else None
+        if last is not None and last.offset == offset and last.tile_id + last.run_length == tile_id:
+            last.run_length += 1
+        else:
+            self._entries.append(_Entry(tile_id, offset, length, 1))
+
+    def finalize(
+        self,
+        min_zoom: int,
+        max_zoom: int,
+        bounds: tuple[float, float, float, float],
+        metadata: dict[str, Any],
+    ) -> int:
+        """写出归档并返回文件字节数。"""
+        self._data.close()
+        try:
+            root, leaves = _build_directories(self._entries)
+            metadata_bytes = gzip.compress(json.dumps(metadata, ensure_ascii=False).encode("utf-8"), mtime=0)
+            header = _header(
+                len(root), len(metadata_bytes), len(leaves), self._data_length,
+                self._addressed_tiles, len(self._entries), len(self._offsets_by_digest),
+                min_zoom, max_zoom, bounds,
+            )
+            partial_path = f"{self.output_path}.partial"
+            with open(partial_path, "wb") as output, open(self._data.name, "rb") as tile_data:
+                output.write(header)
+                output.write(root)
+                output.write(metadata_bytes)
+                output.write(leaves)
+                shutil.copyfileobj(tile_data, output)
+            os.replace(partial_path, self.output_path)
+        finally:
+            os.unlink(self._data.name)
+        return os.path.getsize(self.output_path)
+
+    def discard(self) -> None:
+        self._data.close()
+        if os.path.exists(self._data.name):
+            os.unlink(self._data.name)
+
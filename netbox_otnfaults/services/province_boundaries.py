@@ -0,0 +1,140 @@
+"""
+省界底图的多分辨率简化数据集。
+
+原始 static/netbox_otnfaults/data/中国_省.geojson 为全精度边界（约 1.7 MB），地图多停留在全国视野，
+远超显示所需。按缩放级别分档以 Douglas-Peucker 简化并量化坐标小数位，gzip 压缩后按源文件版本缓存。
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .path_geometry import simplify_line
+from .stats_cache import get_or_compute
+
+
+PROVINCE_GEOJSON_PATH = Path(__file__).resolve().parent.parent / 'static' / 'netbox_otnfaults' / 'data' / '中国_省.geojson'
+
+PROVINCE_BOUNDARIES_CACHE_KEY = 'otnfaults:map:province-boundaries:v1'
+PROVINCE_BOUNDARIES_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class BoundaryLevel:
+    """简化分档：适用的缩放范围（含两端）、简化容差（度）与坐标保留小数位。"""
+    name: str
+    min_zoom: int
+    max_zoom: int
+    tolerance: float
+    precision: int
+
+
+# 容差约为所在档最大缩放级别下 1/4 屏幕像素对应的经纬度跨度
+BOUNDARY_LEVELS: tuple[BoundaryLevel, ...] = (
+    BoundaryLevel('low', 0, 4, 0.02, 3),
+    BoundaryLevel('medium', 5, 7, 0.003, 4),
+    BoundaryLevel('high', 8, 24, 0.0004, 5),
+)
+
+
+def level_for_zoom(zoom: float) -> BoundaryLevel:
+    """分档按整数缩放级别划分，4.9 级仍属于 max_zoom 为 4 的分档。"""
+    for level in BOUNDARY_LEVELS:
+        if zoom < level.max_zoom + 1:
+            return level
+    return BOUNDARY_LEVELS[-1]
+
+
+def province_boundaries_version() -> str:
+    """源文件版本（修改时间与大小），替换省界文件后缓存自然失效。"""
+    stat = os.stat(PROVINCE_GEOJSON_PATH)
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def _simplify_coords(coords: list, level: BoundaryLevel, closed: bool) -> list[list[float]] | None:
+    """简化并量化单条折线或环；退化（环少于 4 点、线少于 2 点）时返回 None。"""
+    points = simplify_line([(float(point[0]), float(point[1])) for point in coords], level.tolerance)
+    quantized: list[list[float]] = []
+    for lng, lat in points:
+        point = [round(lng, level.precision), round(lat, level.precision)]
+        if not quantized or quantized[-1] != point:
+            quantized.append(point)
+    if closed:
+        if len(quantized) < 3:
+            return None
+        if quantized[0] != quantized[-1]:
+            quantized.append(quantized[0])
+        return quantized if len(quantized) >= 4 else None
+    return quantized if len(quantized) >= 2 else None
+
+
+def _simplify_polygon(rings: list, level: BoundaryLevel) -> list | None:
+    exterior = _simplify_coords(rings[0], level, closed=True) if rings else None
+    if exterior is None:
+        return None
+    holes = [hole for hole in (_simplify_coords(ring, level, closed=True) for ring in rings[1:]) if hole]
+    return [exterior, *holes]
+
+
+def simplify_geometry(geometry: dict[str, Any], level: BoundaryLevel) -> dict[str, Any] | None:
+    """
+    简化面与线几何。面的小岛等退化部分直接丢弃，但整个要素全部退化时保留顶点最多的部分，
+    避免小省份（如澳门）在低分辨率档中消失。
+    """
+    geometry_type = geometry.get('type')
+    coordinates = geometry.get('coordinates') or []
+    if geometry_type in ('Polygon', 'MultiPolygon'):
+        polygons = [coordinates] if geometry_type == 'Polygon' else coordinates
+        simplified = [polygon for polygon in (_simplify_polygon(rings, level) for rings in polygons) if polygon]
+        if not simplified and polygons:
+            largest = max(polygons, key=lambda rings: len(rings[0]) if rings else 0)
+            simplified = [[[[round(float(lng), level.precision), round(float(lat), level.precision)] for lng, lat, *_ in largest[0]]]]
+        return {'type': 'MultiPolygon', 'coordinates': simplified} if simplified else None
+    if geometry_type in ('LineString', 'MultiLineString'):
+        lines = [coordinates] if geometry_type == 'LineString' else coordinates
+        simplified = [line for line in (_simplify_coords(coords, level, closed=False) for coords in lines) if line]
+        return {'type': 'MultiLineString', 'coordinates': simplified} if simplified else None
+    return geometry
+
+
+def simplify_feature_collection(data: dict[str, Any], level: BoundaryLevel) -> dict[str, Any]:
+    """
+    返回简化后的 FeatureCollection，附带 zoom_range 成员供前端判断缩放越档后重新请求。
+    """
+    features = []
+    for feature in data.get('features', []):
+        geometry = simplify_geometry(feature.get('geometry') or {}, level)
+        if geometry is None:
+            continue
+        features.append({'type': 'Feature', 'properties': feature.get('properties') or {}, 'geometry': geometry})
+    return {
+        'type': 'FeatureCollection',
+        'level': level.name,
+        'zoom_range': [level.min_zoom, level.max_zoom],
+        'features': features,
+    }
+
+
+def build_province_boundaries(level: BoundaryLevel) -> bytes:
+    """读取源文件并生成指定分档的 gzip 压缩 GeoJSON。"""
+    with open(PROVINCE_GEOJSON_PATH, encoding='utf-8') as source:
+        data = json.load(source)
+    payload = json.dumps(simplify_feature_collection(data, level), ensure_ascii=False, separators=(',', ':'))
+    return gzip.compress(payload.encode('utf-8'), mtime=0)
+
+
+def get_province_boundaries(level: BoundaryLevel, force_refresh: bool = False) -> tuple[str, bytes]:
+    """返回 (版本号, gzip 压缩的简化省界)，按源文件版本与分档缓存。"""
+    version = province_boundaries_version()
+    data = get_or_compute(
+        f'{PROVINCE_BOUNDARIES_CACHE_KEY}:{version}:{level.name}',
+        lambda: build_province_boundaries(level),
+        PROVINCE_BOUNDARIES_CACHE_TIMEOUT,
+        PROVINCE_BOUNDARIES_CACHE_TIMEOUT,
+        force_refresh=force_refresh,
+    )
+    return version, data
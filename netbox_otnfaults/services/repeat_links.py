@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from django.db import transaction
+
+from netbox_otnfaults.models import FaultCategoryChoices, OtnFault, OtnFaultRepeatLink
+from netbox_otnfaults.utils import REPEAT_FAULT_WINDOW, RepeatFaultIndex
+
+
+FIBER_FAULT_CATEGORIES: tuple[str, ...] = (
+    FaultCategoryChoices.FIBER_BREAK,
+    FaultCategoryChoices.FIBER_DEGRADATION,
+    FaultCategoryChoices.FIBER_JITTER,
+)
+
+
+def _fiber_fault_queryset():
+    return (
+        OtnFault.objects.filter(fault_category__in=FIBER_FAULT_CATEGORIES)
+        .only('id', 'fault_category', 'fault_occurrence_time', 'interruption_location_a')
+        .prefetch_related('interruption_location')
+    )
+
+
+def _build_link(fault: OtnFault, previous_fault: OtnFault) -> OtnFaultRepeatLink:
+    return OtnFaultRepeatLink(
+        fault_id=fault.id,
+        previous_fault_id=previous_fault.id,
+        gap=fault.fault_occurrence_time - previous_fault.fault_occurrence_time,
+    )
+
+
+def refresh_repeat_links_for_fault(fault_id: int) -> int:
+    """重算单个故障作为后序故障与前序故障两个方向上的重复关联，返回写入条数。"""
+    fault = _fiber_fault_queryset().filter(pk=fault_id).first()
+    with transaction.atomic():
+        OtnFaultRepeatLink.objects.filter(fault_id=fault_id).delete()
+        OtnFaultRepeatLink.objects.filter(previous_fault_id=fault_id).delete()
+        # 与 RepeatFaultIndex 一致：无 A 端站点的故障不参与重复判定，避免 A 端均为空的故障互相匹配
+        if fault is None or not fault.fault_occurrence_time or not fault.interruption_location_a_id:
+            return 0
+
+        z_site_ids = [site.id for site in fault.interruption_location.all()]
+        if not z_site_ids:
+            return 0
+
+        t = fault.fault_occurrence_time
+        candidates = _fiber_fault_queryset().filter(
+            fault_occurrence_time__gte=t - REPEAT_FAULT_WINDOW,
+            fault_occurrence_time__lte=t + REPEAT_FAULT_WINDOW,
+            interruption_location_a_id=fault.interruption_location_a_id,
+            interruption_location__in=z_site_ids,
+        ).exclude(pk=fault.pk).distinct()
+
+        links: list[OtnFaultRepeatLink] = []
+        for candidate in candidates:
+            if candidate.fault_occurrence_time < t:
+                links.append(_build_link(fault, candidate))
+            elif candidate.fault_occurrence_time > t:
+                links.append(_build_link(candidate, fault))
+
+        OtnFaultRepeatLink.objects.bulk_create(links, ignore_conflicts=True)
+    return len(links)
+
+
+def rebuild_repeat_links(batch_size: int = 1000) -> int:
+    """清空并全量重建重复故障关联表，返回写入条数。"""
+    faults = list(_fiber_fault_queryset().order_by('fault_occurrence_time'))
+    index = RepeatFaultIndex(faults)
+    links = [
+        _build_link(fault, previous_fault)
+        for fault in faults
+        for previous_fault in index.preceding(fault)
+    ]
+    with transaction.atomic():
+        OtnFaultRepeatLink.objects.all().delete()
+        OtnFaultRepeatLink.objects.bulk_create(links, batch_size=batch_size)
+    return len(links)
+
+
+def get_repeat_fault_ids(fault_ids, previous_faults=None) -> set[int]:
+    """
+    返回给定故障中存在 60 天内前序同路由故障的故障 ID。
+    previous_faults 可传入故障查询集，用于限定前序故障的口径。
+    """
+    fault_ids = list(fault_ids)
+    if not fault_ids:
+        return set()
+    links = OtnFaultRepeatLink.objects.filter(fault_id__in=fault_ids)
+    if previous_faults is not None:
+        links = links.filter(previous_fault__in=previous_faults.values('pk'))
+    return set(links.values_list('fault_id', flat=True).distinct())
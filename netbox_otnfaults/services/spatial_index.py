@@ -0,0 +1,121 @@
+"""
+图节点的空间索引：在单位球面三维坐标上构建 KD 树。
+
+球面上两点的弦长与大圆距离单调对应，KD 树按弦长剪枝即可得到与 haversine 一致的最近邻结果，
+不受经纬度网格在高纬度处变形的影响。仅依赖标准库，路径图加载完成后一次性构建；
+CSR 图自带基于坐标数组的索引（见 csr_graph.CsrSpatialIndex），由 graph_spatial_index 统一选择。
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Hashable, Iterable
+
+
+EARTH_RADIUS_M = 6371000
+
+Coordinate = tuple[float, float]
+
+
+def _unit_vector(lng: float, lat: float) -> tuple[float, float, float]:
+    lng_rad, lat_rad = math.radians(lng), math.radians(lat)
+    cos_lat = math.cos(lat_rad)
+    return cos_lat * math.cos(lng_rad), cos_lat * math.sin(lng_rad), math.sin(lat_rad)
+
+
+def _chord_to_meters(chord_sq: float) -> float:
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(chord_sq) / 2))
+
+
+def _meters_to_chord_sq(distance: float) -> float:
+    chord = 2 * math.sin(min(distance / (2 * EARTH_RADIUS_M), math.pi / 2))
+    return chord * chord
+
+
+class NodeSpatialIndex:
+    """
+    节点 (lng, lat) 坐标的 KD 树，支持 k 近邻与半径查询，距离单位为米。
+    nodes 可为坐标元组本身，也可通过 coordinate 参数从任意可哈希节点取坐标。
+    """
+
+    def __init__(self, nodes: Iterable[Hashable], coordinate=None):
+        self._nodes = list(nodes)
+        coordinate = coordinate or (lambda node: node)
+        self._points = [_unit_vector(*coordinate(node)[:2]) for node in self._nodes]
+        # 平铺存储：_tree[i] = (点下标, 切分轴, 左子树, 右子树)，子树以 -1 表示为空
+        self._tree: list[tuple[int, int, int, int]] = []
+        self._root = self._build(list(range(len(self._nodes))), 0)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _build(self, indices: list[int], depth: int) -> int:
+        if not indices:
+            return -1
+        axis = depth % 3
+        indices.sort(key=lambda index: self._points[index][axis])
+        median = len(indices) // 2
+        slot = len(self._tree)
+        self._tree.append((indices[median], axis, -1, -1))
+        left = self._build(indices[:median], depth + 1)
+        right = self._build(indices[median + 1:], depth + 1)
+        self._tree[slot] = (indices[median], axis, left, right)
+        return slot
+
+    def _search(self, target, limit_sq: float, k: int | None) -> list[tuple[float, int]]:
+        """返回 (弦长平方, 点下标) 列表；k 为 None 时返回 limit_sq 内的全部点。"""
+        found: list[tuple[float, int]] = []  # k 近邻时为以负距离排列的最大堆
+        stack = [self._root] if self._root >= 0 else []
+        while stack:
+            slot = stack.pop()
+            index, axis, left, right = self._tree[slot]
+            point = self._points[index]
+            distance_sq = (
+                (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2 + (point[2] - target[2]) ** 2
+            )
+            if distance_sq <= limit_sq:
+                if k is None:
+                    found.append((distance_sq, index))
+                elif len(found) < k:
+                    heapq.heappush(found, (-distance_sq, index))
+                elif distance_sq < -found[0][0]:
+                    heapq.heapreplace(found, (-distance_sq, index))
+                if k is not None and len(found) == k:
+                    limit_sq = -found[0][0]
+
+            delta = target[axis] - point[axis]
+            near, far = (left, right) if delta < 0 else (right, left)
+            # 后压入近侧子树以优先搜索，远侧子树仅在切分面距离不超过当前上限时才可能有更近的点
+            if far >= 0 and delta * delta <= limit_sq:
+                stack.append(far)
+            if near >= 0:
+                stack.append(near)
+
+        if k is not None:
+            found = [(-distance_sq, index) for distance_sq, index in found]
+        found.sort()
+        return found
+
+    def nearest(self, lng: float, lat: float, k: int = 1, max_distance: float | None = None) -> list[tuple[float, Hashable]]:
+        """返回距离最近的至多 k 个节点，按距离升序排列为 [(距离米, 节点), ...]。"""
+        if k <= 0:
+            return []
+        limit_sq = math.inf if max_distance is None else _meters_to_chord_sq(max_distance)
+        found = self._search(_unit_vector(lng, lat), limit_sq, k)
+        return [(_chord_to_meters(distance_sq), self._nodes[index]) for distance_sq, index in found]
+
+    def within(self, lng: float, lat: float, radius: float) -> list[tuple[float, Hashable]]:
+        """返回 radius 米内的全部节点，按距离升序排列为 [(距离米, 节点), ...]。"""
+        found = self._search(_unit_vector(lng, lat), _meters_to_chord_sq(radius), None)
+        return [(_chord_to_meters(distance_sq), self._nodes[index]) for distance_sq, index in found]
+
+
+def graph_spatial_index(graph):
+    """
+    返回图节点的空间索引：CSR 图使用其坐标数组上的索引，避免为每个节点生成坐标元组；
+    NetworkX 图按节点构建 NodeSpatialIndex。
+    """
+    build = getattr(graph, 'spatial_index', None)
+    if callable(build):
+        return build()
+    return NodeSpatialIndex(graph.nodes())
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from netbox_otnfaults.utils import REPEAT_FAULT_WINDOW
+
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_PREFIX = "otnfaults:stats"
+
+# 单飞锁的持有上限，以及未抢到锁且无旧数据时等待他人计算结果的时长与轮询间隔（秒）
+LOCK_TIMEOUT = 120
+LOCK_WAIT_TIMEOUT = 30.0
+LOCK_POLL_INTERVAL = 0.2
+
+# 标签作用域：全部省份、子公司省份合集；其余作用域为省份名称
+ALL_PROVINCES_SCOPE = "*"
+BRANCH_SCOPE = "branch"
+
+# 跨周期生效的全局标签：业务资源变更、挂起故障（统计口径不限发生时间）变更
+SERVICES_TAG = "services"
+SUSPENDED_TAG = "suspended"
+
+# 地图数据集标签：站点及其租户、区域、分组变更；割接任务及其影响业务变更
+SITES_TAG = "sites"
+CUTOVERS_TAG = "cutovers"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{STATS_CACHE_PREFIX}:tag:{tag}"
+
+
+def month_tag(month: str, scope: str = ALL_PROVINCES_SCOPE) -> str:
+    return f"month:{month}:{scope}"
+
+
+def _month_label(value: datetime) -> str:
+    return timezone.localtime(value).strftime('%Y%m')
+
+
+def _iter_month_labels(start: datetime, end: datetime) -> Iterable[str]:
+    """按本地时区遍历 [start, end) 覆盖的自然月。"""
+    current = timezone.localtime(start)
+    year, month = current.year, current.month
+    last = timezone.localtime(end - timedelta(microseconds=1))
+    while (year, month) <= (last.year, last.month):
+        yield f"{year:04d}{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def fault_cache_tags(
+    occurrence_time: datetime | None,
+    province_name: str | None,
+    is_branch_province: bool,
+    is_suspended: bool,
+) -> set[str]:
+    """返回单个故障状态所影响的缓存标签，按发生月份及省份划分。"""
+    tags: set[str] = set()
+    if is_suspended:
+        tags.add(SUSPENDED_TAG)
+    if occurrence_time is None:
+        return tags
+
+    month = _month_label(occurrence_time)
+    tags.add(month_tag(month))
+    if province_name:
+        tags.add(month_tag(month, province_name))
+    if is_branch_province:
+        tags.add(month_tag(month, BRANCH_SCOPE))
+    return tags
+
+
+def period_cache_tags(
+    ranges: Iterable[tuple[datetime | None, datetime | None]],
+    selected_provinces: list[str],
+) -> list[str]:
+    """
+    返回统计载荷依赖的缓存标签。
+    时间范围向前扩展一个重复故障窗口，以覆盖重复故障判定所需的前序故障；
+    选定省份时额外依赖子公司作用域，因子公司统计不受省份筛选约束。
+    """
+    scopes = [*selected_provinces, BRANCH_SCOPE] if selected_provinces else [ALL_PROVINCES_SCOPE]
+    months: set[str] = set()
+    for start, end in ranges:
+        if start and end:
+            months.update(_iter_month_labels(start - REPEAT_FAULT_WINDOW, end))
+    tags = {month_tag(month, scope) for month in months for scope in scopes}
+    tags.update({SERVICES_TAG, SUSPENDED_TAG})
+    return sorted(tags)
+
+
+def tagged_cache_key(base_key: str, tags: list[str]) -> str:
+    """将依赖标签的当前版本折算进缓存键，任一标签失效后旧键即不再命中。"""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # 标签版本被淘汰时以时间戳重新起算，避免与淘汰前的版本号碰撞
+        initial = time.time_ns()
+        for key in missing:
+            cache.add(key, initial, timeout=None)
+        versions.update(cache.get_many(missing))
+    signature = "|".join(f"{key}={versions.get(key, 0)}" for key in keys)
+    digest = hashlib.md5(signature.encode('utf-8')).hexdigest()
+    return f"{base_key}:t{digest}"
+
+
+def invalidate_cache_tags(tags: Iterable[str]) -> None:
+    """递增给定标签的版本号，使依赖这些标签的统计缓存失效。"""
+    for tag in set(tags):
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def _plugin_setting(name: str, default: int) -> int:
+    return settings.PLUGINS_CONFIG.get('netbox_otnfaults', {}).get(name, default)
+
+
+def statistics_cache_timeouts(is_ended: bool) -> tuple[int, int]:
+    """
+    返回 (新鲜期, 保留期) 秒数。
+    已结束周期数据不再变化，新鲜期即保留期；未结束周期新鲜期较短，过期后在保留期内返回旧数据并后台刷新。
+    """
+    if is_ended:
+        ended_timeout = _plugin_setting('statistics_cache_ended_timeout', 12 * 3600)
+        return ended_timeout, ended_timeout
+    return (
+        _plugin_setting('statistics_cache_fresh_timeout', 60),
+        _plugin_setting('statistics_cache_stale_timeout', 15 * 60),
+    )
+
+
+def _store(key: str, stale_key: str | None, payload: Any, fresh_timeout: int, stale_timeout: int) -> None:
+    entry = {'payload': payload, 'fresh_until': time.time() + fresh_timeout}
+    cache.set(key, entry, timeout=stale_timeout)
+    if stale_key:
+        cache.set(stale_key, entry, timeout=stale_timeout)
+
+
+def _compute_and_store(
+    key: str,
+    lock_key: str,
+    stale_key: str | None,
+    compute: Callable[[], Any],
+    fresh_timeout: int,
+    stale_timeout: int,
+) -> Any:
+    try:
+        payload = compute()
+        _store(key, stale_key, payload, fresh_timeout, stale_timeout)
+        return payload
+    finally:
+        cache.delete(lock_key)
+
+
+def _refresh_in_background(
+    key: str,
+    lock_key: str,
+    stale_key: str | None,
+    compute: Callable[[], Any],
+    fresh_timeout: int,
+    stale_timeout: int,
+) -> None:
+    def run() -> None:
+        close_old_connections()
+        try:
+            _compute_and_store(key, lock_key, stale_key, compute, fresh_timeout, stale_timeout)
+        except Exception:
+            logger.exception("统计缓存后台刷新失败: %s", key)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, name=f"otnfaults-cache-refresh:{key}", daemon=True).start()
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    fresh_timeout: int,
+    stale_timeout: int,
+    stale_key: str | None = None,
+    force_refresh: bool = False,
+) -> Any:
+    """
+    带单飞锁与过期后台刷新的缓存读取。
+    - 新鲜数据直接返回；
+    - 有旧数据（本键过期，或依赖标签失效后 stale_key 下的上一版本）时立即返回旧数据，由抢到锁的请求后台刷新；
+    - 无任何数据时仅抢到锁的请求计算，其余请求等待其结果，等待超时后自行计算；
+    - force_refresh 时忽略已有数据，同步计算并写入（供缓存预热使用）。
+    """
+    if force_refresh:
+        payload = compute()
+        _store(key, stale_key, payload, fresh_timeout, stale_timeout)
+        return payload
+
+    entry = cache.get(key)
+    if entry is not None and entry['fresh_until'] > time.time():
+        return entry['payload']
+    if entry is None and stale_key:
+        entry = cache.get(stale_key)
+
+    lock_key = f"{key}:lock"
+    acquired = cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+    if entry is not None:
+        if acquired:
+            _refresh_in_background(key, lock_key, stale_key, compute, fresh_timeout, stale_timeout)
+        return entry['payload']
+
+    if acquired:
+        return _compute_and_store(key, lock_key, stale_key, compute, fresh_timeout, stale_timeout)
+
+    deadline = time.monotonic() + LOCK_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['payload']
+    return compute()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from netbox_otnfaults.services.fault_map_data import get_cached_fault_map_payload
+from netbox_otnfaults.statistics_views import FaultStatisticsDataAPI, ServiceStatisticsDataAPI
+from netbox_otnfaults.views import StatisticsCableBreakMapDataAPI
+
+
+@dataclass(frozen=True)
+class WarmupResult:
+    payload: str
+    params: str
+    elapsed: float
+    error: str | None = None
+
+
+def _shift_period_date(day: date, filter_type: str, direction: int) -> date:
+    """
+    按统计看板“上一周期/下一周期”按钮的规则平移所选日期。
+    年、月按 JS Date 语义保留日号并向后溢出（如 3 月 31 日的上一月为 3 月 3 日），周平移 7 天。
+    """
+    if filter_type == 'week':
+        return day + timedelta(days=7 * direction)
+    months = {'year': 12, 'half': 6, 'quarter': 3, 'month': 1}.get(filter_type, 0) * direction
+    year, month_index = divmod(day.year * 12 + day.month - 1 + months, 12)
+    return date(year, month_index + 1, 1) + timedelta(days=day.day - 1)
+
+
+def _frontend_period_params(day: date, filter_type: str) -> dict[str, int | str]:
+    """返回统计看板在所选日期与周期类型下请求汇总接口的查询参数。"""
+    params: dict[str, int | str] = {'filter_type': filter_type}
+    if filter_type == 'week':
+        iso_year, iso_week, _weekday = day.isocalendar()
+        params.update(year=iso_year, week=iso_week)
+    elif filter_type == 'month':
+        params.update(year=day.year, month=day.month)
+    else:
+        params['year'] = day.year
+    params.update(calendar_year=day.year, calendar_month=day.month)
+    return params
+
+
+def standard_period_params(today: date) -> list[dict[str, int | str]]:
+    """
+    返回需预热的标准统计周期查询参数：本年、本月、本周及各自的上一周期。
+    上一周期日期按看板翻页规则由今日平移得到，参数与前端请求一致，保证与接口命中同一缓存键；
+    平移后落在同一周期（如 3 月 31 日的上一月）时不重复预热。
+    """
+    periods: list[dict[str, int | str]] = []
+    for filter_type in ('year', 'month', 'week'):
+        for day in (today, _shift_period_date(today, filter_type, -1)):
+            params = _frontend_period_params(day, filter_type)
+            if params not in periods:
+                periods.append(params)
+    return periods
+
+
+def _build_request(params: dict[str, Any], provinces: list[str] | None = None) -> HttpRequest:
+    request = HttpRequest()
+    query = QueryDict(mutable=True)
+    for name, value in params.items():
+        query[name] = str(value)
+    if provinces:
+        query.setlist('provinces', provinces)
+    request.GET = query
+    return request
+
+
+def _describe(params: dict[str, Any], provinces: list[str] | None = None) -> str:
+    description = "&".join(f"{name}={value}" for name, value in params.items())
+    if provinces:
+        description += f" provinces={','.join(provinces)}"
+    return description
+
+
+def _timed(payload: str, params: str, compute: Callable[[], Any]) -> WarmupResult:
+    started = time.monotonic()
+    try:
+        compute()
+    except Exception as exc:
+        return WarmupResult(payload, params, time.monotonic() - started, f"{type(exc).__name__}: {exc}")
+    return WarmupResult(payload, params, time.monotonic() - started)
+
+
+def warm_statistics_cache(
+    province_sets: Iterable[list[str]] = ((),),
+    today: date | None = None,
+    on_result: Callable[[WarmupResult], None] | None = None,
+) -> list[WarmupResult]:
+    """
+    同步计算并写入统计看板与故障地图载荷缓存，返回各载荷耗时。
+    province_sets 为需预热的省份组合，空组合表示不筛选省份；单个载荷失败不影响其余载荷。
+    """
+    today = today or timezone.localdate()
+    province_sets = [list(provinces) for provinces in province_sets]
+    results: list[WarmupResult] = []
+
+    def record(result: WarmupResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    record(_timed('fault_map', '', lambda: get_cached_fault_map_payload(force_refresh=True)))
+    for params in standard_period_params(today):
+        request = _build_request(params)
+        record(_timed(
+            'service_statistics',
+            _describe(params),
+            lambda: ServiceStatisticsDataAPI.cached_response_data(request, force_refresh=True),
+        ))
+        for provinces in province_sets:
+            request = _build_request(params, provinces)
+            description = _describe(params, provinces)
+            record(_timed(
+                'fault_statistics',
+                description,
+                lambda: FaultStatisticsDataAPI.cached_response_data(request, force_refresh=True),
+            ))
+            record(_timed(
+                'cable_break_map',
+                description,
+                lambda: StatisticsCableBreakMapDataAPI.cached_payload(request, force_refresh=True),
+            ))
+    return results
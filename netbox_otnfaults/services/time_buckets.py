@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.db.models import Count, DurationField, ExpressionWrapper, F, FloatField, Func, QuerySet, Value
+from django.db.models.functions import Floor
+
+
+class _EpochSeconds(Func):
+    """PostgreSQL：将时间间隔折算为秒数。"""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = FloatField()
+
+
+def count_by_interval(
+    queryset: QuerySet,
+    field: str,
+    start: datetime,
+    interval: timedelta,
+    buckets: int,
+    group_by: str | None = None,
+) -> list[int] | dict[object, list[int]]:
+    """
+    以单条分组查询统计 [start, start + interval * buckets) 内每个等长时间桶的记录数。
+    桶以 start 为起点对齐（不按整点或自然日截断），返回按桶顺序排列的计数列表；
+    指定 group_by 时返回 {分组取值: 计数列表}。
+    """
+    end = start + interval * buckets
+    offset = ExpressionWrapper(F(field) - Value(start), output_field=DurationField())
+    group_fields = [group_by] if group_by else []
+    rows = (
+        queryset
+        .filter(**{f'{field}__gte': start, f'{field}__lt': end})
+        .order_by()
+        .annotate(bucket=Floor(_EpochSeconds(offset) / interval.total_seconds()))
+        .values('bucket', *group_fields)
+        .annotate(count=Count('pk'))
+    )
+
+    counts: dict[object, list[int]] = {}
+    for row in rows:
+        series = counts.setdefault(row[group_by] if group_by else None, [0] * buckets)
+        series[min(max(int(row['bucket']), 0), buckets - 1)] += row['count']
+    if group_by:
+        return counts
+    return counts.get(None, [0] * buckets)
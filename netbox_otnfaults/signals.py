@@ -1,28 +1,305 @@
-from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.cache import cache
-from .models import OtnFault, OtnFaultImpact, BareFiberService, CircuitService
+from dcim.models import Region, Site, SiteGroup
+from tenancy.models import Tenant
+from .models import FaultStatusChoices, OtnFault, OtnFaultImpact, OtnPath, BareFiberService, CircuitService, CutoverImpact, CutoverTask
+from .services.event_stream import publish_event
+from .services.fault_coordinates import (
+    refresh_cutover_resolved_coordinates,
+    refresh_fault_resolved_coordinates,
+    refresh_resolved_coordinates_for_path,
+    refresh_resolved_coordinates_for_site,
+)
+from .services.fault_rollup import fault_rollup_day, refresh_fault_rollup_days
+from .services.otn_path_graph import record_otn_path_change
+from .services.repeat_links import refresh_repeat_links_for_fault
+from .services.stats_cache import CUTOVERS_TAG, SERVICES_TAG, SITES_TAG, fault_cache_tags, invalidate_cache_tags
+from .statistics_views import BRANCH_PROVINCE_NAMES, _normalize_branch_province_name
 
-VERSION_KEY = "otnfaults:stats:version"
 
-def increment_stats_version(*args, **kwargs):
-    """递增全局统计缓存版本号，使旧缓存失效。"""
+def _fault_state(fault):
+    """提取决定统计缓存归属的故障状态：发生时间、省份与挂起状态。"""
+    province = fault.province if fault.province_id else None
+    return {
+        'occurrence_time': fault.fault_occurrence_time,
+        'province_name': province.name if province else None,
+        'is_suspended': fault.fault_status == FaultStatusChoices.SUSPENDED or fault.is_suspended,
+    }
+
+
+def _fault_state_tags(state):
+    if state is None:
+        return set()
+    return fault_cache_tags(
+        state['occurrence_time'],
+        state['province_name'],
+        _normalize_branch_province_name(state['province_name']) in BRANCH_PROVINCE_NAMES,
+        state['is_suspended'],
+    )
+
+
+def _invalidate_stats_cache(tags):
+    """按标签失效统计缓存，缓存后端异常不影响数据保存。"""
     try:
-        current_version = cache.get(VERSION_KEY)
-        if current_version is None:
-            cache.set(VERSION_KEY, 2, timeout=None)
-        else:
-            cache.set(VERSION_KEY, int(current_version) + 1, timeout=None)
+        invalidate_cache_tags(tags)
     except Exception:
         pass
 
-# 注册 post_save / post_delete 信号
-for model in [OtnFault, OtnFaultImpact, BareFiberService, CircuitService]:
-    post_save.connect(increment_stats_version, sender=model)
-    post_delete.connect(increment_stats_version, sender=model)
+
+def _invalidate_fault_ids(fault_ids):
+    faults = OtnFault.objects.select_related('province').filter(pk__in=list(fault_ids))
+    tags = set()
+    for fault in faults:
+        tags |= _fault_state_tags(_fault_state(fault))
+    _invalidate_stats_cache(tags)
+
+
+def remember_previous_fault_state(sender, instance, **kwargs):
+    """故障保存前记录其原发生时间、省份与挂起状态，供保存后同时失效新旧两侧的缓存与日汇总。"""
+    previous = None
+    if instance.pk:
+        previous = OtnFault.objects.select_related('province').filter(pk=instance.pk).first()
+    instance._previous_fault_state = _fault_state(previous) if previous else None
+
+
+def invalidate_fault_stats_cache(sender, instance, **kwargs):
+    """故障保存或删除后，仅失效其新旧发生月份及省份对应的统计缓存。"""
+    tags = _fault_state_tags(getattr(instance, '_previous_fault_state', None))
+    tags |= _fault_state_tags(_fault_state(instance))
+    _invalidate_stats_cache(tags)
+
+
+def invalidate_impact_stats_cache(sender, instance, **kwargs):
+    """业务影响变更后失效所属故障发生月份及省份对应的统计缓存。"""
+    _invalidate_fault_ids([instance.otn_fault_id])
+
+
+def invalidate_fault_stats_cache_on_z_sites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Z 端站点变更影响重复故障判定，失效相关故障对应的统计缓存。"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    _invalidate_fault_ids((pk_set or []) if reverse else [instance.pk])
+
+
+def invalidate_impact_stats_cache_on_z_sites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """业务影响 Z 端站点变更后失效所属故障对应的统计缓存。"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        fault_ids = OtnFaultImpact.objects.filter(pk__in=list(pk_set or [])).values_list('otn_fault_id', flat=True)
+    else:
+        fault_ids = [instance.otn_fault_id]
+    _invalidate_fault_ids(fault_ids)
+
+
+def invalidate_service_stats_cache(sender, instance, **kwargs):
+    """业务资源变更影响所有周期的业务统计，失效全局业务标签。"""
+    _invalidate_stats_cache([SERVICES_TAG])
+
+
+pre_save.connect(remember_previous_fault_state, sender=OtnFault)
+post_save.connect(invalidate_fault_stats_cache, sender=OtnFault)
+post_delete.connect(invalidate_fault_stats_cache, sender=OtnFault)
+post_save.connect(invalidate_impact_stats_cache, sender=OtnFaultImpact)
+post_delete.connect(invalidate_impact_stats_cache, sender=OtnFaultImpact)
+for model in [BareFiberService, CircuitService]:
+    post_save.connect(invalidate_service_stats_cache, sender=model)
+    post_delete.connect(invalidate_service_stats_cache, sender=model)
+
+
+def invalidate_sites_data_cache(sender, instance, **kwargs):
+    """站点及其租户、区域、分组变更后失效地图站点数据集缓存；割接以 A 端站点定位，一并失效。"""
+    _invalidate_stats_cache([SITES_TAG, CUTOVERS_TAG])
+
+
+def invalidate_cutover_data_cache(sender, instance, **kwargs):
+    """割接任务及其影响业务变更后失效地图割接数据集缓存。"""
+    _invalidate_stats_cache([CUTOVERS_TAG])
+
+
+for model in [Site, Tenant, Region, SiteGroup]:
+    post_save.connect(invalidate_sites_data_cache, sender=model)
+    post_delete.connect(invalidate_sites_data_cache, sender=model)
+for model in [CutoverTask, CutoverImpact]:
+    post_save.connect(invalidate_cutover_data_cache, sender=model)
+    post_delete.connect(invalidate_cutover_data_cache, sender=model)
+m2m_changed.connect(invalidate_cutover_data_cache, sender=CutoverTask.interruption_location.through)
 
 # 注册 m2m_changed 信号以监听 Z 端站点关联的变化
-m2m_changed.connect(increment_stats_version, sender=OtnFault.interruption_location.through)
-m2m_changed.connect(increment_stats_version, sender=OtnFaultImpact.service_site_z.through)
+m2m_changed.connect(invalidate_fault_stats_cache_on_z_sites_change, sender=OtnFault.interruption_location.through)
+m2m_changed.connect(invalidate_impact_stats_cache_on_z_sites_change, sender=OtnFaultImpact.service_site_z.through)
+
+
+def refresh_fault_repeat_links(sender, instance, **kwargs):
+    """故障保存后增量刷新其重复故障关联。"""
+    refresh_repeat_links_for_fault(instance.pk)
+
+
+def refresh_fault_repeat_links_on_z_sites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Z 端站点变更后增量刷新相关故障的重复故障关联。
+    从站点一侧 clear() 时 post_clear 不携带 pk_set，需在 pre_clear 时记下受影响的故障。
+    """
+    if reverse and action == 'pre_clear':
+        instance._repeat_link_cleared_fault_ids = list(
+            sender.objects.filter(site_id=instance.pk).values_list('otnfault_id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        fault_ids = [instance.pk]
+    elif action == 'post_clear':
+        fault_ids = instance.__dict__.pop('_repeat_link_cleared_fault_ids', [])
+    else:
+        fault_ids = pk_set or []
+    for fault_id in fault_ids:
+        refresh_repeat_links_for_fault(fault_id)
+
+
+post_save.connect(refresh_fault_repeat_links, sender=OtnFault)
+m2m_changed.connect(refresh_fault_repeat_links_on_z_sites_change, sender=OtnFault.interruption_location.through)
+
+
+def refresh_fault_coordinates(sender, instance, **kwargs):
+    """故障保存后重算其地图定位坐标。"""
+    refresh_fault_resolved_coordinates(instance.pk)
+
+
+def refresh_fault_coordinates_on_z_sites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Z 端站点变更会改变路径中点与站点中心回退结果，重算相关故障的地图定位坐标。"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    fault_ids = (pk_set or []) if reverse else [instance.pk]
+    for fault_id in fault_ids:
+        refresh_fault_resolved_coordinates(fault_id)
+
+
+def refresh_cutover_coordinates(sender, instance, **kwargs):
+    """割接保存后重算其地图定位坐标。"""
+    refresh_cutover_resolved_coordinates(instance.pk)
+
+
+def refresh_cutover_coordinates_on_z_sites_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """割接 Z 端站点变更后重算相关割接的地图定位坐标。"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    cutover_ids = (pk_set or []) if reverse else [instance.pk]
+    for cutover_id in cutover_ids:
+        refresh_cutover_resolved_coordinates(cutover_id)
+
+
+def remember_previous_site_coordinates(sender, instance, **kwargs):
+    """记录站点保存前的经纬度，保存后仅在坐标变化时重算依赖该站点定位的故障与割接。"""
+    instance._previous_site_coordinates = (
+        Site.objects.filter(pk=instance.pk).values_list('latitude', 'longitude').first()
+        if instance.pk else None
+    )
+
+
+def refresh_coordinates_on_site_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_site_coordinates', None)
+    if created or previous == (instance.latitude, instance.longitude):
+        return
+    refresh_resolved_coordinates_for_site(instance.pk)
+
+
+def remember_previous_path_sites(sender, instance, **kwargs):
+    """记录路径保存前的两端站点，端点变更时新旧站点对上的故障与割接都需重算。"""
+    instance._previous_path_sites = (
+        OtnPath.objects.filter(pk=instance.pk).values_list('site_a_id', 'site_z_id').first()
+        if instance.pk else None
+    )
+
+
+def refresh_coordinates_on_path_change(sender, instance, **kwargs):
+    """路径几何或端点变更会改变路径中点定位，重算对应站点对上的故障与割接。"""
+    pairs = {(instance.site_a_id, instance.site_z_id)}
+    previous = getattr(instance, '_previous_path_sites', None)
+    if previous:
+        pairs.add(previous)
+    for site_a_id, site_z_id in pairs:
+        refresh_resolved_coordinates_for_path(site_a_id, site_z_id)
+
+
+post_save.connect(refresh_fault_coordinates, sender=OtnFault)
+m2m_changed.connect(refresh_fault_coordinates_on_z_sites_change, sender=OtnFault.interruption_location.through)
+post_save.connect(refresh_cutover_coordinates, sender=CutoverTask)
+m2m_changed.connect(refresh_cutover_coordinates_on_z_sites_change, sender=CutoverTask.interruption_location.through)
+pre_save.connect(remember_previous_site_coordinates, sender=Site)
+post_save.connect(refresh_coordinates_on_site_change, sender=Site)
+pre_save.connect(remember_previous_path_sites, sender=OtnPath)
+post_save.connect(refresh_coordinates_on_path_change, sender=OtnPath)
+post_delete.connect(refresh_coordinates_on_path_change, sender=OtnPath)
+
+
+def record_otn_path_graph_change(sender, instance, **kwargs):
+    """路径保存或删除后记录路由图变更，各进程在下次使用路径图时仅增量更新该路径的边。"""
+    record_otn_path_change(instance.pk)
+
+
+post_save.connect(record_otn_path_graph_change, sender=OtnPath)
+post_delete.connect(record_otn_path_graph_change, sender=OtnPath)
+
+
+def refresh_fault_rollups(sender, instance, **kwargs):
+    """故障保存或删除后刷新其原发生日期与当前发生日期的日汇总。"""
+    previous_state = getattr(instance, '_previous_fault_state', None)
+    refresh_fault_rollup_days([
+        fault_rollup_day(previous_state['occurrence_time']) if previous_state else None,
+        fault_rollup_day(instance.fault_occurrence_time),
+    ])
+
+
+def refresh_fault_rollups_on_impact_change(sender, instance, **kwargs):
+    """业务影响变更会改变故障的 I 类判定，刷新所属故障发生日期的日汇总。"""
+    fault = OtnFault.objects.filter(pk=instance.otn_fault_id).only('fault_occurrence_time').first()
+    if fault is not None:
+        refresh_fault_rollup_days([fault_rollup_day(fault.fault_occurrence_time)])
+
+
+def refresh_fault_rollups_on_service_change(sender, instance, **kwargs):
+    """业务资源变更（如电路是否重要）会改变受影响故障的 I 类判定，刷新这些故障发生日期的日汇总。"""
+    occurrence_times = (
+        OtnFault.objects.filter(pk__in=instance.fault_impacts.values('otn_fault_id'))
+        .values_list('fault_occurrence_time', flat=True)
+    )
+    refresh_fault_rollup_days(fault_rollup_day(occurrence_time) for occurrence_time in occurrence_times)
+
+
+post_save.connect(refresh_fault_rollups, sender=OtnFault)
+post_delete.connect(refresh_fault_rollups, sender=OtnFault)
+post_save.connect(refresh_fault_rollups_on_impact_change, sender=OtnFaultImpact)
+post_delete.connect(refresh_fault_rollups_on_impact_change, sender=OtnFaultImpact)
+for model in [BareFiberService, CircuitService]:
+    post_save.connect(refresh_fault_rollups_on_service_change, sender=model)
+    post_delete.connect(refresh_fault_rollups_on_service_change, sender=model)
+
+
+def _event_action(kwargs):
+    if 'created' not in kwargs:
+        return 'deleted'
+    return 'created' if kwargs['created'] else 'updated'
+
+
+def publish_fault_event(sender, instance, **kwargs):
+    """故障保存或删除后向大屏事件流推送变更通知。"""
+    publish_event('fault', _event_action(kwargs), instance.pk, status=instance.fault_status)
+
+
+def publish_impact_event(sender, instance, **kwargs):
+    """业务影响变更后向大屏事件流推送所属故障的变更通知。"""
+    publish_event('impact', _event_action(kwargs), instance.pk, fault_id=instance.otn_fault_id)
+
+
+def publish_cutover_event(sender, instance, **kwargs):
+    """割接任务变更后向大屏事件流推送变更通知。"""
+    publish_event('cutover', _event_action(kwargs), instance.pk)
 
 
+post_save.connect(publish_fault_event, sender=OtnFault)
+post_delete.connect(publish_fault_event, sender=OtnFault)
+post_save.connect(publish_impact_event, sender=OtnFaultImpact)
+post_delete.connect(publish_impact_event, sender=OtnFaultImpact)
+post_save.connect(publish_cutover_event, sender=CutoverTask)
+post_delete.connect(publish_cutover_event, sender=CutoverTask)
@@ -9,6 +9,11 @@
     const CONFIG = window.DASHBOARD_CONFIG;
     let dataTimer = null;
     let lastData = null;
+    let lastVersion = null;
+    let lastFetchAt = 0;
+    let eventSource = null;
+    let streamConnected = false;
+    let streamFetchTimer = null;
 
     /**
      * 应用启动
@@ -30,8 +35,9 @@
             // 5. 数据就绪后启动播控引擎
             _startDirectingEngine();
 
-            // 6. 设置定时刷新
-            dataTimer = setInterval(_fetchData, CONFIG.refreshInterval);
+            // 6. 设置定时刷新，并订阅变更事件流
+            dataTimer = setInterval(_pollData, CONFIG.refreshInterval);
+            _connectEventStream();
 
             // 7. 更新连接状态
             _setConnectionStatus(true);
@@ -41,7 +47,8 @@
             // 即使数据加载失败也启动播控（空数据巡航模式）
             _startDirectingEngine();
             // 重试
-            dataTimer = setInterval(_fetchData, CONFIG.refreshInterval);
+            dataTimer = setInterval(_pollData, CONFIG.refreshInterval);
+            _connectEventStream();
         });
     });
 
@@ -49,7 +56,12 @@
      * 获取数据
      */
     function _fetchData() {
-        return fetch(CONFIG.dataUrl, {
+        lastFetchAt = Date.now();
+        var url = new URL(CONFIG.dataUrl, window.location.origin);
+        if (lastData && lastVersion) {
+            url.searchParams.set('since', lastVersion);
+        }
+        return fetch(url.toString(), {
             credentials: 'same-origin',
             headers: { 'X-Requested-With': 'XMLHttpRequest' }
         })
@@ -58,9 +70,14 @@
                 return r.json();
             })
             .then(function (data) {
-                lastData = data;
                 _setConnectionStatus(true);
-                _processData(data);
+                lastVersion = data.version || null;
+                // 数据未变化：沿用上次数据，仅按当前时间刷新历时与割接倒计时
+                if (!(data.unchanged && lastData)) {
+                    lastData = data.delta ? _applyDelta(lastData, data) : data;
+                }
+                _refreshElapsedFields(lastData);
+                _processData(lastData);
             })
             .catch(function (err) {
                 console.warn('[Dashboard] 数据获取失败:', err);
@@ -68,6 +85,107 @@
             });
     }
 
+    /**
+     * 定时刷新：事件流在线时变更由推送触发，仅按较长间隔确认数据版本并刷新历时等随时间变化的字段
+     */
+    function _pollData() {
+        if (streamConnected && Date.now() - lastFetchAt < CONFIG.streamRefreshInterval) return;
+        _fetchData();
+    }
+
+    /**
+     * 订阅变更事件流：故障、业务影响或割接变更时合并短时间内的多条事件后拉取增量数据；
+     * 断线重连后服务端无法补发期间事件时发送 resync，此时丢弃版本号拉取全量数据；
+     * 服务端未开启事件流（eventsUrl 为空）时仅按定时轮询刷新
+     */
+    function _connectEventStream() {
+        if (!CONFIG.eventsUrl || !window.EventSource || eventSource) return;
+
+        eventSource = new EventSource(CONFIG.eventsUrl, { withCredentials: true });
+        eventSource.addEventListener('ready', function () {
+            streamConnected = true;
+        });
+        ['fault', 'impact', 'cutover'].forEach(function (kind) {
+            eventSource.addEventListener(kind, _scheduleStreamFetch);
+        });
+        eventSource.addEventListener('resync', function () {
+            lastVersion = null;
+            _scheduleStreamFetch();
+        });
+        eventSource.onerror = function () {
+            // 浏览器按服务端 retry 自动重连，期间回退为定时轮询
+            streamConnected = false;
+        };
+    }
+
+    function _scheduleStreamFetch() {
+        if (streamFetchTimer) return;
+        streamFetchTimer = setTimeout(function () {
+            streamFetchTimer = null;
+            _fetchData();
+        }, 500);
+    }
+
+    /**
+     * 将增量响应合并到上次数据：按 ID 替换新增/变更条目、删除移除条目、合并未变更条目随附的时间相关字段，并按服务端顺序重排
+     */
+    function _applyDelta(base, data) {
+        var merged = Object.assign({}, base);
+        Object.keys(data).forEach(function (key) {
+            if (key !== 'changes' && key !== 'delta' && key !== 'volatile') merged[key] = data[key];
+        });
+        Object.keys(data.changes || {}).forEach(function (name) {
+            var change = data.changes[name];
+            var itemsById = new Map();
+            (base[name] || []).forEach(function (item) { itemsById.set(item.id, item); });
+            change.removed.forEach(function (id) { itemsById.delete(id); });
+            change.added.concat(change.changed).forEach(function (item) { itemsById.set(item.id, item); });
+            var volatile = (data.volatile || {})[name] || {};
+            merged[name] = change.order
+                .map(function (id) {
+                    var item = itemsById.get(id);
+                    return item && volatile[id] ? Object.assign({}, item, volatile[id]) : item;
+                })
+                .filter(Boolean);
+        });
+        return merged;
+    }
+
+    /**
+     * 按当前时间推算随时间变化的字段（服务端版本号只随数据变更变化）：故障历时与割接倒计时
+     */
+    function _refreshElapsedFields(data) {
+        var now = Date.now();
+        (data.active_faults || []).forEach(function (fault) {
+            if (!fault.occurrence_time) return;
+            var end = fault.recovery_time ? Date.parse(fault.recovery_time) : now;
+            fault.duration = _formatDuration(Math.floor((end - Date.parse(fault.occurrence_time)) / 1000));
+        });
+        (data.cutovers || []).forEach(function (cutover) {
+            if (!cutover.planned_cutover_time) return;
+            cutover.minutes_until = Math.floor((Date.parse(cutover.planned_cutover_time) - now) / 60000);
+        });
+    }
+
+    /**
+     * 历时文本，格式与服务端 _format_duration_seconds 一致
+     */
+    function _formatDuration(totalSeconds) {
+        if (totalSeconds < 0) return '';
+        var units = [
+            [Math.floor(totalSeconds / 86400), '天'],
+            [Math.floor((totalSeconds % 86400) / 3600), '小时'],
+            [Math.floor((totalSeconds % 3600) / 60), '分'],
+            [totalSeconds % 60, '秒']
+        ];
+        for (var i = 0; i < units.length; i++) {
+            if (units[i][0] > 0) {
+                return units.slice(i).map(function (unit) { return unit[0] + unit[1]; }).join('');
+            }
+        }
+        return '0秒';
+    }
+
     /**
      * 处理数据并分发给各模块
      */
@@ -229,7 +347,7 @@
         },
         startPolling: function () {
             if (dataTimer) clearInterval(dataTimer);
-            dataTimer = setInterval(_fetchData, CONFIG.refreshInterval);
+            dataTimer = setInterval(_pollData, CONFIG.refreshInterval);
             console.log('[Dashboard] 轮询已恢复');
         }
     };
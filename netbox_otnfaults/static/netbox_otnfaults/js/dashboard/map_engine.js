@@ -281,12 +281,41 @@ window.MapEngine = (function () {
     /**
      * 加载省界图层
      */
+    function _provinceGeoJsonUrl() {
+        return CONFIG.provinceGeoJsonUrl + '?zoom=' + Math.floor(map.getZoom());
+    }
+
+    /**
+     * 省界按缩放级别分档简化，缩放越出当前档的 zoom_range 时重新请求对应精度
+     */
+    function _watchProvinceZoomRange(zoomRange) {
+        if (!Array.isArray(zoomRange)) return;
+        let [minZoom, maxZoom] = zoomRange;
+        let loading = false;
+        map.on('zoomend', () => {
+            const zoom = map.getZoom();
+            if (loading || (zoom >= minZoom && zoom < maxZoom + 1)) return;
+            loading = true;
+            fetch(_provinceGeoJsonUrl())
+                .then(r => r.json())
+                .then(data => {
+                    _convertGeoJsonCoords(data);
+                    const source = map.getSource('provinces');
+                    if (source) source.setData(data);
+                    [minZoom, maxZoom] = data.zoom_range || [0, Infinity];
+                })
+                .catch(err => console.warn('省界数据加载失败:', err))
+                .finally(() => { loading = false; });
+        });
+    }
+
     function _loadProvinceLayer() {
-        fetch(CONFIG.provinceGeoJsonUrl)
+        fetch(_provinceGeoJsonUrl())
             .then(r => r.json())
             .then(data => {
                 // GCJ-02 → WGS-84 坐标转换，使省界与故障/站点坐标对齐
                 _convertGeoJsonCoords(data);
+                _watchProvinceZoomRange(data.zoom_range);
 
                 map.addSource('provinces', {
                     type: 'geojson',
@@ -72,15 +72,31 @@ class OTNMapCore {
         });
     }
 
+    // 站点数据集按版本号 URL 单独加载，浏览器缓存命中时无需重新下载
+    let sitesPromise = Promise.resolve(null);
+    if (this.config.sitesDataUrl) {
+      sitesPromise = fetch(this.config.sitesDataUrl, { credentials: 'same-origin' })
+        .then(async res => {
+          if (!res.ok) throw new Error(`HTTP error! status: ${res.status}`);
+          return (await res.json()).sites_data;
+        })
+        .catch(err => {
+          console.error("Failed to load sites data:", err);
+          return null;
+        });
+    }
+
     // 3. 基础底图设置 & 等待数据
     this.map.on("load", async () => {
       if (window.OTNPerf) window.OTNPerf.mark('map_load_event');
 
       // 等待数据返回
       try {
-        const data = await dataPromise;
+        const [data, sitesData] = await Promise.all([dataPromise, sitesPromise]);
+        if (sitesData) {
+          this.config.sitesData = sitesData;
+        }
         if (data) {
-          this.config.sitesData = data.sites_data;
           this.config.markerData = data.marker_data;
           this.config.heatmapData = data.heatmap_data;
           this.config.skipped_count = data.skipped_count || 0;
@@ -200,6 +216,29 @@ class OTNMapCore {
     }
   }
 
+  /**
+   * 省界按缩放级别分档简化，缩放越出当前档的 zoom_range 时重新请求对应精度
+   */
+  _watchGeojsonZoomRange(zoomRange, geojsonUrl) {
+    if (!Array.isArray(zoomRange)) return;
+    let [minZoom, maxZoom] = zoomRange;
+    let loading = false;
+    this.map.on("zoomend", () => {
+      const zoom = this.map.getZoom();
+      if (loading || (zoom >= minZoom && zoom < maxZoom + 1)) return;
+      loading = true;
+      fetch(geojsonUrl(zoom))
+        .then(res => res.json())
+        .then(data => {
+          const source = this.map.getSource("user-geojson-source");
+          if (source) source.setData(data);
+          [minZoom, maxZoom] = data.zoom_range || [0, Infinity];
+        })
+        .catch(err => console.error("加载自定义 GeoJSON 失败:", err))
+        .finally(() => { loading = false; });
+    });
+  }
+
   /**
    * 初始化共享图层 (站点和 OTN 路径底图)
    */
@@ -209,10 +248,12 @@ class OTNMapCore {
 
     // 0. 用户自定义 GeoJSON 底层 (如省份边界)
     if (this.config.userGeojsonUrl) {
-      fetch(this.config.userGeojsonUrl)
+      const geojsonUrl = (zoom) => `${this.config.userGeojsonUrl}?zoom=${Math.floor(zoom)}`;
+      fetch(geojsonUrl(this.map.getZoom()))
         .then(res => res.json())
         .then(data => {
           this.mapBase.addGeoJsonSource("user-geojson-source", data);
+          this._watchGeojsonZoomRange(data.zoom_range, geojsonUrl);
 
           // 深灰色填充层
           this.mapBase.addLayer(
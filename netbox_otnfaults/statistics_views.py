@@ -7,25 +7,29 @@ from django.shortcuts import render
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Count, Q, F, Func, DurationField, ExpressionWrapper, QuerySet, Exists, OuterRef
+from django.db import connection
+from django.db.models import Aggregate, Case, Count, Q, F, FloatField, Func, DurationField, ExpressionWrapper, QuerySet, Exists, OuterRef, Sum, Value, When
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.views import View
 from datetime import timedelta, date, datetime
 from django.db.models.functions import TruncDate, Coalesce, Cast
 from decimal import Decimal
+import hashlib
 import math
 from urllib.parse import quote
 from typing import Any
 
 from .models import (
-    OtnFault, OtnFaultImpact, BareFiberService,
+    OtnFault, OtnFaultImpact, BareFiberService, OtnFaultDailyRollup,
     FaultCategoryChoices, ResourceTypeChoices, CableTypeChoices,
     ServiceTypeChoices, FaultStatusChoices, BusinessImpactChoices,
     PowerFaultImpactChoices, CutoverTask
 )
 from dcim.models import Region
+from .services.repeat_links import get_repeat_fault_ids
+from .services.stats_cache import get_or_compute, period_cache_tags, statistics_cache_timeouts, tagged_cache_key
 from .statistics_period import build_period_display
-from .utils import detect_repeat_faults
+from .utils import REPEAT_FAULT_WINDOW, RepeatFaultIndex, detect_repeat_faults
 
 
 def _annotate_class_i_business_impact(queryset: QuerySet) -> QuerySet:
@@ -228,6 +232,42 @@ def _is_branch_company_fault(fault) -> bool:
     return _branch_province_for_fault(fault) in BRANCH_PROVINCE_NAMES and not _should_exclude_for_branch(fault)
 
 
+def _branch_company_fault_q() -> Q:
+    """子公司口径的数据库筛选条件，与 _is_branch_company_fault 一致：省份属于子公司且处理单位不在排除名单内。"""
+    province_q = Q()
+    for alias in BRANCH_PROVINCE_ALIASES:
+        province_q |= Q(province__name__startswith=alias)
+    return province_q & ~Q(handling_unit__name__in=EXCLUDED_HANDLING_UNITS)
+
+
+# 子公司光缆中断逐条统计（箱线图、周/月趋势、绩效卡片）所需的故障字段
+BRANCH_FAULT_FIELDS: tuple[str, ...] = (
+    'id',
+    'fault_category',
+    'fault_status',
+    'is_suspended',
+    'fault_occurrence_time',
+    'fault_recovery_time',
+    'interruption_reason',
+    'interruption_reason_detail',
+    'resource_type',
+    'province__name',
+    'handling_unit__name',
+)
+
+
+def _branch_company_faults(queryset: QuerySet) -> list:
+    """在数据库内按子公司口径筛选，仅加载逐条统计所需字段，不预取 Z 端站点。"""
+    queryset = (
+        queryset.filter(_branch_company_fault_q())
+        .select_related(None)
+        .select_related('province', 'handling_unit')
+        .prefetch_related(None)
+        .only(*BRANCH_FAULT_FIELDS)
+    )
+    return [fault for fault in queryset if _is_branch_company_fault(fault)]
+
+
 def truncate_sla(value: float) -> float:
     return math.trunc(value * 100.0) / 100.0
 
@@ -273,23 +313,52 @@ def _build_resource_chart_data(resource_stats: dict[str, dict[str, object]]) ->
 
 
 def _build_fault_category_summary(faults: list, now) -> list[dict[str, str | int | float]]:
+    category_totals: dict[str, dict[str, int | float]] = {}
+    for fault in faults:
+        totals = category_totals.setdefault(fault.fault_category, {'count': 0, 'duration': 0.0})
+        totals['count'] += 1
+        if fault.fault_occurrence_time:
+            totals['duration'] += _duration_hours_for_fault(fault, now)
+    return _build_fault_category_summary_from_totals(category_totals)
+
+
+def _fault_category_totals(queryset: QuerySet, now) -> dict[str, dict[str, int | float]]:
+    """按故障分类汇总故障数与历时（小时）：已恢复故障在数据库内求和，仅逐条读取未恢复故障的发生时间。"""
+    category_totals: dict[str, dict[str, int | float]] = {}
+    rows = queryset.order_by().values('fault_category').annotate(
+        count=Count('pk'),
+        recovered_duration=Sum(ExpressionWrapper(
+            F('fault_recovery_time') - F('fault_occurrence_time'),
+            output_field=DurationField(),
+        )),
+    )
+    for row in rows:
+        recovered_duration = row['recovered_duration']
+        category_totals[row['fault_category']] = {
+            'count': row['count'],
+            'duration': recovered_duration.total_seconds() / 3600.0 if recovered_duration else 0.0,
+        }
+    open_faults = queryset.order_by().filter(
+        fault_occurrence_time__isnull=False,
+        fault_recovery_time__isnull=True,
+    ).values_list('fault_category', 'fault_occurrence_time')
+    for category, occurrence_time in open_faults:
+        category_totals[category]['duration'] += (now - occurrence_time).total_seconds() / 3600.0
+    return category_totals
+
+
+def _build_fault_category_summary_from_totals(
+    category_totals: dict[str, dict[str, int | float]],
+) -> list[dict[str, str | int | float]]:
     category_counts: dict[str, dict[str, int | float]] = {
         label: {'count': 0, 'duration': 0.0}
         for _, label in FAULT_CATEGORY_SUMMARY_ORDER
     }
-    category_labels = dict(FAULT_CATEGORY_SUMMARY_ORDER)
-
-    for fault in faults:
-        label = category_labels.get(fault.fault_category, '未知')
-        if label not in category_counts:
-            category_counts[label] = {'count': 0, 'duration': 0.0}
-
-        category_counts[label]['count'] += 1
-
-        if fault.fault_occurrence_time:
-            end_t = fault.fault_recovery_time if fault.fault_recovery_time else now
-            duration_hours = (end_t - fault.fault_occurrence_time).total_seconds() / 3600.0
-            category_counts[label]['duration'] += duration_hours
+    for category, label in FAULT_CATEGORY_SUMMARY_ORDER:
+        totals = category_totals.get(category)
+        if totals:
+            category_counts[label]['count'] += totals['count']
+            category_counts[label]['duration'] += totals['duration']
 
     return [
         {
@@ -425,6 +494,10 @@ def _build_physical_daily_fault_series(period_start, period_end, faults: list, n
         day_labels.append(cursor.isoformat())
         cursor += timedelta(days=1)
     week_ranges = _build_physical_week_ranges(period_start, period_end)
+    # 周区间自周期首日起每 7 天一段，按日序号直接定位所属周
+    week_key_by_day: dict[str, str] = {
+        day: week_ranges[index // 7]['key'] for index, day in enumerate(day_labels)
+    }
 
     daily_counts: dict[str, int] = {day: 0 for day in day_labels}
     weekly_counts: dict[str, int] = {week['key']: 0 for week in week_ranges}
@@ -450,7 +523,7 @@ def _build_physical_daily_fault_series(period_start, period_end, faults: list, n
             duration_hours = total_duration
             duration_samples[local_day].append(total_duration)
             daily_durations[local_day] += total_duration
-            week_key = next((week['key'] for week in week_ranges if week['start'] <= local_day <= week['end']), None)
+            week_key = week_key_by_day.get(local_day)
             if week_key:
                 weekly_counts[week_key] += 1
                 weekly_durations[week_key] += total_duration
@@ -500,10 +573,25 @@ def _build_other_fault_summary(
     faults: list,
     suspended_faults_count: int,
     suspended_faults_total_count: int | None = None,
+) -> dict[str, int]:
+    return _build_other_fault_summary_from_counts(
+        {
+            FaultCategoryChoices.FIBER_DEGRADATION: sum(1 for f in faults if f.fault_category == FaultCategoryChoices.FIBER_DEGRADATION),
+            FaultCategoryChoices.FIBER_JITTER: sum(1 for f in faults if f.fault_category == FaultCategoryChoices.FIBER_JITTER),
+        },
+        suspended_faults_count,
+        suspended_faults_total_count,
+    )
+
+
+def _build_other_fault_summary_from_counts(
+    category_counts: dict[str, int],
+    suspended_faults_count: int,
+    suspended_faults_total_count: int | None = None,
 ) -> dict[str, int]:
     return {
-        'fiber_degradation': sum(1 for f in faults if f.fault_category == FaultCategoryChoices.FIBER_DEGRADATION),
-        'fiber_jitter': sum(1 for f in faults if f.fault_category == FaultCategoryChoices.FIBER_JITTER),
+        'fiber_degradation': category_counts.get(FaultCategoryChoices.FIBER_DEGRADATION, 0),
+        'fiber_jitter': category_counts.get(FaultCategoryChoices.FIBER_JITTER, 0),
         'suspended_faults': suspended_faults_count,
         'suspended_faults_total': suspended_faults_total_count if suspended_faults_total_count is not None else suspended_faults_count,
     }
@@ -698,6 +786,172 @@ def _compute_cable_break_overview(faults: list, now) -> dict:
     }
 
 
+class _EpochHours(Func):
+    """PostgreSQL：将时间间隔折算为小时数。"""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s) / 3600.0'
+    output_field = FloatField()
+
+
+class _PercentileCont(Aggregate):
+    """PostgreSQL percentile_cont 有序集聚合，线性插值口径与 _percentile 一致。"""
+    function = 'PERCENTILE_CONT'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile: float, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+CABLE_BREAK_LONG_DURATION_RANGES: dict[str, tuple[float, float | None]] = {
+    '6-8小时': (6.0, 8.0),
+    '8-10小时': (8.0, 10.0),
+    '10-12小时': (10.0, 12.0),
+    '12小时以上': (12.0, None),
+}
+
+
+def _duration_hours_range_q(lower: float, upper: float | None) -> Q:
+    condition = Q(duration_hours__gte=lower)
+    if upper is not None:
+        condition &= Q(duration_hours__lt=upper)
+    return condition
+
+
+def _compute_cable_break_overview_from_queryset(queryset: QuerySet, now) -> dict:
+    """
+    以聚合查询计算光缆中断概览，返回值与 _compute_cable_break_overview 一致。
+    历时、分桶与分位数均在数据库内计算，不加载故障实例；非 PostgreSQL 数据库回退到逐条计算。
+    """
+    if connection.vendor != 'postgresql':
+        return _compute_cable_break_overview(list(queryset), now)
+
+    cable_break_qs = (
+        queryset
+        .filter(fault_category=FaultCategoryChoices.FIBER_BREAK, is_suspended=False)
+        .exclude(fault_status=FaultStatusChoices.SUSPENDED)
+        .select_related(None)
+        .prefetch_related(None)
+        .order_by()
+        .annotate(
+            duration_hours=_EpochHours(ExpressionWrapper(
+                Coalesce(F('fault_recovery_time'), now) - F('fault_occurrence_time'),
+                output_field=DurationField(),
+            ))
+        )
+    )
+    reason_labels = dict(OtnFault._meta.get_field('interruption_reason').flatchoices)
+    construction_reasons = [value for value, label in reason_labels.items() if label == '施工']
+    valid_q = Q(duration_hours__gt=0.5)
+    daytime_q = Q(fault_occurrence_time__hour__gte=6, fault_occurrence_time__hour__lt=18)
+    construction_q = Q(interruption_reason__in=construction_reasons)
+
+    aggregates = {
+        'cb_count': Count('pk'),
+        'total_duration': Sum('duration_hours'),
+        'timeout_count': Count('pk', filter=Q(duration_hours__gte=4.0)),
+        'cb_valid_count': Count('pk', filter=valid_q),
+        'cb_valid_dur': Sum('duration_hours', filter=valid_q),
+        'cb_day_count': Count('pk', filter=valid_q & daytime_q),
+        'cb_day_dur': Sum('duration_hours', filter=valid_q & daytime_q),
+        'cb_night_count': Count('pk', filter=valid_q & ~daytime_q),
+        'cb_night_dur': Sum('duration_hours', filter=valid_q & ~daytime_q),
+        'cb_cons_count': Count('pk', filter=valid_q & construction_q),
+        'cb_cons_dur': Sum('duration_hours', filter=valid_q & construction_q),
+        'cb_noncons_count': Count('pk', filter=valid_q & ~construction_q),
+        'cb_noncons_dur': Sum('duration_hours', filter=valid_q & ~construction_q),
+        'p50': _PercentileCont('duration_hours', 0.5),
+        'p90': _PercentileCont('duration_hours', 0.9),
+    }
+    for index, (lower, upper) in enumerate(CABLE_BREAK_LONG_DURATION_RANGES.values()):
+        aggregates[f'long_count_{index}'] = Count('pk', filter=_duration_hours_range_q(lower, upper))
+        aggregates[f'long_duration_{index}'] = Sum('duration_hours', filter=_duration_hours_range_q(lower, upper))
+    totals = {
+        name: value or 0
+        for name, value in cable_break_qs.aggregate(**aggregates).items()
+    }
+
+    reason_counts: dict[str, int] = {}
+    source_counts: dict[str, int] = {}
+    reason_duration: dict[str, float] = {}
+    source_duration: dict[str, float] = {}
+    # 资源来源分组口径同 _source_group_for_fault
+    source_group = Case(
+        When(resource_type__in=[ResourceTypeChoices.SELF_BUILT, ResourceTypeChoices.COORDINATED], then=Value('自控')),
+        When(resource_type=ResourceTypeChoices.LEASED, then=Value('第三方')),
+        default=Value('其他/未填'),
+    )
+    grouped_rows = cable_break_qs.annotate(source_group=source_group).values(
+        'interruption_reason', 'source_group'
+    ).annotate(
+        count=Count('pk'),
+        duration=Sum('duration_hours'),
+    )
+    for row in grouped_rows:
+        reason_value = row['interruption_reason']
+        reason = reason_labels.get(reason_value, reason_value) if reason_value else '未填/未知'
+        source = row['source_group']
+        duration = row['duration'] or 0.0
+        reason_counts[reason] = reason_counts.get(reason, 0) + row['count']
+        source_counts[source] = source_counts.get(source, 0) + row['count']
+        reason_duration[reason] = reason_duration.get(reason, 0.0) + duration
+        source_duration[source] = source_duration.get(source, 0.0) + duration
+
+    histogram_bucket = Case(
+        *[When(duration_hours__lte=float(bucket), then=Value(bucket)) for bucket in range(1, 25)],
+        default=Value(25),
+    )
+    histogram: dict[int, int] = {i: 0 for i in range(1, 26)}
+    for row in cable_break_qs.annotate(bucket=histogram_bucket).values('bucket').annotate(count=Count('pk')):
+        histogram[row['bucket']] = row['count']
+
+    cb_count = totals['cb_count']
+
+    def average(duration_key: str, count_key: str) -> float:
+        return round(totals[duration_key] / totals[count_key] if totals[count_key] > 0 else 0.0, 2)
+
+    avg_metrics = {
+        'overall_avg': average('total_duration', 'cb_count'),
+        'p50_repair_duration': round(totals['p50'], 2),
+        'p90_repair_duration': round(totals['p90'], 2),
+        'timeout_rate': round(totals['timeout_count'] * 100.0 / cb_count if cb_count > 0 else 0.0, 1),
+        'valid_avg': average('cb_valid_dur', 'cb_valid_count'),
+        'daytime_avg': average('cb_day_dur', 'cb_day_count'),
+        'nighttime_avg': average('cb_night_dur', 'cb_night_count'),
+        'construction_avg': average('cb_cons_dur', 'cb_cons_count'),
+        'non_construction_avg': average('cb_noncons_dur', 'cb_noncons_count'),
+    }
+    long_duration_buckets = {
+        name: totals[f'long_count_{index}']
+        for index, name in enumerate(CABLE_BREAK_LONG_DURATION_RANGES)
+    }
+    long_duration_bucket_durations = {
+        name: round(totals[f'long_duration_{index}'], 2)
+        for index, name in enumerate(CABLE_BREAK_LONG_DURATION_RANGES)
+    }
+    hist_data = [
+        {
+            'label': _duration_histogram_bucket_label(i),
+            'value': histogram[i],
+            'percent': round(histogram[i] * 100.0 / cb_count, 1) if cb_count > 0 else 0.0,
+        }
+        for i in range(1, 26)
+    ]
+
+    return {
+        'total_count': cb_count,
+        'total_duration': round(totals['total_duration'], 2),
+        'long_duration_total': round(sum(totals[f'long_duration_{index}'] for index in range(len(CABLE_BREAK_LONG_DURATION_RANGES))), 2),
+        'reason_top3': _sorted_count_items(reason_counts)[:3],
+        'source_counts': _ordered_source_items(source_counts),
+        'reason_duration_top3': _sorted_count_items(reason_duration)[:3],
+        'source_duration_counts': _ordered_source_items(source_duration),
+        'long_duration_buckets': long_duration_buckets,
+        'long_duration_bucket_durations': long_duration_bucket_durations,
+        'avg_metrics': avg_metrics,
+        'histogram': hist_data,
+    }
+
+
 def _normalize_branch_province_name(name: str | None) -> str | None:
     if not name:
         return None
@@ -744,54 +998,8 @@ def _build_branch_week_ranges(year_start, year_end) -> list[dict[str, str]]:
     return ranges
 
 
-def _count_repeat_fiber_faults(faults: list, end_date, now) -> int:
-    fiber_faults = [
-        fault for fault in faults
-        if getattr(fault, 'is_fiber_fault', False) and fault.fault_occurrence_time
-    ]
-    if not fiber_faults:
-        return 0
-
-    min_occurrence = min(fault.fault_occurrence_time for fault in fiber_faults)
-    check_start = min_occurrence - timedelta(days=60)
-    comparison_end = end_date if end_date else now
-    comparison_faults = list(
-        OtnFault.objects.filter(
-            fault_occurrence_time__gte=check_start,
-            fault_occurrence_time__lt=comparison_end,
-            fault_category__in=[
-                FaultCategoryChoices.FIBER_BREAK,
-                FaultCategoryChoices.FIBER_DEGRADATION,
-                FaultCategoryChoices.FIBER_JITTER,
-            ],
-        )
-        .select_related('interruption_location_a')
-        .prefetch_related('interruption_location')
-    )
-    z_sites_cache = {
-        fault.id: set(site.id for site in fault.interruption_location.all())
-        for fault in comparison_faults
-    }
-
-    repeat_count = 0
-    for fault in fiber_faults:
-        fault_z_site_ids = z_sites_cache.get(
-            fault.id,
-            set(site.id for site in fault.interruption_location.all()),
-        )
-        for previous_fault in comparison_faults:
-            if previous_fault.id == fault.id:
-                continue
-            if previous_fault.fault_occurrence_time >= fault.fault_occurrence_time:
-                continue
-            if (fault.fault_occurrence_time - previous_fault.fault_occurrence_time) > timedelta(days=60):
-                continue
-            if previous_fault.interruption_location_a_id != fault.interruption_location_a_id:
-                continue
-            if z_sites_cache.get(previous_fault.id, set()).intersection(fault_z_site_ids):
-                repeat_count += 1
-                break
-    return repeat_count
+def _count_repeat_fiber_faults(faults: list) -> int:
+    return len(_build_repeat_fault_id_set(faults))
 
 
 def _classify_branch_fault_responsibility(fault) -> dict[str, object]:
@@ -861,54 +1069,14 @@ def _calculate_branch_performance_score(metrics: dict[str, float]) -> dict[str,
     }
 
 
-def _build_repeat_fault_id_set(faults: list, end_date, now) -> set[int]:
-    fiber_faults = [
-        fault for fault in faults
-        if getattr(fault, 'is_fiber_fault', False) and fault.fault_occurrence_time
-    ]
-    if not fiber_faults:
-        return set()
-
-    min_occurrence = min(fault.fault_occurrence_time for fault in fiber_faults)
-    check_start = min_occurrence - timedelta(days=60)
-    comparison_end = end_date if end_date else now
-    comparison_faults = list(
-        OtnFault.objects.filter(
-            fault_occurrence_time__gte=check_start,
-            fault_occurrence_time__lt=comparison_end,
-            fault_category__in=[
-                FaultCategoryChoices.FIBER_BREAK,
-                FaultCategoryChoices.FIBER_DEGRADATION,
-                FaultCategoryChoices.FIBER_JITTER,
-            ],
-        )
-        .select_related('interruption_location_a')
-        .prefetch_related('interruption_location')
+def _build_repeat_fault_id_set(faults: list, previous_faults: QuerySet | None = None) -> set[int]:
+    return get_repeat_fault_ids(
+        (
+            fault.id for fault in faults
+            if getattr(fault, 'is_fiber_fault', False) and fault.fault_occurrence_time
+        ),
+        previous_faults,
     )
-    z_sites_cache = {
-        fault.id: set(site.id for site in fault.interruption_location.all())
-        for fault in comparison_faults
-    }
-
-    repeat_ids: set[int] = set()
-    for fault in fiber_faults:
-        fault_z_site_ids = z_sites_cache.get(
-            fault.id,
-            set(site.id for site in fault.interruption_location.all()),
-        )
-        for previous_fault in comparison_faults:
-            if previous_fault.id == fault.id:
-                continue
-            if previous_fault.fault_occurrence_time >= fault.fault_occurrence_time:
-                continue
-            if (fault.fault_occurrence_time - previous_fault.fault_occurrence_time) > timedelta(days=60):
-                continue
-            if previous_fault.interruption_location_a_id != fault.interruption_location_a_id:
-                continue
-            if z_sites_cache.get(previous_fault.id, set()).intersection(fault_z_site_ids):
-                repeat_ids.add(fault.id)
-                break
-    return repeat_ids
 
 
 def _empty_branch_performance_metrics(length_km: float) -> dict[str, float]:
@@ -1053,10 +1221,39 @@ def _build_branch_performance_bare_fiber_annual_stats(
     return stats
 
 
+def _build_branch_power_fault_counts(year_start, year_end) -> dict[str, dict[str, int]]:
+    """按子公司省份统计全年非挂起供电故障数及其中托管数，在数据库内分组计数。"""
+    counts: dict[str, dict[str, int]] = {
+        province: {'total': 0, 'hosted': 0}
+        for province in BRANCH_PROVINCE_NAMES
+    }
+    rows = (
+        OtnFault.objects.filter(
+            _branch_company_fault_q(),
+            fault_occurrence_time__gte=year_start,
+            fault_occurrence_time__lt=year_end,
+            fault_category=FaultCategoryChoices.POWER_FAULT,
+        )
+        .exclude(_suspended_fault_q())
+        .order_by()
+        .values('province__name')
+        .annotate(
+            total=Count('pk'),
+            hosted=Count('pk', filter=Q(power_fault_impact=PowerFaultImpactChoices.HOSTED)),
+        )
+    )
+    for row in rows:
+        province = _normalize_branch_province_name(row['province__name'])
+        if province in counts:
+            counts[province]['total'] += row['total']
+            counts[province]['hosted'] += row['hosted']
+    return counts
+
+
 def _build_branch_company_performance_cards(
     branch_faults: list,
     year_faults: list,
-    year_all_faults: list,
+    power_fault_counts: dict[str, dict[str, int]],
     path_lengths: dict[str, float],
     calendar_months: list[dict[str, object]],
     calendar_full_months: list[dict[str, object]],
@@ -1064,7 +1261,7 @@ def _build_branch_company_performance_cards(
     end_date,
     now,
 ) -> list[dict[str, object]]:
-    repeat_fault_ids = _build_repeat_fault_id_set(branch_faults, end_date, now)
+    repeat_fault_ids = _build_repeat_fault_id_set(branch_faults)
     fault_groups: dict[str, list] = {province: [] for province in BRANCH_PROVINCE_NAMES}
     for fault in branch_faults:
         province = _branch_province_for_fault(fault)
@@ -1099,17 +1296,12 @@ def _build_branch_company_performance_cards(
     week_ranges = _build_branch_week_ranges(year_start, year_end)
     week_labels = [week['label'] for week in week_ranges]
     bare_fiber_annual_stats = _build_branch_performance_bare_fiber_annual_stats(year_start, year_end, now)
-    year_fault_groups: dict[str, list] = {province: [] for province in BRANCH_PROVINCE_NAMES}
-    for fault in year_all_faults:
-        province = _branch_province_for_fault(fault)
-        if province in year_fault_groups:
-            year_fault_groups[province].append(fault)
     year_cable_break_groups: dict[str, list] = {province: [] for province in BRANCH_PROVINCE_NAMES}
     for fault in year_faults:
         province = _branch_province_for_fault(fault)
         if province in year_cable_break_groups:
             year_cable_break_groups[province].append(fault)
-    year_repeat_fault_ids = _build_repeat_fault_id_set(year_faults, year_end, now)
+    year_repeat_fault_ids = _build_repeat_fault_id_set(year_faults)
 
     cards: list[dict[str, object]] = []
     for province in BRANCH_PROVINCE_NAMES:
@@ -1189,16 +1381,8 @@ def _build_branch_company_performance_cards(
             for fault in cable_break_annual_faults
             if fault.id in year_repeat_fault_ids
         )
-        power_faults = [
-            fault for fault in year_fault_groups[province]
-            if fault.fault_category == FaultCategoryChoices.POWER_FAULT
-            and _is_non_suspended_fault(fault)
-        ]
-        power_hosted_count = sum(
-            1
-            for fault in power_faults
-            if getattr(fault, 'power_fault_impact', None) == PowerFaultImpactChoices.HOSTED
-        )
+        power_total_count = power_fault_counts[province]['total']
+        power_hosted_count = power_fault_counts[province]['hosted']
         cards.append({
             'province': province,
             'label': f'{province}分公司',
@@ -1224,7 +1408,7 @@ def _build_branch_company_performance_cards(
                     'repeat_count': cable_break_repeat_count,
                 },
                 'power': {
-                    'total_count': len(power_faults),
+                    'total_count': power_total_count,
                     'hosted_count': power_hosted_count,
                 },
             },
@@ -1262,34 +1446,30 @@ def _build_branch_company_performance_cards(
 
 
 def _build_branch_company_statistics(
-    all_faults: list,
-    cable_break_faults: list,
-    suspended_faults_count: int,
     start_date,
     end_date,
     now,
     calendar_year: int | None = None,
     calendar_month: int | None = None,
 ) -> dict[str, object]:
+    """
+    子公司统计：总体分类与挂起数按分组聚合查询计算，
+    光缆中断按子公司口径在数据库内筛选后仅加载逐条统计所需字段。
+    """
     path_lengths = BRANCH_PROVINCE_PATH_LENGTHS.copy()
-    branch_all_faults = [
-        fault for fault in all_faults
-        if _is_branch_company_fault(fault)
-    ]
-    branch_cable_break_faults = [
-        fault for fault in cable_break_faults
-        if _is_branch_company_fault(fault)
-    ]
-    branch_suspended_faults_count = sum(
-        1
-        for fault in OtnFault.objects.select_related('province', 'handling_unit').filter(_suspended_fault_q())
-        if _is_branch_company_fault(fault)
+    branch_qs = OtnFault.objects.filter(_branch_company_fault_q())
+    branch_category_totals = _fault_category_totals(
+        branch_qs.filter(fault_occurrence_time__gte=start_date, fault_occurrence_time__lt=end_date),
+        now,
     )
+    branch_cable_break_faults = _branch_company_faults(get_cable_break_base_queryset(start_date, end_date))
+    branch_suspended_faults_count = branch_qs.filter(_suspended_fault_q()).count()
 
-    overview_faults = [
-        fault for fault in branch_all_faults
-        if fault.fault_category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES
-    ]
+    overview_category_totals = {
+        category: totals
+        for category, totals in branch_category_totals.items()
+        if category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES
+    }
     province_stats: dict[str, dict[str, float | int]] = {
         province: {'count': 0, 'duration': 0.0, 'valid_duration': 0.0, 'valid_count': 0}
         for province in BRANCH_PROVINCE_NAMES
@@ -1371,19 +1551,8 @@ def _build_branch_company_statistics(
         for province in BRANCH_PROVINCE_NAMES
     }
 
-    year_all_faults = [
-        fault for fault in OtnFault.objects.select_related('province', 'interruption_location_a', 'handling_unit')
-        .prefetch_related('interruption_location')
-        .filter(
-            fault_occurrence_time__gte=year_start,
-            fault_occurrence_time__lt=year_end,
-        )
-        if _is_branch_company_fault(fault)
-    ]
-    year_faults = [
-        fault for fault in get_cable_break_base_queryset(year_start, year_end)
-        if _is_branch_company_fault(fault)
-    ]
+    power_fault_counts = _build_branch_power_fault_counts(year_start, year_end)
+    year_faults = _branch_company_faults(get_cable_break_base_queryset(year_start, year_end))
     for fault in year_faults:
         province = _branch_province_for_fault(fault)
         if not province or not fault.fault_occurrence_time:
@@ -1439,9 +1608,10 @@ def _build_branch_company_statistics(
             'month_valid_duration_per_1000km': [_per_1000km(monthly_by_province[province][month['key']]['valid_duration'], length_km) for month in month_ranges],
         })
 
-    branch_cable_break_overview = _compute_cable_break_overview(branch_cable_break_faults, now)
-
-    branch_cable_break_overview = _compute_cable_break_overview(branch_cable_break_faults, now)
+    branch_cable_break_overview = _compute_cable_break_overview_from_queryset(
+        get_cable_break_base_queryset(start_date, end_date).filter(_branch_company_fault_q()),
+        now,
+    )
     branch_bare_fiber_interruption = _compute_bare_fiber_interruption_overview(
         start_date,
         end_date,
@@ -1449,15 +1619,11 @@ def _build_branch_company_statistics(
         now,
         branch_company_scope=True,
     )
-    branch_cable_break_overview['repeat_faults_count'] = _count_repeat_fiber_faults(
-        branch_cable_break_faults,
-        end_date,
-        now,
-    )
+    branch_cable_break_overview['repeat_faults_count'] = _count_repeat_fiber_faults(branch_cable_break_faults)
     performance_cards = _build_branch_company_performance_cards(
         branch_cable_break_faults,
         year_faults,
-        year_all_faults,
+        power_fault_counts,
         path_lengths,
         calendar_months,
         calendar_full_months,
@@ -1470,9 +1636,12 @@ def _build_branch_company_statistics(
         'provinces': BRANCH_PROVINCE_NAMES,
         'path_lengths': path_lengths,
         'overview': {
-            'total_count': len(overview_faults),
-            'categories': _build_fault_category_summary(overview_faults, now),
-            'other': _build_other_fault_summary(branch_all_faults, branch_suspended_faults_count),
+            'total_count': sum(totals['count'] for totals in overview_category_totals.values()),
+            'categories': _build_fault_category_summary_from_totals(overview_category_totals),
+            'other': _build_other_fault_summary_from_counts(
+                {category: totals['count'] for category, totals in branch_category_totals.items()},
+                branch_suspended_faults_count,
+            ),
         },
         'bare_fiber_interruption': branch_bare_fiber_interruption,
         'cable_break_overview': branch_cable_break_overview,
@@ -1572,6 +1741,189 @@ def _parse_time_range(request):
     return start_date, end_date, prev_start_date, prev_end_date, yoy_start_date, yoy_end_date, filter_type
 
 
+# 故障日汇总表中影响等级的存储取值
+FAULT_ROLLUP_IMPACT_LEVELS: dict[str, str] = {
+    "割接排除": "cutover",
+    "V类": "class_v",
+    "I类": "class_i",
+    "II类": "class_ii",
+    "III类": "class_iii",
+    "IV类": "class_iv",
+    "未知": "unknown",
+}
+
+# 统计看板按周期汇总日汇总表时使用的分组维度
+FAULT_ROLLUP_GROUP_FIELDS: tuple[str, ...] = (
+    'fault_category',
+    'impact_level',
+    'is_suspended',
+    'is_planned_rectification',
+)
+
+FAULT_ROLLUP_HISTOGRAM_SIZE = 25
+
+
+def _is_planned_rectification_fault(fault) -> bool:
+    return (
+        fault.interruption_reason == 'cable_rectification'
+        and fault.interruption_reason_detail == 'planned_reporting'
+    )
+
+
+def _fault_rollup_dimensions(fault) -> dict[str, object]:
+    """返回故障在日汇总表中的维度取值，故障需已标注 has_class_i_business_impact。"""
+    return {
+        'day': timezone.localdate(fault.fault_occurrence_time),
+        'province_id': fault.province_id,
+        'fault_category': fault.fault_category or '',
+        'resource_type': fault.resource_type or '',
+        'interruption_reason': fault.interruption_reason or '',
+        'source_group': _source_group_for_fault(fault),
+        'is_suspended': not _is_non_suspended_fault(fault),
+        'is_planned_rectification': _is_planned_rectification_fault(fault),
+        'impact_level': FAULT_ROLLUP_IMPACT_LEVELS[
+            _get_impact_level_display(fault, fault.has_class_i_business_impact)
+        ],
+    }
+
+
+def _fault_rollup_row(fault, now) -> dict[str, object]:
+    """将单个故障折算为与日汇总分组结果同构的行，用于实时合并尚未恢复的故障。"""
+    dimensions = _fault_rollup_dimensions(fault)
+    duration_hours = _duration_hours_for_fault(fault, now)
+    return {
+        **{field: dimensions[field] for field in FAULT_ROLLUP_GROUP_FIELDS},
+        'count_total': 1,
+        'duration_total': duration_hours,
+        'long_total': 1 if duration_hours >= 6.0 else 0,
+    }
+
+
+def _load_fault_rollup_rows(
+    start_date: datetime,
+    end_date: datetime,
+    selected_provinces: list[str],
+    now: datetime,
+) -> list[dict[str, object]]:
+    """
+    按分组维度汇总统计周期内的故障日汇总行，并实时合并周期内尚未恢复的故障。
+    统计周期由 _parse_time_range 按本地自然日对齐，可直接映射为日汇总的日期区间。
+    """
+    rollups = OtnFaultDailyRollup.objects.filter(
+        day__gte=timezone.localdate(start_date),
+        day__lt=timezone.localdate(end_date),
+    )
+    if selected_provinces:
+        rollups = rollups.filter(province__name__in=selected_provinces)
+    rows = list(
+        rollups.values(*FAULT_ROLLUP_GROUP_FIELDS)
+        .annotate(
+            count_total=Sum('fault_count'),
+            duration_total=Sum('duration_hours'),
+            long_total=Sum('long_count'),
+        )
+        .order_by()
+    )
+
+    open_faults = _annotate_class_i_business_impact(
+        _apply_physical_province_filter(
+            OtnFault.objects.filter(
+                fault_occurrence_time__gte=start_date,
+                fault_occurrence_time__lt=end_date,
+                fault_recovery_time__isnull=True,
+            ),
+            selected_provinces,
+        )
+    )
+    rows.extend(_fault_rollup_row(fault, now) for fault in open_faults)
+    return rows
+
+
+def _summarize_fault_rollup_rows(rows: list[dict[str, object]]) -> dict[str, Any]:
+    """将日汇总分组行折算为影响等级卡片、环形图、总体分类及光缆中断 KPI 数据。"""
+    level_stats = {
+        "total": 0, "class_i_ii": 0, "class_i": 0, "class_ii": 0,
+        "class_iii": 0, "class_iv": 0, "class_v": 0,
+    }
+    ring_fiber = {"class_i": 0, "class_ii": 0, "suspended": 0}
+    ring_power = {"class_i": 0, "class_iii": 0, "suspended": 0}
+    ring_environment = {"class_i": 0, "class_iii": 0, "suspended": 0}
+    rings_by_category = {
+        FaultCategoryChoices.FIBER_BREAK: ring_fiber,
+        FaultCategoryChoices.POWER_FAULT: ring_power,
+        FaultCategoryChoices.AC_FAULT: ring_environment,
+        FaultCategoryChoices.DEVICE_FAULT: ring_environment,
+    }
+    category_labels = dict(FAULT_CATEGORY_SUMMARY_ORDER)
+    category_totals: dict[str, dict[str, int | float]] = {
+        label: {'count': 0, 'duration': 0.0}
+        for _, label in FAULT_CATEGORY_SUMMARY_ORDER
+    }
+    category_counts: dict[str, int] = {}
+    overall_total_count = 0
+    cable_break = {'count': 0, 'duration': 0.0, 'long_count': 0}
+
+    for row in rows:
+        category = row['fault_category']
+        level = row['impact_level']
+        count = int(row['count_total'] or 0)
+        duration = float(row['duration_total'] or 0.0)
+
+        category_counts[category] = category_counts.get(category, 0) + count
+        if category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES:
+            overall_total_count += count
+            label = category_labels.get(category)
+            if label is not None:
+                category_totals[label]['count'] += count
+                category_totals[label]['duration'] += duration
+
+        if row['is_planned_rectification']:
+            continue
+
+        if category == FaultCategoryChoices.FIBER_BREAK and not row['is_suspended']:
+            cable_break['count'] += count
+            cable_break['duration'] += duration
+            cable_break['long_count'] += int(row['long_total'] or 0)
+
+        if level == 'cutover':
+            continue
+        level_stats['total'] += count
+        if level in level_stats:
+            level_stats[level] += count
+        if level in ('class_i', 'class_ii'):
+            level_stats['class_i_ii'] += count
+
+        ring = rings_by_category.get(category)
+        if ring is None:
+            continue
+        if level == 'class_v':
+            ring['suspended'] += count
+        elif level == 'class_i':
+            ring['class_i'] += count
+        elif 'class_ii' in ring:
+            ring['class_ii'] += count
+        else:
+            ring['class_iii'] += count
+
+    return {
+        'level_stats': level_stats,
+        'ring_fiber': ring_fiber,
+        'ring_power': ring_power,
+        'ring_environment': ring_environment,
+        'overall_total_count': overall_total_count,
+        'category_stats': [
+            {
+                'name': label,
+                'value': int(category_totals[label]['count']),
+                'duration': round(float(category_totals[label]['duration']), 2),
+            }
+            for _, label in FAULT_CATEGORY_SUMMARY_ORDER
+        ],
+        'category_counts': category_counts,
+        'cable_break': cable_break,
+    }
+
+
 def _compute_comparison_period_data(
     start_date: datetime,
     end_date: datetime,
@@ -1591,25 +1943,13 @@ def _compute_comparison_period_data(
         start_date, end_date, selected_provinces, now
     )
 
-    # 2. 故障影响等级统计
-    qs_all = OtnFault.objects.select_related('province', 'interruption_location_a', 'handling_unit').prefetch_related('interruption_location')
-    qs_period = qs_all.filter(fault_occurrence_time__gte=start_date, fault_occurrence_time__lt=end_date)
-    unfiltered_all_faults = list(qs_period)
-    filtered_qs = _apply_physical_province_filter(qs_period, selected_provinces)
-    all_faults = list(filtered_qs)
-    annotated_qs = _annotate_class_i_business_impact(
-        _exclude_planned_rectification_faults(filtered_qs)
+    # 2. 故障影响等级统计（按故障日汇总表求和，仅实时合并尚未恢复的故障）
+    qs_all = OtnFault.objects.all()
+    rollup_summary = _summarize_fault_rollup_rows(
+        _load_fault_rollup_rows(start_date, end_date, selected_provinces, now)
     )
 
-    level_stats = annotated_qs.aggregate(
-        total=Count('id', filter=Q_CLASS_TOTAL),
-        class_i_ii=Count('id', filter=Q_CLASS_I_II),
-        class_i=Count('id', filter=Q_CLASS_I),
-        class_ii=Count('id', filter=Q_CLASS_II),
-        class_iii=Count('id', filter=Q_CLASS_III),
-        class_iv=Count('id', filter=Q_CLASS_IV),
-        class_v=Count('id', filter=Q_CLASS_V),
-    )
+    level_stats = rollup_summary['level_stats']
     cutover_count = CutoverTask.objects.filter(
         started_at__gte=start_date,
         started_at__lt=end_date
@@ -1619,46 +1959,13 @@ def _compute_comparison_period_data(
     level_stats['cutover_implemented'] = cutover_count.count()
 
     # 3. 影响等级环形图数据
-    ring_fiber = {"class_i": 0, "class_ii": 0, "suspended": 0}
-    ring_power = {"class_i": 0, "class_iii": 0, "suspended": 0}
-    ring_environment = {"class_i": 0, "class_iii": 0, "suspended": 0}
-
-    for fault in annotated_qs:
-        if fault.source_cutover_task_id is not None:
-            continue
-        is_suspended = fault.fault_status == FaultStatusChoices.SUSPENDED or fault.is_suspended
-        
-        if fault.fault_category == FaultCategoryChoices.FIBER_BREAK:
-            if is_suspended:
-                ring_fiber["suspended"] += 1
-            elif fault.has_class_i_business_impact:
-                ring_fiber["class_i"] += 1
-            else:
-                ring_fiber["class_ii"] += 1
-        elif fault.fault_category == FaultCategoryChoices.POWER_FAULT:
-            if is_suspended:
-                ring_power["suspended"] += 1
-            elif fault.power_fault_impact == PowerFaultImpactChoices.HOSTED:
-                ring_power["class_i"] += 1
-            else:
-                ring_power["class_iii"] += 1
-        elif fault.fault_category in [FaultCategoryChoices.AC_FAULT, FaultCategoryChoices.DEVICE_FAULT]:
-            is_class_i_ac = fault.fault_category == FaultCategoryChoices.AC_FAULT and getattr(fault, 'ac_fault_is_class_i', False)
-            is_class_i_device = fault.fault_category == FaultCategoryChoices.DEVICE_FAULT and getattr(fault, 'device_fault_is_class_i', False)
-            if is_suspended:
-                ring_environment["suspended"] += 1
-            elif is_class_i_ac or is_class_i_device:
-                ring_environment["class_i"] += 1
-            else:
-                ring_environment["class_iii"] += 1
+    ring_fiber = rollup_summary['ring_fiber']
+    ring_power = rollup_summary['ring_power']
+    ring_environment = rollup_summary['ring_environment']
 
     # 4. 全量故障 KPI 汇总及分类统计
-    overall_faults = [
-        f for f in all_faults
-        if f.fault_category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES
-    ]
-    overall_total_count = len(overall_faults)
-    overall_category_stats = _build_fault_category_summary(overall_faults, now)
+    overall_total_count = rollup_summary['overall_total_count']
+    overall_category_stats = rollup_summary['category_stats']
 
     # 挂起详情
     all_suspended_faults_total_count = _apply_physical_province_filter(qs_all.filter(_suspended_fault_q()), selected_provinces).count()
@@ -1667,66 +1974,37 @@ def _compute_comparison_period_data(
         selected_provinces,
     ).count()
 
-    other_overview = _build_other_fault_summary(
-        all_faults,
+    other_overview = _build_other_fault_summary_from_counts(
+        rollup_summary['category_counts'],
         all_open_suspended_faults_count,
         all_suspended_faults_total_count,
     )
 
     # 5. 光缆中断与历时 KPI 计算
-    global_cable_break_faults = list(get_cable_break_base_queryset(start_date, end_date))
-    faults = list(_apply_physical_province_filter(
+    faults_qs = _apply_physical_province_filter(
         get_cable_break_base_queryset(start_date, end_date),
         selected_provinces,
-    ))
+    )
+    # 对比周期仅需故障 ID 判定重复故障，概览统计由聚合查询完成，避免加载完整故障实例
+    faults = list(
+        faults_qs.select_related(None).prefetch_related(None)
+        .only('pk', 'fault_category', 'fault_occurrence_time')
+    )
 
-    total_count = len(faults)
-    total_duration = 0.0
-    long_faults_count = 0
+    total_count = rollup_summary['cable_break']['count']
+    total_duration = rollup_summary['cable_break']['duration']
+    long_faults_count = rollup_summary['cable_break']['long_count']
     repeat_faults_count = 0
 
     if faults:
-        p_fiber_faults = [f for f in faults if f.is_fiber_fault]
-        if p_fiber_faults:
-            p_min_occ = min([f.fault_occurrence_time for f in p_fiber_faults])
-            p_check_start = p_min_occ - timedelta(days=60)
-            p_past_qs = _exclude_planned_rectification_faults(
-                OtnFault.objects.filter(
-                    fault_occurrence_time__gte=p_check_start,
-                    fault_occurrence_time__lt=end_date,
-                    fault_category__in=[
-                        FaultCategoryChoices.FIBER_BREAK,
-                        FaultCategoryChoices.FIBER_DEGRADATION,
-                        FaultCategoryChoices.FIBER_JITTER,
-                    ],
-                )
-                .select_related('interruption_location_a')
-                .prefetch_related('interruption_location')
-            )
-            p_past_list = list(p_past_qs)
-        else:
-            p_past_list = []
-
-        repeat_result = detect_repeat_faults(faults, p_past_list)
-        repeat_faults_count = len(repeat_result.kpi_repeat_ids)
-
-        for f in faults:
-            occ = f.fault_occurrence_time
-            rec = f.fault_recovery_time if f.fault_recovery_time else now
-            dur = (rec - occ).total_seconds() / 3600.0
-            total_duration += dur
-            if dur >= 6.0:
-                long_faults_count += 1
+        p_past_qs = _exclude_planned_rectification_faults(OtnFault.objects.all())
+        repeat_faults_count = len(_build_repeat_fault_id_set(faults, p_past_qs))
 
     avg_duration = total_duration / total_count if total_count > 0 else 0.0
-    cable_break_overview = _compute_cable_break_overview(faults, now)
+    cable_break_overview = _compute_cable_break_overview_from_queryset(faults_qs, now)
 
     # 6. 子公司统计
-    unfiltered_open_suspended_faults_count = qs_all.filter(_suspended_fault_q()).exclude(fault_status=FaultStatusChoices.CLOSED).count()
     branch_company_stats = _build_branch_company_statistics(
-        unfiltered_all_faults,
-        global_cable_break_faults,
-        unfiltered_open_suspended_faults_count,
         start_date,
         end_date,
         now,
@@ -1768,6 +2046,89 @@ def _compute_comparison_period_data(
     }
 
 
+def _fault_summary_cache_keys(
+    filter_type: str,
+    period: tuple[datetime, datetime],
+    prev_period: tuple[datetime | None, datetime | None],
+    yoy_period: tuple[datetime | None, datetime | None],
+    selected_provinces: list[str],
+    calendar_year: int,
+    calendar_month: int,
+) -> tuple[str, str]:
+    """
+    返回统计汇总的 (缓存键, 旧数据键)。
+    缓存键折算所依赖周期及省份标签的版本号，故障变更只失效其发生月份与省份相关的缓存；
+    旧数据键不含标签版本，标签失效后仍可取到上一版本载荷。
+    """
+    start_date, end_date = period
+    provinces_str = ",".join(sorted(selected_provinces))
+    provinces_hash = hashlib.md5(provinces_str.encode('utf-8')).hexdigest() if provinces_str else "all"
+    base_cache_key = f"otnfaults:stats:fault-summary:v3:{filter_type}:{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}:{provinces_hash}:{calendar_year}:{calendar_month}"
+    cache_key = tagged_cache_key(
+        base_cache_key,
+        period_cache_tags(
+            _fault_summary_cache_ranges([period, prev_period, yoy_period], calendar_year, calendar_month),
+            selected_provinces,
+        ),
+    )
+    return cache_key, base_cache_key
+
+
+def _service_summary_cache_keys(
+    filter_type: str,
+    period: tuple[datetime, datetime],
+    include_all_bare_fiber: bool,
+    selected_year: int,
+    calendar_year: int,
+    calendar_month: int,
+) -> tuple[str, str]:
+    """返回业务统计的 (缓存键, 旧数据键)，依赖统计周期、所选年度及日历月份范围内的标签。"""
+    tz = timezone.get_current_timezone()
+    start_date, end_date = period
+    calendar_months = _build_recent_calendar_months(calendar_year, calendar_month, tz, num_months=3)
+    calendar_full_months = _build_year_to_month_calendar_months(calendar_year, calendar_month, tz)
+    base_cache_key = (
+        f"otnfaults:stats:service-summary:v1:{filter_type}:{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
+        f":{int(include_all_bare_fiber)}:{selected_year}:{calendar_year}:{calendar_month}"
+    )
+    cache_key = tagged_cache_key(
+        base_cache_key,
+        period_cache_tags(
+            [
+                period,
+                (timezone.datetime(selected_year, 1, 1, tzinfo=tz), timezone.datetime(selected_year + 1, 1, 1, tzinfo=tz)),
+                (
+                    min(calendar_months[0]['start'], calendar_full_months[0]['start']),
+                    max(calendar_months[-1]['end'], calendar_full_months[-1]['end']),
+                ),
+            ],
+            [],
+        ),
+    )
+    return cache_key, base_cache_key
+
+
+def _fault_summary_cache_ranges(
+    periods: list[tuple[datetime | None, datetime | None]],
+    calendar_year: int,
+    calendar_month: int,
+) -> list[tuple[datetime, datetime]]:
+    """返回统计汇总载荷读取的全部故障时间范围：各对比周期、其子公司年度区间以及子公司日历月份。"""
+    tz = timezone.get_current_timezone()
+    ranges = [(start, end) for start, end in periods if start and end]
+    for start, _ in list(ranges):
+        ranges.append((
+            timezone.datetime(start.year, 1, 1, tzinfo=tz),
+            timezone.datetime(start.year + 1, 1, 1, tzinfo=tz),
+        ))
+    calendar_months = _build_recent_calendar_months(calendar_year, calendar_month, tz)
+    ranges.append((
+        min(calendar_months[0]['start'], timezone.datetime(calendar_year, 1, 1, tzinfo=tz)),
+        calendar_months[-1]['end'],
+    ))
+    return ranges
+
+
 def _build_recent_calendar_months(year: int, month: int, tz, num_months: int = 6) -> list[dict[str, object]]:
     """Return month metadata for the recent months ending at the requested month."""
     months: list[dict[str, object]] = []
@@ -2000,6 +2361,11 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
     permission_required = 'netbox_otnfaults.view_otnfault'
 
     def get(self, request) -> JsonResponse:
+        return JsonResponse(self.cached_response_data(request))
+
+    @classmethod
+    def cached_response_data(cls, request: HttpRequest, force_refresh: bool = False) -> dict[str, Any]:
+        """按请求参数读取统计汇总缓存，接口与缓存预热共用同一套缓存键。"""
         start_date, end_date, prev_start_date, prev_end_date, yoy_start_date, yoy_end_date, filter_type = _parse_time_range(request)
         now = timezone.localtime()
         
@@ -2008,26 +2374,42 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
         calendar_year = int(request.GET.get('calendar_year', start_date.year))
         calendar_month = int(request.GET.get('calendar_month', timezone.localtime(start_date).month))
         
-        from django.core.cache import cache
-        import hashlib
-        
-        version_key = "otnfaults:stats:version"
-        cache_version = cache.get(version_key)
-        if cache_version is None:
-            cache_version = 1
-            cache.set(version_key, cache_version, timeout=None)
-            
-        provinces_str = ",".join(sorted(selected_provinces))
-        provinces_hash = hashlib.md5(provinces_str.encode('utf-8')).hexdigest() if provinces_str else "all"
-        
-        cache_key = f"otnfaults:stats:v{cache_version}:fault-summary:v2:{filter_type}:{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}:{provinces_hash}:{calendar_year}:{calendar_month}"
-        
-        if is_ended:
-            cached_data = cache.get(cache_key)
-            if cached_data is not None:
-                # 检查缓存数据中是否包含同比核心字段，防止老格式缓存导致同比缺失
-                if 'yoy_kpis' in cached_data:
-                    return JsonResponse(cached_data)
+        cache_key, base_cache_key = _fault_summary_cache_keys(
+            filter_type,
+            (start_date, end_date),
+            (prev_start_date, prev_end_date),
+            (yoy_start_date, yoy_end_date),
+            selected_provinces,
+            calendar_year,
+            calendar_month,
+        )
+        fresh_timeout, stale_timeout = statistics_cache_timeouts(bool(is_ended))
+        return get_or_compute(
+            cache_key,
+            lambda: cls.build_response_data(
+                start_date, end_date, prev_start_date, prev_end_date, yoy_start_date, yoy_end_date,
+                selected_provinces, calendar_year, calendar_month,
+            ),
+            fresh_timeout,
+            stale_timeout,
+            stale_key=base_cache_key,
+            force_refresh=force_refresh,
+        )
+
+    @staticmethod
+    def build_response_data(
+        start_date: datetime,
+        end_date: datetime,
+        prev_start_date: datetime | None,
+        prev_end_date: datetime | None,
+        yoy_start_date: datetime | None,
+        yoy_end_date: datetime | None,
+        selected_provinces: list[str],
+        calendar_year: int,
+        calendar_month: int,
+    ) -> dict[str, Any]:
+        """计算统计汇总载荷，供接口缓存未命中、后台刷新及缓存预热调用。"""
+        now = timezone.localtime()
 
         # 统一计算环比周期和同比周期数据，以极大精简并复用逻辑
         prev_data = {}
@@ -2051,25 +2433,15 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
         if prev_data:
             prev_bare_fiber_interruption = prev_data.get('bare_fiber_interruption', {})
 
-        # 先预抓取一段无过滤条件的全量当前期基础查询集，仅用于提取“总体情况面板” Banner 数据
         qs_all = OtnFault.objects.select_related('province', 'interruption_location_a', 'handling_unit').prefetch_related('interruption_location')
-        all_current_qs = qs_all.filter(fault_occurrence_time__gte=start_date, fault_occurrence_time__lt=end_date)
-        filtered_current_qs = _apply_physical_province_filter(all_current_qs, selected_provinces)
-        all_faults = list(filtered_current_qs)
 
-        # 计算当前期影响程度等级指标卡片数据
-        annotated_current_qs = _annotate_class_i_business_impact(
-            _exclude_planned_rectification_faults(filtered_current_qs)
-        )
-        current_level_stats = annotated_current_qs.aggregate(
-            total=Count('id', filter=Q_CLASS_TOTAL),
-            class_i_ii=Count('id', filter=Q_CLASS_I_II),
-            class_i=Count('id', filter=Q_CLASS_I),
-            class_ii=Count('id', filter=Q_CLASS_II),
-            class_iii=Count('id', filter=Q_CLASS_III),
-            class_iv=Count('id', filter=Q_CLASS_IV),
-            class_v=Count('id', filter=Q_CLASS_V),
+        # 当前期影响程度等级、环形图与总体分类统计均按故障日汇总表求和
+        current_rollup_summary = _summarize_fault_rollup_rows(
+            _load_fault_rollup_rows(start_date, end_date, selected_provinces, now)
         )
+
+        # 计算当前期影响程度等级指标卡片数据
+        current_level_stats = current_rollup_summary['level_stats']
         current_cutover_count = CutoverTask.objects.filter(
             started_at__gte=start_date,
             started_at__lt=end_date
@@ -2094,55 +2466,19 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
             yoy_level_stats = yoy_data.get('impact_level_summary', yoy_level_stats)
 
         # 计算当前期影响程度等级占比环形图数据
-        ring_fiber = {"class_i": 0, "class_ii": 0, "suspended": 0}
-        ring_power = {"class_i": 0, "class_iii": 0, "suspended": 0}
-        ring_environment = {"class_i": 0, "class_iii": 0, "suspended": 0}
+        ring_fiber = current_rollup_summary['ring_fiber']
+        ring_power = current_rollup_summary['ring_power']
+        ring_environment = current_rollup_summary['ring_environment']
 
-        for fault in annotated_current_qs:
-            if fault.source_cutover_task_id is not None:
-                continue
-            is_suspended = fault.fault_status == FaultStatusChoices.SUSPENDED or fault.is_suspended
-            
-            if fault.fault_category == FaultCategoryChoices.FIBER_BREAK:
-                if is_suspended:
-                    ring_fiber["suspended"] += 1
-                elif fault.has_class_i_business_impact:
-                    ring_fiber["class_i"] += 1
-                else:
-                    ring_fiber["class_ii"] += 1
-            elif fault.fault_category == FaultCategoryChoices.POWER_FAULT:
-                if is_suspended:
-                    ring_power["suspended"] += 1
-                elif fault.power_fault_impact == PowerFaultImpactChoices.HOSTED:
-                    ring_power["class_i"] += 1
-                else:
-                    ring_power["class_iii"] += 1
-            elif fault.fault_category in [FaultCategoryChoices.AC_FAULT, FaultCategoryChoices.DEVICE_FAULT]:
-                is_class_i_ac = fault.fault_category == FaultCategoryChoices.AC_FAULT and getattr(fault, 'ac_fault_is_class_i', False)
-                is_class_i_device = fault.fault_category == FaultCategoryChoices.DEVICE_FAULT and getattr(fault, 'device_fault_is_class_i', False)
-                if is_suspended:
-                    ring_environment["suspended"] += 1
-                elif is_class_i_ac or is_class_i_device:
-                    ring_environment["class_i"] += 1
-                else:
-                    ring_environment["class_iii"] += 1
-
-        unfiltered_current_faults = list(all_current_qs)
         all_suspended_faults_total_count = _apply_physical_province_filter(qs_all.filter(_suspended_fault_q()), selected_provinces).count()
         all_open_suspended_faults_count = _apply_physical_province_filter(
             qs_all.filter(_suspended_fault_q()).exclude(fault_status=FaultStatusChoices.CLOSED),
             selected_provinces,
         ).count()
-        unfiltered_open_suspended_faults_count = qs_all.filter(_suspended_fault_q()).exclude(fault_status=FaultStatusChoices.CLOSED).count()
-
-        overall_faults = [
-            f for f in all_faults
-            if f.fault_category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES
-        ]
-        overall_total_count = len(overall_faults)
-        overall_category_stats = _build_fault_category_summary(overall_faults, now)
-        other_overview = _build_other_fault_summary(
-            all_faults,
+        overall_total_count = current_rollup_summary['overall_total_count']
+        overall_category_stats = current_rollup_summary['category_stats']
+        other_overview = _build_other_fault_summary_from_counts(
+            current_rollup_summary['category_counts'],
             all_open_suspended_faults_count,
             all_suspended_faults_total_count,
         )
@@ -2166,17 +2502,14 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
         physical_daily_stats = _build_physical_daily_fault_series(physical_daily_start, physical_daily_end, physical_daily_faults, now)
 
         # 提取当前期光缆中断故障
-        global_cable_break_faults = list(get_cable_break_base_queryset(start_date, end_date))
-        physical_duration_boxplot_faults = list(_apply_physical_province_filter(
+        cable_break_qs = _apply_physical_province_filter(
             get_cable_break_base_queryset(start_date, end_date),
             selected_provinces,
-        ))
+        )
+        physical_duration_boxplot_faults = list(cable_break_qs)
         physical_duration_boxplot_stats = _build_physical_daily_fault_series(start_date, end_date, physical_duration_boxplot_faults, now)
         faults = physical_duration_boxplot_faults
         branch_company_stats = _build_branch_company_statistics(
-            unfiltered_current_faults,
-            global_cable_break_faults,
-            unfiltered_open_suspended_faults_count,
             start_date,
             end_date,
             now,
@@ -2227,24 +2560,8 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
         long_faults_count = 0
         repeat_faults_count = 0
         
-        fiber_faults = [f for f in faults if f.is_fiber_fault]
-        if fiber_faults:
-            min_occurrence = min([f.fault_occurrence_time for f in fiber_faults])
-            check_start = min_occurrence - timedelta(days=60)
-            past_faults_qs = OtnFault.objects.filter(
-                fault_occurrence_time__gte=check_start,
-                fault_occurrence_time__lt=end_date if end_date else now,
-                fault_category__in=[FaultCategoryChoices.FIBER_BREAK, 
-                                    FaultCategoryChoices.FIBER_DEGRADATION, 
-                                    FaultCategoryChoices.FIBER_JITTER]
-            ).select_related('interruption_location_a').prefetch_related('interruption_location')
-            past_faults_list = list(past_faults_qs)
-        else:
-            past_faults_list = []
-
         # 统一计算当前期的重复故障
-        repeat_result = detect_repeat_faults(faults, past_faults_list)
-        repeat_faults_count = len(repeat_result.kpi_repeat_ids)
+        repeat_faults_count = len(_build_repeat_fault_id_set(faults))
 
         # 统计图表维度
         resource_stats = {}
@@ -2274,8 +2591,8 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
             reason_stats[reason]['count'] += 1
             reason_stats[reason]['duration'] += duration_hours
 
-        # 使用辅助函数计算当前期光缆中断概览
-        cable_break_overview = _compute_cable_break_overview(faults, now)
+        # 当前期光缆中断概览与对比周期同样在数据库内聚合
+        cable_break_overview = _compute_cable_break_overview_from_queryset(cable_break_qs, now)
         avg_duration_hours = total_duration_hours / total_count if total_count > 0 else 0.0
 
         # 计算上周期和同比周期的全维度对比数据
@@ -2386,10 +2703,7 @@ class FaultStatisticsDataAPI(PermissionRequiredMixin, View):
             'selected_provinces': selected_provinces,
         }
 
-        if is_ended:
-            cache.set(cache_key, response_data, timeout=12 * 3600)
-
-        return JsonResponse(response_data)
+        return response_data
 
 
 
@@ -2404,10 +2718,49 @@ class ServiceStatisticsDataAPI(PermissionRequiredMixin, View):
     permission_required = 'netbox_otnfaults.view_otnfaultimpact'
 
     def get(self, request) -> JsonResponse:
+        return JsonResponse(self.cached_response_data(request))
+
+    @classmethod
+    def cached_response_data(cls, request: HttpRequest, force_refresh: bool = False) -> dict[str, Any]:
+        """按请求参数读取业务统计缓存，接口与缓存预热共用同一套缓存键。"""
         start_date, end_date, prev_start_date, prev_end_date, _yoy_start_date, _yoy_end_date, filter_type = _parse_time_range(request)
         include_all_bare_fiber: bool = request.GET.get('include_all_bare_fiber') == '1'
         now = timezone.localtime()
         selected_year = int(request.GET.get('year', start_date.year))
+        calendar_year = int(request.GET.get('calendar_year', selected_year))
+        calendar_month = int(request.GET.get('calendar_month', timezone.localtime(start_date).month))
+
+        cache_key, base_cache_key = _service_summary_cache_keys(
+            filter_type,
+            (start_date, end_date),
+            include_all_bare_fiber,
+            selected_year,
+            calendar_year,
+            calendar_month,
+        )
+        fresh_timeout, stale_timeout = statistics_cache_timeouts(bool(end_date and end_date <= now))
+        return get_or_compute(
+            cache_key,
+            lambda: cls.build_response_data(
+                start_date, end_date, include_all_bare_fiber, selected_year, calendar_year, calendar_month,
+            ),
+            fresh_timeout,
+            stale_timeout,
+            stale_key=base_cache_key,
+            force_refresh=force_refresh,
+        )
+
+    @staticmethod
+    def build_response_data(
+        start_date: datetime,
+        end_date: datetime,
+        include_all_bare_fiber: bool,
+        selected_year: int,
+        calendar_year: int,
+        calendar_month: int,
+    ) -> dict[str, Any]:
+        """计算业务统计载荷，供接口缓存未命中、后台刷新及缓存预热调用。"""
+        now = timezone.localtime()
         tz = timezone.get_current_timezone()
         year_start = timezone.datetime(selected_year, 1, 1, tzinfo=tz)
         year_end = timezone.datetime(selected_year + 1, 1, 1, tzinfo=tz)
@@ -2437,8 +2790,6 @@ class ServiceStatisticsDataAPI(PermissionRequiredMixin, View):
         yearly_impacts = []
         calendar_impacts = []
         
-        calendar_year = int(request.GET.get('calendar_year', selected_year))
-        calendar_month = int(request.GET.get('calendar_month', timezone.localtime(start_date).month))
         calendar_months = _build_recent_calendar_months(calendar_year, calendar_month, tz, num_months=3)
         calendar_full_months = _build_year_to_month_calendar_months(calendar_year, calendar_month, tz)
         
@@ -2820,11 +3171,11 @@ class ServiceStatisticsDataAPI(PermissionRequiredMixin, View):
             display_end_date = end_date - timedelta(days=1)
             display_end_date_str = display_end_date.strftime('%Y-%m-%d')
 
-        return JsonResponse({
+        return {
             'period': build_period_display(start_date, end_date, now),
             'period_total_hours': round(period_total_hours, 2),
             'services': services_result,
-        })
+        }
 
 
 class FaultStatisticsDetailsAPI(PermissionRequiredMixin, View):
@@ -3063,7 +3414,7 @@ class FaultStatisticsDetailsAPI(PermissionRequiredMixin, View):
             if fiber_faults:
                 min_t = min(f.fault_occurrence_time for f in fiber_faults)
                 preceding_qs = OtnFault.objects.filter(
-                    fault_occurrence_time__gte=min_t - timedelta(days=60),
+                    fault_occurrence_time__gte=min_t - REPEAT_FAULT_WINDOW,
                     fault_occurrence_time__lt=end_date if end_date else now,
                     fault_category__in=[FaultCategoryChoices.FIBER_BREAK, 
                                         FaultCategoryChoices.FIBER_DEGRADATION, 
@@ -3203,24 +3554,16 @@ class FaultRepeatsAPI(PermissionRequiredMixin, View):
             
         t = fault.fault_occurrence_time
         past_qs = OtnFault.objects.filter(
-            fault_occurrence_time__gte=t - timedelta(days=60),
-            fault_occurrence_time__lt=t + timedelta(days=60),
+            fault_occurrence_time__gte=t - REPEAT_FAULT_WINDOW,
+            fault_occurrence_time__lt=t + REPEAT_FAULT_WINDOW,
             fault_category__in=[FaultCategoryChoices.FIBER_BREAK, 
                                 FaultCategoryChoices.FIBER_DEGRADATION, 
                                 FaultCategoryChoices.FIBER_JITTER]
         ).select_related('province', 'interruption_location_a', 'handling_unit').prefetch_related('interruption_location')
         
-        z_ids = set(s.id for s in fault.interruption_location.all())
-        matched_faults = []
-        for f in past_qs:
-            if f.id == fault.id:
-                continue
-            if f.interruption_location_a_id == fault.interruption_location_a_id:
-                f_z_ids = set(s.id for s in f.interruption_location.all())
-                if z_ids.intersection(f_z_ids):
-                    matched_faults.append(f)
+        matched_faults = RepeatFaultIndex(past_qs).related(fault, t - REPEAT_FAULT_WINDOW, t + REPEAT_FAULT_WINDOW)
         
-        all_matched = [fault] + sorted(matched_faults, key=lambda x: x.fault_occurrence_time)
+        all_matched = [fault] + matched_faults
         
         results = []
         now = timezone.localtime()
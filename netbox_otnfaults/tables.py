@@ -1059,6 +1059,7 @@ class CutoverTaskTable(NetBoxTable):
             'management_unit', 'management_unit_name', 'cutover_reason',
             'province', 'cutover_location', 'interruption_location_a', 'interruption_location',
             'cutover_longitude', 'cutover_latitude',
+            'resolved_longitude', 'resolved_latitude', 'resolved_coords_source',
             'implementation_unit', 'cutover_contact', 'cutover_contact_phone', 'line_supervisor',
             'planned_cutover_time', 'planned_cutover_times', 'planned_impact_minutes',
             'resource_type', 'cable_route', 'resource_owner', 'maintenance_mode',
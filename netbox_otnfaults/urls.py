@@ -42,6 +42,11 @@ urlpatterns = [
     path('faults/bulk-delete/', views.OtnFaultBulkDeleteView.as_view(), name='otnfault_bulk_delete'),
     path('faults/map-globe/', views.OtnFaultGlobeMapView.as_view(), name='otnfault_map_globe'),
     path('faults/map-data/', views.OtnFaultMapDataView.as_view(), name='otnfault_map_data'),
+    path('faults/map-clusters/', views.FaultMapClusterView.as_view(), name='otnfault_map_clusters'),
+    path('map/sites-data/', views.MapSitesDataView.as_view(), name='map_sites_data'),
+    path('map/tiles/<str:layer>/<int:z>/<int:x>/<int:y>.mvt', views.MapTileView.as_view(), name='map_tile'),
+    path('map/tiles/<str:layer>/features/<int:pk>/', views.MapTileFeatureView.as_view(), name='map_tile_feature'),
+    path('map/province-boundaries/', views.ProvinceBoundariesView.as_view(), name='map_province_boundaries'),
     path('map/preferences/<str:map_mode>/', views.MapPreferenceView.as_view(), name='map_preferences'),
     path('map/location/', views.LocationMapView.as_view(), name='location_map'),
     path('faults/<int:pk>/', include(get_model_urls('netbox_otnfaults', 'otnfault'))),
@@ -149,6 +154,7 @@ urlpatterns = [
     # 大屏可视化系统
     path('dashboard/', dashboard_views.DashboardPageView.as_view(), name='dashboard'),
     path('dashboard/data/', dashboard_views.DashboardDataAPI.as_view(), name='dashboard_data'),
+    path('dashboard/events/', dashboard_views.DashboardEventStreamView.as_view(), name='dashboard_events'),
 
     # 每周通报大屏
     path('weekly-report/', weekly_report_views.WeeklyReportPageView.as_view(), name='weekly_report'),
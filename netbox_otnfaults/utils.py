@@ -51,7 +51,13 @@ def build_fault_colors_config() -> dict[str, dict[str, str]]:
     }
 
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from datetime import timedelta
+
+
+REPEAT_FAULT_WINDOW = timedelta(days=60)
+
 
 @dataclass
 class RepeatFaultResult:
@@ -60,6 +66,89 @@ class RepeatFaultResult:
     matched_preceding_faults: list
 
 
+class RepeatFaultIndex:
+    """
+    重复故障索引：按 (A端站点, Z端站点) 分桶，桶内按故障起始时间排序，
+    通过二分查找定位 60 天窗口内的前后故障，避免逐条两两比较。
+    """
+
+    def __init__(self, faults=(), z_site_cache: dict[int, set[int]] | None = None,
+                 window: timedelta = REPEAT_FAULT_WINDOW) -> None:
+        self.window = window
+        self.z_site_cache: dict[int, set[int]] = z_site_cache if z_site_cache is not None else {}
+        self._bucket_faults: dict[tuple[int, int], dict[int, object]] = {}
+        self._buckets: dict[tuple[int, int], tuple[list, list]] = {}
+        for fault in faults:
+            self.add(fault)
+
+    def z_site_ids(self, fault) -> set[int]:
+        if fault.id not in self.z_site_cache:
+            self.z_site_cache[fault.id] = set(site.id for site in fault.interruption_location.all())
+        return self.z_site_cache[fault.id]
+
+    def _keys(self, fault) -> list[tuple[int, int]]:
+        if not fault.is_fiber_fault or not fault.fault_occurrence_time:
+            return []
+        a_id = fault.interruption_location_a_id
+        if not a_id:
+            return []
+        return [(a_id, z_id) for z_id in self.z_site_ids(fault)]
+
+    def add(self, fault) -> None:
+        for key in self._keys(fault):
+            self._bucket_faults.setdefault(key, {})[fault.id] = fault
+            self._buckets.pop(key, None)
+
+    def _bucket(self, key: tuple[int, int]) -> tuple[list, list]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            ordered = sorted(self._bucket_faults.get(key, {}).values(), key=lambda x: x.fault_occurrence_time)
+            bucket = ([f.fault_occurrence_time for f in ordered], ordered)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _iter_window(self, fault, lower, upper, include_lower: bool, include_upper: bool):
+        for key in self._keys(fault):
+            if key not in self._bucket_faults:
+                continue
+            times, ordered = self._bucket(key)
+            lo = bisect_left(times, lower) if include_lower else bisect_right(times, lower)
+            hi = bisect_right(times, upper) if include_upper else bisect_left(times, upper)
+            for position in range(lo, hi):
+                if ordered[position].id != fault.id:
+                    yield ordered[position]
+
+    def _exists(self, fault, lower, upper, include_lower: bool, include_upper: bool) -> bool:
+        return next(self._iter_window(fault, lower, upper, include_lower, include_upper), None) is not None
+
+    def has_preceding(self, fault) -> bool:
+        """是否存在起始时间早于本故障且间隔不超过窗口期的同路由故障（KPI 口径）。"""
+        t = fault.fault_occurrence_time
+        return bool(t) and self._exists(fault, t - self.window, t, True, False)
+
+    def preceding(self, fault) -> list:
+        """返回窗口期内起始时间早于本故障的同路由故障，按起始时间排序。"""
+        t = fault.fault_occurrence_time
+        if not t:
+            return []
+        return self.related(fault, t - self.window, t)
+
+    def has_neighbor(self, fault) -> bool:
+        """前后窗口期内是否存在其他同路由故障（界面标记口径）。"""
+        t = fault.fault_occurrence_time
+        return bool(t) and self._exists(fault, t - self.window, t + self.window, True, True)
+
+    def has_following(self, fault) -> bool:
+        """是否存在起始时间晚于本故障且间隔不超过窗口期的同路由故障。"""
+        t = fault.fault_occurrence_time
+        return bool(t) and self._exists(fault, t, t + self.window, False, True)
+
+    def related(self, fault, start, end) -> list:
+        """返回 [start, end) 内与本故障同路由的其他故障，按起始时间排序。"""
+        matched = {f.id: f for f in self._iter_window(fault, start, end, True, False)}
+        return sorted(matched.values(), key=lambda x: x.fault_occurrence_time)
+
+
 def detect_repeat_faults(faults, past_faults, preceding_faults=None) -> RepeatFaultResult:
     """
     高效重复故障判定算法。
@@ -68,109 +157,14 @@ def detect_repeat_faults(faults, past_faults, preceding_faults=None) -> RepeatFa
     past_list = list(past_faults)
     preceding_list = list(preceding_faults) if preceding_faults else []
 
-    all_faults = faults_list + past_list + preceding_list
-    
-    z_cache = {}
-    for f in all_faults:
-        if f.id not in z_cache:
-            z_cache[f.id] = set(s.id for s in f.interruption_location.all())
-
-    buckets = {}
-    
-    def add_to_bucket(f):
-        if not f.is_fiber_fault or not f.fault_occurrence_time:
-            return
-        a_id = f.interruption_location_a_id
-        if not a_id:
-            return
-        z_ids = z_cache.get(f.id, set())
-        for z_id in z_ids:
-            key = (a_id, z_id)
-            if key not in buckets:
-                buckets[key] = []
-            buckets[key].append(f)
-
-    for f in all_faults:
-        add_to_bucket(f)
-
-    for key in buckets:
-        unique_f = {}
-        for f in buckets[key]:
-            unique_f[f.id] = f
-        buckets[key] = sorted(unique_f.values(), key=lambda x: x.fault_occurrence_time)
-
-    kpi_repeat_ids = set()
-    ui_repeat_ids = set()
-    matched_preceding_faults = []
+    index = RepeatFaultIndex(faults_list + past_list + preceding_list)
+    kpi_repeat_ids = set(f.id for f in faults_list if index.has_preceding(f))
+    ui_repeat_ids = set(f.id for f in faults_list if index.has_neighbor(f))
 
-    for f in faults_list:
-        if not f.is_fiber_fault or not f.fault_occurrence_time:
-            continue
-        
-        a_id = f.interruption_location_a_id
-        z_ids = z_cache.get(f.id, set())
-        
-        is_kpi = False
-        is_ui = False
-        
-        for z_id in z_ids:
-            key = (a_id, z_id)
-            if key not in buckets:
-                continue
-            
-            bucket_faults = buckets[key]
-            f_time = f.fault_occurrence_time
-            
-            for pf in bucket_faults:
-                if pf.id == f.id:
-                    continue
-                
-                pf_time = pf.fault_occurrence_time
-                time_diff = f_time - pf_time
-                
-                if 0 < time_diff.total_seconds() <= 60 * 86400:
-                    is_kpi = True
-                
-                if abs(time_diff.total_seconds()) <= 60 * 86400:
-                    is_ui = True
-                    
-                if is_kpi and is_ui:
-                    break
-            
-            if is_kpi:
-                kpi_repeat_ids.add(f.id)
-            if is_ui:
-                ui_repeat_ids.add(f.id)
-
-    matched_preceding_set = set()
-    for pf in preceding_list:
-        if not pf.is_fiber_fault or not pf.fault_occurrence_time:
-            continue
-        
-        a_id = pf.interruption_location_a_id
-        z_ids = z_cache.get(pf.id, set())
-        
-        matched = False
-        for z_id in z_ids:
-            key = (a_id, z_id)
-            if key not in buckets:
-                continue
-            
-            bucket_faults = buckets[key]
-            pf_time = pf.fault_occurrence_time
-            
-            for cf in bucket_faults:
-                if cf.id != pf.id and cf in faults_list:
-                    time_diff = cf.fault_occurrence_time - pf_time
-                    if 0 < time_diff.total_seconds() <= 60 * 86400:
-                        matched = True
-                        break
-            if matched:
-                break
-        
-        if matched:
-            matched_preceding_set.add(pf.id)
-            matched_preceding_faults.append(pf)
+    matched_preceding_faults = []
+    if preceding_list:
+        current_index = RepeatFaultIndex(faults_list, z_site_cache=index.z_site_cache)
+        matched_preceding_faults = [pf for pf in preceding_list if current_index.has_following(pf)]
 
     return RepeatFaultResult(
         kpi_repeat_ids=kpi_repeat_ids,
@@ -1,6 +1,6 @@
 from netbox.views import generic
 from django.shortcuts import get_object_or_404, redirect, render
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseNotModified
 from utilities.views import register_model_view, ViewTab
 from django_tables2 import RequestConfig
 from .models import (
@@ -31,13 +31,15 @@ from .tables import (
     HeavyDutyTable, HeavyDutySiteTable
 )
 from django.utils import timezone
-from django.utils.dateparse import parse_datetime
-from datetime import timedelta
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
+from datetime import datetime, timedelta
 from django.views.generic import View
 from django.contrib import messages
-from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Min, Q
+import gzip
 import json
 from typing import Any
 from django.core.serializers.json import DjangoJSONEncoder
@@ -63,11 +65,19 @@ from .services.map_preferences import (
 from .utils import build_fault_colors_config, get_hex_color
 from .template_content import build_contract_fault_context
 from .services.fault_map_data import (
-    build_fault_map_payload,
+    build_fault_map_window_payload,
     build_statistics_cable_break_map_payload,
-    get_sites_data,
+    get_cached_fault_map_payload,
+    get_cached_sites_data,
+    parse_bbox,
+    sites_data_url,
+    sites_data_version,
     build_cutover_map_payload,
 )
+from .services.fault_clusters import get_fault_clusters
+from .services.map_tiles import MAP_TILE_LAYERS, MAP_TILE_MAX_ZOOM, get_map_feature, get_map_tile, is_valid_tile
+from .services.province_boundaries import get_province_boundaries, level_for_zoom
+from .services.stats_cache import get_or_compute, period_cache_tags, statistics_cache_timeouts, tagged_cache_key
 from .services.fault_coordinates import (
     resolve_fault_coordinates,
     resolve_cutover_coordinates,
@@ -191,30 +201,191 @@ class OtnFaultMapDataView(PermissionRequiredMixin, View):
             )
             return JsonResponse({'cutover_data': cutover_data})
 
-        # 获取站点数据 (所有模式都需要)
-        sites_data = get_sites_data()
-        
-        # 根据模式返回不同数据
+        # 站点数据由 MapSitesDataView 按版本单独加载，路径、路径组、位置模式无其他数据
         if mode != 'fault':
-            # 路径、路径组、位置模式只需要站点数据
-            return JsonResponse({
-                'sites_data': sites_data
-            })
+            return JsonResponse({})
         
         # 解析割接过滤参数
         cutover_status = request.GET.getlist('cutover_status') or request.GET.getlist('cutover_status[]')
         cutover_time_range = request.GET.get('cutover_time_range', 'all')
         
-        payload = build_fault_map_payload()
+        # 视野范围与时间窗口参数：按持久化的定位坐标列查询，不经过全量缓存
+        bbox = parse_bbox(request.GET.get('bbox'))
+        if request.GET.get('bbox') and bbox is None:
+            return JsonResponse({'error': 'bbox 参数应为 west,south,east,north'}, status=400)
+        try:
+            since = self._parse_time_param(request.GET.get('since'))
+            until = self._parse_time_param(request.GET.get('until'), end_of_day=True)
+        except ValueError:
+            return JsonResponse({'error': 'since/until 参数应为日期或日期时间'}, status=400)
+
+        if bbox or since or until:
+            payload = build_fault_map_window_payload(since=since, until=until, bbox=bbox)
+        else:
+            payload = get_cached_fault_map_payload()
         cutover_data = build_cutover_map_payload(status_list=cutover_status, time_range=cutover_time_range)
         
         return JsonResponse({
-            'sites_data': sites_data,
             'heatmap_data': payload['heatmap_data'],
             'marker_data': payload['marker_data'],
             'cutover_data': cutover_data,
         })
 
+    @staticmethod
+    def _parse_time_param(value: str | None, end_of_day: bool = False):
+        """
+        解析日期或日期时间参数，未带时区时按当前时区处理；缺省返回 None，格式无效抛出 ValueError。
+        end_of_day 用于开区间的截止参数：仅给出日期时取次日零点，使该日整天包含在内。
+        """
+        if not value:
+            return None
+        # 先按纯日期识别：parse_datetime 也接受纯日期，会丢失"仅给出日期"的信息
+        parsed_date = parse_date(value)
+        if parsed_date is not None:
+            if end_of_day:
+                parsed_date += timedelta(days=1)
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+        else:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValueError(value)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+        return parsed
+
+
+class FaultMapClusterView(PermissionRequiredMixin, View):
+    """故障地图聚合数据 (Async API)：按缩放级别与视野范围返回聚合点或单个故障标记"""
+    permission_required = 'netbox_otnfaults.view_otnfault'
+
+    def get(self, request):
+        try:
+            zoom = int(float(request.GET.get('zoom', 0)))
+        except (ValueError, OverflowError):
+            return JsonResponse({'error': 'zoom 参数无效'}, status=400)
+        bbox = parse_bbox(request.GET.get('bbox'))
+        if request.GET.get('bbox') and bbox is None:
+            return JsonResponse({'error': 'bbox 参数应为 west,south,east,north'}, status=400)
+
+        return JsonResponse(get_fault_clusters(min(max(zoom, 0), MAP_TILE_MAX_ZOOM), bbox))
+
+
+class MapSitesDataView(PermissionRequiredMixin, View):
+    """地图站点数据集 (Async API)，所有地图模式共用，按版本号缓存"""
+    # 与地图页面及原先内嵌站点的 otnfault_map_data 一致，不额外要求 dcim 权限
+    permission_required = 'netbox_otnfaults.view_otnfault'
+
+    # 携带当前版本号请求时浏览器可长期缓存，版本变更后页面将引用新的 URL
+    VERSIONED_MAX_AGE = 365 * 24 * 60 * 60
+
+    def get(self, request):
+        version = sites_data_version()
+        etag = f'"{version}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse({
+                'version': version,
+                'sites_data': get_cached_sites_data(version),
+            })
+
+        response['ETag'] = etag
+        if request.GET.get('v') == version:
+            response['Cache-Control'] = f'private, max-age={self.VERSIONED_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class MapTileView(PermissionRequiredMixin, View):
+    """地图矢量瓦片 (MVT)，按图层与数据集版本缓存"""
+    LAYER_PERMISSIONS = {
+        'faults': 'netbox_otnfaults.view_otnfault',
+        'sites': 'netbox_otnfaults.view_otnfault',
+        'cutovers': 'netbox_otnfaults.view_cutovertask',
+    }
+
+    def get_permission_required(self):
+        return (self.LAYER_PERMISSIONS.get(self.kwargs['layer'], 'netbox_otnfaults.view_otnfault'),)
+
+    def get(self, request, layer, z, x, y):
+        if layer not in MAP_TILE_LAYERS or not is_valid_tile(z, x, y):
+            raise Http404
+
+        version, tile = get_map_tile(layer, z, x, y)
+        etag = f'"{version}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(tile, content_type='application/vnd.mapbox-vector-tile')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class MapTileFeatureView(MapTileView):
+    """矢量瓦片要素详情，供弹窗按 ID 按需加载"""
+
+    def get(self, request, layer, pk):
+        if layer not in MAP_TILE_LAYERS:
+            raise Http404
+
+        feature = get_map_feature(layer, pk)
+        if feature is None:
+            raise Http404
+        return JsonResponse(feature)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """按 Accept-Encoding 的 q 值判断客户端是否接受 gzip，q=0 视为拒绝；未列出 gzip 时以 * 为准"""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+class ProvinceBoundariesView(LoginRequiredMixin, View):
+    """按缩放级别分档简化的省界底图，gzip 压缩下发"""
+
+    MAX_AGE = 24 * 60 * 60
+
+    def get(self, request):
+        try:
+            zoom = float(request.GET.get('zoom', 0))
+        except ValueError:
+            return JsonResponse({'error': 'zoom 参数无效'}, status=400)
+
+        level = level_for_zoom(zoom)
+        version, data = get_province_boundaries(level)
+        use_gzip = _accepts_gzip(request.headers.get('Accept-Encoding', ''))
+        # 强 ETag 需区分编码，gzip 与未压缩两种响应体不能共用同一个标签
+        etag = f'"{version}-{level.name}-{"gzip" if use_gzip else "identity"}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        elif use_gzip:
+            response = HttpResponse(data, content_type='application/geo+json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(data), content_type='application/geo+json')
+        response['ETag'] = etag
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = f'private, max-age={self.MAX_AGE}'
+        return response
+
 
 class MapPreferenceView(PermissionRequiredMixin, View):
     """Current user's per-map-mode style preference endpoint."""
@@ -289,6 +460,7 @@ class OtnFaultGlobeMapView(PermissionRequiredMixin, View):
             
             # 动态数据 URL
             'map_data_url': reverse('plugins:netbox_otnfaults:otnfault_map_data'),
+            'sites_data_url': sites_data_url(),
 
             # 辅助数据
             'fault_list_url': reverse('plugins:netbox_otnfaults:otnfault_list'),
@@ -332,6 +504,7 @@ class StatisticsCableBreakMapView(PermissionRequiredMixin, View):
             'layers_config': json.dumps(mode_config.get('layers', {})),
             'projection': mode_config.get('projection', 'mercator'),
             'map_data_url': map_data_url,
+            'sites_data_url': sites_data_url(),
             'map_period_label': _format_statistics_map_period_label(filter_type, start_date, end_date, now),
             'apikey': plugin_settings.get('map_api_key', ''),
             'map_center': json.dumps(plugin_settings.get('map_default_center', [112.53, 33.00])),
@@ -358,9 +531,48 @@ class StatisticsCableBreakMapDataAPI(PermissionRequiredMixin, View):
     permission_required = 'netbox_otnfaults.view_otnfault'
 
     def get(self, request):
+        payload = self.cached_payload(request)
+        return JsonResponse({
+            'heatmap_data': payload['heatmap_data'],
+            'marker_data': payload['marker_data'],
+            'skipped_count': payload['skipped_count'],
+            'defaulted_count': payload['defaulted_count'],
+        })
+
+    @classmethod
+    def cached_payload(cls, request, force_refresh: bool = False) -> dict:
+        """按请求参数读取光缆中断地图载荷缓存，接口与缓存预热共用同一套缓存键。"""
         start_date, end_date, _prev_start_date, _prev_end_date, _yoy_start_date, _yoy_end_date, _filter_type = _parse_time_range(request)
         now = timezone.localtime()
         selected_provinces = _parse_selected_provinces(request)
+
+        cache_key, base_cache_key = cls.cache_keys(start_date, end_date, selected_provinces)
+        fresh_timeout, stale_timeout = statistics_cache_timeouts(end_date <= now)
+        return get_or_compute(
+            cache_key,
+            lambda: cls.build_payload(start_date, end_date, selected_provinces),
+            fresh_timeout,
+            stale_timeout,
+            stale_key=base_cache_key,
+            force_refresh=force_refresh,
+        )
+
+    @staticmethod
+    def cache_keys(start_date, end_date, selected_provinces: list[str]) -> tuple[str, str]:
+        """返回光缆中断地图载荷的 (缓存键, 旧数据键)，站点数据不入缓存。"""
+        provinces_key = ",".join(sorted(selected_provinces)) or "all"
+        base_cache_key = (
+            f"otnfaults:stats:cable-break-map:v1:{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}:{provinces_key}"
+        )
+        cache_key = tagged_cache_key(
+            base_cache_key,
+            period_cache_tags([(start_date, end_date)], selected_provinces),
+        )
+        return cache_key, base_cache_key
+
+    @staticmethod
+    def build_payload(start_date, end_date, selected_provinces: list[str]) -> dict:
+        now = timezone.localtime()
         base_qs = _apply_physical_province_filter(
             get_cable_break_base_queryset(start_date, end_date),
             selected_provinces,
@@ -372,14 +584,7 @@ class StatisticsCableBreakMapDataAPI(PermissionRequiredMixin, View):
         )
         faults = list(fault_qs)
 
-        payload = build_statistics_cable_break_map_payload(faults, end_date, now)
-        return JsonResponse({
-            'sites_data': get_sites_data(),
-            'heatmap_data': payload['heatmap_data'],
-            'marker_data': payload['marker_data'],
-            'skipped_count': payload['skipped_count'],
-            'defaulted_count': payload['defaulted_count'],
-        })
+        return build_statistics_cable_break_map_payload(faults, end_date, now)
 
 @register_model_view(OtnFault)
 class OtnFaultView(generic.ObjectView):
@@ -1075,15 +1280,13 @@ class LocationMapView(PermissionRequiredMixin, View):
                     geom = path.geometry
                     if isinstance(geom, list):
                         # 纯坐标数组格式，转换为 GeoJSON
-                        coords = geom
                         geometry_obj = {
                             'type': 'LineString',
-                            'coordinates': coords
+                            'coordinates': geom
                         }
                     else:
                         # GeoJSON 格式
                         geometry_obj = geom
-                        coords = geom.get('coordinates', [])
                     
                     # 构建 GeoJSON Feature
                     highlight_path_data = {
@@ -1095,12 +1298,10 @@ class LocationMapView(PermissionRequiredMixin, View):
                         },
                         'geometry': geometry_obj
                     }
-                    # 计算路径中心用于自动缩放
-                    if coords:
-                        lngs = [c[0] for c in coords]
-                        lats = [c[1] for c in coords]
-                        center_lng = sum(lngs) / len(lngs)
-                        center_lat = sum(lats) / len(lats)
+                    # 以预计算的路径范围中心用于自动缩放
+                    if path.bbox_west is not None:
+                        center_lng = float(path.bbox_west + path.bbox_east) / 2
+                        center_lat = float(path.bbox_south + path.bbox_north) / 2
                         target_lat, target_lng = center_lat, center_lng
             except (OtnPath.DoesNotExist, ValueError):
                 pass
@@ -1121,17 +1322,13 @@ class LocationMapView(PermissionRequiredMixin, View):
                 
                 if paths_with_geom.exists():
                     features = []
-                    all_lngs = []
-                    all_lats = []
                     
                     for path in paths_with_geom:
                         geom = path.geometry
                         if isinstance(geom, list):
-                            coords = geom
-                            geometry_obj = {'type': 'LineString', 'coordinates': coords}
+                            geometry_obj = {'type': 'LineString', 'coordinates': geom}
                         else:
                             geometry_obj = geom
-                            coords = geom.get('coordinates', [])
                         
                         features.append({
                             'type': 'Feature',
@@ -1142,21 +1339,20 @@ class LocationMapView(PermissionRequiredMixin, View):
                             },
                             'geometry': geometry_obj
                         })
-                        
-                        # 收集所有坐标用于计算边界
-                        for c in coords:
-                            all_lngs.append(c[0])
-                            all_lats.append(c[1])
                     
                     highlight_paths_data = {
                         'type': 'FeatureCollection',
                         'features': features
                     }
                     
-                    # 计算所有路径的中心
-                    if all_lngs and all_lats:
-                        center_lng = (min(all_lngs) + max(all_lngs)) / 2
-                        center_lat = (min(all_lats) + max(all_lats)) / 2
+                    # 由各路径预计算的范围汇总所有路径的中心
+                    bounds = paths_with_geom.aggregate(
+                        west=Min('bbox_west'), south=Min('bbox_south'),
+                        east=Max('bbox_east'), north=Max('bbox_north'),
+                    )
+                    if bounds['west'] is not None:
+                        center_lng = float(bounds['west'] + bounds['east']) / 2
+                        center_lat = float(bounds['south'] + bounds['north']) / 2
                         target_lat, target_lng = center_lat, center_lng
                     
                     path_name = f"路径组: {path_group_name} ({len(features)} 条路径)"
@@ -1271,6 +1467,7 @@ class LocationMapView(PermissionRequiredMixin, View):
             
             # 共享数据 - 通过 API 动态加载
             'map_data_url': map_data_url,
+            'sites_data_url': sites_data_url(),
             'apikey': plugin_settings.get('map_api_key', ''),
             'map_center': json.dumps(map_center),
             'map_zoom': map_zoom,
@@ -1370,6 +1567,7 @@ class RouteEditorView(PermissionRequiredMixin, View):
             
             # 数据 API
             'map_data_url': reverse('plugins:netbox_otnfaults:otnfault_map_data') + '?mode=route_editor',
+            'sites_data_url': sites_data_url(),
             **build_map_preference_context(request, 'route_editor'),
         })
 
@@ -0,0 +1,157 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+CSR_GRAPH_PATH = PLUGIN_ROOT / "services" / "csr_graph.py"
+GRAPH_PATH = PLUGIN_ROOT / "services" / "otn_path_graph.py"
+HIGHWAY_PATH = PLUGIN_ROOT / "services" / "highway_graph.py"
+SPATIAL_INDEX_PATH = PLUGIN_ROOT / "services" / "spatial_index.py"
+BENCHMARK_PATH = PLUGIN_ROOT / "management" / "commands" / "benchmark_graph_engines.py"
+
+
+def _load_csr_graph_module():
+    spec = importlib.util.spec_from_file_location("csr_graph_under_test", CSR_GRAPH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    with mock.patch.dict(sys.modules, {spec.name: module}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _settings_modules(engine):
+    conf_module = types.ModuleType("django.conf")
+    conf_module.settings = types.SimpleNamespace(PLUGINS_CONFIG={"netbox_otnfaults": {"graph_engine": engine}})
+    return {"django": types.ModuleType("django"), "django.conf": conf_module}
+
+
+csr_graph = _load_csr_graph_module()
+
+BEIJING = (116.4, 39.9)
+TIANJIN = (117.2, 39.1)
+SHIJIAZHUANG = (114.5, 38.0)
+JINAN = (117.0, 36.7)
+ZHENGZHOU = (113.6, 34.7)
+ISOLATED_A, ISOLATED_B = (87.6, 43.8), (88.0, 44.0)
+NODES = [BEIJING, TIANJIN, SHIJIAZHUANG, JINAN, ZHENGZHOU, ISOLATED_A, ISOLATED_B]
+
+
+def _edge(node_a, node_b, path_name):
+    return node_a, node_b, {
+        "weight": csr_graph._haversine(node_a, node_b), "path_name": path_name, "cable_type": "self_built", "path_ids": [1],
+    }
+
+
+EDGES = [
+    _edge(BEIJING, TIANJIN, "京津"),
+    _edge(TIANJIN, JINAN, "京沪"),
+    _edge(JINAN, ZHENGZHOU, "济郑"),
+    _edge(BEIJING, SHIJIAZHUANG, "京石"),
+    _edge(SHIJIAZHUANG, ZHENGZHOU, "京石"),
+    _edge(ISOLATED_A, ISOLATED_B, "乌昌"),
+    _edge(JINAN, JINAN, "济郑"),
+]
+
+
+class GraphEngineSettingTestCase(unittest.TestCase):
+    def test_engine_follows_setting_and_falls_back_without_scipy(self) -> None:
+        with mock.patch.dict(sys.modules, _settings_modules("csr")), mock.patch.object(csr_graph, "HAS_SCIPY", True):
+            self.assertEqual(csr_graph.graph_engine(), csr_graph.CSR_ENGINE)
+        with mock.patch.dict(sys.modules, _settings_modules("csr")), mock.patch.object(csr_graph, "HAS_SCIPY", False):
+            self.assertEqual(csr_graph.graph_engine(), csr_graph.NETWORKX_ENGINE)
+        with mock.patch.dict(sys.modules, _settings_modules("unknown")):
+            self.assertEqual(csr_graph.graph_engine(), csr_graph.NETWORKX_ENGINE)
+
+    def test_services_route_through_engine(self) -> None:
+        graph_source = GRAPH_PATH.read_text(encoding="utf-8")
+        highway_source = HIGHWAY_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("self._graph = CsrRouteGraph.from_snapshot(snapshot)", graph_source)
+        self.assertIn("lru_cache(maxsize=ROUTE_CACHE_SIZE)(self._shortest_path)", graph_source)
+        self.assertIn("segment = self._shortest_path(route_nodes[i], route_nodes[i+1])", highway_source)
+
+    def test_benchmark_counts_the_spatial_index(self) -> None:
+        source = BENCHMARK_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("csr_index = csr_graph.spatial_index()", source)
+        self.assertIn("csr_bytes += csr_index.tree_bytes", source)
+        self.assertIn("service._spatial_index = graph_spatial_index(service._graph)", source)
+
+
+@unittest.skipUnless(csr_graph.HAS_SCIPY, "SciPy 未安装")
+class CsrRouteGraphTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph = csr_graph.CsrRouteGraph.from_edges(NODES, EDGES)
+
+    def test_shortest_path_matches_expected_route(self) -> None:
+        path, length = self.graph.shortest_path(BEIJING, ZHENGZHOU)
+
+        expected = csr_graph._haversine(BEIJING, SHIJIAZHUANG) + csr_graph._haversine(SHIJIAZHUANG, ZHENGZHOU)
+        self.assertEqual(path, (BEIJING, SHIJIAZHUANG, ZHENGZHOU))
+        self.assertAlmostEqual(length, expected, places=3)
+        self.assertIsNone(self.graph.shortest_path(BEIJING, ISOLATED_A))
+        self.assertIsNone(self.graph.shortest_path(BEIJING, (0.0, 0.0)))
+        self.assertEqual(self.graph.shortest_path(JINAN, JINAN), ((JINAN,), 0.0))
+
+    def test_attributes_are_interned(self) -> None:
+        self.assertEqual(self.graph.number_of_nodes(), len(NODES))
+        self.assertEqual(self.graph.number_of_edges(), 6)
+        self.assertEqual(len(self.graph.attr_table), 5)
+        self.assertEqual(self.graph.edge_data(SHIJIAZHUANG, ZHENGZHOU)["path_name"], "京石")
+        self.assertNotIn("path_ids", self.graph.edge_data(BEIJING, TIANJIN))
+        self.assertIsNone(self.graph.edge_data(BEIJING, ZHENGZHOU))
+
+    def test_nodes_are_looked_up_through_sorted_coordinate_index(self) -> None:
+        self.assertEqual(self.graph.nodes(), NODES)
+        self.assertIn(JINAN, self.graph)
+        self.assertNotIn((JINAN[0], JINAN[1] + 1e-5), self.graph)
+        self.assertNotIn((0.0, 0.0), self.graph)
+        self.assertFalse(hasattr(self.graph, "_node_ids"))
+
+    def test_nbytes_counts_every_structure(self) -> None:
+        graph = self.graph
+        arrays = (
+            graph.lngs, graph.lats, graph._order, graph.edge_attrs,
+            graph.matrix.data, graph.matrix.indices, graph.matrix.indptr,
+        )
+
+        self.assertGreater(graph.nbytes, sum(array.nbytes for array in arrays))
+
+
+@unittest.skipUnless(csr_graph.HAS_SCIPY, "SciPy 未安装")
+class CsrSpatialIndexTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        spec = importlib.util.spec_from_file_location("spatial_index_under_test", SPATIAL_INDEX_PATH)
+        spatial_index = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(spatial_index)
+        self.graph = csr_graph.CsrRouteGraph.from_edges(NODES, EDGES)
+        self.index = spatial_index.graph_spatial_index(self.graph)
+        self.reference = spatial_index.NodeSpatialIndex(NODES)
+
+    def test_queries_match_node_spatial_index(self) -> None:
+        self.assertIsInstance(self.index, csr_graph.CsrSpatialIndex)
+        for lng, lat in ((116.0, 39.0), (88.1, 43.9), (0.0, 0.0)):
+            for expected, found in (
+                (self.reference.nearest(lng, lat, k=3), self.index.nearest(lng, lat, k=3)),
+                (self.reference.nearest(lng, lat, k=10, max_distance=300000), self.index.nearest(lng, lat, k=10, max_distance=300000)),
+                (self.reference.within(lng, lat, 400000), self.index.within(lng, lat, 400000)),
+            ):
+                self.assertEqual([node for _distance, node in found], [node for _distance, node in expected])
+                for (found_distance, _node), (expected_distance, _node) in zip(found, expected):
+                    self.assertAlmostEqual(found_distance, expected_distance, delta=0.01)
+        self.assertEqual(self.index.nearest(116.0, 39.0, k=0), [])
+
+    def test_index_keeps_arrays_instead_of_node_tuples(self) -> None:
+        self.assertEqual(len(self.index), len(NODES))
+        self.assertGreater(self.index.nbytes, self.index.tree_bytes)
+        self.assertFalse(hasattr(self.index, "_nodes"))
+
+
+if __name__ == "__main__":
+    unittest.main()
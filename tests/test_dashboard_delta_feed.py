@@ -0,0 +1,169 @@
+from datetime import datetime, timezone
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DELTA_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "dashboard_delta.py"
+DASHBOARD_VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "dashboard_views.py"
+DASHBOARD_APP_PATH = REPO_ROOT / "netbox_otnfaults" / "static" / "netbox_otnfaults" / "js" / "dashboard" / "dashboard_app.js"
+
+
+class _FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+
+class _Manager:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+
+    def aggregate(self, **kwargs):
+        return dict(self.fingerprint)
+
+    def filter(self, **kwargs):
+        return types.SimpleNamespace(count=lambda: self.fingerprint["in_window"])
+
+
+def _load_delta_module(fake_cache, fingerprint):
+    model = types.SimpleNamespace(objects=_Manager(fingerprint))
+    django_module = types.ModuleType("django")
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = fake_cache
+    serializers_module = types.ModuleType("django.core.serializers.json")
+    serializers_module.DjangoJSONEncoder = json.JSONEncoder
+    models_module = types.ModuleType("django.db.models")
+    models_module.Count = mock.MagicMock()
+    models_module.Max = mock.MagicMock()
+    dcim_models = types.ModuleType("dcim.models")
+    dcim_models.Site = model
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(DELTA_PATH.parents[1])]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(DELTA_PATH.parent)]
+    otn_models = types.ModuleType("netbox_otnfaults.models")
+    for name in ("CutoverImpact", "CutoverTask", "HeavyDuty", "OtnFault", "OtnFaultImpact", "OtnPath"):
+        setattr(otn_models, name, model)
+    modules = {
+        "django": django_module,
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "django.core.serializers": types.ModuleType("django.core.serializers"),
+        "django.core.serializers.json": serializers_module,
+        "django.db": types.ModuleType("django.db"),
+        "django.db.models": models_module,
+        "dcim": types.ModuleType("dcim"),
+        "dcim.models": dcim_models,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.models": otn_models,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.dashboard_delta", DELTA_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+def _payload(faults, sites):
+    return {
+        "timestamp": "2025-03-01T08:00:00+08:00",
+        "summary": {"active_faults": len(faults)},
+        "active_faults": faults,
+        "trend_24h": [],
+        "sites": sites,
+        "fault_paths": [],
+        "ticker_events": [],
+        "cutovers": [],
+        "heavy_duties": [],
+    }
+
+
+class DashboardDeltaFeedTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = _FakeCache()
+        self.fingerprint = {"count": 3, "updated": "2025-03-01T00:00:00", "in_window": 0}
+        self.module = _load_delta_module(self.cache, self.fingerprint)
+
+    def test_version_changes_with_source_data_and_hour(self) -> None:
+        now = datetime(2025, 3, 1, 8, 0, 10, tzinfo=timezone.utc)
+        version = self.module.dashboard_data_version(now)
+
+        self.assertEqual(self.module.dashboard_data_version(now.replace(minute=59)), version)
+        self.assertNotEqual(self.module.dashboard_data_version(now.replace(hour=9)), version)
+        self.fingerprint["in_window"] = 1
+        self.assertNotEqual(self.module.dashboard_data_version(now), version)
+        self.fingerprint["in_window"] = 0
+        self.fingerprint["count"] = 4
+        self.assertNotEqual(self.module.dashboard_data_version(now), version)
+
+    def test_unknown_version_returns_full_payload(self) -> None:
+        payload = _payload([{"id": 1, "duration": "1分"}], [{"id": 10, "name": "A"}])
+
+        response = self.module.build_dashboard_response(payload, "v1", "missing")
+
+        self.assertFalse(response["delta"])
+        self.assertEqual(response["version"], "v1")
+        self.assertEqual(response["sites"], [{"id": 10, "name": "A"}])
+
+    def test_known_version_returns_only_changed_items(self) -> None:
+        sites = [{"id": 10, "name": "A"}, {"id": 11, "name": "B"}]
+        self.module.build_dashboard_response(
+            _payload([{"id": 1, "duration": "1分"}, {"id": 2, "duration": "5分"}], sites), "v1", None
+        )
+
+        response = self.module.build_dashboard_response(
+            _payload([{"id": 3, "duration": "1秒"}, {"id": 1, "duration": "2分"}], sites), "v2", "v1"
+        )
+
+        self.assertTrue(response["delta"])
+        self.assertNotIn("sites", response)
+        self.assertEqual(response["summary"], {"active_faults": 2})
+        fault_changes = response["changes"]["active_faults"]
+        self.assertEqual(fault_changes["added"], [{"id": 3, "duration": "1秒"}])
+        self.assertEqual(fault_changes["changed"], [])
+        self.assertEqual(fault_changes["removed"], [2])
+        self.assertEqual(fault_changes["order"], [3, 1])
+        self.assertEqual(response["volatile"]["active_faults"][1], {"duration": "2分", "priority_score": None})
+        self.assertEqual(response["changes"]["sites"], {"added": [], "changed": [], "removed": [], "order": [10, 11]})
+
+    def test_snapshot_of_a_version_is_not_overwritten(self) -> None:
+        sites = [{"id": 10, "name": "A"}]
+        self.module.build_dashboard_response(_payload([{"id": 1, "duration": "1分"}], sites), "v1", None)
+        self.module.build_dashboard_response(_payload([{"id": 1, "duration": "2分"}], sites + [{"id": 11, "name": "B"}]), "v1", None)
+
+        response = self.module.build_dashboard_response(_payload([{"id": 1, "duration": "3分"}], sites), "v2", "v1")
+
+        self.assertEqual(response["changes"]["sites"]["removed"], [])
+        self.assertEqual(response["changes"]["active_faults"]["changed"], [])
+
+    def test_view_short_circuits_unchanged_version_and_client_merges_deltas(self) -> None:
+        views_source = DASHBOARD_VIEWS_PATH.read_text(encoding="utf-8")
+        app_source = DASHBOARD_APP_PATH.read_text(encoding="utf-8")
+        get_source = views_source.split("class DashboardDataAPI(", 1)[1].split("def build_payload(", 1)[0]
+
+        self.assertIn("return JsonResponse({'version': version, 'unchanged': True})", get_source)
+        self.assertLess(get_source.index("if since == version:"), get_source.index("self.build_payload(now)"))
+        self.assertIn("url.searchParams.set('since', lastVersion);", app_source)
+        self.assertIn("lastData = data.delta ? _applyDelta(lastData, data) : data;", app_source)
+        self.assertIn("_refreshElapsedFields(lastData);", app_source)
+        self.assertIn("Object.assign({}, item, volatile[id])", app_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
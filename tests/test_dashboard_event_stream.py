@@ -0,0 +1,170 @@
+import asyncio
+import importlib.util
+import inspect
+import json
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+EVENT_STREAM_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "event_stream.py"
+SIGNALS_PATH = REPO_ROOT / "netbox_otnfaults" / "signals.py"
+PLUGIN_INIT_PATH = REPO_ROOT / "netbox_otnfaults" / "__init__.py"
+DASHBOARD_VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "dashboard_views.py"
+DASHBOARD_TEMPLATE_PATH = REPO_ROOT / "netbox_otnfaults" / "templates" / "netbox_otnfaults" / "dashboard.html"
+DASHBOARD_APP_PATH = REPO_ROOT / "netbox_otnfaults" / "static" / "netbox_otnfaults" / "js" / "dashboard" / "dashboard_app.js"
+
+
+class _FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aget_many(self, keys):
+        return self.get_many(keys)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def incr(self, key):
+        if key not in self.data:
+            raise ValueError(key)
+        self.data[key] += 1
+        return self.data[key]
+
+
+def _load_event_stream_module(fake_cache):
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = fake_cache
+    serializers_module = types.ModuleType("django.core.serializers.json")
+    serializers_module.DjangoJSONEncoder = json.JSONEncoder
+    db_module = types.ModuleType("django.db")
+    db_module.transaction = types.SimpleNamespace(on_commit=lambda func: func())
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "django.core.serializers": types.ModuleType("django.core.serializers"),
+        "django.core.serializers.json": serializers_module,
+        "django.db": db_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("event_stream_under_test", EVENT_STREAM_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    module.EVENT_STREAM_LIFETIME = 0
+    return module
+
+
+def _collect(stream):
+    async def collect():
+        return [chunk async for chunk in stream]
+
+    return asyncio.run(collect())
+
+
+class DashboardEventStreamTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = _FakeCache()
+        self.module = _load_event_stream_module(self.cache)
+
+    def test_reconnect_replays_missed_events_in_order(self) -> None:
+        self.module.publish_event("fault", "created", 7, status="processing")
+        self.module.publish_event("impact", "updated", 3, fault_id=7)
+
+        chunks = _collect(self.module.stream_events(0))
+
+        self.assertEqual(chunks[0], "retry: 3000\n\n")
+        self.assertTrue(chunks[1].startswith("id: 1\nevent: fault\n"))
+        self.assertTrue(chunks[2].startswith("id: 2\nevent: impact\n"))
+        self.assertIn('"fault_id": 7', chunks[2])
+        self.assertTrue(chunks[3].startswith("id: 2\nevent: ready\n"))
+
+    def test_reconnect_with_expired_events_requests_resync(self) -> None:
+        self.module.publish_event("fault", "created", 7)
+        self.module.publish_event("fault", "updated", 7)
+        del self.cache.data[self.module._event_key(1)]
+
+        chunks = _collect(self.module.stream_events(0))
+
+        self.assertTrue(chunks[1].startswith("id: 2\nevent: resync\n"))
+        self.assertEqual(len(chunks), 3)
+
+    def test_new_connection_starts_at_current_sequence(self) -> None:
+        self.module.publish_event("cutover", "deleted", 5)
+
+        chunks = _collect(self.module.stream_events(None))
+
+        self.assertEqual(chunks[1], 'id: 1\nevent: ready\ndata: {"sequence": 1}\n\n')
+
+    def test_stream_delivers_events_published_while_connected(self) -> None:
+        self.module.EVENT_STREAM_LIFETIME = 5
+        self.module.EVENT_POLL_INTERVAL = 0.01
+
+        async def consume():
+            stream = self.module.stream_events(None)
+            chunks = []
+            async for chunk in stream:
+                chunks.append(chunk)
+                if "event: ready" in chunk:
+                    self.module.publish_event("fault", "updated", 9)
+                elif "event: fault" in chunk:
+                    break
+            await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(asyncio.wait_for(consume(), timeout=2))
+
+        self.assertTrue(inspect.isasyncgenfunction(self.module.stream_events))
+        self.assertTrue(chunks[-1].startswith("id: 1\nevent: fault\n"))
+
+    def test_signals_publish_and_dashboard_subscribes(self) -> None:
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+        app_source = DASHBOARD_APP_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("post_save.connect(publish_fault_event, sender=OtnFault)", signals_source)
+        self.assertIn("post_delete.connect(publish_cutover_event, sender=CutoverTask)", signals_source)
+        self.assertIn("new EventSource(CONFIG.eventsUrl", app_source)
+        self.assertIn("eventSource.addEventListener('resync'", app_source)
+
+    def test_event_stream_is_opt_in_and_dashboard_falls_back_to_polling(self) -> None:
+        init_source = PLUGIN_INIT_PATH.read_text(encoding="utf-8")
+        views_source = DASHBOARD_VIEWS_PATH.read_text(encoding="utf-8")
+        template_source = DASHBOARD_TEMPLATE_PATH.read_text(encoding="utf-8")
+        app_source = DASHBOARD_APP_PATH.read_text(encoding="utf-8")
+        stream_view_source = views_source.split("class DashboardEventStreamView(", 1)[1].split("\nclass ", 1)[0]
+
+        self.assertIn("'dashboard_event_stream': False,", init_source)
+        self.assertLess(
+            stream_view_source.index("raise Http404("),
+            stream_view_source.index("StreamingHttpResponse(stream_events(last_event_id)"),
+        )
+        self.assertIn("async def get(self, request):", stream_view_source)
+        self.assertLess(
+            stream_view_source.index("await sync_to_async(self._has_permission)(request)"),
+            stream_view_source.index("StreamingHttpResponse(stream_events(last_event_id)"),
+        )
+        self.assertIn("{% if dashboard_event_stream %}{% url \"plugins:netbox_otnfaults:dashboard_events\" %}{% endif %}", template_source)
+        self.assertIn("if (!CONFIG.eventsUrl || !window.EventSource || eventSource) return;", app_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
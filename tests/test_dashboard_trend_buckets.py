@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TIME_BUCKETS_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "time_buckets.py"
+DASHBOARD_VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "dashboard_views.py"
+
+
+class _RowsQuerySet:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+
+    def filter(self, **kwargs):
+        self.filters.update(kwargs)
+        return self
+
+    def order_by(self, *fields):
+        return self
+
+    def annotate(self, **kwargs):
+        return self
+
+    def values(self, *fields):
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def _load_time_buckets_module():
+    django_module = types.ModuleType("django")
+    db_module = types.ModuleType("django.db")
+    models_module = types.ModuleType("django.db.models")
+    for name in ("Count", "DurationField", "ExpressionWrapper", "F", "FloatField", "QuerySet", "Value"):
+        setattr(models_module, name, mock.MagicMock())
+    models_module.Func = type(
+        "Func",
+        (),
+        {"__init__": lambda self, *args, **kwargs: None, "__truediv__": lambda self, other: self},
+    )
+    functions_module = types.ModuleType("django.db.models.functions")
+    functions_module.Floor = mock.MagicMock()
+    modules = {
+        "django": django_module,
+        "django.db": db_module,
+        "django.db.models": models_module,
+        "django.db.models.functions": functions_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("time_buckets_under_test", TIME_BUCKETS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+class DashboardTrendBucketsTestCase(unittest.TestCase):
+    def test_count_by_interval_fills_every_bucket_from_one_grouped_query(self) -> None:
+        module = _load_time_buckets_module()
+        start = datetime(2025, 3, 1, 14, 37, tzinfo=timezone.utc)
+        queryset = _RowsQuerySet([{"bucket": 0.0, "count": 2}, {"bucket": 23.0, "count": 5}])
+
+        counts = module.count_by_interval(queryset, "fault_occurrence_time", start, timedelta(hours=1), 24)
+
+        self.assertEqual(len(counts), 24)
+        self.assertEqual((counts[0], counts[1], counts[23]), (2, 0, 5))
+        self.assertEqual(queryset.filters["fault_occurrence_time__gte"], start)
+        self.assertEqual(queryset.filters["fault_occurrence_time__lt"], start + timedelta(hours=24))
+
+    def test_count_by_interval_groups_series_by_field(self) -> None:
+        module = _load_time_buckets_module()
+        queryset = _RowsQuerySet([
+            {"bucket": 1.0, "fault_category": "fiber_break", "count": 3},
+            {"bucket": 2.0, "fault_category": "power_fault", "count": 1},
+        ])
+
+        counts = module.count_by_interval(
+            queryset, "fault_occurrence_time", datetime(2025, 3, 1, tzinfo=timezone.utc), timedelta(days=1), 3,
+            group_by="fault_category",
+        )
+
+        self.assertEqual(counts, {"fiber_break": [0, 3, 0], "power_fault": [0, 0, 1]})
+
+    def test_dashboard_trend_uses_single_bucketed_query(self) -> None:
+        source = DASHBOARD_VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("hourly_counts = count_by_interval(", source)
+        self.assertNotIn("for i in range(24):", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+COORDS_PATH = PLUGIN_ROOT / "services" / "fault_coordinates.py"
+
+
+class OtnFault:
+    pass
+
+
+class CutoverTask:
+    pass
+
+
+class _PathQuerySet:
+    def __init__(self, paths, calls):
+        self.paths = paths
+        self.calls = calls
+
+    def filter(self, **kwargs):
+        self.calls.append(kwargs)
+        return self
+
+    def exclude(self, **kwargs):
+        return self
+
+    def only(self, *fields):
+        return self
+
+    def __iter__(self):
+        return iter(self.paths)
+
+
+def _load_fault_coordinates_module(paths, calls):
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(PLUGIN_ROOT)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(PLUGIN_ROOT / "services")]
+    models_module = types.ModuleType("netbox_otnfaults.models")
+    models_module.OtnFault = OtnFault
+    models_module.CutoverTask = CutoverTask
+    models_module.OtnPath = types.SimpleNamespace(objects=types.SimpleNamespace(
+        filter=lambda **kwargs: _PathQuerySet(paths, calls).filter(**kwargs),
+    ))
+    modules = {
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.models": models_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.fault_coordinates", COORDS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module, models_module
+
+
+def _site(pk, lat, lng):
+    return types.SimpleNamespace(pk=pk, latitude=lat, longitude=lng)
+
+
+def _fault(pk, a_site, z_sites, source=""):
+    fault = OtnFault()
+    fault.pk = pk
+    fault.interruption_latitude = None
+    fault.interruption_longitude = None
+    fault.interruption_location_a = a_site
+    fault.interruption_location = types.SimpleNamespace(all=lambda: list(z_sites))
+    fault.resolved_latitude = 1.0 if source else None
+    fault.resolved_longitude = 2.0 if source else None
+    fault.resolved_coords_source = source
+    return fault
+
+
+def _path(pk, site_a_id, site_z_id, midpoint):
+    return types.SimpleNamespace(
+        pk=pk, site_a_id=site_a_id, site_z_id=site_z_id, midpoint_latitude=midpoint[0], midpoint_longitude=midpoint[1],
+    )
+
+
+class FaultCoordinateBatchTestCase(unittest.TestCase):
+    def test_resolve_many_uses_one_path_query_for_all_site_pairs(self) -> None:
+        calls = []
+        paths = [
+            _path(10, 1, 2, (30.5, 114.5)),
+            # 反向存储的路径同样匹配 (A=3, Z=1)
+            _path(11, 1, 3, (39.2, 116.2)),
+            _path(12, 2, 3, (0.5, 0.5)),
+        ]
+        module, _models = _load_fault_coordinates_module(paths, calls)
+        site_1, site_2, site_3 = _site(1, 30.0, 114.0), _site(2, 31.0, 115.0), _site(3, 39.0, 116.0)
+        faults = [
+            _fault(100, site_1, [site_2]),
+            _fault(101, site_3, [site_1]),
+            _fault(102, site_1, [site_2, site_3]),
+            _fault(103, site_2, [site_1], source="a_site"),
+        ]
+
+        with mock.patch.object(module, "_find_path_between_sites") as find_path:
+            resolved = module.resolve_many(faults)
+
+        find_path.assert_not_called()
+        self.assertEqual([call for call in calls if "site_a_id__in" in call], [{"site_a_id__in": {1, 2, 3}, "site_z_id__in": {1, 2, 3}}])
+        self.assertEqual((resolved[100].lat, resolved[100].lng, resolved[100].source), (30.5, 114.5, "path_midpoint"))
+        self.assertEqual((resolved[101].lat, resolved[101].lng), (39.2, 116.2))
+        self.assertEqual(resolved[102].source, "a_site")
+        self.assertEqual((resolved[103].lat, resolved[103].lng), (1.0, 2.0))
+
+    def test_refresh_ignores_stored_columns(self) -> None:
+        calls = []
+        module, _models = _load_fault_coordinates_module([_path(10, 1, 2, (30.5, 114.5))], calls)
+        faults = [_fault(100, _site(1, 30.0, 114.0), [_site(2, 31.0, 115.0)], source="a_site")]
+
+        self.assertEqual(module.resolve_many(faults)[100].source, "a_site")
+        self.assertEqual(module.resolve_many(faults, refresh=True)[100].source, "path_midpoint")
+        self.assertEqual(module.resolve_many([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
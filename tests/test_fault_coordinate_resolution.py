@@ -24,15 +24,16 @@ class FaultCoordinateResolutionTestCase(unittest.TestCase):
         self.assertIn("source='cutover'", source)
         self.assertIn("len(z_sites) == 1", source)
         self.assertIn("_find_path_between_sites", source)
-        self.assertIn("_geometry_midpoint", source)
+        self.assertIn("_path_midpoint", source)
         self.assertIn("return _calculate_sites_center", source)
 
-    def test_path_midpoint_uses_coordinate_array_middle_index(self) -> None:
+    def test_path_midpoint_reads_precomputed_columns_without_geometry(self) -> None:
         source = COORDS_PATH.read_text(encoding="utf-8")
 
-        self.assertIn("def _geometry_midpoint(geometry: Any) -> tuple[float, float] | None:", source)
-        self.assertIn("coords = geometry.get('coordinates')", source)
-        self.assertIn("midpoint = coords[len(coords) // 2]", source)
+        self.assertIn("def _path_midpoint(path: Any) -> tuple[float, float] | None:", source)
+        self.assertIn("return float(path.midpoint_latitude), float(path.midpoint_longitude)", source)
+        self.assertIn(".only(*_PATH_MIDPOINT_FIELDS)", source)
+        self.assertNotIn("'geometry'", source.split("_PATH_MIDPOINT_FIELDS = ", 1)[1].split("\n", 1)[0])
 
     def test_map_payload_serializers_delegate_to_shared_resolver_and_keep_imprecision_flags(self) -> None:
         source = MAP_DATA_PATH.read_text(encoding="utf-8")
@@ -47,10 +48,11 @@ class FaultCoordinateResolutionTestCase(unittest.TestCase):
         views_source = VIEWS_PATH.read_text(encoding="utf-8")
         cutover_html_source = (REPO_ROOT / "netbox_otnfaults" / "templates" / "netbox_otnfaults" / "cutovertask.html").read_text(encoding="utf-8")
 
-        self.assertIn("from .services.fault_coordinates import resolve_fault_coordinates", dashboard_source)
-        self.assertIn("resolved = resolve_fault_coordinates(fault)", dashboard_source)
-        self.assertIn("resolve_cutover_coordinates", dashboard_source)
-        self.assertIn("resolved = resolve_cutover_coordinates(cutover)", dashboard_source)
+        self.assertIn("from .services.fault_coordinates import resolve_many", dashboard_source)
+        self.assertIn("fault_coordinates = resolve_many(active_faults_qs)", dashboard_source)
+        self.assertIn("resolved = fault_coordinates[fault.pk]", dashboard_source)
+        self.assertIn("cutover_coordinates = resolve_many(upcoming_cutovers_qs)", dashboard_source)
+        self.assertIn("resolved = cutover_coordinates[cutover.pk]", dashboard_source)
         self.assertIn("'lat': resolved.lat if resolved is not None else None", dashboard_source)
         self.assertIn("'lng': resolved.lng if resolved is not None else None", dashboard_source)
         self.assertIn("'site_a_id': cutover.interruption_location_a_id", dashboard_source)
@@ -0,0 +1,214 @@
+import ast
+from datetime import date, datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MODELS_PATH = REPO_ROOT / "netbox_otnfaults" / "models.py"
+SIGNALS_PATH = REPO_ROOT / "netbox_otnfaults" / "signals.py"
+SERVICE_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "fault_rollup.py"
+COMMAND_PATH = REPO_ROOT / "netbox_otnfaults" / "management" / "commands" / "rebuild_fault_rollups.py"
+MIGRATION_PATH = REPO_ROOT / "netbox_otnfaults" / "migrations" / "0092_otnfaultdailyrollup.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+BASE_TIME = datetime(2025, 3, 1, 8, tzinfo=timezone.utc)
+
+
+def _load_migration_module():
+    django_module = types.ModuleType("django")
+    django_db_module = types.ModuleType("django.db")
+    django_db_module.migrations = types.SimpleNamespace(
+        Migration=object,
+        CreateModel=mock.MagicMock(),
+        AddIndex=mock.MagicMock(),
+        AddConstraint=mock.MagicMock(),
+        RunPython=mock.MagicMock(),
+    )
+    django_db_module.models = mock.MagicMock()
+    django_db_models_module = mock.MagicMock()
+    django_utils_module = types.ModuleType("django.utils")
+    django_utils_module.timezone = types.SimpleNamespace(localdate=lambda value: value.date())
+    django_contrib_module = types.ModuleType("django.contrib")
+    django_postgres_module = types.ModuleType("django.contrib.postgres")
+    django_postgres_module.fields = mock.MagicMock()
+    django_contrib_module.postgres = django_postgres_module
+    django_module.db = django_db_module
+    django_module.utils = django_utils_module
+    django_module.contrib = django_contrib_module
+    modules = {
+        "django": django_module,
+        "django.db": django_db_module,
+        "django.db.models": django_db_models_module,
+        "django.utils": django_utils_module,
+        "django.contrib": django_contrib_module,
+        "django.contrib.postgres": django_postgres_module,
+        "django.contrib.postgres.fields": django_postgres_module.fields,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("fault_rollup_migration_under_test", MIGRATION_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+class _FaultQuerySet(list):
+    def filter(self, **kwargs):
+        return _FaultQuerySet(fault for fault in self if fault.fault_recovery_time is not None)
+
+    def annotate(self, **kwargs):
+        return self
+
+    def iterator(self, chunk_size=None):
+        return iter(self)
+
+
+class _ImpactQuerySet:
+    def filter(self, *args, **kwargs):
+        return self
+
+
+class _RollupManager:
+    def __init__(self):
+        self.created = []
+
+    def bulk_create(self, rollups, batch_size=None):
+        self.created.extend(rollups)
+
+
+def _fault(category, hours, days=0, **overrides):
+    occurrence = BASE_TIME + timedelta(days=days)
+    values = {
+        "province_id": 1,
+        "fault_category": category,
+        "resource_type": "self_built",
+        "interruption_reason": "construction",
+        "interruption_reason_detail": None,
+        "fault_status": "closed",
+        "is_suspended": False,
+        "source_cutover_task_id": None,
+        "power_fault_impact": None,
+        "ac_fault_is_class_i": False,
+        "device_fault_is_class_i": False,
+        "has_class_i_business_impact": False,
+        "fault_occurrence_time": occurrence,
+        "fault_recovery_time": occurrence + timedelta(hours=hours) if hours is not None else None,
+    }
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+class FaultDailyRollupTestCase(unittest.TestCase):
+    def test_model_signals_and_rebuild_command_are_declared(self) -> None:
+        models_source = MODELS_PATH.read_text(encoding="utf-8")
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+        service_source = SERVICE_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("class OtnFaultDailyRollup(models.Model):", models_source)
+        self.assertIn("name='unique_otn_fault_daily_rollup'", models_source)
+        self.assertIn("pre_save.connect(remember_previous_fault_state, sender=OtnFault)", signals_source)
+        self.assertIn("post_save.connect(refresh_fault_rollups, sender=OtnFault)", signals_source)
+        self.assertIn("post_delete.connect(refresh_fault_rollups, sender=OtnFault)", signals_source)
+        self.assertIn("post_save.connect(refresh_fault_rollups_on_impact_change, sender=OtnFaultImpact)", signals_source)
+        self.assertIn("post_save.connect(refresh_fault_rollups_on_service_change, sender=model)", signals_source)
+        self.assertIn("post_delete.connect(refresh_fault_rollups_on_service_change, sender=model)", signals_source)
+        self.assertIn("def refresh_fault_rollup_days(days: Iterable[date | None]) -> int:", service_source)
+        self.assertIn("def rebuild_fault_rollups(batch_size: int = 1000) -> int:", service_source)
+        self.assertTrue(COMMAND_PATH.exists(), "rebuild_fault_rollups management command should exist")
+
+    def test_service_change_refreshes_days_of_impacted_faults(self) -> None:
+        tree = ast.parse(SIGNALS_PATH.read_text(encoding="utf-8"))
+        function = next(
+            node for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name == "refresh_fault_rollups_on_service_change"
+        )
+        occurrence_times = [datetime(2025, 3, 1, 8, tzinfo=timezone.utc), datetime(2025, 3, 4, 9, tzinfo=timezone.utc), None]
+        lookups, refreshed = [], []
+
+        class _Faults:
+            def filter(self, **kwargs):
+                lookups.append(kwargs)
+                return self
+
+            def values_list(self, field, flat=False):
+                return occurrence_times
+
+        namespace = {
+            "OtnFault": types.SimpleNamespace(objects=_Faults()),
+            "fault_rollup_day": lambda value: value.date() if value else None,
+            "refresh_fault_rollup_days": lambda days: refreshed.append(list(days)),
+        }
+        exec(compile(ast.Module(body=[function], type_ignores=[]), str(SIGNALS_PATH), "exec"), namespace)
+        impacts = types.SimpleNamespace(values=lambda field: f"impact.{field}")
+
+        namespace["refresh_fault_rollups_on_service_change"](None, types.SimpleNamespace(fault_impacts=impacts))
+
+        self.assertEqual(lookups, [{"pk__in": "impact.otn_fault_id"}])
+        self.assertEqual(refreshed, [[date(2025, 3, 1), date(2025, 3, 4), None]])
+
+    def test_summary_and_comparison_periods_sum_rollup_rows(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+        comparison_source = source.split("def _compute_comparison_period_data(", 1)[1].split("\n\n\ndef ", 1)[0]
+        api_source = source.split("class FaultStatisticsDataAPI(", 1)[1].split("\n\n\nclass ", 1)[0]
+        loader_source = source.split("def _load_fault_rollup_rows(", 1)[1].split("\n\n\ndef ", 1)[0]
+
+        self.assertIn("rollup_summary = _summarize_fault_rollup_rows(", comparison_source)
+        self.assertIn("current_rollup_summary = _summarize_fault_rollup_rows(", api_source)
+        self.assertNotIn("for fault in annotated_qs:", comparison_source)
+        self.assertNotIn("for fault in annotated_current_qs:", api_source)
+        self.assertIn("rollups.filter(province__name__in=selected_provinces)", loader_source)
+        self.assertIn("fault_recovery_time__isnull=True", loader_source)
+
+    def test_migration_populates_rollups_from_recovered_faults(self) -> None:
+        migration = _load_migration_module()
+        faults = _FaultQuerySet([
+            _fault("fiber_break", 2),
+            _fault("fiber_break", 7),
+            _fault("fiber_break", 30, has_class_i_business_impact=True),
+            _fault("power_fault", 1, power_fault_impact="hosted"),
+            _fault("fiber_break", 3, is_suspended=True),
+            _fault("fiber_break", 1, days=1),
+            _fault("fiber_break", None),
+        ])
+        rollups = _RollupManager()
+        rollup_model = type(
+            "OtnFaultDailyRollup",
+            (),
+            {"objects": rollups, "__init__": lambda self, **kwargs: self.__dict__.update(kwargs)},
+        )
+        models = {
+            "OtnFault": types.SimpleNamespace(objects=faults),
+            "OtnFaultImpact": types.SimpleNamespace(objects=_ImpactQuerySet()),
+            "OtnFaultDailyRollup": rollup_model,
+        }
+        apps = types.SimpleNamespace(get_model=lambda app_label, name: models[name])
+
+        migration.populate_fault_rollups(apps, None)
+
+        summary = {
+            (rollup.day.day, rollup.fault_category, rollup.impact_level): (
+                rollup.fault_count,
+                round(rollup.duration_hours, 2),
+                rollup.long_count,
+                rollup.duration_histogram,
+            )
+            for rollup in rollups.created
+        }
+        class_ii_histogram = [0] * 25
+        class_ii_histogram[1] = 1
+        class_ii_histogram[6] = 1
+        self.assertEqual(summary[(1, "fiber_break", "class_ii")], (2, 9.0, 1, class_ii_histogram))
+        self.assertEqual(summary[(1, "fiber_break", "class_i")][:3], (1, 30.0, 1))
+        self.assertEqual(summary[(1, "fiber_break", "class_i")][3][24], 1)
+        self.assertEqual(summary[(1, "power_fault", "class_i")][:3], (1, 1.0, 0))
+        self.assertEqual(summary[(1, "fiber_break", "class_v")][:3], (1, 3.0, 0))
+        self.assertEqual(summary[(2, "fiber_break", "class_ii")][:3], (1, 1.0, 0))
+        self.assertEqual(len(rollups.created), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES_PATH = REPO_ROOT / "netbox_otnfaults" / "services"
+FAULT_CLUSTERS_PATH = SERVICES_PATH / "fault_clusters.py"
+URLS_PATH = REPO_ROOT / "netbox_otnfaults" / "urls.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "views.py"
+
+
+class _FakeCache:
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+
+def _load_fault_clusters_module(faults, computed, payload_reads=None, payload_version=None):
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = _FakeCache(computed)
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(SERVICES_PATH.parent)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(SERVICES_PATH)]
+    fault_map_data = types.ModuleType("netbox_otnfaults.services.fault_map_data")
+    fault_map_data.bbox_contains = lambda bbox, lng, lat: bbox[0] <= lng <= bbox[2] and bbox[1] <= lat <= bbox[3]
+    fault_map_data.fault_map_data_version = lambda: "faults-v1"
+    def get_cached_fault_map_payload():
+        if payload_reads is not None:
+            payload_reads.append(1)
+        return {"marker_data": faults, "version": payload_version or "faults-v1"}
+
+    fault_map_data.get_cached_fault_map_payload = get_cached_fault_map_payload
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.services.fault_map_data": fault_map_data,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.fault_clusters", FAULT_CLUSTERS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+FAULTS = [
+    {"id": 1, "lng": 116.40, "lat": 39.90, "category": "fiber_break"},
+    {"id": 2, "lng": 116.41, "lat": 39.91, "category": "power_fault"},
+    {"id": 3, "lng": 116.42, "lat": 39.90, "category": "fiber_break"},
+    {"id": 4, "lng": 87.60, "lat": 43.80, "category": "fiber_break"},
+]
+
+
+class FaultMapClustersTestCase(unittest.TestCase):
+    def test_low_zoom_returns_clusters_with_category_breakdown(self) -> None:
+        computed = {}
+        module = _load_fault_clusters_module(FAULTS, computed)
+
+        result = module.get_fault_clusters(5)
+        clusters = sorted(result["clusters"], key=lambda cluster: -cluster["count"])
+
+        self.assertEqual(result["version"], "faults-v1")
+        self.assertEqual(result["markers"], [])
+        self.assertEqual([cluster["count"] for cluster in clusters], [3, 1])
+        self.assertEqual(clusters[0]["categories"], {"fiber_break": 2, "power_fault": 1})
+        self.assertNotIn("fault_id", clusters[0])
+        self.assertEqual(clusters[1]["fault_id"], 4)
+        self.assertAlmostEqual(clusters[0]["lng"], 116.41, places=2)
+
+        # 聚合索引按数据版本只构建一次
+        module.get_fault_clusters(3)
+        self.assertEqual(list(computed), ["otnfaults:map:fault-clusters:v1:faults-v1"])
+        self.assertEqual(sum(cluster["count"] for cluster in computed[next(iter(computed))][0]), 4)
+
+    def test_bbox_filters_clusters_and_high_zoom_returns_markers(self) -> None:
+        module = _load_fault_clusters_module(FAULTS, {})
+        bbox = (100.0, 30.0, 120.0, 45.0)
+
+        low = module.get_fault_clusters(5, bbox)
+        high = module.get_fault_clusters(module.CLUSTER_MAX_ZOOM + 1, bbox)
+
+        self.assertEqual([cluster["count"] for cluster in low["clusters"]], [3])
+        self.assertEqual(high["clusters"], [])
+        self.assertEqual([marker["id"] for marker in high["markers"]], [1, 2, 3])
+
+    def test_cached_index_does_not_read_the_map_payload(self) -> None:
+        payload_reads = []
+        module = _load_fault_clusters_module(FAULTS, {}, payload_reads)
+
+        module.get_fault_clusters(5)
+        module.get_fault_clusters(3)
+        self.assertEqual(len(payload_reads), 1)
+
+        module.get_fault_clusters(module.CLUSTER_MAX_ZOOM + 1)
+        self.assertEqual(len(payload_reads), 2)
+
+    def test_stale_payload_is_indexed_under_its_own_version(self) -> None:
+        computed = {}
+        payload_reads = []
+        module = _load_fault_clusters_module(FAULTS, computed, payload_reads, payload_version="faults-v0")
+
+        result = module.get_fault_clusters(5)
+        high = module.get_fault_clusters(module.CLUSTER_MAX_ZOOM + 1)
+
+        self.assertEqual(result["version"], "faults-v0")
+        self.assertEqual(high["version"], "faults-v0")
+        self.assertEqual(list(computed), ["otnfaults:map:fault-clusters:v1:faults-v0"])
+
+        # 新版本载荷就绪后按新版本重建
+        payload_reads.clear()
+        with mock.patch.object(module, "get_cached_fault_map_payload", return_value={"marker_data": FAULTS[:1], "version": "faults-v1"}):
+            result = module.get_fault_clusters(5)
+        self.assertEqual(result["version"], "faults-v1")
+        self.assertEqual([cluster["count"] for cluster in result["clusters"]], [1])
+
+    def test_view_rejects_non_finite_zoom(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+        view_source = source.split("class FaultMapClusterView(", 1)[1].split("\nclass ", 1)[0]
+
+        self.assertIn("except (ValueError, OverflowError):", view_source)
+
+    def test_cluster_route_is_registered(self) -> None:
+        source = URLS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("path('faults/map-clusters/', views.FaultMapClusterView.as_view(), name='otnfault_map_clusters'),", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
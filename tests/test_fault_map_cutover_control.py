@@ -108,10 +108,9 @@ class FaultMapCutoverControlTestCase(unittest.TestCase):
         )[0]
 
         cutover_only_index = view_method.index("if request.GET.get('cutover_only') == '1':")
-        sites_index = view_method.index("sites_data = get_sites_data()")
-        faults_index = view_method.index("payload = build_fault_map_payload()")
-        self.assertLess(cutover_only_index, sites_index)
+        faults_index = view_method.index("payload = get_cached_fault_map_payload()")
         self.assertLess(cutover_only_index, faults_index)
+        self.assertNotIn("get_sites_data()", view_method)
         self.assertIn("return JsonResponse({'cutover_data': cutover_data})", view_method)
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+import ast
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import types
+import unittest
+
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+MODELS_PATH = PLUGIN_ROOT / "models.py"
+VIEWS_PATH = PLUGIN_ROOT / "views.py"
+SIGNALS_PATH = PLUGIN_ROOT / "signals.py"
+MAP_DATA_PATH = PLUGIN_ROOT / "services" / "fault_map_data.py"
+MIGRATION_PATH = PLUGIN_ROOT / "migrations" / "0093_otnfault_resolved_coordinates.py"
+
+
+def _load_parse_time_param():
+    """从视图源码中取出 _parse_time_param，时区按 UTC 处理。"""
+    tree = ast.parse(VIEWS_PATH.read_text(encoding="utf-8"))
+    function = next(
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef) and node.name == "_parse_time_param"
+    )
+    function.decorator_list = []
+    namespace = {
+        "datetime": datetime,
+        "timedelta": timedelta,
+        "parse_date": parse_date,
+        "parse_datetime": parse_datetime,
+        "timezone": types.SimpleNamespace(
+            is_naive=lambda value: value.tzinfo is None,
+            make_aware=lambda value, tz: value.replace(tzinfo=tz),
+            get_current_timezone=lambda: timezone.utc,
+        ),
+    }
+    exec(compile(ast.Module(body=[function], type_ignores=[]), str(VIEWS_PATH), "exec"), namespace)
+    return namespace["_parse_time_param"]
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("otnfault_resolved_coordinates_migration", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Sites:
+    def __init__(self, sites):
+        self.sites = sites
+
+    def all(self):
+        return self.sites
+
+
+def _site(lat, lng):
+    return types.SimpleNamespace(latitude=lat, longitude=lng)
+
+
+def _fault(a_site=None, z_sites=(), lat=None, lng=None):
+    return types.SimpleNamespace(
+        interruption_latitude=lat,
+        interruption_longitude=lng,
+        interruption_location_a=a_site,
+        interruption_location=_Sites(list(z_sites)),
+    )
+
+
+class FaultMapViewportFilterTestCase(unittest.TestCase):
+    def test_migration_backfill_follows_map_fallback_order(self) -> None:
+        migration = _load_migration()
+        migration._path_midpoint = lambda OtnPath, a_site, z_site: (30.5, 114.3)
+
+        self.assertEqual(migration._resolve(None, _fault(lat=39.9, lng=116.4)), (39.9, 116.4, "fault"))
+        self.assertEqual(
+            migration._resolve(None, _fault(_site(30.0, 114.0), [_site(31.0, 115.0)])),
+            (30.5, 114.3, "path_midpoint"),
+        )
+        self.assertEqual(
+            migration._resolve(None, _fault(_site(30.0, 114.0), [_site(31.0, 115.0), _site(32.0, 116.0)])),
+            (30.0, 114.0, "a_site"),
+        )
+        self.assertEqual(
+            migration._resolve(None, _fault(None, [_site(30.0, 114.0), _site(32.0, 116.0)])),
+            (31.0, 115.0, "sites_center"),
+        )
+        self.assertIsNone(migration._resolve(None, _fault()))
+
+    def test_resolved_coordinate_columns_are_indexed_and_maintained(self) -> None:
+        models_source = MODELS_PATH.read_text(encoding="utf-8")
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn('models.Index(fields=["resolved_longitude", "resolved_latitude"], name="otnfault_resolved_coord_idx"),', models_source)
+        self.assertIn("post_save.connect(refresh_fault_coordinates, sender=OtnFault)", signals_source)
+        self.assertIn(
+            "m2m_changed.connect(refresh_fault_coordinates_on_z_sites_change, sender=OtnFault.interruption_location.through)",
+            signals_source,
+        )
+
+    def test_view_filters_window_and_bbox_through_database_query(self) -> None:
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+        map_data_source = MAP_DATA_PATH.read_text(encoding="utf-8")
+        view_method = views_source.split("class OtnFaultMapDataView", 1)[1].split("\n\nclass FaultMapClusterView", 1)[0]
+
+        self.assertIn("payload = build_fault_map_window_payload(since=since, until=until, bbox=bbox)", view_method)
+        self.assertIn("payload = get_cached_fault_map_payload()", view_method)
+        self.assertIn("faults = faults.filter(bbox_filter(bbox, 'resolved_latitude', 'resolved_longitude'))", map_data_source)
+        self.assertIn("faults = faults.filter(fault_occurrence_time__lt=until)", map_data_source)
+
+    def test_date_only_until_includes_the_whole_day(self) -> None:
+        parse_time_param = _load_parse_time_param()
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertEqual(parse_time_param("2025-03-01"), datetime(2025, 3, 1, tzinfo=timezone.utc))
+        self.assertEqual(parse_time_param("2025-03-01", end_of_day=True), datetime(2025, 3, 2, tzinfo=timezone.utc))
+        self.assertEqual(
+            parse_time_param("2025-03-01T08:30:00", end_of_day=True),
+            datetime(2025, 3, 1, 8, 30, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(parse_time_param("", end_of_day=True))
+        with self.assertRaises(ValueError):
+            parse_time_param("2025-13-01")
+        self.assertIn("until = self._parse_time_param(request.GET.get('until'), end_of_day=True)", views_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_ROOT = REPO_ROOT / "netbox_otnfaults"
+VIEWS_PATH = PACKAGE_ROOT / "views.py"
+MAP_DATA_PATH = PACKAGE_ROOT / "services" / "fault_map_data.py"
+SIGNALS_PATH = PACKAGE_ROOT / "signals.py"
+DASHBOARD_VIEWS_PATH = PACKAGE_ROOT / "dashboard_views.py"
+UNIFIED_MAP_TEMPLATE_PATH = PACKAGE_ROOT / "templates" / "netbox_otnfaults" / "unified_map.html"
+MAP_CORE_PATH = PACKAGE_ROOT / "static" / "netbox_otnfaults" / "js" / "unified_map_core.js"
+
+
+class MapSitesDatasetTestCase(unittest.TestCase):
+    def test_sites_dataset_is_cached_per_tag_version(self) -> None:
+        source = MAP_DATA_PATH.read_text(encoding="utf-8")
+        cached_source = source.split("def get_cached_sites_data(", 1)[1].split("\n\n\ndef ", 1)[0]
+
+        self.assertIn("tagged_cache_key(SITES_DATA_CACHE_KEY, [SITES_TAG])", source)
+        self.assertIn('f"{SITES_DATA_CACHE_KEY}:t{version}"', cached_source)
+        self.assertIn("get_sites_data,", cached_source)
+        self.assertIn("?v={sites_data_version()}", source)
+
+    def test_sites_endpoint_honours_etag_and_versioned_url(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+        view_source = source.split("class MapSitesDataView(", 1)[1].split("\n\n\nclass ", 1)[0]
+
+        self.assertIn("if etag in parse_etags(request.headers.get('If-None-Match', '')):", view_source)
+        self.assertIn("response = HttpResponseNotModified()", view_source)
+        self.assertLess(view_source.index("HttpResponseNotModified()"), view_source.index("get_cached_sites_data(version)"))
+        self.assertIn("if request.GET.get('v') == version:", view_source)
+        self.assertIn("immutable", view_source)
+
+    def test_sites_endpoint_uses_map_permission(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+        view_source = source.split("class MapSitesDataView(", 1)[1].split("\n\n\nclass ", 1)[0]
+
+        self.assertIn("permission_required = 'netbox_otnfaults.view_otnfault'", view_source)
+        self.assertNotIn("dcim.view_site", source)
+
+    def test_map_payloads_no_longer_embed_sites(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertNotIn("'sites_data': get_sites_data()", source)
+        self.assertNotIn("'sites_data': sites_data,", source)
+        self.assertEqual(source.count("'sites_data_url': sites_data_url(),"), 4)
+        self.assertIn("sitesDataUrl: '{{ sites_data_url|escapejs }}',", UNIFIED_MAP_TEMPLATE_PATH.read_text(encoding="utf-8"))
+        map_core = MAP_CORE_PATH.read_text(encoding="utf-8")
+        self.assertIn("fetch(this.config.sitesDataUrl, { credentials: 'same-origin' })", map_core)
+        self.assertIn("await Promise.all([dataPromise, sitesPromise])", map_core)
+
+    def test_site_changes_invalidate_dataset_and_dashboard_reuses_it(self) -> None:
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+        dashboard_source = DASHBOARD_VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("_invalidate_stats_cache([SITES_TAG, CUTOVERS_TAG])", signals_source)
+        self.assertIn("for model in [Site, Tenant, Region, SiteGroup]:", signals_source)
+        self.assertIn("for site in get_cached_sites_data()", dashboard_source)
+        self.assertNotIn("Site.objects.exclude(latitude__isnull=True)", dashboard_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES_PATH = REPO_ROOT / "netbox_otnfaults" / "services"
+MVT_PATH = SERVICES_PATH / "mvt.py"
+MAP_TILES_PATH = SERVICES_PATH / "map_tiles.py"
+URLS_PATH = REPO_ROOT / "netbox_otnfaults" / "urls.py"
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+
+def _read_message(data):
+    """解析一层 protobuf 消息，返回 [(字段号, 值)]，LEN 字段返回原始字节。"""
+    fields = []
+    offset = 0
+    while offset < len(data):
+        key, offset = _read_varint(data, offset)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, offset = _read_varint(data, offset)
+        elif wire_type == 1:
+            value, offset = data[offset:offset + 8], offset + 8
+        else:
+            length, offset = _read_varint(data, offset)
+            value, offset = data[offset:offset + length], offset + length
+        fields.append((field, value))
+    return fields
+
+
+def _read_packed(data):
+    values, offset = [], 0
+    while offset < len(data):
+        value, offset = _read_varint(data, offset)
+        values.append(value)
+    return values
+
+
+def _decode_tile(tile):
+    layers = {}
+    for _field, layer_bytes in _read_message(tile):
+        layer_fields = _read_message(layer_bytes)
+        name = next(value for field, value in layer_fields if field == 1).decode("utf-8")
+        keys = [value.decode("utf-8") for field, value in layer_fields if field == 3]
+        values = [_read_message(value)[0] for field, value in layer_fields if field == 4]
+        features = []
+        for field, feature_bytes in layer_fields:
+            if field != 2:
+                continue
+            feature = dict(_read_message(feature_bytes))
+            tags = _read_packed(feature.get(2, b""))
+            properties = {}
+            for index in range(0, len(tags), 2):
+                value_field, value = values[tags[index + 1]]
+                properties[keys[tags[index]]] = value.decode("utf-8") if value_field == 1 else value
+            features.append({
+                "id": feature.get(1),
+                "type": feature[3],
+                "geometry": _read_packed(feature[4]),
+                "properties": properties,
+            })
+        layers[name] = features
+    return layers
+
+
+class _FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set_many(self, data, timeout=None):
+        self.data.update(data)
+
+
+def _load_map_tiles_module(fake_cache, faults, payload_version="faults-v1"):
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = fake_cache
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(SERVICES_PATH.parent)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(SERVICES_PATH)]
+    fault_map_data = types.ModuleType("netbox_otnfaults.services.fault_map_data")
+    fault_map_data.build_cutover_map_payload = lambda: []
+    fault_map_data.fault_map_data_version = lambda: "faults-v1"
+    fault_map_data.get_cached_fault_map_payload = lambda: {"marker_data": faults, "version": payload_version}
+    fault_map_data.get_cached_sites_data = lambda version=None: []
+    fault_map_data.sites_data_version = lambda: "sites-v1"
+    stats_cache = types.ModuleType("netbox_otnfaults.services.stats_cache")
+    stats_cache.CUTOVERS_TAG = "cutovers"
+    stats_cache.get_or_compute = mock.MagicMock()
+    stats_cache.tagged_cache_key = lambda base, tags: f"{base}:tv1"
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.services.fault_map_data": fault_map_data,
+        "netbox_otnfaults.services.stats_cache": stats_cache,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        return _load_module("netbox_otnfaults.services.map_tiles", MAP_TILES_PATH)
+
+
+class MvtEncoderTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mvt = _load_module("mvt_under_test", MVT_PATH)
+        sys.modules.pop("mvt_under_test", None)
+
+    def test_point_feature_round_trips_through_protobuf(self) -> None:
+        tile = self.mvt.encode_tile({
+            "faults": [{
+                "id": 7,
+                "type": self.mvt.GEOM_POINT,
+                "geometry": [(25, 17)],
+                "properties": {"number": "F-7", "count": 3, "is_long": True, "missing": None},
+            }],
+        })
+
+        feature = _decode_tile(tile)["faults"][0]
+
+        self.assertEqual(feature["id"], 7)
+        self.assertEqual(feature["type"], 1)
+        # MoveTo(1) 后接 zigzag(25)、zigzag(17)
+        self.assertEqual(feature["geometry"], [9, 50, 34])
+        self.assertEqual(feature["properties"], {"number": "F-7", "count": 3, "is_long": 1})
+
+    def test_linestring_uses_relative_moves_and_drops_degenerate_lines(self) -> None:
+        tile = self.mvt.encode_tile({
+            "paths": [
+                {"id": 1, "type": self.mvt.GEOM_LINESTRING, "geometry": [[(2, 2), (2, 2), (10, 2), (10, 12)]]},
+                {"id": 2, "type": self.mvt.GEOM_LINESTRING, "geometry": [[(5, 5), (5, 5)]]},
+            ],
+        })
+
+        features = _decode_tile(tile)["paths"]
+
+        self.assertEqual(len(features), 1)
+        self.assertEqual(features[0]["geometry"], [9, 4, 4, 18, 16, 0, 0, 20])
+
+    def test_tile_pixel_and_bounds_agree(self) -> None:
+        west, south, east, north = self.mvt.tile_bounds(4, 12, 6)
+
+        self.assertEqual(self.mvt.lnglat_to_tile_pixel(west, north, 4, 12, 6), (0, 0))
+        self.assertEqual(self.mvt.lnglat_to_tile_pixel(east, south, 4, 12, 6), (4096, 4096))
+
+
+class MapTileServiceTestCase(unittest.TestCase):
+    def test_tile_contains_only_points_inside_tile_and_is_cached(self) -> None:
+        cache = _FakeCache()
+        faults = [
+            {"id": 1, "lng": 116.4, "lat": 39.9, "number": "F-1", "category": "fiber_break", "status_key": "processing"},
+            {"id": 2, "lng": 87.6, "lat": 43.8, "number": "F-2", "category": "power_fault", "status_key": "closed"},
+        ]
+        module = _load_map_tiles_module(cache, faults)
+        z, x, y = 6, 52, 24
+
+        version, tile = module.get_map_tile("faults", z, x, y)
+        features = _decode_tile(tile)["faults"]
+
+        self.assertEqual([feature["id"] for feature in features], [1])
+        self.assertEqual(features[0]["properties"]["category"], "fiber_break")
+        self.assertIn(f"otnfaults:map:tiles:faults:{version}:{z}:{x}:{y}", cache.data)
+        self.assertEqual(module.get_map_feature("faults", 2)["number"], "F-2")
+        self.assertIsNone(module.get_map_feature("faults", 3))
+        self.assertTrue(module.is_valid_tile(z, x, y))
+        self.assertFalse(module.is_valid_tile(2, 4, 0))
+
+    def test_tile_miss_reads_only_overlapping_buckets_of_the_index(self) -> None:
+        cache = _FakeCache()
+        faults = [
+            {"id": 1, "lng": 116.4, "lat": 39.9, "number": "F-1"},
+            {"id": 2, "lng": 87.6, "lat": 43.8, "number": "F-2"},
+            {"id": 3, "lng": None, "lat": None, "number": "F-3"},
+        ]
+        module = _load_map_tiles_module(cache, faults)
+        module.get_map_tile("faults", 6, 52, 24)
+        faults.clear()
+
+        with mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            _version, tile = module.get_map_tile("faults", 10, 843, 388)
+
+        self.assertEqual([feature["id"] for feature in _decode_tile(tile)["faults"]], [1])
+        self.assertEqual(len(get_many.call_args.args[0]), 1)
+        self.assertEqual(module.get_map_feature("faults", 3)["number"], "F-3")
+
+    def test_stale_payload_is_cached_under_its_own_version(self) -> None:
+        cache = _FakeCache()
+        faults = [{"id": 1, "lng": 116.4, "lat": 39.9, "number": "F-1"}]
+        module = _load_map_tiles_module(cache, faults, payload_version="faults-v0")
+
+        version, _tile = module.get_map_tile("faults", 6, 52, 24)
+
+        self.assertEqual(version, "faults-v0")
+        self.assertIn("otnfaults:map:tiles:faults:faults-v0:6:52:24", cache.data)
+        self.assertNotIn("otnfaults:map:tiles:faults:faults-v1:6:52:24", cache.data)
+        self.assertNotIn("otnfaults:map:tiles:index:faults:faults-v1:manifest", cache.data)
+
+    def test_tile_routes_are_registered(self) -> None:
+        source = URLS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("path('map/tiles/<str:layer>/<int:z>/<int:x>/<int:y>.mvt', views.MapTileView.as_view(), name='map_tile'),", source)
+        self.assertIn("name='map_tile_feature'", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
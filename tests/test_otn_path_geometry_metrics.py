@@ -0,0 +1,221 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+PATH_GEOMETRY_PATH = PLUGIN_ROOT / "services" / "path_geometry.py"
+MODELS_PATH = PLUGIN_ROOT / "models.py"
+METRICS_MIGRATION_PATH = PLUGIN_ROOT / "migrations" / "0095_otnpath_geometry_metrics.py"
+RECOMPUTE_COMMAND_PATH = PLUGIN_ROOT / "management" / "commands" / "recompute_otn_path_metrics.py"
+ENCODED_MIGRATION_PATH = PLUGIN_ROOT / "migrations" / "0096_otnpath_geometry_encoded.py"
+
+
+def _load_path_geometry_module():
+    spec = importlib.util.spec_from_file_location("path_geometry_under_test", PATH_GEOMETRY_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    with mock.patch.dict(sys.modules, {spec.name: module}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _load_migration_module(path):
+    django_module = types.ModuleType("django")
+    django_db_module = types.ModuleType("django.db")
+    django_db_module.migrations = mock.MagicMock()
+    django_db_module.models = mock.MagicMock()
+    django_module.db = django_db_module
+    with mock.patch.dict(sys.modules, {"django": django_module, "django.db": django_db_module}):
+        spec = importlib.util.spec_from_file_location(f"migration_{path.stem}_under_test", path)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+class _SitePairQ:
+    """以两端站点对代替 Q 对象，| 合并为双向匹配的站点对集合。"""
+
+    def __init__(self, site_a, site_z):
+        self.pairs = {(site_a, site_z)}
+
+    def __or__(self, other):
+        merged = _SitePairQ(None, None)
+        merged.pairs = self.pairs | other.pairs
+        return merged
+
+
+class _PathQuerySet:
+    def __init__(self, paths, pairs=None):
+        self.paths = paths
+        self.pairs = pairs
+
+    def filter(self, condition=None, **kwargs):
+        return _PathQuerySet(self.paths, condition.pairs if condition is not None else self.pairs)
+
+    def first(self):
+        return next((path for pair, path in self.paths.items() if pair in self.pairs), None)
+
+
+class _Sites:
+    def __init__(self, sites):
+        self.sites = sites
+
+    def all(self):
+        return self.sites
+
+
+class _LocatedQuerySet:
+    def __init__(self, rows, updates):
+        self.rows = rows
+        self.updates = updates
+
+    def filter(self, pk=None, resolved_coords_source=None):
+        if pk is not None:
+            return types.SimpleNamespace(update=lambda **fields: self.updates.setdefault(pk, fields))
+        return _LocatedQuerySet([row for row in self.rows if row.resolved_coords_source == resolved_coords_source], self.updates)
+
+    def select_related(self, *fields):
+        return self
+
+    def prefetch_related(self, *lookups):
+        return self
+
+    def iterator(self, chunk_size=None):
+        return iter(self.rows)
+
+
+def _located(pk, source, a_site, z_sites):
+    return types.SimpleNamespace(
+        pk=pk, resolved_coords_source=source, interruption_location_a=a_site, interruption_location=_Sites(z_sites),
+    )
+
+
+class OtnPathGeometryMetricsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_path_geometry_module()
+
+    def test_midpoint_is_weighted_by_segment_length_not_vertex_index(self) -> None:
+        # 前两段很短、最后一段很长，真实中点落在最后一段上，而非中间顶点
+        geometry = {"type": "LineString", "coordinates": [[100.0, 30.0], [100.01, 30.0], [100.02, 30.0], [102.0, 30.0]]}
+
+        lat, lng = self.module.arc_length_midpoint(self.module.line_coordinates(geometry))
+
+        self.assertAlmostEqual(lat, 30.0, places=6)
+        self.assertAlmostEqual(lng, 101.0, places=2)
+
+    def test_metric_fields_include_bbox_and_vertex_count(self) -> None:
+        fields = self.module.path_metric_fields([[116.0, 39.0], [117.0, 40.0], None, [115.5, 41.0]])
+
+        self.assertEqual(fields["vertex_count"], 3)
+        self.assertEqual(
+            (fields["bbox_west"], fields["bbox_south"], fields["bbox_east"], fields["bbox_north"]),
+            (115.5, 39.0, 117.0, 41.0),
+        )
+        self.assertEqual(set(fields), set(self.module.PATH_METRIC_FIELDS))
+
+    def test_empty_and_single_point_geometry(self) -> None:
+        empty = self.module.path_metric_fields([])
+        single = self.module.path_metric_fields([[116.0, 39.0]])
+
+        self.assertEqual(empty["vertex_count"], 0)
+        self.assertIsNone(empty["midpoint_latitude"])
+        self.assertEqual((single["midpoint_latitude"], single["midpoint_longitude"]), (39.0, 116.0))
+
+    def test_otn_path_save_refreshes_metrics_with_geometry(self) -> None:
+        source = MODELS_PATH.read_text(encoding="utf-8")
+        path_model = source.split("class OtnPath(OtnBaseModel):", 1)[1].split("\nclass ", 1)[0]
+
+        self.assertIn("for field_name, value in path_metric_fields(self.geometry).items():", path_model)
+        self.assertIn("kwargs['update_fields'] = {*update_fields, *PATH_METRIC_FIELDS, 'geometry_encoded'}", path_model)
+        self.assertIn("self.geometry_encoded = encoded_geometry(self.geometry)", path_model)
+
+    def test_metrics_migration_uses_frozen_copy_matching_service(self) -> None:
+        migration = _load_migration_module(METRICS_MIGRATION_PATH)
+        geometries = [
+            None,
+            [],
+            [[116.0, None]],
+            [[116.0, 39.0]],
+            {"type": "LineString", "coordinates": [[100.0, 30.0], [100.01, 30.0], [100.02, 30.0], [102.0, 30.0]]},
+            [[116.0, 39.0], [117.0, 40.0], None, [115.5, 41.0], [115.5, 41.0]],
+        ]
+
+        self.assertNotIn("netbox_otnfaults.services", METRICS_MIGRATION_PATH.read_text(encoding="utf-8"))
+        self.assertEqual(migration.PATH_METRIC_FIELDS, self.module.PATH_METRIC_FIELDS)
+        for geometry in geometries:
+            self.assertEqual(migration._path_metric_fields(geometry), self.module.path_metric_fields(geometry))
+
+    def test_metrics_migration_moves_path_midpoint_coordinates_to_arc_midpoint(self) -> None:
+        migration = _load_migration_module(METRICS_MIGRATION_PATH)
+        path = types.SimpleNamespace(midpoint_latitude="39.500000", midpoint_longitude="116.800000")
+        fault_updates, cutover_updates = {}, {}
+        faults = [
+            _located(1, "path_midpoint", "A", ["Z"]),
+            _located(2, "path_midpoint", "Z", ["A"]),
+            _located(3, "path_midpoint", "A", ["Y"]),
+            _located(4, "a_site", "A", ["Z"]),
+        ]
+        cutovers = [_located(10, "path_midpoint", "A", ["Z", "Y"])]
+        models = {
+            "OtnPath": types.SimpleNamespace(objects=_PathQuerySet({("A", "Z"): path})),
+            "OtnFault": types.SimpleNamespace(objects=_LocatedQuerySet(faults, fault_updates)),
+            "CutoverTask": types.SimpleNamespace(objects=_LocatedQuerySet(cutovers, cutover_updates)),
+        }
+        apps = types.SimpleNamespace(get_model=lambda app_label, name: models[name])
+
+        with mock.patch.object(migration.models, "Q", _SitePairQ):
+            migration.refresh_path_midpoint_coordinates(apps, None)
+
+        moved = {"resolved_latitude": "39.500000", "resolved_longitude": "116.800000"}
+        cleared = {"resolved_latitude": None, "resolved_longitude": None, "resolved_coords_source": ""}
+        self.assertEqual(fault_updates, {1: moved, 2: moved, 3: cleared})
+        self.assertEqual(cutover_updates, {10: cleared})
+
+    def test_recompute_command_relocates_rows_on_moved_paths(self) -> None:
+        source = RECOMPUTE_COMMAND_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("moved_site_pairs.add((path.site_a_id, path.site_z_id))", source)
+        self.assertIn("refresh_resolved_coordinates_for_path(site_a_id, site_z_id)", source)
+
+    def test_encoded_geometry_migration_uses_frozen_copy_matching_service(self) -> None:
+        migration = _load_migration_module(ENCODED_MIGRATION_PATH)
+        geometries = [
+            None,
+            [],
+            [[116.0, None]],
+            {"type": "LineString", "coordinates": [[116.3974281, 39.9087], [-73.5, -45.25]]},
+            [[116.0, 39.0], ["x", 40.0], None, [115.5, 41.0, 12.0]],
+        ]
+
+        self.assertNotIn("netbox_otnfaults.services", ENCODED_MIGRATION_PATH.read_text(encoding="utf-8"))
+        for geometry in geometries:
+            self.assertEqual(migration._encoded_geometry(geometry), self.module.encoded_geometry(geometry))
+
+    def test_encoded_coordinates_round_trip_at_micro_degree_precision(self) -> None:
+        data = self.module.encoded_geometry({"type": "LineString", "coordinates": [[116.3974281, 39.9087], [-73.5, -45.25]]})
+
+        self.assertEqual(len(data), 16)
+        self.assertEqual(self.module.decode_coordinates(data), [(116.397428, 39.9087), (-73.5, -45.25)])
+        self.assertIsNone(self.module.encoded_geometry([[116.0, None]]))
+        self.assertEqual(self.module.decode_coordinates(None), [])
+
+    def test_coordinate_array_views_buffer_without_copy(self) -> None:
+        data = self.module.encode_coordinates([(116.0, 39.0), (117.5, 40.25)])
+        values = self.module.coordinate_array(data)
+
+        if self.module.HAS_NUMPY:
+            self.assertEqual(values.shape, (2, 2))
+            self.assertFalse(values.flags.owndata)
+            self.assertEqual(values[1].tolist(), [117_500_000, 40_250_000])
+        else:
+            self.assertEqual(list(values), [116_000_000, 39_000_000, 117_500_000, 40_250_000])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+GRAPH_PATH = PLUGIN_ROOT / "services" / "otn_path_graph.py"
+SIGNALS_PATH = PLUGIN_ROOT / "signals.py"
+
+
+class _Cache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def add(self, key, value, timeout=None):
+        self.data.setdefault(key, value)
+
+    def incr(self, key):
+        if key not in self.data:
+            raise ValueError(key)
+        self.data[key] += 1
+        return self.data[key]
+
+
+class _Graph:
+    """仅含节点表的图替身，copy 与 NetworkX 一样返回独立的新实例。"""
+
+    def __init__(self, nodes_data):
+        self.nodes_data = dict(nodes_data)
+
+    def copy(self):
+        return _Graph(self.nodes_data)
+
+    def nodes(self):
+        return self.nodes_data.keys()
+
+    def number_of_nodes(self):
+        return len(self.nodes_data)
+
+
+def _load_graph_module(cache):
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = cache
+    db_module = types.ModuleType("django.db")
+    db_module.transaction = types.SimpleNamespace(on_commit=lambda func: func())
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(PLUGIN_ROOT)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(PLUGIN_ROOT / "services")]
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "django.db": db_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.otn_path_graph", GRAPH_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class OtnPathGraphIncrementalTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = _Cache()
+        self.module = _load_graph_module(self.cache)
+        self.service = object.__new__(self.module.OtnPathGraphService)
+        self.service._graph = object()
+        self.service._version = 0
+        self.service._missing_syncs = 0
+
+    def test_changes_are_recorded_in_version_order(self) -> None:
+        self.module.record_otn_path_change(7)
+        self.module.record_otn_path_change(9)
+
+        self.assertEqual(self.module.current_graph_version(), 2)
+        self.assertEqual(self.module.read_graph_changes(0, 2), ([7, 9], 2))
+        self.assertEqual(self.module.read_graph_changes(1, 2), ([9], 2))
+
+    def test_sync_applies_each_changed_path_once(self) -> None:
+        for path_id in (7, 9, 7):
+            self.module.record_otn_path_change(path_id)
+
+        with mock.patch.object(self.service, "_apply_path_changes") as apply_changes, mock.patch.object(self.service, "_reload") as reload:
+            self.service.sync()
+            self.service.sync()
+
+        apply_changes.assert_called_once_with([7, 9])
+        reload.assert_not_called()
+        self.assertEqual(self.service._version, 3)
+
+    def test_sync_waits_for_missing_change_then_reloads(self) -> None:
+        self.module.record_otn_path_change(7)
+        self.module.record_otn_path_change(9)
+        del self.cache.data[self.module._graph_change_key(2)]
+
+        with mock.patch.object(self.service, "_apply_path_changes") as apply_changes, mock.patch.object(self.service, "_reload") as reload:
+            for _ in range(self.module.GRAPH_MISSING_SYNC_LIMIT):
+                self.service.sync()
+            reload.assert_not_called()
+            self.service.sync()
+
+        apply_changes.assert_called_once_with([7])
+        reload.assert_called_once_with()
+
+    def test_counter_reset_or_large_gap_reloads(self) -> None:
+        self.service._version = 10
+        self.cache.data[self.module.GRAPH_VERSION_KEY] = 3
+
+        with mock.patch.object(self.service, "_reload") as reload:
+            self.service.sync()
+            self.cache.data[self.module.GRAPH_VERSION_KEY] = 11 + self.module.GRAPH_CHANGE_REPLAY_LIMIT
+            self.service.sync()
+
+        self.assertEqual(reload.call_count, 2)
+
+    def test_changes_are_applied_to_a_copy_and_swapped_in(self) -> None:
+        old_graph = _Graph({(116.4, 39.9): {}})
+        self.service._graph = old_graph
+        self.service._node_index = {(116.4, 39.9): (116.4, 39.9)}
+        self.service._path_edges = {7: {((116.4, 39.9), (117.2, 39.1))}}
+        rebuilt = []
+
+        def rebuild(working, path_id):
+            working._graph.nodes_data[(117.2, 39.1)] = {}
+            working._path_edges[path_id].clear()
+            rebuilt.append(working)
+
+        with mock.patch.object(self.module.OtnPathGraphService, "_rebuild_path", rebuild):
+            self.service.update_path(7)
+
+        self.assertIsNot(rebuilt[0], self.service)
+        self.assertEqual(list(old_graph.nodes()), [(116.4, 39.9)])
+        self.assertEqual(list(self.service._graph.nodes()), [(116.4, 39.9), (117.2, 39.1)])
+        self.assertEqual(len(self.service._spatial_index), 2)
+        self.assertEqual(self.service._path_edges, {7: set()})
+
+    def test_reload_swaps_in_a_fully_loaded_instance(self) -> None:
+        old_graph = self.service._graph
+
+        def load(instance):
+            self.assertIs(self.service._graph, old_graph)
+            instance._graph = _Graph({(116.4, 39.9): {}})
+            instance._node_index = instance._path_edges = None
+            instance._version = 5
+
+        with mock.patch.object(self.module.OtnPathGraphService, "_load_graph", load):
+            self.service._reload()
+
+        self.assertIsNot(self.service._graph, old_graph)
+        self.assertEqual(self.service._version, 5)
+
+    def test_sync_skips_while_another_thread_is_updating(self) -> None:
+        self.module.record_otn_path_change(7)
+
+        with mock.patch.object(self.service, "_apply_path_changes") as apply_changes:
+            with self.service._update_lock:
+                self.service.sync()
+            apply_changes.assert_not_called()
+            self.service.sync()
+
+        apply_changes.assert_called_once_with([7])
+
+    def test_path_signals_record_graph_changes(self) -> None:
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("post_save.connect(record_otn_path_graph_change, sender=OtnPath)", signals_source)
+        self.assertIn("post_delete.connect(record_otn_path_graph_change, sender=OtnPath)", signals_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+GRAPH_PATH = PLUGIN_ROOT / "services" / "otn_path_graph.py"
+
+
+def _load_graph_module():
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = types.SimpleNamespace()
+    db_module = types.ModuleType("django.db")
+    db_module.transaction = types.SimpleNamespace(on_commit=lambda func: func())
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(PLUGIN_ROOT)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(PLUGIN_ROOT / "services")]
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.core": types.ModuleType("django.core"),
+        "django.core.cache": cache_module,
+        "django.db": db_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.otn_path_graph", GRAPH_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class _Graph:
+    """按 NetworkX 邻接表接口提供最小的无向图。"""
+
+    def __init__(self, edges):
+        self.adj = {}
+        for node_a, node_b, weight in edges:
+            self.adj.setdefault(node_a, {})[node_b] = {"weight": weight}
+            self.adj.setdefault(node_b, {})[node_a] = {"weight": weight}
+
+    def __contains__(self, node):
+        return node in self.adj
+
+    def number_of_nodes(self):
+        return len(self.adj)
+
+
+BEIJING = (116.4, 39.9)
+TIANJIN = (117.2, 39.1)
+SHIJIAZHUANG = (114.5, 38.0)
+JINAN = (117.0, 36.7)
+ZHENGZHOU = (113.6, 34.7)
+ISOLATED_A, ISOLATED_B = (87.6, 43.8), (88.0, 44.0)
+
+
+class OtnPathGraphRoutingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_graph_module()
+        self.service = object.__new__(self.module.OtnPathGraphService)
+        distance = self.service._haversine
+        edges = [
+            (BEIJING, TIANJIN, distance(BEIJING, TIANJIN)),
+            (TIANJIN, JINAN, distance(TIANJIN, JINAN)),
+            (JINAN, ZHENGZHOU, distance(JINAN, ZHENGZHOU)),
+            (BEIJING, SHIJIAZHUANG, distance(BEIJING, SHIJIAZHUANG)),
+            (SHIJIAZHUANG, ZHENGZHOU, distance(SHIJIAZHUANG, ZHENGZHOU)),
+            (ISOLATED_A, ISOLATED_B, distance(ISOLATED_A, ISOLATED_B)),
+        ]
+        self.service._graph = _Graph(edges)
+        self.service._reset_route_cache()
+
+    def test_astar_returns_shortest_path_and_length_in_one_pass(self) -> None:
+        path, length = self.service._astar(BEIJING, ZHENGZHOU)
+
+        expected = self.service._haversine(BEIJING, SHIJIAZHUANG) + self.service._haversine(SHIJIAZHUANG, ZHENGZHOU)
+        self.assertEqual(path, (BEIJING, SHIJIAZHUANG, ZHENGZHOU))
+        self.assertAlmostEqual(length, expected)
+        self.assertIsNone(self.service._astar(BEIJING, ISOLATED_A))
+        self.assertEqual(self.service._astar(JINAN, JINAN), ((JINAN,), 0.0))
+
+    def test_both_directions_share_one_cached_route(self) -> None:
+        forward = self.service._route_between(BEIJING, ZHENGZHOU)
+        backward = self.service._route_between(ZHENGZHOU, BEIJING)
+
+        self.assertEqual(backward[0], forward[0][::-1])
+        self.assertEqual(self.service._cached_route.cache_info().hits, 1)
+
+        self.service._reset_route_cache()
+        self.assertEqual(self.service._cached_route.cache_info().currsize, 0)
+
+    def test_calculate_route_concatenates_segments(self) -> None:
+        snapped = iter([TIANJIN, ZHENGZHOU, JINAN])
+        waypoints = [{"lng": 117.0, "lat": 39.0}, {"lng": 113.0, "lat": 34.0}, {"lng": 117.0, "lat": 36.0}]
+
+        with mock.patch.object(self.module, "HAS_NETWORKX", True), \
+                mock.patch.object(self.service, "find_nearest_node", side_effect=lambda *args, **kwargs: next(snapped)):
+            result = self.service.calculate_route(waypoints)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["route"]["geometry"]["coordinates"], [list(TIANJIN), list(JINAN), list(ZHENGZHOU), list(JINAN)])
+        self.assertAlmostEqual(
+            result["route"]["length_meters"],
+            self.service._haversine(TIANJIN, JINAN) + 2 * self.service._haversine(JINAN, ZHENGZHOU),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import importlib.util
+from pathlib import Path
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES_PATH = REPO_ROOT / "netbox_otnfaults" / "services"
+SNAPSHOT_PATH = SERVICES_PATH / "otn_path_graph_snapshot.py"
+GRAPH_PATH = SERVICES_PATH / "otn_path_graph.py"
+
+
+def _load_snapshot_module():
+    spec = importlib.util.spec_from_file_location("otn_path_graph_snapshot_under_test", SNAPSHOT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    with mock.patch.dict(sys.modules, {spec.name: module}):
+        spec.loader.exec_module(module)
+    return module
+
+
+NODES = [(116.39747, 39.90873), (117.2, 39.13333), (114.30525, 30.59276), (113.26436, 23.12908)]
+EDGES = [
+    (NODES[0], NODES[1], {"weight": 113000.5, "path_name": "京津", "cable_type": "self_built"}),
+    (NODES[1], NODES[2], {"weight": 950000.25, "path_name": "津汉", "cable_type": "leased"}),
+    (NODES[2], NODES[3], {"weight": 830000.0, "path_name": "汉广", "cable_type": "self_built"}),
+    (NODES[3], NODES[3], {"weight": 0.0, "path_name": "汉广", "cable_type": "self_built"}),
+]
+
+
+class OtnPathGraphSnapshotTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_snapshot_module()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.directory.name) / "graph.snapshot")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_round_trip_restores_nodes_edges_and_csr_arrays(self) -> None:
+        self.module.write_snapshot(self.path, "a" * 40, NODES, EDGES)
+
+        with self.module.open_snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.version, "a" * 40)
+            self.assertEqual(snapshot.nodes(), NODES)
+            self.assertEqual(sorted(snapshot.edges(), key=lambda edge: edge[2]["weight"]), sorted(EDGES, key=lambda edge: edge[2]["weight"]))
+            # 无向边在 CSR 中双向各记一次，自环仅记一次
+            self.assertEqual(list(snapshot.indptr), [0, 1, 3, 5, 7])
+            self.assertEqual(len(snapshot.path_attrs), 3)
+
+    def test_missing_incompatible_and_truncated_files_are_ignored(self) -> None:
+        with self.module.open_snapshot(self.path) as snapshot:
+            self.assertIsNone(snapshot)
+
+        self.module.write_snapshot(self.path, "b" * 40, NODES, EDGES)
+        data = Path(self.path).read_bytes()
+        Path(self.path).write_bytes(data[:100])
+        with self.module.open_snapshot(self.path) as snapshot:
+            self.assertIsNone(snapshot)
+
+        Path(self.path).write_bytes(b"XXXX" + data[4:])
+        with self.module.open_snapshot(self.path) as snapshot:
+            self.assertIsNone(snapshot)
+
+        Path(self.path).write_bytes(b"")
+        with self.module.open_snapshot(self.path) as snapshot:
+            self.assertIsNone(snapshot)
+
+    def test_default_path_lives_under_media_root_unless_configured(self) -> None:
+        def _settings_modules(plugin_config):
+            conf_module = types.ModuleType("django.conf")
+            conf_module.settings = types.SimpleNamespace(
+                MEDIA_ROOT="/opt/netbox/netbox/media", PLUGINS_CONFIG={"netbox_otnfaults": plugin_config},
+            )
+            return {"django": types.ModuleType("django"), "django.conf": conf_module}
+
+        with mock.patch.dict(sys.modules, _settings_modules({})):
+            self.assertEqual(
+                self.module.default_snapshot_path(), "/opt/netbox/netbox/media/netbox_otnfaults/otn_path_graph.snapshot",
+            )
+        with mock.patch.dict(sys.modules, _settings_modules({"otn_path_graph_snapshot_file": "/srv/graph.snapshot"})):
+            self.assertEqual(self.module.default_snapshot_path(), "/srv/graph.snapshot")
+
+    def test_service_loads_snapshot_when_version_matches(self) -> None:
+        source = GRAPH_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("if snapshot is None or snapshot.version != version:", source)
+        self.assertIn("if not (version and self._load_snapshot(snapshot_path, version)):", source)
+        self.assertIn("self._write_snapshot(snapshot_path, version)", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
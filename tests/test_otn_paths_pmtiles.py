@@ -0,0 +1,160 @@
+import gzip
+import importlib.util
+from pathlib import Path
+import struct
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES_PATH = REPO_ROOT / "netbox_otnfaults" / "services"
+PATH_PMTILES_PATH = SERVICES_PATH / "path_pmtiles.py"
+
+
+class _QuerySet:
+    def __init__(self, paths):
+        self.paths = paths
+
+    def defer(self, *fields):
+        return self
+
+    def select_related(self, *fields):
+        return self
+
+    def order_by(self, *fields):
+        return self
+
+    def iterator(self, chunk_size=None):
+        return iter(self.paths)
+
+
+def _path(pk, geometry):
+    coords = geometry["coordinates"] if isinstance(geometry, dict) else geometry
+    return types.SimpleNamespace(
+        pk=pk,
+        name=f"P{pk}",
+        site_a=types.SimpleNamespace(pk=1, name="A"),
+        site_z=None,
+        cable_type="self_built",
+        calculated_length=None,
+        description="",
+        geometry=geometry,
+        coordinates=[(float(lng), float(lat)) for lng, lat in coords],
+    )
+
+
+def _load_path_pmtiles_module(paths):
+    conf_module = types.ModuleType("django.conf")
+    conf_module.settings = types.SimpleNamespace(PLUGINS_CONFIG={})
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(SERVICES_PATH.parent)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(SERVICES_PATH)]
+    models_module = types.ModuleType("netbox_otnfaults.models")
+    models_module.OtnPath = types.SimpleNamespace(objects=_QuerySet(paths))
+    modules = {
+        "django": types.ModuleType("django"),
+        "django.conf": conf_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.models": models_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.path_pmtiles", PATH_PMTILES_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        pmtiles = sys.modules["netbox_otnfaults.services.pmtiles"]
+    return module, pmtiles
+
+
+def _read_varints(data):
+    values, offset = [], 0
+    while offset < len(data):
+        value = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        values.append(value)
+    return values
+
+
+class OtnPathsPmtilesTestCase(unittest.TestCase):
+    def test_tile_ids_follow_hilbert_order(self) -> None:
+        _module, pmtiles = _load_path_pmtiles_module([])
+
+        self.assertEqual(
+            [pmtiles.zxy_to_tile_id(*zxy) for zxy in [(0, 0, 0), (1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0), (2, 0, 0)]],
+            [0, 1, 2, 3, 4, 5],
+        )
+
+    def test_simplify_keeps_endpoints_and_drops_collinear_points(self) -> None:
+        module, _pmtiles = _load_path_pmtiles_module([])
+
+        points = [(0.0, 0.0), (0.1, 0.0), (0.2, 0.0001), (0.3, 0.0), (0.3, 0.2)]
+
+        self.assertEqual(module.simplify_line(points, 0.001), [(0.0, 0.0), (0.3, 0.0), (0.3, 0.2)])
+
+    def test_zoom_tiles_only_hold_segments_crossing_each_tile(self) -> None:
+        module, _pmtiles = _load_path_pmtiles_module([])
+        path = module._PathGeometry(
+            world_points=[(0.1, 0.1), (0.2, 0.1), (0.2, 0.3), (0.9, 0.3)],
+            properties={"id": 9},
+        )
+
+        tiles = module.build_zoom_tiles([path], 1)
+
+        self.assertEqual(set(tiles), {(0, 0), (1, 0)})
+        # 右侧瓦片仅包含跨越中线的最后一段
+        self.assertEqual(tiles[(1, 0)][0]["geometry"], [[(-2458, 2458), (3277, 2458)]])
+        self.assertEqual(len(tiles[(0, 0)][0]["geometry"][0]), 4)
+
+    def test_build_writes_valid_archive_and_reports_size(self) -> None:
+        paths = [
+            _path(1, {"type": "LineString", "coordinates": [[100.0, 30.0], [110.0, 35.0]]}),
+            _path(2, [[116.0, 39.0], [117.0, 40.0]]),
+            _path(3, [[116.0, 39.0]]),
+        ]
+        module, _pmtiles = _load_path_pmtiles_module(paths)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = str(Path(directory) / "otn_paths.pmtiles")
+            progress = []
+            result = module.build_otn_paths_pmtiles(
+                output_path, max_zoom=3, on_zoom=lambda z, tiles, elapsed: progress.append((z, tiles)),
+            )
+            data = Path(output_path).read_bytes()
+            leftovers = sorted(p.name for p in Path(directory).iterdir())
+
+        self.assertEqual((result.path_count, result.skipped_count), (2, 1))
+        self.assertEqual(result.size_bytes, len(data))
+        self.assertEqual([z for z, _tiles in progress], [0, 1, 2, 3])
+        self.assertEqual(leftovers, ["otn_paths.pmtiles"])
+
+        self.assertEqual(data[:8], b"PMTiles\x03")
+        header = struct.unpack("<QQQQQQQQQQQ", data[8:96])
+        root_offset, root_length, _meta_offset, _meta_length, _leaf_offset, leaf_length, data_offset, data_length = header[:8]
+        self.assertEqual(root_offset, 127)
+        self.assertEqual(leaf_length, 0)
+        self.assertEqual(data_offset + data_length, len(data))
+        self.assertEqual(header[8], result.tile_count)
+        self.assertEqual(data[101], 3)
+
+        directory_values = _read_varints(gzip.decompress(data[root_offset:root_offset + root_length]))
+        entry_count = directory_values[0]
+        self.assertGreater(entry_count, 0)
+        self.assertEqual(directory_values[1], 0)
+        first_tile = gzip.decompress(data[data_offset:data_offset + directory_values[1 + 2 * entry_count]])
+        self.assertIn(b"otn_paths", first_tile)
+
+
+if __name__ == "__main__":
+    unittest.main()
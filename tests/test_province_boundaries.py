@@ -0,0 +1,121 @@
+import ast
+import gzip
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+SERVICES_PATH = PLUGIN_ROOT / "services"
+BOUNDARIES_PATH = SERVICES_PATH / "province_boundaries.py"
+VIEWS_PATH = PLUGIN_ROOT / "views.py"
+URLS_PATH = PLUGIN_ROOT / "urls.py"
+
+
+def _load_accepts_gzip():
+    """从视图源码中取出 _accepts_gzip。"""
+    tree = ast.parse(VIEWS_PATH.read_text(encoding="utf-8"))
+    function = next(
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef) and node.name == "_accepts_gzip"
+    )
+    namespace = {}
+    exec(compile(ast.Module(body=[function], type_ignores=[]), str(VIEWS_PATH), "exec"), namespace)
+    return namespace["_accepts_gzip"]
+
+
+def _load_province_boundaries_module():
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(PLUGIN_ROOT)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(SERVICES_PATH)]
+    stats_cache_module = types.ModuleType("netbox_otnfaults.services.stats_cache")
+    stats_cache_module.get_or_compute = lambda key, compute, fresh, stale, force_refresh=False: compute()
+    modules = {
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.services.stats_cache": stats_cache_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.province_boundaries", BOUNDARIES_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class ProvinceBoundariesTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_province_boundaries_module()
+
+    def test_zoom_selects_level(self) -> None:
+        self.assertEqual(
+            [self.module.level_for_zoom(zoom).name for zoom in (0, 4, 4.9, 5, 7, 8, 30)],
+            ["low", "low", "low", "medium", "medium", "high", "high"],
+        )
+
+    def test_polygon_is_simplified_quantized_and_kept_closed(self) -> None:
+        level = self.module.BoundaryLevel("test", 0, 4, 0.1, 2)
+        ring = [[100.0, 30.0], [100.5, 30.001], [101.0, 30.0], [101.0, 31.0], [100.0, 31.0], [100.0, 30.0]]
+        island = [[110.0, 20.0], [110.01, 20.0], [110.01, 20.01], [110.0, 20.0]]
+
+        geometry = self.module.simplify_geometry({"type": "MultiPolygon", "coordinates": [[ring], [island]]}, level)
+
+        self.assertEqual(
+            geometry,
+            {"type": "MultiPolygon", "coordinates": [[[[100.0, 30.0], [101.0, 30.0], [101.0, 31.0], [100.0, 31.0], [100.0, 30.0]]]]},
+        )
+
+    def test_fully_collapsed_feature_keeps_largest_part(self) -> None:
+        level = self.module.BoundaryLevel("test", 0, 4, 1.0, 3)
+        ring = [[113.5, 22.1], [113.6, 22.1], [113.6, 22.2], [113.5, 22.1]]
+
+        geometry = self.module.simplify_geometry({"type": "Polygon", "coordinates": [ring]}, level)
+
+        self.assertEqual(geometry["coordinates"], [[ring]])
+
+    def test_build_reduces_bundled_boundaries_and_reports_zoom_range(self) -> None:
+        level = self.module.BOUNDARY_LEVELS[0]
+        _version, data = self.module.get_province_boundaries(level)
+        payload = json.loads(gzip.decompress(data))
+
+        self.assertLess(len(data), self.module.PROVINCE_GEOJSON_PATH.stat().st_size // 10)
+        self.assertEqual(payload["zoom_range"], [level.min_zoom, level.max_zoom])
+        self.assertEqual(len(payload["features"]), 42)
+
+    def test_endpoint_is_routed_and_serves_gzip(self) -> None:
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("name='map_province_boundaries'", URLS_PATH.read_text(encoding="utf-8"))
+        self.assertIn("response['Content-Encoding'] = 'gzip'", views_source)
+        self.assertIn("version, data = get_province_boundaries(level)", views_source)
+
+    def test_etag_differs_between_gzip_and_identity_bodies(self) -> None:
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("""'"{version}-{level.name}-{"gzip" if use_gzip else "identity"}"'""", views_source)
+        self.assertIn("elif use_gzip:", views_source)
+
+    def test_accept_encoding_q_values_are_honoured(self) -> None:
+        accepts_gzip = _load_accepts_gzip()
+
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, gzip;q=0.5"))
+        self.assertTrue(accepts_gzip("*"))
+        self.assertTrue(accepts_gzip("X-GZIP"))
+        self.assertFalse(accepts_gzip("gzip;q=0, deflate"))
+        self.assertFalse(accepts_gzip("gzip; q=0.000"))
+        self.assertFalse(accepts_gzip("*;q=0"))
+        self.assertFalse(accepts_gzip("br, *;q=1, gzip;q=0"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertFalse(accepts_gzip(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
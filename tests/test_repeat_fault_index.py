@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+UTILS_PATH = REPO_ROOT / "netbox_otnfaults" / "utils.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+MAP_DATA_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "fault_map_data.py"
+
+
+def _load_utils_module():
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(UTILS_PATH.parent)]
+    models = types.ModuleType("netbox_otnfaults.models")
+    models.FaultCategoryChoices = type("FaultCategoryChoices", (), {"CHOICES": []})
+    models.FaultStatusChoices = type("FaultStatusChoices", (), {"CHOICES": []})
+    with mock.patch.dict(sys.modules, {"netbox_otnfaults": package, "netbox_otnfaults.models": models}):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.utils", UTILS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+UTILS = _load_utils_module()
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class _Sites:
+    def __init__(self, site_ids):
+        self._sites = [types.SimpleNamespace(id=site_id) for site_id in site_ids]
+
+    def all(self):
+        return self._sites
+
+
+class _Fault:
+    def __init__(self, fault_id, a_id, z_ids, days, is_fiber_fault=True):
+        self.id = fault_id
+        self.pk = fault_id
+        self.interruption_location_a_id = a_id
+        self.interruption_location = _Sites(z_ids)
+        self.fault_occurrence_time = BASE_TIME + timedelta(days=days)
+        self.is_fiber_fault = is_fiber_fault
+
+    def __eq__(self, other):
+        return isinstance(other, _Fault) and other.id == self.id
+
+    def __hash__(self):
+        return self.id
+
+
+class RepeatFaultIndexTestCase(unittest.TestCase):
+    def test_has_preceding_uses_inclusive_window_on_same_site_pair(self) -> None:
+        first = _Fault(1, 10, [20], 0)
+        at_limit = _Fault(2, 10, [20], 60)
+        beyond = _Fault(3, 10, [20], 121)
+        other_pair = _Fault(4, 10, [21], 61)
+        index = UTILS.RepeatFaultIndex([first, at_limit, beyond, other_pair])
+
+        self.assertFalse(index.has_preceding(first))
+        self.assertTrue(index.has_preceding(at_limit))
+        self.assertFalse(index.has_preceding(beyond))
+        self.assertFalse(index.has_preceding(other_pair))
+
+    def test_non_fiber_faults_are_not_indexed(self) -> None:
+        power = _Fault(1, 10, [20], 0, is_fiber_fault=False)
+        fiber = _Fault(2, 10, [20], 1)
+        index = UTILS.RepeatFaultIndex([power, fiber])
+
+        self.assertFalse(index.has_preceding(fiber))
+
+    def test_related_returns_sorted_unique_matches_across_z_sites(self) -> None:
+        target = _Fault(1, 10, [20, 21], 30)
+        both_pairs = _Fault(2, 10, [20, 21], 10)
+        later = _Fault(3, 10, [21], 50)
+        outside = _Fault(4, 10, [20], 90)
+        index = UTILS.RepeatFaultIndex([later, outside, both_pairs, target])
+        window = UTILS.REPEAT_FAULT_WINDOW
+        start = target.fault_occurrence_time - window
+        end = target.fault_occurrence_time + window
+
+        self.assertEqual([fault.id for fault in index.related(target, start, end)], [2, 3])
+
+    def test_detect_repeat_faults_splits_kpi_ui_and_preceding_matches(self) -> None:
+        preceding = _Fault(1, 10, [20], -30)
+        current = _Fault(2, 10, [20], 0)
+        future = _Fault(3, 11, [20], 0)
+        future_match = _Fault(4, 11, [20], 10)
+
+        result = UTILS.detect_repeat_faults([current, future], [future_match], [preceding])
+
+        self.assertEqual(result.kpi_repeat_ids, {2})
+        self.assertEqual(result.ui_repeat_ids, {2, 3})
+        self.assertEqual([fault.id for fault in result.matched_preceding_faults], [1])
+
+    def test_statistics_callers_share_the_index_instead_of_nested_scans(self) -> None:
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+        map_data_source = MAP_DATA_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("RepeatFaultIndex(past_qs).related(", views_source)
+        self.assertNotIn("for previous_fault in comparison_faults:", views_source)
+        self.assertIn("return fault.id in self.repeat_fault_ids", map_data_source)
+        self.assertNotIn("for past_fault in self.past_faults_list:", map_data_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
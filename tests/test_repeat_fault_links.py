@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MODELS_PATH = REPO_ROOT / "netbox_otnfaults" / "models.py"
+SIGNALS_PATH = REPO_ROOT / "netbox_otnfaults" / "signals.py"
+SERVICE_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "repeat_links.py"
+COMMAND_PATH = REPO_ROOT / "netbox_otnfaults" / "management" / "commands" / "rebuild_repeat_links.py"
+MIGRATION_PATH = REPO_ROOT / "netbox_otnfaults" / "migrations" / "0091_otnfaultrepeatlink.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+MAP_DATA_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "fault_map_data.py"
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _load_migration_module():
+    django_module = types.ModuleType("django")
+    django_db_module = types.ModuleType("django.db")
+    django_db_module.migrations = types.SimpleNamespace(
+        Migration=object,
+        CreateModel=mock.MagicMock(),
+        AddConstraint=mock.MagicMock(),
+        RunPython=mock.MagicMock(),
+    )
+    django_db_module.models = mock.MagicMock()
+    django_module.db = django_db_module
+    with mock.patch.dict(sys.modules, {"django": django_module, "django.db": django_db_module}):
+        spec = importlib.util.spec_from_file_location("repeat_link_migration_under_test", MIGRATION_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+class _FaultQuerySet(list):
+    def filter(self, **kwargs):
+        categories = kwargs["fault_category__in"]
+        return _FaultQuerySet(fault for fault in self if fault.fault_category in categories)
+
+    def order_by(self, field):
+        return _FaultQuerySet(sorted(self, key=lambda fault: getattr(fault, field)))
+
+    def prefetch_related(self, *args):
+        return self
+
+
+class _Sites:
+    def __init__(self, site_ids):
+        self._sites = [types.SimpleNamespace(id=site_id) for site_id in site_ids]
+
+    def all(self):
+        return self._sites
+
+
+def _fault(fault_id, z_ids, days, category="fiber_break", a_id=1):
+    return types.SimpleNamespace(
+        id=fault_id,
+        fault_category=category,
+        interruption_location_a_id=a_id,
+        interruption_location=_Sites(z_ids),
+        fault_occurrence_time=BASE_TIME + timedelta(days=days),
+    )
+
+
+class _LinkManager:
+    def __init__(self):
+        self.created = []
+
+    def bulk_create(self, links, batch_size=None):
+        self.created.extend(links)
+
+
+class RepeatFaultLinkTestCase(unittest.TestCase):
+    def test_model_signals_and_rebuild_command_are_declared(self) -> None:
+        models_source = MODELS_PATH.read_text(encoding="utf-8")
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+        service_source = SERVICE_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("class OtnFaultRepeatLink(models.Model):", models_source)
+        self.assertIn("name='unique_otn_fault_repeat_link'", models_source)
+        self.assertIn("post_save.connect(refresh_fault_repeat_links, sender=OtnFault)", signals_source)
+        self.assertIn(
+            "m2m_changed.connect(refresh_fault_repeat_links_on_z_sites_change, sender=OtnFault.interruption_location.through)",
+            signals_source,
+        )
+        self.assertIn("if reverse and action == 'pre_clear':", signals_source)
+        self.assertIn("not fault.interruption_location_a_id", service_source)
+        self.assertIn("def refresh_repeat_links_for_fault(fault_id: int) -> int:", service_source)
+        self.assertIn("def rebuild_repeat_links(batch_size: int = 1000) -> int:", service_source)
+        self.assertTrue(COMMAND_PATH.exists(), "rebuild_repeat_links management command should exist")
+
+    def test_statistics_and_map_read_repeat_flags_from_link_table(self) -> None:
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+        map_data_source = MAP_DATA_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("return get_repeat_fault_ids(", views_source)
+        self.assertIn("repeat_faults_count = len(_build_repeat_fault_id_set(faults))", views_source)
+        self.assertIn("repeat_fault_ids = get_repeat_fault_ids(", map_data_source)
+
+    def test_migration_populates_links_within_window_on_shared_site_pair(self) -> None:
+        migration = _load_migration_module()
+        faults = _FaultQuerySet([
+            _fault(1, [10], 0),
+            _fault(2, [10, 11], 30),
+            _fault(3, [11], 95),
+            _fault(4, [10], 90),
+            _fault(5, [10], 95, category="power_fault"),
+            _fault(6, [10], 1, a_id=None),
+            _fault(7, [10], 2, a_id=None),
+        ])
+        links = _LinkManager()
+        link_model = type(
+            "OtnFaultRepeatLink",
+            (),
+            {"objects": links, "__init__": lambda self, **kwargs: self.__dict__.update(kwargs)},
+        )
+        fault_model = types.SimpleNamespace(objects=faults)
+        apps = types.SimpleNamespace(
+            get_model=lambda app_label, name: fault_model if name == "OtnFault" else link_model,
+        )
+
+        migration.populate_repeat_links(apps, None)
+
+        self.assertEqual(
+            sorted((link.fault_id, link.previous_fault_id, link.gap.days) for link in links.created),
+            [(2, 1, 30), (4, 2, 60)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLUGIN_ROOT = REPO_ROOT / "netbox_otnfaults"
+COORDS_PATH = PLUGIN_ROOT / "services" / "fault_coordinates.py"
+SIGNALS_PATH = PLUGIN_ROOT / "signals.py"
+COMMAND_PATH = PLUGIN_ROOT / "management" / "commands" / "backfill_resolved_coordinates.py"
+
+
+class OtnFault:
+    pass
+
+
+class CutoverTask:
+    pass
+
+
+def _load_fault_coordinates_module():
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(PLUGIN_ROOT)]
+    services_package = types.ModuleType("netbox_otnfaults.services")
+    services_package.__path__ = [str(PLUGIN_ROOT / "services")]
+    models_module = types.ModuleType("netbox_otnfaults.models")
+    models_module.OtnFault = OtnFault
+    models_module.CutoverTask = CutoverTask
+    models_module.OtnPath = types.SimpleNamespace()
+    modules = {
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": services_package,
+        "netbox_otnfaults.models": models_module,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.services.fault_coordinates", COORDS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _fault(**fields):
+    fault = OtnFault()
+    fault.interruption_latitude = None
+    fault.interruption_longitude = None
+    fault.interruption_location_a = types.SimpleNamespace(latitude=30.0, longitude=114.0)
+    fault.interruption_location = types.SimpleNamespace(all=lambda: [])
+    fault.__dict__.update(fields)
+    return fault
+
+
+class ResolvedCoordinateColumnsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_fault_coordinates_module()
+
+    def test_stored_columns_are_read_without_resolving(self) -> None:
+        fault = _fault(resolved_latitude=31.5, resolved_longitude=117.25, resolved_coords_source="path_midpoint")
+
+        with mock.patch.object(self.module, "resolve_location_coordinates") as resolve:
+            resolved = self.module.resolve_fault_coordinates(fault)
+
+        resolve.assert_not_called()
+        self.assertEqual((resolved.lat, resolved.lng, resolved.source), (31.5, 117.25, "path_midpoint"))
+        self.assertTrue(resolved.coords_from_site)
+
+    def test_unresolved_and_unstored_rows(self) -> None:
+        unresolved = _fault(resolved_latitude=None, resolved_longitude=None, resolved_coords_source="unresolved")
+        unstored = _fault(resolved_latitude=None, resolved_longitude=None, resolved_coords_source="")
+
+        self.assertIsNone(self.module.resolve_fault_coordinates(unresolved))
+        resolved = self.module.resolve_fault_coordinates(unstored)
+        self.assertEqual((resolved.lat, resolved.lng, resolved.source), (30.0, 114.0, "a_site"))
+
+    def test_column_values_round_and_mark_unresolved(self) -> None:
+        coordinate = self.module.FaultCoordinate(lat=30.1234567, lng=114.7654321, source="a_site")
+
+        self.assertEqual(
+            self.module.resolved_coordinate_fields(coordinate),
+            {"resolved_latitude": 30.123457, "resolved_longitude": 114.765432, "resolved_coords_source": "a_site"},
+        )
+        self.assertEqual(self.module.resolved_coordinate_fields(None)["resolved_coords_source"], "unresolved")
+
+    def test_site_and_path_hooks_and_backfill_command_are_registered(self) -> None:
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("post_save.connect(refresh_cutover_coordinates, sender=CutoverTask)", signals_source)
+        self.assertIn("post_save.connect(refresh_coordinates_on_site_change, sender=Site)", signals_source)
+        self.assertIn("post_save.connect(refresh_coordinates_on_path_change, sender=OtnPath)", signals_source)
+        self.assertIn("post_delete.connect(refresh_coordinates_on_path_change, sender=OtnPath)", signals_source)
+        self.assertIn("backfill_resolved_coordinates(", COMMAND_PATH.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import importlib.util
+import math
+from pathlib import Path
+import random
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES_PATH = REPO_ROOT / "netbox_otnfaults" / "services"
+SPATIAL_INDEX_PATH = SERVICES_PATH / "spatial_index.py"
+
+
+def _load_spatial_index_module():
+    spec = importlib.util.spec_from_file_location("spatial_index_under_test", SPATIAL_INDEX_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def _haversine(coord1, coord2):
+    lat1, lat2 = math.radians(coord1[1]), math.radians(coord2[1])
+    dlat = math.radians(coord2[1] - coord1[1])
+    dlng = math.radians(coord2[0] - coord1[0])
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+    return 6371000 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class NodeSpatialIndexTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = _load_spatial_index_module()
+        rng = random.Random(7)
+        self.nodes = [(round(rng.uniform(73.0, 135.0), 5), round(rng.uniform(18.0, 53.0), 5)) for _ in range(2000)]
+        self.index = self.module.NodeSpatialIndex(self.nodes)
+        self.targets = [(rng.uniform(73.0, 135.0), rng.uniform(18.0, 53.0)) for _ in range(50)]
+
+    def test_k_nearest_matches_brute_force_haversine(self) -> None:
+        for lng, lat in self.targets:
+            expected = sorted(self.nodes, key=lambda node: _haversine((lng, lat), node))[:5]
+            found = self.index.nearest(lng, lat, k=5)
+
+            self.assertEqual([node for _distance, node in found], expected)
+            self.assertAlmostEqual(found[0][0], _haversine((lng, lat), expected[0]), delta=0.01)
+
+    def test_radius_query_matches_brute_force(self) -> None:
+        for lng, lat in self.targets:
+            expected = sorted(node for node in self.nodes if _haversine((lng, lat), node) <= 150000)
+            found = self.index.within(lng, lat, 150000)
+
+            self.assertEqual(sorted(node for _distance, node in found), expected)
+            self.assertEqual([distance for distance, _node in found], sorted(distance for distance, _node in found))
+
+    def test_max_distance_and_empty_index(self) -> None:
+        self.assertEqual(self.index.nearest(0.0, 0.0, k=1, max_distance=100000), [])
+        self.assertEqual(self.module.NodeSpatialIndex([]).nearest(116.0, 39.0), [])
+        self.assertEqual(self.index.nearest(116.0, 39.0, k=0), [])
+
+    def test_graph_services_use_the_index(self) -> None:
+        for name in ("otn_path_graph.py", "highway_graph.py"):
+            source = (SERVICES_PATH / name).read_text(encoding="utf-8")
+
+            self.assertIn("self._spatial_index = graph_spatial_index(self._graph)", source)
+            self.assertNotIn("for node in self._graph.nodes():", source)
+
+
+    def test_graphs_with_their_own_index_skip_node_tuples(self) -> None:
+        sentinel = object()
+        csr_like = type("CsrLikeGraph", (), {
+            "spatial_index": lambda graph: sentinel,
+            "nodes": lambda graph: self.fail("CSR 图不应逐节点构建索引"),
+        })()
+        networkx_like = type("NetworkxLikeGraph", (), {"nodes": lambda graph: self.nodes[:10]})()
+
+        self.assertIs(self.module.graph_spatial_index(csr_like), sentinel)
+        self.assertIsInstance(self.module.graph_spatial_index(networkx_like), self.module.NodeSpatialIndex)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -120,7 +120,8 @@ class StatisticsBranchCompanyTestCase(unittest.TestCase):
         self.assertIn("'count_per_1000km': _per_1000km(", performance_source)
         self.assertIn("'duration_per_1000km': _per_1000km(", performance_source)
         self.assertIn("def _build_branch_performance_bare_fiber_annual_stats(", source)
-        self.assertIn("year_all_faults = [", source)
+        self.assertIn("power_fault_counts = _build_branch_power_fault_counts(year_start, year_end)", source)
+        self.assertNotIn("year_all_faults = [", source)
         self.assertIn("PowerFaultImpactChoices.HOSTED", source)
         self.assertIn("'bare_fiber': bare_fiber_annual_stats.get(province", performance_source)
         self.assertIn("'cable_break': {", performance_source)
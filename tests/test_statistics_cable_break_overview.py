@@ -39,7 +39,7 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         self.assertIn("fault.fault_status != FaultStatusChoices.SUSPENDED", source)
         self.assertIn("and not fault.is_suspended", source)
         self.assertIn("def _compute_cable_break_overview(faults: list, now) -> dict:", source)
-        self.assertIn("cable_break_overview = _compute_cable_break_overview(faults, now)", source)
+        self.assertIn("cable_break_overview = _compute_cable_break_overview_from_queryset(cable_break_qs, now)", source)
         self.assertIn("'cable_break_overview': cable_break_overview", source)
         self.assertIn("'prev_cable_break_overview': prev_cable_break_overview", source)
         self.assertIn("'total_count': cb_count", source)
@@ -57,6 +57,20 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         self.assertIn("'10-12小时': 0", source)
         self.assertIn("'12小时以上': 0", source)
 
+    def test_comparison_periods_aggregate_cable_break_overview_in_sql(self) -> None:
+        source = VIEWS_PATH.read_text(encoding="utf-8")
+        comparison_source = source.split("def _compute_comparison_period_data(", 1)[1].split("\n\n\ndef ", 1)[0]
+        aggregate_source = source.split("def _compute_cable_break_overview_from_queryset(", 1)[1].split("\n\n\ndef ", 1)[0]
+
+        self.assertIn("cable_break_overview = _compute_cable_break_overview_from_queryset(faults_qs, now)", comparison_source)
+        self.assertIn(".only('pk', 'fault_category', 'fault_occurrence_time')", comparison_source)
+        self.assertIn("function = 'PERCENTILE_CONT'", source)
+        self.assertIn("'p50': _PercentileCont('duration_hours', 0.5)", aggregate_source)
+        self.assertIn("'p90': _PercentileCont('duration_hours', 0.9)", aggregate_source)
+        self.assertIn("When(duration_hours__lte=float(bucket), then=Value(bucket)) for bucket in range(1, 25)", aggregate_source)
+        self.assertIn("return _compute_cable_break_overview(list(queryset), now)", aggregate_source)
+        self.assertNotIn("for fault in", aggregate_source)
+
     def test_template_contains_cable_break_overview_section_and_cards(self) -> None:
         template = TEMPLATE_PATH.read_text(encoding="utf-8")
 
@@ -626,10 +640,9 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         self.assertIn("OVERALL_EXCLUDED_TOTAL_CATEGORIES", source)
         self.assertIn("FaultCategoryChoices.FIBER_DEGRADATION", source)
         self.assertIn("FaultCategoryChoices.FIBER_JITTER", source)
-        self.assertIn("overall_faults = [", source)
-        self.assertIn("if f.fault_category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES", source)
-        self.assertIn("overall_total_count = len(overall_faults)", source)
-        self.assertIn("overall_category_stats = _build_fault_category_summary(overall_faults, now)", source)
+        self.assertIn("if category not in OVERALL_EXCLUDED_TOTAL_CATEGORIES:", source)
+        self.assertIn("overall_total_count = current_rollup_summary['overall_total_count']", source)
+        self.assertIn("overall_category_stats = current_rollup_summary['category_stats']", source)
         self.assertIn("all_suspended_faults_total_count = _apply_physical_province_filter(qs_all.filter(_suspended_fault_q()), selected_provinces).count()", source)
         self.assertIn("_apply_physical_province_filter(", source)
         self.assertIn("all_open_suspended_faults_count = _apply_physical_province_filter(", source)
@@ -1826,16 +1839,17 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
             "class ServiceStatisticsDataAPI",
             1,
         )[0]
+        cache_keys_source = source.split("def _fault_summary_cache_keys(", 1)[1].split("\n\n\ndef ", 1)[0]
 
         cache_key_line = next(
-            line for line in data_api_source.splitlines()
+            line for line in cache_keys_source.splitlines()
             if "cache_key = f" in line
         )
         self.assertIn("{calendar_year}", cache_key_line)
         self.assertIn("{calendar_month}", cache_key_line)
         self.assertLess(
             data_api_source.index("calendar_year = int(request.GET.get("),
-            data_api_source.index("cached_data = cache.get(cache_key)"),
+            data_api_source.index("return get_or_compute("),
         )
 
     def test_statistics_query_indexes_have_migration(self) -> None:
@@ -2030,7 +2044,7 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         self.assertIn("fault_category=FaultCategoryChoices.FIBER_BREAK", source)
         self.assertIn("filter(is_suspended=False)", source)
         self.assertIn("exclude(fault_status=FaultStatusChoices.SUSPENDED)", source)
-        self.assertIn("faults = list(get_cable_break_base_queryset(start_date, end_date))", source)
+        self.assertIn("_branch_company_faults(get_cable_break_base_queryset(start_date, end_date))", source)
         self.assertNotIn("qs = qs_all.filter(fault_category=FaultCategoryChoices.FIBER_BREAK)", source)
 
     def test_cable_break_scope_excludes_only_planned_rectification_faults(self) -> None:
@@ -2063,7 +2077,7 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         source = VIEWS_PATH.read_text(encoding="utf-8")
         repeat_history_source = source.split(
             "p_past_qs =", 1
-        )[1].split("p_past_list = list(p_past_qs)", 1)[0]
+        )[1].split("_build_repeat_fault_id_set(faults, p_past_qs)", 1)[0]
 
         self.assertIn(
             "_exclude_planned_rectification_faults(",
@@ -2140,7 +2154,7 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
 
         self.assertIn("'disable_3d_buildings': True", views_source)
         self.assertIn("disable3dBuildings: {{ disable_3d_buildings|yesno:\"true,false\" }}", template)
-        self.assertIn("userGeojsonUrl: '{% static \"netbox_otnfaults/data/中国_省.geojson\" %}'", template)
+        self.assertIn("userGeojsonUrl: '{% url \"plugins:netbox_otnfaults:map_province_boundaries\" %}'", template)
         self.assertIn("id: \"user-geojson-fill\"", user_geojson_block)
         self.assertIn("\"fill-color\"", user_geojson_block)
         self.assertIn("\"fill-opacity\"", user_geojson_block)
@@ -2669,8 +2683,9 @@ class StatisticsCableBreakOverviewTestCase(unittest.TestCase):
         self.assertIn("year_start = timezone.datetime(now.year, 1, 1", views_source)
         self.assertIn("year_end = timezone.datetime(now.year + 1, 1, 1", views_source)
         self.assertIn("physical_daily_start, physical_daily_end = _resolve_physical_daily_range(now)", views_source)
-        self.assertIn("physical_duration_boxplot_faults = list(_apply_physical_province_filter(", views_source)
-        self.assertIn("global_cable_break_faults = list(get_cable_break_base_queryset(start_date, end_date))", views_source)
+        self.assertIn("cable_break_qs = _apply_physical_province_filter(", views_source)
+        self.assertIn("physical_duration_boxplot_faults = list(cable_break_qs)", views_source)
+        self.assertNotIn("global_cable_break_faults = list(", views_source)
         self.assertIn("physical_duration_boxplot_stats = _build_physical_daily_fault_series(start_date, end_date, physical_duration_boxplot_faults, now)", views_source)
         self.assertIn("fault_category=FaultCategoryChoices.FIBER_BREAK", views_source)
         self.assertIn(".filter(is_suspended=False)", views_source)
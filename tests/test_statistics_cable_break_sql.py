@@ -0,0 +1,254 @@
+from datetime import datetime, timedelta, timezone
+import importlib.util
+import math
+from pathlib import Path
+import statistics
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+NOW = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+REASON_LABELS = {"construction": "施工", "animal": "动物", "natural": "自然灾害"}
+DAYTIME_HOURS = range(6, 18)
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def _load_statistics_views():
+    base_classes = {
+        name: type(name, (), {"__init__": lambda self, *args, **kwargs: None})
+        for name in ("Aggregate", "Func", "PermissionRequiredMixin", "View")
+    }
+    models_module = _module(
+        "django.db.models",
+        **{name: mock.MagicMock(name=name) for name in (
+            "Case", "Count", "Q", "F", "FloatField", "DurationField", "ExpressionWrapper",
+            "QuerySet", "Exists", "OuterRef", "Sum", "Value", "When",
+        )},
+        Aggregate=base_classes["Aggregate"],
+        Func=base_classes["Func"],
+    )
+    otn_models = _module(
+        "netbox_otnfaults.models",
+        **{name: mock.MagicMock(name=name) for name in (
+            "OtnFaultImpact", "BareFiberService", "OtnFaultDailyRollup", "CableTypeChoices",
+            "ServiceTypeChoices", "BusinessImpactChoices", "PowerFaultImpactChoices", "CutoverTask",
+        )},
+        OtnFault=types.SimpleNamespace(_meta=types.SimpleNamespace(
+            get_field=lambda name: types.SimpleNamespace(flatchoices=list(REASON_LABELS.items())),
+        )),
+        FaultCategoryChoices=mock.MagicMock(FIBER_BREAK="fiber_break", POWER_FAULT="power_fault"),
+        FaultStatusChoices=mock.MagicMock(SUSPENDED="suspended"),
+        ResourceTypeChoices=mock.MagicMock(SELF_BUILT="self_built", COORDINATED="coordinated", LEASED="leased"),
+    )
+    package = _module("netbox_otnfaults")
+    package.__path__ = [str(VIEWS_PATH.parent)]
+    services = _module("netbox_otnfaults.services")
+    services.__path__ = [str(VIEWS_PATH.parent / "services")]
+    modules = {
+        "django": _module("django"),
+        "django.shortcuts": _module("django.shortcuts", render=mock.MagicMock()),
+        "django.http": _module("django.http", HttpRequest=object, HttpResponse=object, JsonResponse=mock.MagicMock()),
+        "django.urls": _module("django.urls", reverse=mock.MagicMock()),
+        "django.utils": _module("django.utils", timezone=types.SimpleNamespace(localtime=lambda value: value)),
+        "django.db": _module("django.db", connection=types.SimpleNamespace(vendor="postgresql")),
+        "django.db.models": models_module,
+        "django.db.models.functions": _module(
+            "django.db.models.functions", TruncDate=mock.MagicMock(), Coalesce=mock.MagicMock(), Cast=mock.MagicMock(),
+        ),
+        "django.contrib": _module("django.contrib"),
+        "django.contrib.auth": _module("django.contrib.auth"),
+        "django.contrib.auth.mixins": _module(
+            "django.contrib.auth.mixins", PermissionRequiredMixin=base_classes["PermissionRequiredMixin"],
+        ),
+        "django.views": _module("django.views", View=base_classes["View"]),
+        "dcim": _module("dcim"),
+        "dcim.models": _module("dcim.models", Region=mock.MagicMock()),
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.models": otn_models,
+        "netbox_otnfaults.services": services,
+        "netbox_otnfaults.services.repeat_links": _module(
+            "netbox_otnfaults.services.repeat_links", get_repeat_fault_ids=mock.MagicMock(),
+        ),
+        "netbox_otnfaults.services.stats_cache": _module(
+            "netbox_otnfaults.services.stats_cache",
+            get_or_compute=mock.MagicMock(),
+            period_cache_tags=mock.MagicMock(),
+            statistics_cache_timeouts=mock.MagicMock(),
+            tagged_cache_key=mock.MagicMock(),
+        ),
+        "netbox_otnfaults.statistics_period": _module(
+            "netbox_otnfaults.statistics_period", build_period_display=mock.MagicMock(),
+        ),
+        "netbox_otnfaults.utils": _module(
+            "netbox_otnfaults.utils",
+            REPEAT_FAULT_WINDOW=timedelta(days=60),
+            RepeatFaultIndex=mock.MagicMock(),
+            detect_repeat_faults=mock.MagicMock(),
+        ),
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("netbox_otnfaults.statistics_views", VIEWS_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+def _fault(start_hours, duration_hours, reason=None, resource_type="self_built", category="fiber_break", status="closed"):
+    occurrence = NOW - timedelta(hours=start_hours)
+    recovery = occurrence + timedelta(hours=duration_hours) if duration_hours is not None else None
+    return types.SimpleNamespace(
+        fault_category=category,
+        fault_status=status,
+        is_suspended=status == "suspended",
+        fault_occurrence_time=occurrence,
+        fault_recovery_time=recovery,
+        interruption_reason=reason,
+        resource_type=resource_type,
+        get_interruption_reason_display=lambda: REASON_LABELS[reason],
+    )
+
+
+FAULTS = [
+    _fault(200, 0.3, "construction"),
+    _fault(190, 1.0, "construction", "leased"),
+    _fault(180, 2.5, "animal"),
+    _fault(170, 4.2, None, None),
+    _fault(160, 6.5, "natural", "coordinated"),
+    _fault(150, 9.0, "construction"),
+    _fault(140, 11.0, "animal", "leased"),
+    _fault(130, 30.0, "construction"),
+    _fault(20, None, "animal"),
+    _fault(100, 3.0, "animal", category="power_fault"),
+    _fault(90, 5.0, "construction", status="suspended"),
+]
+
+
+class _FakeCableBreakQuerySet:
+    """按故障列表模拟 ORM 筛选与聚合结果，聚合值按 SQL 语义在测试内独立计算。"""
+
+    def __init__(self, faults):
+        self.faults = list(faults)
+
+    def filter(self, **conditions):
+        return _FakeCableBreakQuerySet(
+            fault for fault in self.faults
+            if all(getattr(fault, name) == value for name, value in conditions.items())
+        )
+
+    def exclude(self, **conditions):
+        return _FakeCableBreakQuerySet(
+            fault for fault in self.faults
+            if not all(getattr(fault, name) == value for name, value in conditions.items())
+        )
+
+    def select_related(self, *fields):
+        return self
+
+    def prefetch_related(self, *lookups):
+        return self
+
+    def order_by(self, *fields):
+        return self
+
+    def annotate(self, **annotations):
+        return self
+
+    def __iter__(self):
+        return iter(self.faults)
+
+    def _hours(self, fault):
+        end = fault.fault_recovery_time or NOW
+        return (end - fault.fault_occurrence_time).total_seconds() / 3600.0
+
+    def _sum(self, predicate=lambda fault, hours: True):
+        values = [self._hours(fault) for fault in self.faults if predicate(fault, self._hours(fault))]
+        return (len(values), sum(values) if values else None)
+
+    def aggregate(self, **aggregates):
+        hours = sorted(self._hours(fault) for fault in self.faults)
+        valid = lambda fault, value: value > 0.5
+        day = lambda fault, value: valid(fault, value) and fault.fault_occurrence_time.hour in DAYTIME_HOURS
+        night = lambda fault, value: valid(fault, value) and fault.fault_occurrence_time.hour not in DAYTIME_HOURS
+        cons = lambda fault, value: valid(fault, value) and fault.interruption_reason == "construction"
+        noncons = lambda fault, value: valid(fault, value) and fault.interruption_reason != "construction"
+        quantiles = statistics.quantiles(hours, n=10, method="inclusive")
+        result = {
+            "cb_count": len(hours),
+            "total_duration": sum(hours),
+            "timeout_count": self._sum(lambda fault, value: value >= 4.0)[0],
+            "p50": quantiles[4],
+            "p90": quantiles[8],
+        }
+        for prefix, predicate in (("valid", valid), ("day", day), ("night", night), ("cons", cons), ("noncons", noncons)):
+            result[f"cb_{prefix}_count"], result[f"cb_{prefix}_dur"] = self._sum(predicate)
+        for index, (lower, upper) in enumerate(((6, 8), (8, 10), (10, 12), (12, math.inf))):
+            count, duration = self._sum(lambda fault, value: lower <= value < upper)
+            result[f"long_count_{index}"], result[f"long_duration_{index}"] = count, duration
+        if set(aggregates) != set(result):
+            raise AssertionError(f"unexpected aggregates: {sorted(set(aggregates) ^ set(result))}")
+        return result
+
+    def values(self, *fields):
+        return _FakeGroupedRows(self, fields)
+
+
+class _FakeGroupedRows:
+    def __init__(self, queryset, fields):
+        self.queryset = queryset
+        self.fields = fields
+
+    def annotate(self, **annotations):
+        groups = {}
+        for fault in self.queryset.faults:
+            hours = self.queryset._hours(fault)
+            if self.fields == ("bucket",):
+                key = (next((bucket for bucket in range(1, 25) if hours <= bucket), 25),)
+            else:
+                if fault.resource_type in ("self_built", "coordinated"):
+                    source = "自控"
+                elif fault.resource_type == "leased":
+                    source = "第三方"
+                else:
+                    source = "其他/未填"
+                key = (fault.interruption_reason, source)
+            count, duration = groups.get(key, (0, 0.0))
+            groups[key] = (count + 1, duration + hours)
+        names = ("bucket",) if self.fields == ("bucket",) else ("interruption_reason", "source_group")
+        return [
+            {**dict(zip(names, key)), "count": count, "duration": duration}
+            for key, (count, duration) in groups.items()
+        ]
+
+
+class CableBreakOverviewSqlTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.views = _load_statistics_views()
+
+    def test_sql_overview_matches_python_overview_on_same_faults(self) -> None:
+        queryset = _FakeCableBreakQuerySet(FAULTS)
+
+        sql_overview = self.views._compute_cable_break_overview_from_queryset(queryset, NOW)
+        python_overview = self.views._compute_cable_break_overview(FAULTS, NOW)
+
+        self.assertEqual(sql_overview, python_overview)
+        self.assertEqual(sql_overview["total_count"], 9)
+
+    def test_non_postgresql_falls_back_to_python_overview(self) -> None:
+        with mock.patch.object(self.views.connection, "vendor", "sqlite"):
+            overview = self.views._compute_cable_break_overview_from_queryset(_FakeCableBreakQuerySet(FAULTS), NOW)
+
+        self.assertEqual(overview, self.views._compute_cable_break_overview(FAULTS, NOW))
+
+
+if __name__ == "__main__":
+    unittest.main()
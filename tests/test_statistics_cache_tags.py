@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta, timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+STATS_CACHE_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "stats_cache.py"
+SIGNALS_PATH = REPO_ROOT / "netbox_otnfaults" / "signals.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+
+
+class _FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        if key not in self.data:
+            raise ValueError(key)
+        self.data[key] += 1
+        return self.data[key]
+
+
+def _load_stats_cache_module(fake_cache):
+    django_module = types.ModuleType("django")
+    core_module = types.ModuleType("django.core")
+    cache_module = types.ModuleType("django.core.cache")
+    cache_module.cache = fake_cache
+    conf_module = types.ModuleType("django.conf")
+    conf_module.settings = types.SimpleNamespace(PLUGINS_CONFIG={})
+    db_module = types.ModuleType("django.db")
+    db_module.close_old_connections = lambda: None
+    utils_module = types.ModuleType("django.utils")
+    utils_module.timezone = types.SimpleNamespace(localtime=lambda value: value)
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(STATS_CACHE_PATH.parents[1])]
+    otn_utils = types.ModuleType("netbox_otnfaults.utils")
+    otn_utils.REPEAT_FAULT_WINDOW = timedelta(days=60)
+    modules = {
+        "django": django_module,
+        "django.core": core_module,
+        "django.core.cache": cache_module,
+        "django.conf": conf_module,
+        "django.db": db_module,
+        "django.utils": utils_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.utils": otn_utils,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("stats_cache_under_test", STATS_CACHE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+    return module
+
+
+class StatisticsCacheTagsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = _FakeCache()
+        self.module = _load_stats_cache_module(self.cache)
+
+    def test_fault_tags_follow_occurrence_month_province_and_suspension(self) -> None:
+        tags = self.module.fault_cache_tags(datetime(2023, 5, 3, tzinfo=timezone.utc), "浙江", True, True)
+
+        self.assertEqual(
+            tags,
+            {"month:202305:*", "month:202305:浙江", "month:202305:branch", "suspended"},
+        )
+        self.assertEqual(self.module.fault_cache_tags(None, "浙江", False, False), set())
+
+    def test_period_tags_cover_repeat_lookback_and_selected_provinces(self) -> None:
+        tags = self.module.period_cache_tags(
+            [(datetime(2025, 3, 1, tzinfo=timezone.utc), datetime(2025, 4, 1, tzinfo=timezone.utc)), (None, None)],
+            ["山东"],
+        )
+
+        self.assertIn("month:202501:山东", tags)
+        self.assertIn("month:202503:branch", tags)
+        self.assertNotIn("month:202504:山东", tags)
+        self.assertNotIn("month:202503:*", tags)
+        self.assertIn("services", tags)
+
+    def test_only_dependent_tag_invalidation_changes_cache_key(self) -> None:
+        tags_2025 = self.module.period_cache_tags(
+            [(datetime(2025, 3, 1, tzinfo=timezone.utc), datetime(2025, 4, 1, tzinfo=timezone.utc))],
+            [],
+        )
+        key = self.module.tagged_cache_key("summary", tags_2025)
+
+        self.module.invalidate_cache_tags(
+            self.module.fault_cache_tags(datetime(2023, 5, 3, tzinfo=timezone.utc), "浙江", False, False)
+        )
+        self.assertEqual(self.module.tagged_cache_key("summary", tags_2025), key)
+
+        self.module.invalidate_cache_tags(
+            self.module.fault_cache_tags(datetime(2025, 3, 9, tzinfo=timezone.utc), "浙江", False, False)
+        )
+        self.assertNotEqual(self.module.tagged_cache_key("summary", tags_2025), key)
+
+    def test_get_or_compute_serves_fresh_entry_and_single_flights_misses(self) -> None:
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        self.assertEqual(self.module.get_or_compute("k", compute, 60, 600), {"value": 1})
+        self.assertEqual(self.module.get_or_compute("k", compute, 60, 600), {"value": 1})
+        self.assertEqual(len(calls), 1)
+        self.assertNotIn("k:lock", self.cache.data)
+
+    def test_get_or_compute_returns_stale_payload_and_refreshes_once(self) -> None:
+        self.cache.data["old"] = {"payload": "previous", "fresh_until": 0}
+        refreshes = []
+
+        with mock.patch.object(self.module, "_refresh_in_background", lambda key, *args: refreshes.append(key)):
+            first = self.module.get_or_compute("new", lambda: "fresh", 60, 600, stale_key="old")
+            second = self.module.get_or_compute("new", lambda: "fresh", 60, 600, stale_key="old")
+
+        self.assertEqual((first, second), ("previous", "previous"))
+        self.assertEqual(refreshes, ["new"])
+
+    def test_get_or_compute_waits_for_lock_holder_result(self) -> None:
+        self.cache.data["k:lock"] = 1
+        original_sleep = self.module.time.sleep
+
+        def finish_other_worker(_seconds):
+            self.cache.data["k"] = {"payload": "from-other-worker", "fresh_until": float("inf")}
+
+        with mock.patch.object(self.module.time, "sleep", finish_other_worker):
+            result = self.module.get_or_compute("k", lambda: self.fail("should not compute"), 60, 600)
+
+        self.assertIs(self.module.time.sleep, original_sleep)
+        self.assertEqual(result, "from-other-worker")
+
+    def test_signals_and_summary_use_scoped_tags_instead_of_global_version(self) -> None:
+        signals_source = SIGNALS_PATH.read_text(encoding="utf-8")
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertNotIn("otnfaults:stats:version", signals_source)
+        self.assertNotIn("otnfaults:stats:version", views_source)
+        self.assertIn("tags = _fault_state_tags(getattr(instance, '_previous_fault_state', None))", signals_source)
+        self.assertIn("cache_key = tagged_cache_key(", views_source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+import importlib.util
+from pathlib import Path
+import sys
+import types
+import unittest
+from unittest import mock
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+WARMUP_PATH = REPO_ROOT / "netbox_otnfaults" / "services" / "stats_warmup.py"
+COMMAND_PATH = REPO_ROOT / "netbox_otnfaults" / "management" / "commands" / "warm_statistics_cache.py"
+SCRIPT_PATH = REPO_ROOT / "netbox_otnfaults" / "scripts" / "warm_statistics_cache.py"
+STATISTICS_VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "statistics_views.py"
+VIEWS_PATH = REPO_ROOT / "netbox_otnfaults" / "views.py"
+
+
+class _Get(dict):
+    def getlist(self, key):
+        return []
+
+
+def _frontend_params(selected, filter_type):
+    """按统计看板 buildTimeParams 与 loadData 拼接的查询参数（独立于预热实现）。"""
+    year, month, _day = (int(part) for part in selected.split("-"))
+    if filter_type == "week":
+        iso_year, iso_week, _weekday = date.fromisoformat(selected).isocalendar()
+        params = {"filter_type": "week", "year": iso_year, "week": iso_week}
+    elif filter_type == "month":
+        params = {"filter_type": "month", "year": year, "month": month}
+    else:
+        params = {"filter_type": "year", "year": year}
+    params.update(calendar_year=year, calendar_month=month)
+    return params
+
+
+def _summary_cache_key(views_module, params):
+    """经 FaultStatisticsDataAPI.cached_response_data 取得接口使用的缓存键。"""
+    keys = []
+    views_module.get_or_compute = lambda cache_key, *args, **kwargs: keys.append(cache_key)
+    request = types.SimpleNamespace(GET=_Get({name: str(value) for name, value in params.items()}))
+    views_module.FaultStatisticsDataAPI.cached_response_data(request)
+    return keys[0]
+
+
+def _load_statistics_views():
+    from test_statistics_cable_break_sql import _load_statistics_views as load
+
+    module = load()
+    module.timezone = types.SimpleNamespace(
+        datetime=datetime,
+        get_current_timezone=lambda: dt_timezone.utc,
+        localdate=lambda: date(2025, 3, 5),
+        localtime=lambda value=None: value or datetime(2025, 3, 5, 12, tzinfo=dt_timezone.utc),
+    )
+    module.tagged_cache_key = lambda base_key, tags: base_key
+    module.period_cache_tags = lambda ranges, provinces: ()
+    module.statistics_cache_timeouts = lambda is_ended: (60, 120)
+    return module
+
+
+class _QueryDict(dict):
+    def __init__(self, mutable=False):
+        super().__init__()
+        self.lists = {}
+
+    def setlist(self, key, values):
+        self.lists[key] = list(values)
+
+
+def _load_warmup_module(calls):
+    def recorder(name):
+        def record(request=None, force_refresh=False):
+            calls.append((name, dict(request.GET) if request else {}, getattr(request.GET, "lists", {}) if request else {}, force_refresh))
+            if name == "cable_break_map" and request.GET.get("filter_type") == "week":
+                raise RuntimeError("boom")
+            return {}
+        return record
+
+    django_module = types.ModuleType("django")
+    http_module = types.ModuleType("django.http")
+    http_module.HttpRequest = type("HttpRequest", (), {})
+    http_module.QueryDict = _QueryDict
+    utils_module = types.ModuleType("django.utils")
+    utils_module.timezone = types.SimpleNamespace(localdate=lambda: date(2025, 3, 5))
+    package = types.ModuleType("netbox_otnfaults")
+    package.__path__ = [str(WARMUP_PATH.parents[1])]
+    fault_map_data = types.ModuleType("netbox_otnfaults.services.fault_map_data")
+    fault_map_data.get_cached_fault_map_payload = lambda force_refresh=False: recorder("fault_map")(None, force_refresh)
+    statistics_views = types.ModuleType("netbox_otnfaults.statistics_views")
+    statistics_views.FaultStatisticsDataAPI = types.SimpleNamespace(cached_response_data=recorder("fault_statistics"))
+    statistics_views.ServiceStatisticsDataAPI = types.SimpleNamespace(cached_response_data=recorder("service_statistics"))
+    views = types.ModuleType("netbox_otnfaults.views")
+    views.StatisticsCableBreakMapDataAPI = types.SimpleNamespace(cached_payload=recorder("cable_break_map"))
+    modules = {
+        "django": django_module,
+        "django.http": http_module,
+        "django.utils": utils_module,
+        "netbox_otnfaults": package,
+        "netbox_otnfaults.services": types.ModuleType("netbox_otnfaults.services"),
+        "netbox_otnfaults.services.fault_map_data": fault_map_data,
+        "netbox_otnfaults.statistics_views": statistics_views,
+        "netbox_otnfaults.views": views,
+    }
+    with mock.patch.dict(sys.modules, modules):
+        spec = importlib.util.spec_from_file_location("stats_warmup_under_test", WARMUP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        assert spec.loader is not None
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class StatisticsCacheWarmupTestCase(unittest.TestCase):
+    def test_standard_periods_cover_current_and_previous_year_month_and_week(self) -> None:
+        module = _load_warmup_module([])
+
+        periods = module.standard_period_params(date(2025, 1, 2))
+
+        self.assertEqual(
+            [(period["filter_type"], period["year"], period.get("month"), period.get("week")) for period in periods],
+            [
+                ("year", 2025, None, None),
+                ("year", 2024, None, None),
+                ("month", 2025, 1, None),
+                ("month", 2024, 12, None),
+                ("week", 2025, None, 1),
+                ("week", 2024, None, 52),
+            ],
+        )
+        self.assertEqual((periods[3]["calendar_year"], periods[3]["calendar_month"]), (2024, 12))
+
+    def test_warmed_keys_match_dashboard_requests_after_period_navigation(self) -> None:
+        module = _load_warmup_module([])
+        views_module = _load_statistics_views()
+        # 看板默认选中今日，“上一周期”按 JS Date 语义平移：年、月保留日号并溢出，周减 7 天
+        cases = {
+            date(2024, 2, 29): {"year": "2023-03-01", "month": "2024-01-29", "week": "2024-02-22"},
+            date(2025, 3, 31): {"year": "2024-03-31", "month": "2025-03-03", "week": "2025-03-24"},
+            date(2025, 1, 2): {"year": "2024-01-02", "month": "2024-12-02", "week": "2024-12-26"},
+        }
+
+        for today, previous in cases.items():
+            with self.subTest(today=today):
+                requested = {
+                    _summary_cache_key(views_module, _frontend_params(selected, filter_type))
+                    for filter_type, previous_date in previous.items()
+                    for selected in (today.isoformat(), previous_date)
+                }
+                periods = module.standard_period_params(today)
+                warmed = {_summary_cache_key(views_module, params) for params in periods}
+
+                self.assertEqual(warmed, requested)
+                self.assertEqual(len(periods), len(warmed))
+
+    def test_warmup_refreshes_every_payload_and_reports_failures(self) -> None:
+        calls = []
+        module = _load_warmup_module(calls)
+        reported = []
+
+        results = module.warm_statistics_cache([[], ["山东"]], on_result=reported.append)
+
+        self.assertEqual(results, reported)
+        self.assertEqual(len(results), 1 + 6 * (1 + 2 * 2))
+        self.assertTrue(all(call[3] for call in calls))
+        self.assertIn(("fault_statistics", {"filter_type": "year", "year": "2025", "calendar_year": "2025", "calendar_month": "3"}, {"provinces": ["山东"]}, True), calls)
+        failures = [result for result in results if result.error]
+        self.assertEqual(len(failures), 4)
+        self.assertTrue(all(result.payload == "cable_break_map" for result in failures))
+
+    def test_views_and_warmup_share_cached_payload_helpers(self) -> None:
+        statistics_source = STATISTICS_VIEWS_PATH.read_text(encoding="utf-8")
+        views_source = VIEWS_PATH.read_text(encoding="utf-8")
+
+        self.assertIn("return JsonResponse(self.cached_response_data(request))", statistics_source)
+        self.assertIn("payload = self.cached_payload(request)", views_source)
+        self.assertIn("payload = get_cached_fault_map_payload()", views_source)
+        self.assertTrue(COMMAND_PATH.exists(), "warm_statistics_cache management command should exist")
+        self.assertIn("class WarmStatisticsCache(Script):", SCRIPT_PATH.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
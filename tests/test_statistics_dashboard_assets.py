@@ -138,13 +138,13 @@ class StatisticsDashboardAssetsTestCase(unittest.TestCase):
 
         self.assertIn("def _parse_selected_provinces(request: HttpRequest) -> list[str]:", source)
         self.assertIn("selected_provinces = _parse_selected_provinces(request)", source)
-        self.assertIn("filtered_current_qs = _apply_physical_province_filter(all_current_qs, selected_provinces)", source)
-        self.assertIn("faults = list(filtered_current_qs)", source)
-        self.assertIn("global_cable_break_faults = list(get_cable_break_base_queryset(start_date, end_date))", source)
+        self.assertIn("_load_fault_rollup_rows(start_date, end_date, selected_provinces, now)", source)
+        self.assertNotIn("global_cable_break_faults = list(", source)
         self.assertIn("province_stats = _build_physical_province_chart_stats(faults, now)", source)
         physical_daily_source = source.split("physical_daily_faults = list(", 1)[1].split("physical_daily_stats =", 1)[0]
         self.assertIn("_apply_physical_province_filter(", physical_daily_source)
-        self.assertIn("physical_duration_boxplot_faults = list(_apply_physical_province_filter(", source)
+        self.assertIn("cable_break_qs = _apply_physical_province_filter(", source)
+        self.assertIn("physical_duration_boxplot_faults = list(cable_break_qs)", source)
         self.assertIn("'selected_provinces': selected_provinces", source)
 
     def test_statistics_data_api_filters_previous_physical_comparison_by_selected_provinces(self) -> None:
@@ -155,15 +155,15 @@ class StatisticsDashboardAssetsTestCase(unittest.TestCase):
             1,
         )[1].split(")", 1)[0]
 
-        self.assertIn("all_faults = list(filtered_qs)", func_source)
         self.assertIn(
-            "filtered_qs = _apply_physical_province_filter(qs_period, selected_provinces)",
+            "_load_fault_rollup_rows(start_date, end_date, selected_provinces, now)",
             func_source,
         )
-        self.assertIn("overall_faults = [", func_source)
-        self.assertIn("other_overview = _build_other_fault_summary(", func_source)
-        self.assertIn("all_faults,", branch_company_call)
-        self.assertNotIn("overall_faults,", branch_company_call)
+        self.assertIn("overall_category_stats = rollup_summary['category_stats']", func_source)
+        self.assertIn("other_overview = _build_other_fault_summary_from_counts(", func_source)
+        self.assertIn("start_date,", branch_company_call)
+        self.assertNotIn("all_faults,", branch_company_call)
+        self.assertNotIn("unfiltered_all_faults = list(", func_source)
 
     def test_statistics_dashboard_js_uses_theme_aware_chart_options(self) -> None:
         script = JS_PATH.read_text(encoding="utf-8")
@@ -80,17 +80,15 @@ class StatisticsImpactLevelTestCase(unittest.TestCase):
             "class FaultStatisticsDataAPI", 1
         )[1].split("class FaultStatisticsDetailsAPI", 1)[0]
 
-        self.assertIn(
-            "_annotate_class_i_business_impact(\n"
-            "        _exclude_planned_rectification_faults(filtered_qs)\n"
-            "    )",
-            comparison_source,
-        )
-        self.assertIn(
-            "_annotate_class_i_business_impact(\n"
-            "            _exclude_planned_rectification_faults(filtered_current_qs)\n"
-            "        )",
-            current_source,
+        summary_source = source.split(
+            "def _summarize_fault_rollup_rows", 1
+        )[1].split("def _compute_comparison_period_data", 1)[0]
+
+        self.assertIn("rollup_summary['level_stats']", comparison_source)
+        self.assertIn("current_rollup_summary['level_stats']", current_source)
+        self.assertLess(
+            summary_source.index("if row['is_planned_rectification']:"),
+            summary_source.index("level_stats['total'] += count"),
         )
 
     def test_impact_level_and_ring_details_exclude_planned_rectification_faults(self) -> None: